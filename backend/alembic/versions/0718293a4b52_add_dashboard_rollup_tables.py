@@ -0,0 +1,92 @@
+"""Add pre-aggregated rollup tables for the admin dashboard
+
+Revision ID: 0718293a4b52
+Revises: f60718293a41
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0718293a4b52"
+down_revision: Union[str, None] = "f60718293a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("department", sa.String(length=32), nullable=False),
+        sa.Column("category", sa.String(length=128), nullable=False),
+        sa.Column("status", sa.String(length=24), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "department", "category", "status"),
+    )
+    op.create_table(
+        "transmission_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("target_type", sa.String(length=32), nullable=False),
+        sa.Column("status", sa.String(length=24), nullable=False),
+        sa.Column("transmission_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "target_type", "status"),
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("rebuilt_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    # Le compacteur cherche les lignes creees ou modifiees depuis son dernier passage.
+    op.create_index(op.f("ix_formal_reports_updated_at"), "formal_reports", ["updated_at"], unique=False)
+    op.create_index(op.f("ix_external_transmissions_created_at"), "external_transmissions", ["created_at"], unique=False)
+    op.create_index(op.f("ix_external_transmissions_updated_at"), "external_transmissions", ["updated_at"], unique=False)
+
+    # Construction initiale : le tableau de bord est juste des la fin de la migration.
+    # Jours UTC, comme le compacteur : independants du fuseau de la session.
+    op.execute(
+        """
+        INSERT INTO report_daily_rollups (day, department, category, status, report_count)
+        SELECT date(timezone('UTC', r.created_at)), coalesce(m.department, 'non_localise'),
+               coalesce(a.primary_category, 'non_classe'), r.status, count(r.id)
+        FROM formal_reports r
+        JOIN messages m ON r.message_id = m.id
+        JOIN analyses a ON r.analysis_id = a.id
+        GROUP BY date(timezone('UTC', r.created_at)), coalesce(m.department, 'non_localise'),
+                 coalesce(a.primary_category, 'non_classe'), r.status
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO transmission_daily_rollups (day, target_type, status, transmission_count)
+        SELECT date(timezone('UTC', t.created_at)), t.target_type, t.status, count(t.id)
+        FROM external_transmissions t
+        GROUP BY date(timezone('UTC', t.created_at)), t.target_type, t.status
+        """
+    )
+    now = datetime.now(timezone.utc)
+    watermarks = sa.table(
+        "rollup_watermarks",
+        sa.column("name", sa.String()),
+        sa.column("refreshed_at", sa.DateTime(timezone=True)),
+        sa.column("rebuilt_at", sa.DateTime(timezone=True)),
+    )
+    op.bulk_insert(watermarks, [{"name": "admin_dashboard", "refreshed_at": now, "rebuilt_at": now}])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_external_transmissions_updated_at"), table_name="external_transmissions")
+    op.drop_index(op.f("ix_external_transmissions_created_at"), table_name="external_transmissions")
+    op.drop_index(op.f("ix_formal_reports_updated_at"), table_name="formal_reports")
+    op.drop_table("rollup_watermarks")
+    op.drop_table("transmission_daily_rollups")
+    op.drop_table("report_daily_rollups")
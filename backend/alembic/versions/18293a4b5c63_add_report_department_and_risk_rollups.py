@@ -0,0 +1,126 @@
+"""Persist the report department and add the risk bucket to report rollups
+
+Revision ID: 18293a4b5c63
+Revises: 0718293a4b52
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "18293a4b5c63"
+down_revision: Union[str, None] = "0718293a4b52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Valeurs deja normalisees par resolve_department : recopiees telles quelles.
+# Les autres rapports restent NULL et sont resolus par le compacteur (dechiffrement du numero).
+CANONICAL_DEPARTMENTS = (
+    "Alibori",
+    "Atacora",
+    "Atlantique",
+    "Borgou",
+    "Collines",
+    "Couffo",
+    "Donga",
+    "Littoral",
+    "Mono",
+    "Oueme",
+    "Plateau",
+    "Zou",
+    "UNKNOWN",
+)
+
+
+def _mark_rebuilt() -> None:
+    now = datetime.now(timezone.utc)
+    watermarks = sa.table(
+        "rollup_watermarks",
+        sa.column("name", sa.String()),
+        sa.column("refreshed_at", sa.DateTime(timezone=True)),
+        sa.column("rebuilt_at", sa.DateTime(timezone=True)),
+    )
+    op.execute(
+        watermarks.update().where(watermarks.c.name == "admin_dashboard").values(refreshed_at=now, rebuilt_at=now)
+    )
+
+
+def upgrade() -> None:
+    op.add_column("formal_reports", sa.Column("department", sa.String(length=32), nullable=True))
+    op.create_index(op.f("ix_formal_reports_department"), "formal_reports", ["department"], unique=False)
+    department_list = ", ".join(f"'{department}'" for department in CANONICAL_DEPARTMENTS)
+    op.execute(
+        f"""
+        UPDATE formal_reports
+        SET department = (SELECT m.department FROM messages m WHERE m.id = formal_reports.message_id)
+        WHERE EXISTS (
+            SELECT 1 FROM messages m
+            WHERE m.id = formal_reports.message_id AND m.department IN ({department_list})
+        )
+        """
+    )
+
+    # Donnees derivees : la table est recreee et reconstruite depuis les sources,
+    # par jour UTC comme le compacteur (le watermark marque la reconstruction faite).
+    op.drop_table("report_daily_rollups")
+    op.create_table(
+        "report_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("department", sa.String(length=32), nullable=False),
+        sa.Column("category", sa.String(length=128), nullable=False),
+        sa.Column("risk_bucket", sa.String(length=8), nullable=False),
+        sa.Column("status", sa.String(length=24), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False),
+        sa.Column("latest_report_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("day", "department", "category", "risk_bucket", "status"),
+    )
+    op.execute(
+        """
+        INSERT INTO report_daily_rollups
+            (day, department, category, risk_bucket, status, report_count, latest_report_at)
+        SELECT date(timezone('UTC', r.created_at)), coalesce(r.department, 'UNKNOWN'), coalesce(a.primary_category, 'non_classe'),
+               CASE WHEN a.risk_score >= 65 THEN 'high' WHEN a.risk_score >= 35 THEN 'medium' ELSE 'low' END,
+               r.status, count(r.id), max(r.created_at)
+        FROM formal_reports r
+        JOIN analyses a ON r.analysis_id = a.id
+        GROUP BY date(timezone('UTC', r.created_at)), coalesce(r.department, 'UNKNOWN'), coalesce(a.primary_category, 'non_classe'),
+                 CASE WHEN a.risk_score >= 65 THEN 'high' WHEN a.risk_score >= 35 THEN 'medium' ELSE 'low' END,
+                 r.status
+        """
+    )
+    _mark_rebuilt()
+
+
+def downgrade() -> None:
+    op.drop_table("report_daily_rollups")
+    op.create_table(
+        "report_daily_rollups",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("department", sa.String(length=32), nullable=False),
+        sa.Column("category", sa.String(length=128), nullable=False),
+        sa.Column("status", sa.String(length=24), nullable=False),
+        sa.Column("report_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "department", "category", "status"),
+    )
+    op.execute(
+        """
+        INSERT INTO report_daily_rollups (day, department, category, status, report_count)
+        SELECT date(timezone('UTC', r.created_at)), coalesce(m.department, 'non_localise'),
+               coalesce(a.primary_category, 'non_classe'), r.status, count(r.id)
+        FROM formal_reports r
+        JOIN messages m ON r.message_id = m.id
+        JOIN analyses a ON r.analysis_id = a.id
+        GROUP BY date(timezone('UTC', r.created_at)), coalesce(m.department, 'non_localise'),
+                 coalesce(a.primary_category, 'non_classe'), r.status
+        """
+    )
+    _mark_rebuilt()
+    op.drop_index(op.f("ix_formal_reports_department"), table_name="formal_reports")
+    op.drop_column("formal_reports", "department")
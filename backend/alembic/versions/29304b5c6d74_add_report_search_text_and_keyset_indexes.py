@@ -0,0 +1,107 @@
+"""Add the folded search text and keyset pagination indexes to formal reports
+
+Revision ID: 29304b5c6d74
+Revises: 18293a4b5c63
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "29304b5c6d74"
+down_revision: Union[str, None] = "18293a4b5c63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _fold(value: str) -> str:
+    # Copie figee de services/search_text.build_report_search_text.
+    normalized = unicodedata.normalize("NFKD", value or "")
+    folded = normalized.encode("ascii", "ignore").decode("ascii").lower()
+    return _WHITESPACE.sub(" ", folded).strip()
+
+
+def _backfill_search_text() -> None:
+    bind = op.get_bind()
+    reports = sa.table(
+        "formal_reports",
+        sa.column("id", sa.Integer()),
+        sa.column("message_id", sa.Integer()),
+        sa.column("public_reference", sa.String()),
+        sa.column("search_text", sa.Text()),
+    )
+    messages = sa.table(
+        "messages",
+        sa.column("id", sa.Integer()),
+        sa.column("content", sa.Text()),
+        sa.column("submitted_url", sa.Text()),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(reports.c.id, reports.c.public_reference, messages.c.content, messages.c.submitted_url)
+            .select_from(reports.join(messages, reports.c.message_id == messages.c.id))
+            .where(reports.c.id > last_id)
+            .order_by(reports.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        for row in rows:
+            parts = (row.content, row.submitted_url, row.public_reference)
+            bind.execute(
+                reports.update()
+                .where(reports.c.id == row.id)
+                .values(search_text=_fold(" ".join(part for part in parts if part)))
+            )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    if is_postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column("formal_reports", sa.Column("search_text", sa.Text(), nullable=True))
+    _backfill_search_text()
+
+    op.create_index("ix_formal_reports_created_at_id", "formal_reports", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_formal_reports_reporter_created_at_id",
+        "formal_reports",
+        ["reporter_user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_formal_reports_status_created_at_id",
+        "formal_reports",
+        ["status", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_formal_reports_search_text_trgm",
+        "formal_reports",
+        ["search_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"search_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_formal_reports_search_text_trgm", table_name="formal_reports")
+    op.drop_index("ix_formal_reports_status_created_at_id", table_name="formal_reports")
+    op.drop_index("ix_formal_reports_reporter_created_at_id", table_name="formal_reports")
+    op.drop_index("ix_formal_reports_created_at_id", table_name="formal_reports")
+    op.drop_column("formal_reports", "search_text")
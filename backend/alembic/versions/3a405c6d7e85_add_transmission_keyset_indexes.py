@@ -0,0 +1,39 @@
+"""Add keyset pagination indexes to external transmissions
+
+Revision ID: 3a405c6d7e85
+Revises: 29304b5c6d74
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a405c6d7e85"
+down_revision: Union[str, None] = "29304b5c6d74"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_external_transmissions_created_at_id",
+        "external_transmissions",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_external_transmissions_status_created_at_id",
+        "external_transmissions",
+        ["status", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_external_transmissions_status_created_at_id", table_name="external_transmissions")
+    op.drop_index("ix_external_transmissions_created_at_id", table_name="external_transmissions")
@@ -0,0 +1,49 @@
+"""Add threat indicator indexes for the dashboard and public heatmap
+
+Revision ID: 4b516d7e8f96
+Revises: 3a405c6d7e85
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4b516d7e8f96"
+down_revision: Union[str, None] = "3a405c6d7e85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_threat_indicators_type_occurrence",
+        "threat_indicators",
+        ["indicator_type", sa.text("occurrence_count DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_threat_indicators_alert_occurrence",
+        "threat_indicators",
+        [sa.text("occurrence_count DESC")],
+        unique=False,
+        postgresql_where=sa.text("alert_triggered"),
+        sqlite_where=sa.text("alert_triggered"),
+    )
+    op.create_index(
+        "ix_threat_indicators_region_category",
+        "threat_indicators",
+        ["region", "dominant_category"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_threat_indicators_region_category", table_name="threat_indicators")
+    op.drop_index("ix_threat_indicators_alert_occurrence", table_name="threat_indicators")
+    op.drop_index("ix_threat_indicators_type_occurrence", table_name="threat_indicators")
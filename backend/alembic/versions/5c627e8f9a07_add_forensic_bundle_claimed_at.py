@@ -0,0 +1,29 @@
+"""Record when a worker claimed a forensic bundle rendering job
+
+Revision ID: 5c627e8f9a07
+Revises: 4b516d7e8f96
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c627e8f9a07"
+down_revision: Union[str, None] = "4b516d7e8f96"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Les jobs deja RENDERING restent sans date de prise : le consommateur les reprend au demarrage.
+    op.add_column("forensic_bundles", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("forensic_bundles", "claimed_at")
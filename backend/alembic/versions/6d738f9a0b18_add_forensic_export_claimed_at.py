@@ -0,0 +1,29 @@
+"""Record when a worker claimed a forensic export job
+
+Revision ID: 6d738f9a0b18
+Revises: 5c627e8f9a07
+Create Date: 2026-10-19 23:10:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6d738f9a0b18"
+down_revision: Union[str, None] = "5c627e8f9a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Les exports deja RUNNING restent sans date de prise : le consommateur les reprend au demarrage.
+    op.add_column("forensic_export_jobs", sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("forensic_export_jobs", "claimed_at")
@@ -0,0 +1,50 @@
+"""Add evidence blobs table for content-addressed storage
+
+Revision ID: b2c3d4e5f607
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c3d4e5f607"
+down_revision: Union[str, None] = "a7b8c9d0e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "evidence_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("storage_key", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=True),
+        sa.Column("content_type", sa.String(length=128), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    # Reprise de l'existant : une reference par ligne de preuve deja en base.
+    op.execute(
+        """
+        INSERT INTO evidence_blobs (sha256, storage_key, ref_count)
+        SELECT file_hash, MIN(file_path), COUNT(*)
+        FROM (
+            SELECT file_hash, file_path FROM evidences WHERE file_hash IS NOT NULL AND file_path IS NOT NULL
+            UNION ALL
+            SELECT file_hash, file_path FROM evidence_items WHERE file_hash IS NOT NULL
+        ) AS refs
+        GROUP BY file_hash
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("evidence_blobs")
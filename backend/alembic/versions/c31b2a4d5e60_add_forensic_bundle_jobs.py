@@ -0,0 +1,46 @@
+"""Track forensic bundle rendering jobs on forensic_bundles
+
+Revision ID: c31b2a4d5e60
+Revises: b2c3d4e5f607
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c31b2a4d5e60"
+down_revision: Union[str, None] = "b2c3d4e5f607"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ACTIVE_JOB_PREDICATE = sa.text("status IN ('PENDING', 'RENDERING')")
+
+
+def upgrade() -> None:
+    op.add_column("forensic_bundles", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.add_column("forensic_bundles", sa.Column("last_error", sa.Text(), nullable=True))
+    op.alter_column("forensic_bundles", "global_hash", existing_type=sa.String(length=64), nullable=True)
+    op.create_index(op.f("ix_forensic_bundles_content_hash"), "forensic_bundles", ["content_hash"], unique=False)
+    op.create_index(
+        "uq_forensic_bundles_active_content_hash",
+        "forensic_bundles",
+        ["content_hash"],
+        unique=True,
+        postgresql_where=ACTIVE_JOB_PREDICATE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_forensic_bundles_active_content_hash", table_name="forensic_bundles")
+    op.drop_index(op.f("ix_forensic_bundles_content_hash"), table_name="forensic_bundles")
+    op.execute("UPDATE forensic_bundles SET global_hash = '' WHERE global_hash IS NULL")
+    op.alter_column("forensic_bundles", "global_hash", existing_type=sa.String(length=64), nullable=False)
+    op.drop_column("forensic_bundles", "last_error")
+    op.drop_column("forensic_bundles", "content_hash")
@@ -0,0 +1,61 @@
+"""Add forensic_export_jobs for bulk dossier exports
+
+Revision ID: d4e5f6071829
+Revises: c31b2a4d5e60
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6071829"
+down_revision: Union[str, None] = "c31b2a4d5e60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "forensic_export_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("uuid", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("requested_by_user_id", sa.Integer(), nullable=True),
+        sa.Column("filters_json", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=24), nullable=False, server_default="PENDING"),
+        sa.Column("total_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processed_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rendered_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("failed_items", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("zip_path", sa.String(), nullable=True),
+        sa.Column("archive_hash", sa.String(length=64), nullable=True),
+        sa.Column("manifest_hash", sa.String(length=64), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["requested_by_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_forensic_export_jobs_id"), "forensic_export_jobs", ["id"], unique=False)
+    op.create_index(op.f("ix_forensic_export_jobs_uuid"), "forensic_export_jobs", ["uuid"], unique=True)
+    op.create_index(
+        op.f("ix_forensic_export_jobs_requested_by_user_id"),
+        "forensic_export_jobs",
+        ["requested_by_user_id"],
+        unique=False,
+    )
+    op.create_index(op.f("ix_forensic_export_jobs_status"), "forensic_export_jobs", ["status"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_forensic_export_jobs_status"), table_name="forensic_export_jobs")
+    op.drop_index(op.f("ix_forensic_export_jobs_requested_by_user_id"), table_name="forensic_export_jobs")
+    op.drop_index(op.f("ix_forensic_export_jobs_uuid"), table_name="forensic_export_jobs")
+    op.drop_index(op.f("ix_forensic_export_jobs_id"), table_name="forensic_export_jobs")
+    op.drop_table("forensic_export_jobs")
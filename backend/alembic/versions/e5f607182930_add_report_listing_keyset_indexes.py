@@ -0,0 +1,29 @@
+"""Add keyset pagination indexes for the reports listing
+
+Revision ID: e5f607182930
+Revises: d4e5f6071829
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f607182930"
+down_revision: Union[str, None] = "d4e5f6071829"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_forensic_bundles_created_at_id", "forensic_bundles", ["created_at", "id"], unique=False)
+    op.create_index("ix_reports_generated_at_id", "reports", ["generated_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reports_generated_at_id", table_name="reports")
+    op.drop_index("ix_forensic_bundles_created_at_id", table_name="forensic_bundles")
@@ -0,0 +1,115 @@
+"""Promote hot snapshot fields of forensic bundles into indexed columns
+
+Revision ID: f60718293a41
+Revises: e5f607182930
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f60718293a41"
+down_revision: Union[str, None] = "e5f607182930"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _risk_score(value) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade() -> None:
+    op.add_column("forensic_bundles", sa.Column("alert_uuid", postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column("forensic_bundles", sa.Column("public_reference", sa.String(length=32), nullable=True))
+    op.add_column("forensic_bundles", sa.Column("snapshot_hash_sha256", sa.String(length=64), nullable=True))
+    op.add_column("forensic_bundles", sa.Column("snapshot_version", sa.String(length=16), nullable=True))
+    op.add_column("forensic_bundles", sa.Column("risk_score", sa.Integer(), nullable=True))
+    op.add_column("forensic_bundles", sa.Column("alert_url", sa.String(), nullable=True))
+    op.create_index(op.f("ix_forensic_bundles_alert_uuid"), "forensic_bundles", ["alert_uuid"], unique=False)
+    op.create_index(op.f("ix_forensic_bundles_public_reference"), "forensic_bundles", ["public_reference"], unique=False)
+    op.create_index(
+        op.f("ix_forensic_bundles_snapshot_hash_sha256"), "forensic_bundles", ["snapshot_hash_sha256"], unique=False
+    )
+    op.create_index(op.f("ix_forensic_bundles_risk_score"), "forensic_bundles", ["risk_score"], unique=False)
+
+    bind = op.get_bind()
+    bundles = sa.table(
+        "forensic_bundles",
+        sa.column("id", sa.Integer()),
+        sa.column("report_id", sa.Integer()),
+        sa.column("manifest_json", sa.JSON()),
+        sa.column("alert_uuid", postgresql.UUID(as_uuid=True)),
+        sa.column("public_reference", sa.String()),
+        sa.column("snapshot_hash_sha256", sa.String()),
+        sa.column("snapshot_version", sa.String()),
+        sa.column("risk_score", sa.Integer()),
+        sa.column("alert_url", sa.String()),
+    )
+    formal_reports = sa.table(
+        "formal_reports",
+        sa.column("id", sa.Integer()),
+        sa.column("uuid", postgresql.UUID(as_uuid=True)),
+        sa.column("legacy_alert_uuid", postgresql.UUID(as_uuid=True)),
+        sa.column("public_reference", sa.String()),
+    )
+
+    # Parcours par lots d'id croissants : la table peut etre volumineuse.
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(
+                bundles.c.id,
+                bundles.c.manifest_json,
+                formal_reports.c.uuid,
+                formal_reports.c.legacy_alert_uuid,
+                formal_reports.c.public_reference,
+            )
+            .select_from(bundles.join(formal_reports, bundles.c.report_id == formal_reports.c.id))
+            .where(bundles.c.id > last_id)
+            .order_by(bundles.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for row in rows:
+            manifest = row.manifest_json or {}
+            snapshot = manifest.get("snapshot") or {}
+            alert = (snapshot.get("data") or {}).get("alert") or {}
+            bind.execute(
+                bundles.update()
+                .where(bundles.c.id == row.id)
+                .values(
+                    alert_uuid=row.legacy_alert_uuid or row.uuid,
+                    public_reference=manifest.get("public_reference") or row.public_reference,
+                    snapshot_hash_sha256=manifest.get("snapshot_hash_sha256"),
+                    snapshot_version=snapshot.get("snapshot_version", "2.0"),
+                    risk_score=_risk_score(alert.get("risk_score")),
+                    alert_url=alert.get("url"),
+                )
+            )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_forensic_bundles_risk_score"), table_name="forensic_bundles")
+    op.drop_index(op.f("ix_forensic_bundles_snapshot_hash_sha256"), table_name="forensic_bundles")
+    op.drop_index(op.f("ix_forensic_bundles_public_reference"), table_name="forensic_bundles")
+    op.drop_index(op.f("ix_forensic_bundles_alert_uuid"), table_name="forensic_bundles")
+    op.drop_column("forensic_bundles", "alert_url")
+    op.drop_column("forensic_bundles", "risk_score")
+    op.drop_column("forensic_bundles", "snapshot_version")
+    op.drop_column("forensic_bundles", "snapshot_hash_sha256")
+    op.drop_column("forensic_bundles", "public_reference")
+    op.drop_column("forensic_bundles", "alert_uuid")
@@ -18,6 +18,7 @@ from app.api.v1.endpoints import (
     dashboard,
     signals,
     incidents,
+    live,
     shield,
     operators,
     threat_intel,
@@ -31,6 +32,7 @@ api_router.include_router(signalements.router, prefix="/signalements", tags=["si
 api_router.include_router(external_receivers.router, prefix="/external", tags=["external-receivers"])
 api_router.include_router(mobile.router, prefix="/mobile", tags=["mobile"])
 api_router.include_router(map_overview.router, prefix="/map", tags=["map"])
+api_router.include_router(live.router, prefix="/live", tags=["live"])
 api_router.include_router(pme.router, prefix="/pme", tags=["pme"])
 api_router.include_router(admin_pme.router, prefix="/admin", tags=["admin-pme"])
 api_router.include_router(admin_console.router, prefix="/admin", tags=["admin-console"])
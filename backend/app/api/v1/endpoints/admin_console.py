@@ -2,8 +2,15 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.response_cache import (
+    AggregateCache,
+    aggregate_cache_key,
+    cached_aggregate,
+    get_aggregate_cache,
+    with_read_session,
+)
 from app.core.security import require_role
-from app.database import get_db
+from app.database import get_read_db
 from app.schemas.admin_console import AdminDashboardData, AdminTransmissionListData
 from app.schemas.response import APIResponse
 from app.services.admin_console import (
@@ -12,6 +19,7 @@ from app.services.admin_console import (
     get_admin_dashboard,
     list_admin_transmissions,
 )
+from app.services.write_events import TOPIC_CAMPAIGNS, TOPIC_REPORTS, TOPIC_ROLLUPS, TOPIC_TRANSMISSIONS
 
 
 router = APIRouter()
@@ -19,10 +27,17 @@ router = APIRouter()
 
 @router.get("/dashboard", response_model=APIResponse[AdminDashboardData])
 async def read_admin_dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    cache: AggregateCache | None = Depends(get_aggregate_cache),
     _principal=Depends(require_role(["ADMIN"])),
 ) -> APIResponse[AdminDashboardData]:
-    payload = await get_admin_dashboard(db=db)
+    payload = await cached_aggregate(
+        cache,
+        aggregate_cache_key("/admin/dashboard", {}, "admin"),
+        lambda: get_admin_dashboard(db=db),
+        topics=(TOPIC_ROLLUPS, TOPIC_REPORTS, TOPIC_TRANSMISSIONS, TOPIC_CAMPAIGNS),
+        refresher=with_read_session(get_admin_dashboard),
+    )
     return APIResponse(success=True, message="Tableau de bord national recupere.", data=payload)
 
 
@@ -33,7 +48,8 @@ async def read_admin_transmissions(
     status: str | None = Query(default=None),
     target: str | None = Query(default=None),
     q: str | None = Query(default=None),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(default=None, max_length=512),
+    db: AsyncSession = Depends(get_read_db),
     _principal=Depends(require_role(["ADMIN"])),
 ) -> APIResponse[AdminTransmissionListData]:
     payload = await list_admin_transmissions(
@@ -43,13 +59,14 @@ async def read_admin_transmissions(
         status_filter=status,
         target_filter=target,
         search=q,
+        cursor=cursor,
     )
     return APIResponse(success=True, message="Transmissions externes recuperees.", data=payload)
 
 
 @router.post("/exports/csv")
 async def export_admin_csv(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _principal=Depends(require_role(["ADMIN"])),
 ) -> Response:
     filename, content = await build_admin_csv_export(db=db)
@@ -62,7 +79,7 @@ async def export_admin_csv(
 
 @router.post("/exports/stix-lite")
 async def export_admin_stix_lite(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _principal=Depends(require_role(["ADMIN"])),
 ) -> Response:
     filename, content = await build_admin_stix_lite_export(db=db)
@@ -16,6 +16,7 @@ from app.schemas.response import APIResponse
 from app.schemas.token import TokenPayload
 from app.services.cascade_delete import delete_alert_cascade
 from app.services.legacy_memory_bridge import sync_memory_domain_status_from_legacy_alert
+from app.services.write_events import ADMIN_AND_OWNER, TOPIC_REPORTS, publish_write_event
 
 
 router = APIRouter()
@@ -163,7 +164,17 @@ async def update_alert(
             alert_uuid=alert.uuid,
             alert_status=alert.status,
         )
+    status_event = {"alert_uuid": str(alert.uuid), "status": alert.status}
+    owner_user_id = alert.owner_user_id
     await db.commit()
+    if status_updated:
+        await publish_write_event(
+            TOPIC_REPORTS,
+            kind="report.status",
+            data=status_event,
+            audience=ADMIN_AND_OWNER,
+            owner_user_id=owner_user_id,
+        )
 
     refreshed = await db.execute(query)
     alert = refreshed.scalars().first()
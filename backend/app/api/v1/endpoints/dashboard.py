@@ -1,14 +1,36 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc, case
+from sqlalchemy import select, func, desc
+from app.core.counters import Counter, CounterSource, run_counters
+from app.core.response_cache import (
+    AggregateCache,
+    aggregate_cache_key,
+    cached_aggregate,
+    get_aggregate_cache,
+    with_read_session,
+)
 from app.core.security import require_role
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import Alert
+from app.schemas.response import APIResponse
+from app.schemas.trends import TrendBucket, TrendData, TrendDimension
+from app.services.trends import get_report_trends
+from app.services.write_events import TOPIC_REPORTS, TOPIC_ROLLUPS
 from datetime import datetime, timedelta
 import pytz
 
 router = APIRouter()
 
+RISK_LEVELS = ("FORT", "MOYEN", "FAIBLE")
+STATUS_ORDER = ("NEW", "IN_REVIEW", "CONFIRMED", "DISMISSED", "BLOCKED_SIMULATED")
+_ALERTS = CounterSource("alerts", Alert)
+ALERT_STATS_COUNTERS = (
+    Counter("risk_FORT", _ALERTS, filter=Alert.risk_score >= 70),
+    Counter("risk_MOYEN", _ALERTS, filter=(Alert.risk_score >= 40) & (Alert.risk_score < 70)),
+    Counter("risk_FAIBLE", _ALERTS, filter=Alert.risk_score < 40),
+    *(Counter(f"status_{status}", _ALERTS, filter=Alert.status == status) for status in STATUS_ORDER),
+)
+
 
 @router.get("/stats")
 async def get_dashboard_stats(
@@ -42,30 +64,9 @@ async def get_dashboard_stats(
             }
         )
 
-    incidents_by_risk = {"FORT": 0, "MOYEN": 0, "FAIBLE": 0}
-    risk_stmt = (
-        select(
-            func.sum(case((Alert.risk_score >= 70, 1), else_=0)).label("high_count"),
-            func.sum(case(((Alert.risk_score >= 40) & (Alert.risk_score < 70), 1), else_=0)).label("medium_count"),
-            func.sum(case((Alert.risk_score < 40, 1), else_=0)).label("low_count"),
-        )
-        .select_from(Alert)
-    )
-    risk_row = (await db.execute(risk_stmt)).first()
-    if risk_row:
-        incidents_by_risk = {
-            "FORT": int(risk_row.high_count or 0),
-            "MOYEN": int(risk_row.medium_count or 0),
-            "FAIBLE": int(risk_row.low_count or 0),
-        }
-
-    status_order = ["NEW", "IN_REVIEW", "CONFIRMED", "DISMISSED", "BLOCKED_SIMULATED"]
-    status_stmt = select(Alert.status, func.count(Alert.id)).group_by(Alert.status)
-    status_rows = (await db.execute(status_stmt)).all()
-    incidents_by_status = {status: 0 for status in status_order}
-    for status, count in status_rows:
-        if status in incidents_by_status:
-            incidents_by_status[status] = int(count)
+    counts = await run_counters(db, ALERT_STATS_COUNTERS)
+    incidents_by_risk = {level: counts[f"risk_{level}"] for level in RISK_LEVELS}
+    incidents_by_status = {status: counts[f"status_{status}"] for status in STATUS_ORDER}
 
     return {
         "incidents_by_day": incidents_by_day,
@@ -85,17 +86,17 @@ async def get_weekly_stats(
     one_week_ago = now - timedelta(days=7)
     two_weeks_ago = now - timedelta(days=14)
 
-    # Current week count
-    query_current = select(func.count(Alert.id)).where(Alert.created_at >= one_week_ago)
-    result_current = await db.execute(query_current)
-    count_current = result_current.scalar() or 0
-
-    # Previous week count
-    query_prev = select(func.count(Alert.id)).where(
-        (Alert.created_at >= two_weeks_ago) & (Alert.created_at < one_week_ago)
+    # Une seule requete sur les deux semaines, chaque semaine en FILTER.
+    last_two_weeks = CounterSource("alerts", Alert, where=(Alert.created_at >= two_weeks_ago,))
+    counts = await run_counters(
+        db,
+        (
+            Counter("current", last_two_weeks, filter=Alert.created_at >= one_week_ago),
+            Counter("previous", last_two_weeks, filter=Alert.created_at < one_week_ago),
+        ),
     )
-    result_prev = await db.execute(query_prev)
-    count_prev = result_prev.scalar() or 0
+    count_current = counts["current"]
+    count_prev = counts["previous"]
 
     # Delta Percent
     if count_prev == 0:
@@ -185,3 +186,38 @@ async def get_reports_count(
     
     return {"count": count}
 
+
+@router.get("/trends", response_model=APIResponse[TrendData])
+async def read_report_trends(
+    bucket: TrendBucket = Query(default="day"),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    dimension: TrendDimension | None = Query(default=None),
+    department: str | None = Query(default=None, max_length=64),
+    category: str | None = Query(default=None, max_length=128),
+    risk: str | None = Query(default=None, pattern="^(high|medium|low)$"),
+    status: str | None = Query(default=None, max_length=24),
+    db: AsyncSession = Depends(get_read_db),
+    cache: AggregateCache | None = Depends(get_aggregate_cache),
+    _principal=Depends(require_role(["ADMIN"])),
+) -> APIResponse[TrendData]:
+    """Signalements par heure, jour, semaine ou mois, completes par des zeros."""
+    params = {
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "dimension": dimension,
+        "department": department,
+        "category": category,
+        "risk": risk,
+        "status": status,
+    }
+    payload = await cached_aggregate(
+        cache,
+        aggregate_cache_key("/dashboard/trends", params, "admin"),
+        lambda: get_report_trends(db=db, **params),
+        # Pas horaire lu dans formal_reports, les autres dans les rollups.
+        topics=(TOPIC_REPORTS,) if bucket == "hour" else (TOPIC_ROLLUPS,),
+        refresher=with_read_session(get_report_trends, **params),
+    )
+    return APIResponse(success=True, message="Tendances recuperees.", data=payload)
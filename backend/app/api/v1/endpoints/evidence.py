@@ -1,22 +1,27 @@
 from pathlib import Path
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import Response
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
+import mimetypes
 import os
+import re
 from app.core.config import settings
+from app.core.http_cache import cached_bytes_response, cached_file_response, not_modified, strong_etag
 from app.core.security import require_role
 from app.database import get_db
-from app.models import Evidence, EvidenceItem
+from app.models import Evidence, EvidenceBlob, EvidenceItem
 from app.schemas.alert import EvidenceResponse
+from app.services.evidence_store import LocalEvidenceBackend, blob_key, get_evidence_store
 
 router = APIRouter()
 
 # TODO: Configurer le chemin réel via une variable d'env ou un volume partagé
 # Pour l'instant, on suppose que les preuves sont montées dans /app/preuves_temp
 EVIDENCE_DIR = "/app/evidences_store"
+SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
 
 @router.get("/", response_model=List[EvidenceResponse])
 async def read_evidences(
@@ -34,7 +39,7 @@ async def read_evidences(
     return evidences
 
 @router.get("/file/{file_name}")
-async def get_evidence_file(file_name: str):
+async def get_evidence_file(file_name: str, request: Request):
     """
     Sert un fichier de preuve (Screenshot) par son nom.
     Sécurisé basiquement contre le Path Traversal.
@@ -47,13 +52,67 @@ async def get_evidence_file(file_name: str):
     
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Evidence file not found")
-            
-    return FileResponse(file_path)
+
+    # Fichiers legacy nommes par leur SHA-256 : contenu adresse, donc immuable.
+    digest = Path(file_name).stem.lower()
+    if SHA256_HEX.match(digest):
+        return await cached_file_response(request, file_path, etag=strong_etag(digest), immutable=True)
+    return await cached_file_response(request, file_path)
+
+
+def _is_content_addressed(storage_key: str, file_hash: str) -> bool:
+    digest = file_hash.lower()
+    return storage_key == blob_key(digest) or Path(storage_key).stem.lower() == digest
+
+
+async def _evidence_media_type(
+    db: AsyncSession, storage_key: str, file_hash: str | None, metadata: dict | None
+) -> str:
+    # Les cles `sha256/aa/bb/<hex>` n'ont pas d'extension : type enregistre a l'upload.
+    content_type = None
+    if file_hash:
+        content_type = await db.scalar(select(EvidenceBlob.content_type).where(EvidenceBlob.sha256 == file_hash))
+    content_type = content_type or (metadata or {}).get("content_type")
+    return str(content_type or mimetypes.guess_type(storage_key)[0] or "application/octet-stream")
+
+
+async def _serve_stored_evidence(
+    request: Request,
+    db: AsyncSession,
+    storage_key: str,
+    file_hash: str | None,
+    metadata: dict | None,
+    *,
+    label: str,
+) -> Response:
+    # ETag fort tire du SHA-256 stocke : un 304 ne touche ni au disque ni au stockage distant.
+    etag = strong_etag(file_hash.lower()) if file_hash else None
+    immutable = bool(file_hash) and _is_content_addressed(storage_key, file_hash)
+    if (cached := not_modified(request, etag, immutable=immutable)) is not None:
+        return cached
+
+    media_type = await _evidence_media_type(db, storage_key, file_hash, metadata)
+    store = get_evidence_store()
+    local = store.local_path(storage_key)
+    if local is not None:
+        return await cached_file_response(request, local, etag=etag, immutable=immutable, media_type=media_type)
+    if isinstance(store.backend, LocalEvidenceBackend) or Path(storage_key).is_absolute():
+        raise HTTPException(status_code=404, detail=f"{label} file not found")
+    try:
+        payload = await store.read_bytes(storage_key)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {label.lower()} path")
+    except Exception:
+        raise HTTPException(status_code=404, detail=f"{label} file not found")
+    if etag is None:
+        return Response(content=payload, media_type=media_type)
+    return cached_bytes_response(request, payload, etag=etag, media_type=media_type, immutable=immutable)
 
 
 @router.get("/view/{evidence_id}")
 async def view_evidence_by_id(
     evidence_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(Evidence).where(Evidence.id == evidence_id)
@@ -64,20 +123,18 @@ async def view_evidence_by_id(
     relative = str(evidence.file_path or "").strip()
     if not relative:
         raise HTTPException(status_code=404, detail="Evidence file path missing")
-
-    base_dir = Path(EVIDENCE_DIR).resolve()
-    target = (base_dir / relative).resolve()
-    if base_dir not in target.parents and target != base_dir:
+    if Path(relative).is_absolute() or ".." in Path(relative).parts:
         raise HTTPException(status_code=400, detail="Invalid evidence path")
-    if not target.exists():
-        raise HTTPException(status_code=404, detail="Evidence file not found")
 
-    return FileResponse(target)
+    return await _serve_stored_evidence(
+        request, db, relative, evidence.file_hash, evidence.metadata_json, label="Evidence"
+    )
 
 
 @router.get("/items/view/{evidence_item_id}")
 async def view_evidence_item_by_id(
     evidence_item_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     stmt = select(EvidenceItem).where(EvidenceItem.id == evidence_item_id)
@@ -88,12 +145,9 @@ async def view_evidence_item_by_id(
     relative = str(evidence_item.file_path or "").strip()
     if not relative:
         raise HTTPException(status_code=404, detail="Evidence item file path missing")
-
-    base_dir = Path(EVIDENCE_DIR).resolve()
-    target = (base_dir / relative).resolve()
-    if base_dir not in target.parents and target != base_dir:
+    if Path(relative).is_absolute() or ".." in Path(relative).parts:
         raise HTTPException(status_code=400, detail="Invalid evidence item path")
-    if not target.exists():
-        raise HTTPException(status_code=404, detail="Evidence item file not found")
 
-    return FileResponse(target)
+    return await _serve_stored_evidence(
+        request, db, relative, evidence_item.file_hash, evidence_item.metadata_json, label="Evidence item"
+    )
@@ -130,6 +130,8 @@ async def read_citizen_incidents(
     status: str | None = Query(default=None),
     q: str | None = Query(default=None),
     scope: str | None = Query(default=None, pattern="^me$"),
+    cursor: str | None = Query(default=None, max_length=512),
+    count: str = Query(default="exact", pattern="^(exact|estimate)$"),
     _subject: str = Depends(get_current_subject),
     token_data: TokenPayload = Depends(get_current_token_payload),
 ):
@@ -142,6 +144,8 @@ async def read_citizen_incidents(
         status_filter=status,
         search=q,
         owner_user_id=scope_owner_user_id,
+        cursor=cursor,
+        count_mode=count,
     )
     return APIResponse(
         success=True,
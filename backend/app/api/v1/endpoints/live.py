@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import AuthenticatedPrincipal, get_current_active_principal
+from app.database import get_db
+from app.services.live_feed import LiveFeedHub, stream_live_events
+
+
+router = APIRouter()
+
+
+@router.get("/events")
+async def stream_live_feed(
+    request: Request,
+    last_event_id: str | None = Header(default=None),
+    since: str | None = Query(default=None, description="Identifiant du dernier evenement recu (si l'en-tete Last-Event-ID est absent)."),
+    principal: AuthenticatedPrincipal = Depends(get_current_active_principal),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Flux SSE des evenements d'ecriture visibles par le role de l'appelant.
+
+    EventSource ne sait pas envoyer l'en-tete Authorization : le frontend lit le
+    flux avec fetch (`frontend/src/lib/live-feed.ts`) et renvoie Last-Event-ID.
+    """
+    hub: LiveFeedHub | None = getattr(request.app.state, "live_feed", None)
+    if hub is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Flux temps reel indisponible.")
+
+    # La session de l'authentification retourne au pool : le flux peut durer des heures.
+    await db.close()
+    return StreamingResponse(
+        stream_live_events(
+            hub,
+            principal,
+            last_event_id=last_event_id or since,
+            heartbeat_seconds=settings.LIVE_FEED_HEARTBEAT_SECONDS,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
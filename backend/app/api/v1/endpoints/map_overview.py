@@ -1,10 +1,18 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.response_cache import (
+    AggregateCache,
+    aggregate_cache_key,
+    cached_aggregate,
+    get_aggregate_cache,
+    with_read_session,
+)
+from app.database import get_read_db
 from app.schemas.map_overview import MapOverviewData
 from app.schemas.response import APIResponse
 from app.services.map_overview import get_map_overview
+from app.services.write_events import TOPIC_ROLLUPS, TOPIC_TRANSMISSIONS
 
 
 router = APIRouter()
@@ -12,10 +20,18 @@ router = APIRouter()
 
 @router.get("/overview", response_model=APIResponse[MapOverviewData])
 async def read_map_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     window: str = Query(default="7d"),
     risk: str = Query(default="all"),
     category: str | None = Query(default=None),
+    cache: AggregateCache | None = Depends(get_aggregate_cache),
 ) -> APIResponse[MapOverviewData]:
-    payload = await get_map_overview(db=db, window=window, risk=risk, category=category)
+    params = {"window": window, "risk": risk, "category": category}
+    payload = await cached_aggregate(
+        cache,
+        aggregate_cache_key("/map/overview", params, "public"),
+        lambda: get_map_overview(db=db, **params),
+        topics=(TOPIC_ROLLUPS, TOPIC_TRANSMISSIONS),
+        refresher=with_read_session(get_map_overview, **params),
+    )
     return APIResponse(success=True, message="Vue cartographique recuperee.", data=payload)
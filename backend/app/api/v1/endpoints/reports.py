@@ -1,69 +1,99 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
 import logging
 import uuid
+from concurrent.futures import Executor
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import FileResponse, Response
-from sqlalchemy import delete, func, select, update
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import String, cast, delete, func, literal_column, null, select, tuple_, union_all, update
 from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 
+from app.core.config import settings
+from app.core.http_cache import cached_bytes_response, cached_file_response, not_modified, strong_etag, weak_etag
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.risk_levels import risk_level_from_score
 from app.core.security import get_current_token_payload, require_role, resolve_scope_owner_user_id
 from app.database import get_db
-from app.models import Alert, Evidence, ForensicBundle, FormalReport, Report
+from app.models import Alert, CampaignAlert, Evidence, ForensicBundle, ForensicExportJob, FormalReport, Report
+from app.schemas.forensic_export import ForensicExportRequest
 from app.schemas.response import APIResponse
 from app.schemas.token import TokenPayload
-from app.services.case_bundle import generate_case_bundle
+from app.services.bundle_jobs import (
+    ACTIVE_BUNDLE_JOB_STATUSES,
+    BUNDLE_JOB_READY,
+    apply_snapshot_columns,
+    bundle_job_status,
+    enqueue_bundle_job,
+    push_bundle_job,
+    wait_for_bundle_job,
+)
+from app.services.bundle_exports import (
+    EXPORT_READY,
+    BundleExportFilter,
+    create_export_job,
+    export_progress,
+    push_export_job,
+)
+from app.services.canonical_json import canonical_encode, pretty_json_bytes
+from app.services.case_bundle import BUNDLE_CHUNK_BYTES, CaseBundleWriter
 from app.services.hashing import compute_snapshot_hash
 from app.services.legacy_memory_bridge import build_legacy_analysis_payload
 from app.services.pdf_generator import generate_forensic_pdf
-from app.services.phone_privacy import decrypt_phone
+from app.services.phone_privacy import decrypt_phone, derive_phone_hash
 from app.services.snapshot import create_alert_snapshot
 
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-ARTIFACT_ROOTS = [Path("/app/evidences_store"), Path("evidences_store")]
-
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
 def _artifact_write_root() -> Path:
-    root = Path("evidences_store")
+    root = Path(settings.EVIDENCE_STORE_ROOT)
     root.mkdir(parents=True, exist_ok=True)
     return root
 
 
-def _candidate_artifact_paths(path_value: str, *, legacy_report_file: bool = False) -> list[Path]:
+def _artifact_path(path_value: str, *, legacy_report_file: bool = False) -> Path:
+    # Emplacement deterministe sous EVIDENCE_STORE_ROOT : une seule verification
+    # disque par lecture. Les anciens `Report.pdf_path` sont des noms nus ranges
+    # sous `reports/`.
     raw = Path(str(path_value).strip())
     if raw.is_absolute():
-        return [raw]
-
-    candidates = [root / raw for root in ARTIFACT_ROOTS]
-    if legacy_report_file:
-        candidates.extend((root / "reports" / raw) for root in ARTIFACT_ROOTS)
-    return candidates
+        return raw
+    root = Path(settings.EVIDENCE_STORE_ROOT)
+    if legacy_report_file and len(raw.parts) == 1:
+        return root / "reports" / raw
+    return root / raw
 
 
 def _resolve_artifact_path(path_value: str | None, *, legacy_report_file: bool = False) -> Path | None:
     if not path_value:
         return None
-    for candidate in _candidate_artifact_paths(path_value, legacy_report_file=legacy_report_file):
-        if candidate.exists():
-            return candidate
-    return None
+    candidate = _artifact_path(path_value, legacy_report_file=legacy_report_file)
+    return candidate if candidate.is_file() else None
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(BUNDLE_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def _write_relative_artifact(relative_path: str, payload: bytes) -> Path:
@@ -211,35 +241,49 @@ async def _build_formal_report_snapshot(
     return jsonable_encoder(snapshot)
 
 
-async def _create_bundle_for_formal_report(
+async def _enqueue_bundle_for_formal_report(
     db: AsyncSession,
     formal_report: FormalReport,
     legacy_alert: Alert | None,
-) -> ForensicBundle:
+    commit: bool = True,
+) -> tuple[ForensicBundle, bool]:
     snapshot = await _build_formal_report_snapshot(db=db, formal_report=formal_report, legacy_alert=legacy_alert)
-    snapshot_hash = compute_snapshot_hash(snapshot)
+    return await enqueue_bundle_job(db, formal_report=formal_report, snapshot=snapshot, commit=commit)
+
+
+async def _render_bundle_artifacts(
+    db: AsyncSession,
+    *,
+    bundle: ForensicBundle,
+    formal_report: FormalReport,
+    legacy_alert: Alert | None,
+    pdf_executor: Executor | None = None,
+) -> None:
+    """Produit PDF, JSON et ZIP d'un job de bundle (appele par le worker).
 
-    bundle_uuid = uuid.uuid4()
+    `pdf_executor` (pool de processus du consommateur ou de l'export en masse)
+    remplace le thread par defaut pour le rendu ReportLab.
+    """
+    snapshot = (bundle.manifest_json or {}).get("snapshot") or {}
+    # Une seule serialisation canonique : le hash sert aussi de nom aux artefacts.
+    snapshot_hash = canonical_encode(snapshot).sha256
+
+    bundle_uuid = bundle.uuid
     artifact_prefix = f"forensic_bundles/{bundle_uuid}"
     pdf_relative_path = f"{artifact_prefix}/report_{snapshot_hash[:8]}.pdf"
     json_relative_path = f"{artifact_prefix}/snapshot_{snapshot_hash[:8]}.json"
     zip_relative_path = f"{artifact_prefix}/dossier_{snapshot_hash[:8]}.zip"
 
-    pdf_target = _write_relative_artifact(pdf_relative_path, b"")
-    try:
-        generate_forensic_pdf(
-            snapshot,
-            str(pdf_target),
-            snapshot_hash,
-            report_uuid=str(bundle_uuid),
-        )
-    except Exception as exc:
-        logger.exception("PDF generation failed for formal report bundle", extra={"report_uuid": str(formal_report.uuid)})
-        raise HTTPException(status_code=500, detail=f"PDF Generation failed: {exc}") from exc
+    pdf_target = await asyncio.to_thread(_write_relative_artifact, pdf_relative_path, b"")
+    # Rendu ReportLab purement CPU : hors de la boucle d'evenements.
+    await asyncio.get_running_loop().run_in_executor(
+        pdf_executor,
+        partial(generate_forensic_pdf, snapshot, str(pdf_target), snapshot_hash, report_uuid=str(bundle_uuid)),
+    )
 
-    pdf_bytes = pdf_target.read_bytes()
-    pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
-    _write_relative_artifact(json_relative_path, json.dumps(snapshot, ensure_ascii=False, indent=2).encode("utf-8"))
+    pdf_hash = await asyncio.to_thread(_file_sha256, pdf_target)
+    # Serialisation et ecriture du snapshot hors de la boucle, comme le ZIP.
+    await asyncio.to_thread(lambda: _write_relative_artifact(json_relative_path, pretty_json_bytes(snapshot)))
 
     incident_data = {
         "id": str(formal_report.id),
@@ -270,9 +314,8 @@ async def _create_bundle_for_formal_report(
         "created_at": snapshot.get("generated_at"),
         "public_reference": formal_report.public_reference,
     }
-    zip_bytes = await generate_case_bundle(incident_data, report_data, pdf_bytes)
-    zip_hash = hashlib.sha256(zip_bytes).hexdigest()
-    _write_relative_artifact(zip_relative_path, zip_bytes)
+    zip_writer = CaseBundleWriter(incident_data, report_data, pdf_target)
+    zip_hash = await asyncio.to_thread(zip_writer.write_to, _artifact_path(zip_relative_path))
 
     manifest = {
         "snapshot": snapshot,
@@ -284,17 +327,12 @@ async def _create_bundle_for_formal_report(
         "generated_at": snapshot.get("generated_at"),
     }
 
-    bundle = ForensicBundle(
-        uuid=bundle_uuid,
-        report_id=formal_report.id,
-        global_hash=zip_hash,
-        manifest_json=manifest,
-        zip_path=zip_relative_path,
-        pdf_path=pdf_relative_path,
-        json_path=json_relative_path,
-        status="READY",
-    )
-    db.add(bundle)
+    bundle.global_hash = zip_hash
+    bundle.manifest_json = manifest
+    apply_snapshot_columns(bundle, snapshot, formal_report=formal_report, snapshot_hash=snapshot_hash)
+    bundle.zip_path = zip_relative_path
+    bundle.pdf_path = pdf_relative_path
+    bundle.json_path = json_relative_path
 
     if legacy_alert and legacy_alert.evidences:
         evidence_ids = [evidence.id for evidence in legacy_alert.evidences if evidence.id is not None]
@@ -305,31 +343,48 @@ async def _create_bundle_for_formal_report(
                 .values(status="SEALED", sealed_at=func.now())
             )
 
-    await db.commit()
-    await db.refresh(bundle)
-    return bundle
-
 
 def _serialize_bundle(bundle: ForensicBundle, *, legacy_alert_id: int | None = None) -> dict[str, Any]:
-    manifest = bundle.manifest_json or {}
-    snapshot = manifest.get("snapshot") or {}
     return {
         "id": bundle.id,
         "uuid": bundle.uuid,
         "alert_id": legacy_alert_id or 0,
+        "alert_uuid": bundle.alert_uuid,
+        "public_reference": bundle.public_reference,
         "report_hash": bundle.global_hash,
-        "snapshot_hash_sha256": manifest.get("snapshot_hash_sha256"),
-        "snapshot_version": snapshot.get("snapshot_version", "2.0"),
+        "snapshot_hash_sha256": bundle.snapshot_hash_sha256,
+        "snapshot_version": bundle.snapshot_version or "2.0",
         "generated_by": "BENIN CYBER SHIELD",
         "pdf_path": bundle.pdf_path,
         "generated_at": bundle.created_at,
-        "snapshot_json": snapshot,
+        "status": bundle_job_status(bundle),
+        "snapshot_json": (bundle.manifest_json or {}).get("snapshot") or {},
     }
 
 
-def _bundle_alert_uuid(bundle: ForensicBundle) -> str:
-    snapshot = (bundle.manifest_json or {}).get("snapshot") or {}
-    return str((((snapshot.get("data") or {}).get("alert") or {}).get("uuid") or ""))
+def _serialize_bundle_job(bundle: ForensicBundle) -> dict[str, Any]:
+    return {
+        "job_id": bundle.uuid,
+        "uuid": bundle.uuid,
+        "status": bundle_job_status(bundle),
+        "error": bundle.last_error,
+        "report_hash": bundle.global_hash,
+        "snapshot_hash_sha256": bundle.snapshot_hash_sha256,
+        "snapshot_version": bundle.snapshot_version or "2.0",
+        "generated_at": bundle.created_at,
+        "pdf_path": bundle.pdf_path,
+        "status_url": f"{settings.API_V1_STR}/reports/jobs/{bundle.uuid}",
+    }
+
+
+def _bundle_job_accepted(bundle: ForensicBundle) -> JSONResponse:
+    # Artefacts pas encore rendus : 202 et statut du job, comme POST /reports.
+    payload = APIResponse(
+        success=True,
+        message="Generation du bundle forensique en cours.",
+        data=_serialize_bundle_job(bundle),
+    )
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(payload))
 
 
 def _serialize_legacy_report(report: Report) -> dict[str, Any]:
@@ -347,102 +402,205 @@ def _serialize_legacy_report(report: Report) -> dict[str, Any]:
     }
 
 
-async def _legacy_alert_id_map(db: AsyncSession, alert_uuids: list[str]) -> dict[str, int]:
-    normalized = [uuid.UUID(value) for value in alert_uuids if value]
-    if not normalized:
-        return {}
-    rows = (await db.execute(select(Alert.id, Alert.uuid).where(Alert.uuid.in_(normalized)))).all()
-    return {str(alert_uuid): int(alert_id) for alert_id, alert_uuid in rows if alert_uuid is not None}
+REPORT_LISTING_BUNDLE = "bundle"
+REPORT_LISTING_LEGACY = "legacy"
+
+
+def _keyset_condition(kind: str, generated_at_column, id_column, cursor: dict[str, Any] | None):
+    """Predicat "apres le curseur" pour une branche de l'union (tri date desc, kind desc, id desc).
+
+    `kind` etant constant dans une branche, le predicat se reduit a une
+    comparaison sur (date, id) que l'index de la branche sait servir.
+    """
+    if cursor is None:
+        return None
+    cursor_at, cursor_kind, cursor_id = cursor["t"], cursor["k"], cursor["i"]
+    if kind < cursor_kind:
+        return generated_at_column <= cursor_at
+    if kind > cursor_kind:
+        return generated_at_column < cursor_at
+    return tuple_(generated_at_column, id_column) < tuple_(cursor_at, cursor_id)
+
+
+def _scope_bundles(stmt, scope_owner_user_id: int | None):
+    if scope_owner_user_id is None:
+        return stmt
+    return stmt.join(FormalReport, ForensicBundle.report_id == FormalReport.id).where(
+        FormalReport.reporter_user_id == scope_owner_user_id
+    )
+
+
+def _bundle_listing_query(*, scope_owner_user_id: int | None, alert_uuid: uuid.UUID | None, cursor, limit: int):
+    # Colonnes denormalisees uniquement : manifest_json n'est ni lu ni parse ici.
+    stmt = (
+        select(
+            literal_column(f"'{REPORT_LISTING_BUNDLE}'", String).label("kind"),
+            ForensicBundle.id.label("id"),
+            ForensicBundle.uuid.label("uuid"),
+            Alert.id.label("alert_id"),
+            ForensicBundle.alert_uuid.label("alert_uuid"),
+            ForensicBundle.public_reference.label("public_reference"),
+            ForensicBundle.global_hash.label("report_hash"),
+            ForensicBundle.snapshot_hash_sha256.label("snapshot_hash_sha256"),
+            ForensicBundle.snapshot_version.label("snapshot_version"),
+            ForensicBundle.alert_url.label("url"),
+            ForensicBundle.risk_score.label("risk_score"),
+            literal_column("'BENIN CYBER SHIELD'", String).label("generated_by"),
+            ForensicBundle.pdf_path.label("pdf_path"),
+            ForensicBundle.status.label("status"),
+            ForensicBundle.created_at.label("generated_at"),
+        )
+        .select_from(ForensicBundle)
+        .outerjoin(Alert, Alert.uuid == ForensicBundle.alert_uuid)
+    )
+    stmt = _scope_bundles(stmt, scope_owner_user_id)
+    if alert_uuid is not None:
+        stmt = stmt.where(ForensicBundle.alert_uuid == alert_uuid)
+    condition = _keyset_condition(REPORT_LISTING_BUNDLE, ForensicBundle.created_at, ForensicBundle.id, cursor)
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return stmt.order_by(ForensicBundle.created_at.desc(), ForensicBundle.id.desc()).limit(limit)
+
+
+def _legacy_listing_query(*, scope_owner_user_id: int | None, alert_uuid: uuid.UUID | None, cursor, limit: int):
+    snapshot = Report.snapshot_json
+    # Dedoublonnage : un rapport legacy est masque des qu'un bundle couvre son alerte.
+    covering_bundle = _scope_bundles(
+        select(ForensicBundle.id).where(ForensicBundle.alert_uuid == Alert.uuid),
+        scope_owner_user_id,
+    )
+
+    stmt = (
+        select(
+            literal_column(f"'{REPORT_LISTING_LEGACY}'", String).label("kind"),
+            Report.id.label("id"),
+            Report.uuid.label("uuid"),
+            Report.alert_id.label("alert_id"),
+            Alert.uuid.label("alert_uuid"),
+            cast(null(), String(32)).label("public_reference"),
+            Report.report_hash.label("report_hash"),
+            Report.snapshot_hash_sha256.label("snapshot_hash_sha256"),
+            Report.snapshot_version.label("snapshot_version"),
+            snapshot[("data", "alert", "url")].as_string().label("url"),
+            snapshot[("data", "alert", "risk_score")].as_integer().label("risk_score"),
+            Report.generated_by.label("generated_by"),
+            Report.pdf_path.label("pdf_path"),
+            cast(null(), String(24)).label("status"),
+            Report.generated_at.label("generated_at"),
+        )
+        .select_from(Report)
+        .outerjoin(Alert, Report.alert_id == Alert.id)
+        .where(~covering_bundle.exists())
+    )
+    if scope_owner_user_id is not None:
+        stmt = stmt.where(Alert.owner_user_id == scope_owner_user_id)
+    if alert_uuid is not None:
+        stmt = stmt.where(Alert.uuid == alert_uuid)
+    condition = _keyset_condition(REPORT_LISTING_LEGACY, Report.generated_at, Report.id, cursor)
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return stmt.order_by(Report.generated_at.desc(), Report.id.desc()).limit(limit)
+
+
+def _report_listing_query(branches: list):
+    # Chaque branche est deja triee et limitee par son index : l'union ne trie
+    # au plus que `limit + 1` lignes par source.
+    listing = union_all(*(select(branch.subquery().c) for branch in branches)).subquery("report_listing")
+    return select(listing).order_by(listing.c.generated_at.desc(), listing.c.kind.desc(), listing.c.id.desc())
+
+
+def _serialize_listing_row(row) -> dict[str, Any]:
+    item = dict(row._mapping)
+    if item["kind"] == REPORT_LISTING_BUNDLE:
+        item["status"] = bundle_job_status(SimpleNamespace(status=item["status"], global_hash=item["report_hash"]))
+    item["alert_id"] = item["alert_id"] or 0
+    item["detail_url"] = f"{settings.API_V1_STR}/reports/{item['uuid']}"
+    return item
 
 
 @router.get("/")
 async def list_reports(
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None, max_length=512),
+    alert_uuid: uuid.UUID | None = None,
     scope: str | None = Query(default=None, pattern="^me$"),
     db: AsyncSession = Depends(get_db),
     token_data: TokenPayload = Depends(get_current_token_payload),
 ):
-    scope_owner_user_id = resolve_scope_owner_user_id(token_data, scope)
+    """Liste paginee par cle (bundles + rapports legacy), sans les snapshots JSON.
 
-    bundle_query = (
-        select(ForensicBundle)
-        .options(selectinload(ForensicBundle.report))
-        .order_by(ForensicBundle.created_at.desc())
-    )
-    if scope_owner_user_id is not None:
-        bundle_query = (
-            bundle_query
-            .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
-            .where(FormalReport.reporter_user_id == scope_owner_user_id)
-        )
-    bundles = (await db.execute(bundle_query)).scalars().all()
-
-    bundle_alert_uuids = []
-    for bundle in bundles:
-        alert_uuid = _bundle_alert_uuid(bundle)
-        if alert_uuid:
-            bundle_alert_uuids.append(alert_uuid)
-    alert_id_map = await _legacy_alert_id_map(db, bundle_alert_uuids)
-
-    items = [
-        _serialize_bundle(
-            bundle,
-            legacy_alert_id=alert_id_map.get(_bundle_alert_uuid(bundle)),
+    `next_cursor` est a renvoyer tel quel pour la page suivante ; le snapshot
+    complet d'un rapport se lit sur `GET /reports/{uuid}`.
+    """
+    scope_owner_user_id = resolve_scope_owner_user_id(token_data, scope)
+    position = (
+        decode_cursor(
+            cursor,
+            datetime_keys=("t",),
+            int_keys=("i",),
+            choices={"k": (REPORT_LISTING_BUNDLE, REPORT_LISTING_LEGACY)},
         )
-        for bundle in bundles
-    ]
-    alert_uuids_present = {
-        str((((item.get("snapshot_json") or {}).get("data") or {}).get("alert") or {}).get("uuid") or "")
-        for item in items
+        if cursor
+        else None
+    )
+    branch_options = {
+        "scope_owner_user_id": scope_owner_user_id,
+        "alert_uuid": alert_uuid,
+        "cursor": position,
+        "limit": limit + 1,
     }
 
-    legacy_query = select(Report).order_by(Report.generated_at.desc())
-    if scope_owner_user_id is not None:
-        legacy_query = legacy_query.join(Alert, Report.alert_id == Alert.id).where(Alert.owner_user_id == scope_owner_user_id)
     try:
-        legacy_reports = (await db.execute(legacy_query)).scalars().all()
+        query = _report_listing_query(
+            [_bundle_listing_query(**branch_options), _legacy_listing_query(**branch_options)]
+        ).limit(limit + 1)
+        rows = (await db.execute(query)).all()
     except ProgrammingError:
         logger.warning("Skipping legacy reports listing because the legacy schema is out of sync.")
-        legacy_reports = []
+        await db.rollback()
+        query = _report_listing_query([_bundle_listing_query(**branch_options)]).limit(limit + 1)
+        rows = (await db.execute(query)).all()
 
-    for report in legacy_reports:
-        snapshot = report.snapshot_json or {}
-        alert_uuid = str((((snapshot.get("data") or {}).get("alert") or {}).get("uuid") or ""))
-        if alert_uuid and alert_uuid in alert_uuids_present:
-            continue
-        items.append(_serialize_legacy_report(report))
-
-    items.sort(key=lambda item: item.get("generated_at") or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
-    return items[skip : skip + limit]
+    items = [_serialize_listing_row(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor({"t": last["generated_at"], "k": last["kind"], "i": last["id"]})
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
 
 
 @router.post("/generate/{alert_uuid}", response_model=APIResponse[Any])
 async def generate_report(
     alert_uuid: uuid.UUID,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     formal_report = await _load_formal_report_by_alert_uuid(db, alert_uuid)
     if formal_report is not None:
         legacy_alert = await _load_legacy_alert_with_evidences(db, formal_report.legacy_alert_uuid)
-        bundle = await _create_bundle_for_formal_report(
+        bundle, created = await _enqueue_bundle_for_formal_report(
             db=db,
             formal_report=formal_report,
             legacy_alert=legacy_alert,
         )
-        report_data = {
-            "id": bundle.id,
-            "uuid": bundle.uuid,
-            "report_hash": bundle.global_hash,
-            "snapshot_hash_sha256": (bundle.manifest_json or {}).get("snapshot_hash_sha256"),
-            "snapshot_version": ((bundle.manifest_json or {}).get("snapshot") or {}).get("snapshot_version", "2.0"),
-            "generated_at": bundle.created_at,
-            "pdf_path": bundle.pdf_path,
-        }
+        if created:
+            await push_bundle_job(bundle.uuid)
+        elif bundle_job_status(bundle) == BUNDLE_JOB_READY:
+            # Snapshot inchange depuis le dernier rendu : aucun nouveau PDF ni ZIP.
+            return APIResponse(
+                success=True,
+                message="Snapshot inchange : bundle forensique existant reutilise.",
+                data=_serialize_bundle_job(bundle),
+            )
+        response.status_code = status.HTTP_202_ACCEPTED
         return APIResponse(
             success=True,
-            message="Rapport genere et bundle forensique enregistre avec succes.",
-            data=report_data,
+            message=(
+                "Generation du bundle forensique mise en file d'attente."
+                if created
+                else "Generation du bundle forensique deja en cours."
+            ),
+            data=_serialize_bundle_job(bundle),
         )
 
     stmt = select(Alert.id).where(Alert.uuid == alert_uuid)
@@ -468,7 +626,8 @@ async def generate_report(
     report_uuid_value = uuid.uuid4()
 
     try:
-        generate_forensic_pdf(
+        await asyncio.to_thread(
+            generate_forensic_pdf,
             snapshot,
             str(pdf_path),
             report_hash,
@@ -517,23 +676,183 @@ async def generate_report(
     )
 
 
+@router.get("/jobs/{job_id}", response_model=APIResponse[Any])
+async def get_bundle_job(
+    job_id: uuid.UUID,
+    wait: float = Query(default=0, ge=0, le=30),
+    db: AsyncSession = Depends(get_db),
+):
+    """Statut d'un job de bundle ; `wait` > 0 attend sa fin (long polling)."""
+    bundle = (
+        await db.execute(
+            select(ForensicBundle).options(defer(ForensicBundle.manifest_json)).where(ForensicBundle.uuid == job_id)
+        )
+    ).scalars().first()
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Bundle job not found")
+
+    if wait > 0 and bundle_job_status(bundle) in ACTIVE_BUNDLE_JOB_STATUSES:
+        async def _is_settled() -> bool:
+            await db.refresh(bundle)
+            await db.commit()
+            return bundle_job_status(bundle) not in ACTIVE_BUNDLE_JOB_STATUSES
+
+        await wait_for_bundle_job(bundle.uuid, timeout=wait, is_settled=_is_settled)
+        await db.refresh(bundle)
+
+    return APIResponse(success=True, message="Statut du job de bundle.", data=_serialize_bundle_job(bundle))
+
+
+def _serialize_export_job(job: ForensicExportJob) -> dict[str, Any]:
+    return {
+        "job_id": job.uuid,
+        "status": job.status,
+        "error": job.last_error,
+        "filters": job.filters_json,
+        "total_items": job.total_items,
+        "processed_items": job.processed_items,
+        "rendered_items": job.rendered_items,
+        "failed_items": job.failed_items,
+        "progress": export_progress(job),
+        "archive_hash": job.archive_hash,
+        "manifest_hash": job.manifest_hash,
+        "created_at": job.created_at,
+        "completed_at": job.completed_at,
+        "status_url": f"{settings.API_V1_STR}/reports/exports/{job.uuid}",
+        "download_url": (
+            f"{settings.API_V1_STR}/reports/exports/{job.uuid}/download" if job.status == EXPORT_READY else None
+        ),
+    }
+
+
+async def _get_export_job(db: AsyncSession, job_id: uuid.UUID) -> ForensicExportJob:
+    job = (await db.execute(select(ForensicExportJob).where(ForensicExportJob.uuid == job_id))).scalars().first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@router.post("/exports", response_model=APIResponse[Any], status_code=status.HTTP_202_ACCEPTED)
+async def create_bundle_export(
+    payload: ForensicExportRequest,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenPayload = Depends(require_role(["ADMIN"])),
+):
+    """Export en masse (periode, categorie, numero, campagne) rendu par un worker."""
+    if payload.campaign_id is not None and await db.get(CampaignAlert, payload.campaign_id) is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    filters = BundleExportFilter(
+        date_from=payload.date_from,
+        date_to=payload.date_to,
+        category=payload.category,
+        suspect_phone_hash=derive_phone_hash(payload.suspect_number) if payload.suspect_number else None,
+        campaign_id=payload.campaign_id,
+    )
+    job = await create_export_job(db, filters=filters, requested_by_user_id=token_data.uid)
+    await push_export_job(job.uuid)
+    return APIResponse(success=True, message="Export mis en file de rendu.", data=_serialize_export_job(job))
+
+
+@router.get("/exports/{job_id}", response_model=APIResponse[Any])
+async def get_bundle_export(
+    job_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    _: TokenPayload = Depends(require_role(["ADMIN"])),
+):
+    job = await _get_export_job(db, job_id)
+    return APIResponse(success=True, message="Statut de l'export.", data=_serialize_export_job(job))
+
+
+@router.get("/exports/{job_id}/download")
+async def download_bundle_export(
+    job_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: TokenPayload = Depends(require_role(["ADMIN"])),
+):
+    job = await _get_export_job(db, job_id)
+    if job.status != EXPORT_READY:
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}")
+    archive_path = _resolve_artifact_path(job.zip_path)
+    if archive_path is None:
+        raise HTTPException(status_code=404, detail="Export archive not found")
+    return await cached_file_response(
+        request,
+        archive_path,
+        etag=strong_etag(job.archive_hash) if job.archive_hash else None,
+        media_type="application/zip",
+        filename=f"export_forensique_{str(job.uuid)[:8]}.zip",
+        headers={"X-Archive-SHA256": job.archive_hash or ""},
+    )
+
+
+@router.get("/{report_uuid}")
+async def get_report(
+    report_uuid: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    token_data: TokenPayload = Depends(get_current_token_payload),
+):
+    """Detail d'un rapport, snapshot JSON complet inclus."""
+    scope_owner_user_id = resolve_scope_owner_user_id(token_data, None)
+
+    bundle_stmt = _scope_bundles(
+        select(ForensicBundle, Alert.id)
+        .outerjoin(Alert, Alert.uuid == ForensicBundle.alert_uuid)
+        .where(ForensicBundle.uuid == report_uuid),
+        scope_owner_user_id,
+    )
+    bundle_row = (await db.execute(bundle_stmt)).first()
+    if bundle_row is not None:
+        bundle, legacy_alert_id = bundle_row
+        return _serialize_bundle(bundle, legacy_alert_id=legacy_alert_id)
+
+    legacy_stmt = select(Report).where(Report.uuid == report_uuid)
+    if scope_owner_user_id is not None:
+        legacy_stmt = legacy_stmt.join(Alert, Report.alert_id == Alert.id).where(
+            Alert.owner_user_id == scope_owner_user_id
+        )
+    report = (await db.execute(legacy_stmt)).scalars().first()
+    if report is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    return _serialize_legacy_report(report)
+
+
 @router.get("/{report_uuid}/download/pdf")
 async def download_pdf(
     report_uuid: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    bundle = (await db.execute(select(ForensicBundle).where(ForensicBundle.uuid == report_uuid))).scalars().first()
-    if bundle is not None:
+    bundle_row = (
+        await db.execute(
+            select(ForensicBundle, ForensicBundle.manifest_json["pdf_hash_sha256"].as_string())
+            .options(defer(ForensicBundle.manifest_json))
+            .where(ForensicBundle.uuid == report_uuid)
+        )
+    ).first()
+    if bundle_row is not None:
+        bundle, pdf_hash = bundle_row
+        if bundle_job_status(bundle) in ACTIVE_BUNDLE_JOB_STATUSES:
+            return _bundle_job_accepted(bundle)
+        # PDF ecrit une seule fois par bundle : ETag fort tire de son SHA-256 scelle.
+        etag = strong_etag(pdf_hash) if pdf_hash else None
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
         full_path = _resolve_artifact_path(bundle.pdf_path)
         if not full_path:
             raise HTTPException(status_code=404, detail="PDF file missing on disk")
-        return FileResponse(
-            str(full_path),
+        return await cached_file_response(
+            request,
+            full_path,
+            etag=etag,
             media_type="application/pdf",
             filename=f"report_{bundle.uuid}.pdf",
         )
 
-    report = (await db.execute(select(Report).where(Report.uuid == report_uuid))).scalars().first()
+    report = (
+        await db.execute(select(Report).options(defer(Report.snapshot_json)).where(Report.uuid == report_uuid))
+    ).scalars().first()
     if report is None:
         raise HTTPException(status_code=404, detail="Report not found")
 
@@ -541,8 +860,10 @@ async def download_pdf(
     if not full_path:
         raise HTTPException(status_code=404, detail="PDF file missing on disk")
 
-    return FileResponse(
-        str(full_path),
+    # PDF legacy regenere s'il manque : pas de hash stable, ETag de Starlette.
+    return await cached_file_response(
+        request,
+        full_path,
         media_type="application/pdf",
         filename=f"report_{report.uuid}.pdf",
     )
@@ -551,40 +872,61 @@ async def download_pdf(
 @router.get("/{report_uuid}/download/json")
 async def download_json(
     report_uuid: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    bundle = (await db.execute(select(ForensicBundle).where(ForensicBundle.uuid == report_uuid))).scalars().first()
+    # Le JSON est une fonction du snapshot : son hash canonique sert d'ETag, ce qui
+    # repond 304 avant toute lecture de manifest_json ou serialisation. ETag faible :
+    # artefact ancien (json.dumps) et reconstruction (orjson ou non) different en
+    # octets, un Range ne doit pas recoller deux representations.
+    bundle = (
+        await db.execute(
+            select(ForensicBundle).options(defer(ForensicBundle.manifest_json)).where(ForensicBundle.uuid == report_uuid)
+        )
+    ).scalars().first()
     if bundle is not None:
+        etag = weak_etag(bundle.snapshot_hash_sha256) if bundle.snapshot_hash_sha256 else None
+        if (cached := not_modified(request, etag)) is not None:
+            return cached
         full_path = _resolve_artifact_path(bundle.json_path)
         if full_path is not None:
-            return FileResponse(
-                str(full_path),
+            return await cached_file_response(
+                request,
+                full_path,
+                etag=etag,
                 media_type="application/json",
                 filename=f"report_{bundle.uuid}.json",
             )
 
-        payload = jsonable_encoder((bundle.manifest_json or {}).get("snapshot") or {})
-        return Response(
-            content=json.dumps(payload, ensure_ascii=False, indent=2),
-            media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename=report_{bundle.uuid}.json"},
-        )
+        await db.refresh(bundle, attribute_names=["manifest_json"])
+        payload = pretty_json_bytes(jsonable_encoder((bundle.manifest_json or {}).get("snapshot") or {}))
+        headers = {"Content-Disposition": f"attachment; filename=report_{bundle.uuid}.json"}
+        if etag is None:
+            return Response(content=payload, media_type="application/json", headers=headers)
+        return cached_bytes_response(request, payload, etag=etag, media_type="application/json", headers=headers)
 
-    report = (await db.execute(select(Report).where(Report.uuid == report_uuid))).scalars().first()
+    report = (
+        await db.execute(select(Report).options(defer(Report.snapshot_json)).where(Report.uuid == report_uuid))
+    ).scalars().first()
     if report is None:
         raise HTTPException(status_code=404, detail="Report not found")
 
-    payload = jsonable_encoder(report.snapshot_json)
-    return Response(
-        content=json.dumps(payload, ensure_ascii=False, indent=2),
-        media_type="application/json",
-        headers={"Content-Disposition": f"attachment; filename=report_{report.uuid}.json"},
-    )
+    snapshot_hash = report.snapshot_hash_sha256 or report.report_hash
+    etag = weak_etag(snapshot_hash) if snapshot_hash else None
+    if (cached := not_modified(request, etag)) is not None:
+        return cached
+    await db.refresh(report, attribute_names=["snapshot_json"])
+    payload = pretty_json_bytes(jsonable_encoder(report.snapshot_json))
+    headers = {"Content-Disposition": f"attachment; filename=report_{report.uuid}.json"}
+    if etag is None:
+        return Response(content=payload, media_type="application/json", headers=headers)
+    return cached_bytes_response(request, payload, etag=etag, media_type="application/json", headers=headers)
 
 
 @router.get("/{report_uuid}/download/case-bundle")
 async def download_case_bundle(
     report_uuid: uuid.UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     _: TokenPayload = Depends(require_role(["ADMIN"])),
 ):
@@ -596,10 +938,15 @@ async def download_case_bundle(
         )
     ).scalars().first()
     if bundle is not None:
+        if bundle_job_status(bundle) in ACTIVE_BUNDLE_JOB_STATUSES:
+            return _bundle_job_accepted(bundle)
         zip_path = _resolve_artifact_path(bundle.zip_path)
         if zip_path is not None:
-            return FileResponse(
-                str(zip_path),
+            # ZIP reconstructible si absent (octets differents du ZIP scelle) : ETag
+            # de Starlette plutot que global_hash.
+            return await cached_file_response(
+                request,
+                zip_path,
                 media_type="application/zip",
                 filename=f"dossier_criet_{bundle.id}.zip",
             )
@@ -607,7 +954,6 @@ async def download_case_bundle(
         pdf_path = _resolve_artifact_path(bundle.pdf_path)
         if pdf_path is None:
             raise HTTPException(status_code=404, detail="PDF file missing on disk")
-        pdf_bytes = pdf_path.read_bytes()
 
         snapshot = (bundle.manifest_json or {}).get("snapshot") or {}
         alert_data = ((snapshot.get("data") or {}).get("alert") or {})
@@ -626,26 +972,28 @@ async def download_case_bundle(
             "analysis_note": alert_data.get("analysis_note"),
             "created_at": alert_data.get("created_at"),
             "updated_at": alert_data.get("updated_at"),
-            "public_reference": (bundle.manifest_json or {}).get("public_reference"),
+            "public_reference": bundle.public_reference,
         }
         report_data = {
             "id": str(bundle.id),
             "uuid": str(bundle.uuid),
             "alert_id": None,
             "report_hash": bundle.global_hash,
-            "snapshot_hash_sha256": (bundle.manifest_json or {}).get("snapshot_hash_sha256"),
-            "snapshot_version": snapshot.get("snapshot_version", "2.0"),
+            "snapshot_hash_sha256": bundle.snapshot_hash_sha256,
+            "snapshot_version": bundle.snapshot_version or "2.0",
             "generated_by": "BENIN CYBER SHIELD",
             "pdf_path": bundle.pdf_path,
             "created_at": str(bundle.created_at),
-            "public_reference": (bundle.manifest_json or {}).get("public_reference"),
+            "public_reference": bundle.public_reference,
         }
-        zip_bytes = await generate_case_bundle(incident_data, report_data, pdf_bytes)
-        _write_relative_artifact(bundle.zip_path, zip_bytes)
-        return Response(
-            content=zip_bytes,
+        # ZIP manquant : reconstruit une fois sur disque, par blocs, puis servi depuis le fichier.
+        zip_target = _artifact_path(bundle.zip_path)
+        await asyncio.to_thread(CaseBundleWriter(incident_data, report_data, pdf_path).write_to, zip_target)
+        return await cached_file_response(
+            request,
+            zip_target,
             media_type="application/zip",
-            headers={"Content-Disposition": f"attachment; filename=dossier_criet_{bundle.id}.zip"},
+            filename=f"dossier_criet_{bundle.id}.zip",
         )
 
     report = (
@@ -660,22 +1008,21 @@ async def download_case_bundle(
 
     target_path = _resolve_artifact_path(report.pdf_path, legacy_report_file=True)
     if target_path is None:
-        candidate = _candidate_artifact_paths(report.pdf_path, legacy_report_file=True)[0]
-        candidate.parent.mkdir(parents=True, exist_ok=True)
-        target_path = candidate
-
-    try:
-        generate_forensic_pdf(
-            report.snapshot_json or {},
-            str(target_path),
-            str(report.report_hash or ""),
-            report_uuid=str(report.uuid),
-        )
-    except Exception as exc:
-        logger.exception("Legacy case bundle PDF generation failed", extra={"report_uuid": str(report_uuid)})
-        raise HTTPException(status_code=500, detail=f"PDF Generation failed: {exc}") from exc
+        # Le snapshot legacy est fige : le PDF n'est regenere que s'il manque sur disque.
+        target_path = _artifact_path(report.pdf_path, legacy_report_file=True)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            await asyncio.to_thread(
+                generate_forensic_pdf,
+                report.snapshot_json or {},
+                str(target_path),
+                str(report.report_hash or ""),
+                report_uuid=str(report.uuid),
+            )
+        except Exception as exc:
+            logger.exception("Legacy case bundle PDF generation failed", extra={"report_uuid": str(report_uuid)})
+            raise HTTPException(status_code=500, detail=f"PDF Generation failed: {exc}") from exc
 
-    pdf_bytes = target_path.read_bytes()
     incident_data = {
         "id": str(alert.id),
         "uuid": str(alert.uuid) if alert.uuid else None,
@@ -704,10 +1051,9 @@ async def download_case_bundle(
         "pdf_path": report.pdf_path,
         "created_at": str(report.generated_at),
     }
-    zip_bytes = await generate_case_bundle(incident_data, report_data, pdf_bytes)
     uuid_short = str(report.id)[:8]
-    return Response(
-        content=zip_bytes,
+    return StreamingResponse(
+        CaseBundleWriter(incident_data, report_data, target_path).iter_chunks(),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename=dossier_criet_{uuid_short}.zip"},
     )
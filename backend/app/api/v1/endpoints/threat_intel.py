@@ -10,9 +10,17 @@ from fastapi.responses import StreamingResponse
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.response_cache import (
+    AggregateCache,
+    aggregate_cache_key,
+    cached_aggregate,
+    get_aggregate_cache,
+    with_read_session,
+)
 from app.core.security import require_role
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import CampaignAlert, ThreatIndicator
+from app.services.write_events import TOPIC_CAMPAIGNS, TOPIC_THREAT_INTEL
 
 
 router = APIRouter()
@@ -20,10 +28,22 @@ router = APIRouter()
 
 @router.get("/threat-intel/dashboard")
 async def get_threat_intel_dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    cache: AggregateCache | None = Depends(get_aggregate_cache),
     _principal=Depends(require_role(["ADMIN"])),
 ) -> dict:
     """Return top recurring indicators, category distribution, and active threat count."""
+    return await cached_aggregate(
+        cache,
+        aggregate_cache_key("/threat-intel/dashboard", {}, "admin"),
+        lambda: _threat_intel_dashboard(db=db),
+        topics=(TOPIC_THREAT_INTEL,),
+        refresher=with_read_session(_threat_intel_dashboard),
+    )
+
+
+async def _threat_intel_dashboard(db: AsyncSession) -> dict:
+    # Lecture bornee via ix_threat_indicators_type_occurrence.
     top_stmt = (
         select(ThreatIndicator)
         .where(ThreatIndicator.indicator_type == "phone")
@@ -32,15 +52,18 @@ async def get_threat_intel_dashboard(
     )
     top_rows = (await db.execute(top_stmt)).scalars().all()
 
+    # Repartition par categorie et menaces actives : un seul parcours.
     categories_stmt = (
-        select(ThreatIndicator.dominant_category, func.count(ThreatIndicator.id))
+        select(
+            ThreatIndicator.dominant_category,
+            func.count(ThreatIndicator.id),
+            func.count(ThreatIndicator.id).filter(ThreatIndicator.alert_triggered.is_(True)),
+        )
         .group_by(ThreatIndicator.dominant_category)
         .order_by(func.count(ThreatIndicator.id).desc())
     )
     categories_rows = (await db.execute(categories_stmt)).all()
-
-    active_threats_stmt = select(func.count(ThreatIndicator.id)).where(ThreatIndicator.alert_triggered.is_(True))
-    active_threats = int((await db.execute(active_threats_stmt)).scalar() or 0)
+    active_threats = sum(int(active or 0) for _category, _count, active in categories_rows)
 
     return {
         "top_numbers": [
@@ -59,7 +82,7 @@ async def get_threat_intel_dashboard(
                 "name": category if category else "UNKNOWN",
                 "count": int(count),
             }
-            for category, count in categories_rows
+            for category, count, _active in categories_rows
         ],
         "active_threats": active_threats,
     }
@@ -68,53 +91,55 @@ async def get_threat_intel_dashboard(
 @router.get("/map/heatmap")
 async def get_map_heatmap(
     db: AsyncSession = Depends(get_db),
+    cache: AggregateCache | None = Depends(get_aggregate_cache),
 ) -> list[dict[str, str | int]]:
     """Return a public regional heatmap aggregated from threat indicators."""
-    stmt = (
+    return await cached_aggregate(
+        cache,
+        aggregate_cache_key("/map/heatmap", {}, "public"),
+        lambda: _regional_heatmap(db=db),
+        topics=(TOPIC_THREAT_INTEL,),
+        refresher=with_read_session(_regional_heatmap),
+    )
+
+
+async def _regional_heatmap(db: AsyncSession) -> list[dict[str, str | int]]:
+    """Total et categorie dominante par region, calcules en SQL (une ligne par region)."""
+    per_category = (
         select(
-            ThreatIndicator.region,
-            ThreatIndicator.dominant_category,
-            func.count(ThreatIndicator.id).label("total"),
+            ThreatIndicator.region.label("region"),
+            ThreatIndicator.dominant_category.label("category"),
+            func.count(ThreatIndicator.id).label("category_count"),
         )
-        .where(ThreatIndicator.region.is_not(None))
+        .where(ThreatIndicator.region.is_not(None), ThreatIndicator.region != "")
         .group_by(ThreatIndicator.region, ThreatIndicator.dominant_category)
+        .subquery()
     )
-    rows = (await db.execute(stmt)).all()
-
-    by_region: dict[str, dict[str, object]] = {}
-    for region, category, total in rows:
-        if not region:
-            continue
-        bucket = by_region.setdefault(
-            str(region),
-            {
-                "region": str(region),
-                "count": 0,
-                "dominant_type": "UNKNOWN",
-                "_types": {},
-            },
-        )
-        bucket["count"] = int(bucket["count"]) + int(total)
-        types = bucket["_types"]
-        assert isinstance(types, dict)
-        key = str(category) if category else "UNKNOWN"
-        types[key] = int(types.get(key, 0)) + int(total)
-
-    response: list[dict[str, str | int]] = []
-    for region_data in by_region.values():
-        types = region_data.get("_types", {})
-        dominant_type = "UNKNOWN"
-        if isinstance(types, dict) and types:
-            dominant_type = max(types.items(), key=lambda item: item[1])[0]
-        response.append(
-            {
-                "region": str(region_data["region"]),
-                "count": int(region_data["count"]),
-                "dominant_type": dominant_type,
-            }
+    ranked = select(
+        per_category.c.region,
+        per_category.c.category,
+        func.sum(per_category.c.category_count).over(partition_by=per_category.c.region).label("region_total"),
+        # Egalite departagee par nom, categorie inconnue en dernier : resultat stable d'un appel a l'autre.
+        func.row_number()
+        .over(
+            partition_by=per_category.c.region,
+            order_by=(per_category.c.category_count.desc(), per_category.c.category.asc().nulls_last()),
         )
-    response.sort(key=lambda item: int(item["count"]), reverse=True)
-    return response
+        .label("position"),
+    ).subquery()
+    stmt = (
+        select(ranked.c.region, ranked.c.region_total, ranked.c.category)
+        .where(ranked.c.position == 1)
+        .order_by(ranked.c.region_total.desc(), ranked.c.region.asc())
+    )
+    return [
+        {
+            "region": str(region),
+            "count": int(total or 0),
+            "dominant_type": str(category) if category else "UNKNOWN",
+        }
+        for region, total, category in (await db.execute(stmt)).all()
+    ]
 
 
 @router.get("/dashboard/intel/export")
@@ -206,9 +231,20 @@ async def export_threat_intel(
 @router.get("/dashboard/intel/summary")
 async def get_campaign_summary(
     db: AsyncSession = Depends(get_db),
+    cache: AggregateCache | None = Depends(get_aggregate_cache),
     _principal=Depends(require_role(["ADMIN"])),
 ) -> dict:
     """Return active coordinated campaign alerts for analyst dashboard banner."""
+    return await cached_aggregate(
+        cache,
+        aggregate_cache_key("/dashboard/intel/summary", {}, "admin"),
+        lambda: _active_campaign_summary(db=db),
+        topics=(TOPIC_CAMPAIGNS,),
+        refresher=with_read_session(_active_campaign_summary),
+    )
+
+
+async def _active_campaign_summary(db: AsyncSession) -> dict:
     stmt = (
         select(CampaignAlert)
         .where(CampaignAlert.status == "ACTIVE")
@@ -18,6 +18,51 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: str = "5432"
     DATABASE_URL: str | None = None
+    DATABASE_READ_URL: str | None = None
+    DATABASE_READ_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_READ_HEALTHCHECK_SECONDS: float = 10.0
+    # Attente max d'une lecture derriere la sonde du replica avant de basculer sur le primaire
+    DATABASE_READ_PROBE_WAIT_SECONDS: float = 0.5
+
+    # Database connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Evidence store (content-addressed blobs): "local" or "s3" (AWS, MinIO...)
+    EVIDENCE_STORE_BACKEND: str = "local"
+    EVIDENCE_STORE_ROOT: str = "evidences_store"
+    EVIDENCE_S3_BUCKET: str | None = None
+    EVIDENCE_S3_PREFIX: str = ""
+    EVIDENCE_S3_ENDPOINT_URL: str | None = None
+    EVIDENCE_S3_REGION: str | None = None
+    EVIDENCE_S3_ACCESS_KEY_ID: str | None = None
+    EVIDENCE_S3_SECRET_ACCESS_KEY: str | None = None
+
+    # Forensic PDF rendering
+    PDF_PAGE_COMPRESSION: bool = False
+    # Resolution des derives d'images de l'annexe (cadre 15.6 x 9.2 cm)
+    PDF_IMAGE_DPI: int = 150
+    PDF_IMAGE_JPEG_QUALITY: int = 80
+
+    # Jobs de rendu des bundles et d'export : un job en cours dont le worker ne
+    # donne plus signe de vie (claimed_at) depuis ce delai repasse en PENDING
+    FORENSIC_JOB_STALE_SECONDS: int = 900
+    FORENSIC_JOB_RECLAIM_INTERVAL_SECONDS: int = 60
+    # Processus de rendu ReportLab du consommateur de bundles : le rendu tient le
+    # GIL, un thread affamerait la boucle de l'API. 0 = thread (worker dedie seulement)
+    FORENSIC_BUNDLE_PDF_PROCESSES: int = 1
+
+    # Bulk forensic exports
+    FORENSIC_EXPORT_PROCESSES: int = 2
+    FORENSIC_EXPORT_MAX_ITEMS: int = 2000
+    # Cle HMAC du manifest agrege ; SECRET_KEY par defaut
+    FORENSIC_EXPORT_SIGNING_KEY: str | None = None
 
     # Redis
     REDIS_URL: str = "redis://redis:6379/0"
@@ -41,6 +86,24 @@ class Settings(BaseSettings):
     ENABLE_FORENSIC_CAPTURE: bool = True
     ENABLE_RESULT_CONSUMER: bool = True
     ENABLE_EXTERNAL_TRANSMISSION_CONSUMER: bool = True
+    # False quand le rendu des bundles tourne dans un worker dedie
+    ENABLE_FORENSIC_BUNDLE_CONSUMER: bool = True
+    ENABLE_FORENSIC_EXPORT_CONSUMER: bool = True
+    # Compteurs du tableau de bord national (rollups) : fraicheur = intervalle du compacteur
+    ENABLE_DASHBOARD_ROLLUP_COMPACTOR: bool = True
+    DASHBOARD_ROLLUP_INTERVAL_SECONDS: int = 30
+    DASHBOARD_ROLLUP_REBUILD_HOURS: int = 24
+    # Cache des agregats interroges en boucle (cartes, tableaux de bord), invalide par les ecritures
+    ENABLE_AGGREGATE_CACHE: bool = True
+    AGGREGATE_CACHE_TTL_SECONDS: float = 10.0
+    AGGREGATE_CACHE_STALE_SECONDS: float = 30.0
+    AGGREGATE_CACHE_MAX_ENTRIES: int = 256
+    # Flux SSE /live : un lecteur Redis par process, rejeu depuis Last-Event-ID
+    ENABLE_LIVE_FEED: bool = True
+    LIVE_FEED_REPLAY_SIZE: int = 1000
+    LIVE_FEED_QUEUE_SIZE: int = 256
+    LIVE_FEED_HEARTBEAT_SECONDS: float = 15.0
+    LIVE_FEED_RETRY_MS: int = 3000
 
     # Observability
     SENTRY_DSN: str | None = None
@@ -75,5 +138,11 @@ class Settings(BaseSettings):
         )
         return self._normalize_database_url(default_url)
 
+    @property
+    def effective_read_database_url(self) -> str | None:
+        if self.DATABASE_READ_URL:
+            return self._normalize_database_url(self.DATABASE_READ_URL)
+        return None
+
 
 settings = Settings()
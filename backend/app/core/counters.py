@@ -0,0 +1,122 @@
+"""Compteurs declaratifs compiles en une requete par source.
+
+Chaque `Counter` nomme un agregat (count, count distinct, max...) sur une
+`CounterSource` (table ou jointure, avec son filtre de parcours) et un filtre
+propre. Les compteurs d'une meme source deviennent une seule requete
+`SELECT count(*) FILTER (WHERE ...), ...` ; les sources independantes partent
+en parallele, chacune sur sa propre connexion du pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Literal, TypeVar, overload
+
+from sqlalchemy import ColumnElement, distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+AggregateKind = Literal["count", "max", "min", "sum"]
+ResultT = TypeVar("ResultT")
+
+
+@dataclass(frozen=True, eq=False)
+class CounterSource:
+    """Perimetre d'une requete : FROM et WHERE communs a ses compteurs."""
+
+    name: str
+    selectable: Any
+    where: tuple[ColumnElement[bool], ...] = ()
+
+
+@dataclass(frozen=True, eq=False)
+class Counter:
+    name: str
+    source: CounterSource
+    filter: ColumnElement[bool] | None = None
+    # Colonne agregee ; None pour count(*).
+    column: ColumnElement[Any] | None = None
+    distinct: bool = False
+    kind: AggregateKind = "count"
+
+    def expression(self) -> ColumnElement[Any]:
+        if self.kind == "count":
+            if self.column is None:
+                aggregate = func.count()
+            else:
+                aggregate = func.count(distinct(self.column) if self.distinct else self.column)
+        else:
+            if self.column is None:
+                raise ValueError(f"Counter {self.name!r}: `column` est requis pour {self.kind}")
+            aggregate = getattr(func, self.kind)(self.column)
+        if self.filter is not None:
+            aggregate = aggregate.filter(self.filter)
+        return aggregate.label(self.name)
+
+
+def compile_counters(counters: Sequence[Counter]) -> list[tuple[CounterSource, Any]]:
+    """Regroupe les compteurs par source : une instruction SELECT par source."""
+    by_source: dict[int, tuple[CounterSource, list[Counter]]] = {}
+    names: set[str] = set()
+    for counter in counters:
+        if counter.name in names:
+            raise ValueError(f"Counter {counter.name!r} defini deux fois")
+        names.add(counter.name)
+        by_source.setdefault(id(counter.source), (counter.source, []))[1].append(counter)
+
+    statements = []
+    for source, grouped in by_source.values():
+        stmt = select(*(counter.expression() for counter in grouped)).select_from(source.selectable)
+        if source.where:
+            stmt = stmt.where(*source.where)
+        statements.append((source, stmt))
+    return statements
+
+
+def _coerce(counter: Counter, value: Any) -> Any:
+    # count et sum valent 0 sur un ensemble vide ; max/min restent None.
+    if counter.kind in ("count", "sum"):
+        return int(value or 0)
+    return value
+
+
+async def _execute_on_own_connection(engine: AsyncEngine, stmt) -> dict[str, Any]:
+    async with engine.connect() as connection:
+        return dict((await connection.execute(stmt)).mappings().one())
+
+
+def _concurrent_engine(db: AsyncSession) -> AsyncEngine | None:
+    engine = db.bind
+    if not isinstance(engine, AsyncEngine) or engine.dialect.name == "sqlite":
+        # SQLite (tests, dev) : une seule connexion, execution sequentielle.
+        return None
+    return engine
+
+
+@overload
+async def run_counters(db: AsyncSession, counters: Sequence[Counter]) -> dict[str, Any]: ...
+
+
+@overload
+async def run_counters(db: AsyncSession, counters: Sequence[Counter], result_type: type[ResultT]) -> ResultT: ...
+
+
+async def run_counters(db: AsyncSession, counters: Sequence[Counter], result_type: type | None = None):
+    """Execute les compteurs et retourne `{nom: valeur}` ou `result_type(**valeurs)`.
+
+    Avec plusieurs sources, chaque requete prend sa propre connexion sur le
+    moteur de la session (primaire ou replica) ; elles ne voient donc pas les
+    ecritures non commitees de `db`.
+    """
+    statements = compile_counters(counters)
+    engine = _concurrent_engine(db) if len(statements) > 1 else None
+    if engine is None:
+        rows = [dict((await db.execute(stmt)).mappings().one()) for _source, stmt in statements]
+    else:
+        rows = await asyncio.gather(*(_execute_on_own_connection(engine, stmt) for _source, stmt in statements))
+
+    raw = {name: value for row in rows for name, value in row.items()}
+    values = {counter.name: _coerce(counter, raw.get(counter.name)) for counter in counters}
+    return result_type(**values) if result_type is not None else values
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up after DB_POOL_TIMEOUT_SECONDS.",
+    ["pool"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond DB_POOL_SIZE.",
+    ["pool"],
+)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool recording checkout wait time per engine.
+
+    The pool label comes from ``pool_logging_name`` so that it survives
+    ``Pool.recreate()`` after a failover/dispose.
+    """
+
+    @property
+    def metrics_label(self) -> str:
+        return self._orig_logging_name or "primary"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=self.metrics_label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(pool=self.metrics_label).observe(time.perf_counter() - started)
+
+
+def _pool_stat(engine: AsyncEngine, attribute: str) -> float:
+    pool = engine.sync_engine.pool
+    reader = getattr(pool, attribute, None)
+    if reader is None:
+        return 0.0
+    return float(max(reader(), 0))
+
+
+def register_pool_gauges(engine: AsyncEngine, label: str) -> None:
+    POOL_CHECKED_OUT.labels(pool=label).set_function(lambda: _pool_stat(engine, "checkedout"))
+    POOL_OVERFLOW.labels(pool=label).set_function(lambda: _pool_stat(engine, "overflow"))
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import re
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+
+# Contenu adresse par son hash : ne change jamais sous la meme URL.
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+# Artefact stable mais supprimable : le client revalide via If-None-Match.
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+_SINGLE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def strong_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+
+def weak_etag(digest: str) -> str:
+    """Validateur d'une representation equivalente mais pas identique octet pour octet.
+
+    Suffit pour les 304 ; If-Range exige un validateur fort, les Range sont
+    alors servis en entier.
+    """
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Comparaison faible d'If-None-Match (RFC 9110 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == target for candidate in if_none_match.split(","))
+
+
+def _cache_headers(etag: str, immutable: bool) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL}
+
+
+def not_modified(request: Request, etag: str | None, *, immutable: bool = False) -> Response | None:
+    """304 si le client possede deja cette representation, sinon None.
+
+    A appeler avant de lire ou serialiser le contenu.
+    """
+    if etag is None or not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+    return Response(status_code=304, headers=_cache_headers(etag, immutable))
+
+
+async def cached_file_response(
+    request: Request,
+    path: str | Path,
+    *,
+    etag: str | None = None,
+    immutable: bool = False,
+    media_type: str | None = None,
+    filename: str | None = None,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """FileResponse avec ETag, 304 et Range (gere par Starlette, If-Range compris).
+
+    Sans hash connu, l'ETag de Starlette (date de modification et taille) est repris.
+    """
+    stat_result = None
+    if etag is None:
+        stat_result = await asyncio.to_thread(os.stat, path)
+        etag = FileResponse(path, stat_result=stat_result).headers["etag"]
+    if (response := not_modified(request, etag, immutable=immutable)) is not None:
+        return response
+    return FileResponse(
+        str(path),
+        headers={**(headers or {}), **_cache_headers(etag, immutable)},
+        media_type=media_type,
+        filename=filename,
+        stat_result=stat_result,
+    )
+
+
+def cached_bytes_response(
+    request: Request,
+    payload: bytes,
+    *,
+    etag: str,
+    media_type: str,
+    immutable: bool = False,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Contenu deja en memoire (backend distant, JSON reconstruit) : 304 et Range simple.
+
+    Un seul intervalle est servi ; les demandes multiples recoivent la reponse
+    complete, ce que la RFC autorise.
+    """
+    if (response := not_modified(request, etag, immutable=immutable)) is not None:
+        return response
+    response_headers = {**(headers or {}), **_cache_headers(etag, immutable), "Accept-Ranges": "bytes"}
+    size = len(payload)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    match = _SINGLE_RANGE.match(range_header.strip()) if range_header else None
+    if match is None or (if_range is not None and (etag.startswith("W/") or if_range.strip() != etag)):
+        return Response(content=payload, media_type=media_type, headers=response_headers)
+
+    first, last = match.groups()
+    if not first and not last:
+        return Response(content=payload, media_type=media_type, headers=response_headers)
+    if first:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size or start > end:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+    response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(content=payload[start : end + 1], status_code=206, media_type=media_type, headers=response_headers)
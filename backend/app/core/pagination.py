@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from collections.abc import Collection, Mapping
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """Curseur opaque de pagination par cle (position du dernier element servi)."""
+    payload = json.dumps(
+        {key: value.isoformat() if isinstance(value, datetime) else value for key, value in values.items()},
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    *,
+    datetime_keys: tuple[str, ...] = (),
+    int_keys: tuple[str, ...] = (),
+    choices: Mapping[str, Collection[Any]] | None = None,
+) -> dict[str, Any]:
+    """Decode un curseur ; cle absente ou de mauvais type -> 400 plutot qu'une erreur SQL."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, dict):
+            raise ValueError("cursor payload must be an object")
+        for key in datetime_keys:
+            values[key] = datetime.fromisoformat(values[key])
+        for key in int_keys:
+            if isinstance(values[key], bool) or not isinstance(values[key], int):
+                raise TypeError(f"cursor key {key!r} must be an integer")
+        for key, allowed in (choices or {}).items():
+            if values[key] not in allowed:
+                raise ValueError(f"cursor key {key!r} has an unexpected value")
+        return values
+    except (binascii.Error, UnicodeError, KeyError, TypeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor") from exc
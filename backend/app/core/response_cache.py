@@ -0,0 +1,197 @@
+"""Cache en memoire des reponses d'agregats (tableaux de bord, cartes).
+
+Chaque onglet admin et l'ecran `/live` interrogent les memes agregats toutes
+les quelques secondes. Une entree est cle par route, parametres normalises et
+perimetre de role, et reste fraiche `ttl_seconds`. Passe ce delai (ou apres
+invalidation), elle est encore servie pendant `stale_seconds` pendant qu'un
+rafraichissement unique tourne en arriere-plan. Les calculs concurrents d'une
+meme cle sont fusionnes : un seul appel au loader, les autres attendent son
+resultat.
+
+L'invalidation est pilotee par les evenements d'ecriture (`write_events`) :
+chaque entree declare les sujets dont elle depend. Un compteur de generation
+par sujet evite de ranger comme frais un resultat calcule pendant une
+invalidation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Header, Request
+
+from app.database import read_session
+
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    topics: frozenset[str]
+    stored_at: float
+    invalidated: bool = False
+
+
+class AggregateCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._stale_seconds = stale_seconds
+        self._max_entries = max(1, max_entries)
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._generations: dict[str, int] = {}
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _generation(self, topics: frozenset[str]) -> tuple[int, ...]:
+        return tuple(self._generations.get(topic, 0) for topic in sorted(topics))
+
+    def invalidate(self, *topics: str) -> None:
+        touched = set(topics)
+        for topic in touched:
+            self._generations[topic] = self._generations.get(topic, 0) + 1
+        for entry in self._entries.values():
+            if entry.topics & touched:
+                entry.invalidated = True
+
+    def invalidate_all(self) -> None:
+        # Reconnexion au canal : des evenements ont pu etre perdus entre-temps.
+        self.invalidate(*set(self._generations).union(*(entry.topics for entry in self._entries.values())))
+
+    async def get_or_compute(
+        self,
+        key: str,
+        loader: Loader,
+        *,
+        topics: Iterable[str],
+        refresher: Loader | None = None,
+    ) -> Any:
+        """Retourne la valeur en cache ou la calcule une seule fois.
+
+        `loader` utilise la session de la requete ; `refresher`, s'il est fourni,
+        ouvre sa propre session et permet de servir une entree perimee pendant
+        son rafraichissement en arriere-plan.
+        """
+        topic_set = frozenset(topics)
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.stored_at
+            if not entry.invalidated and age < self._ttl_seconds:
+                self._entries.move_to_end(key)
+                return entry.value
+            if refresher is not None and age < self._ttl_seconds + self._stale_seconds:
+                self._schedule_refresh(key, refresher, topic_set)
+                self._entries.move_to_end(key)
+                return entry.value
+        return await self._load(key, loader, topic_set)
+
+    async def _load(self, key: str, loader: Loader, topics: frozenset[str]) -> Any:
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Calcul abandonne par son initiateur : un des appelants reprend la main.
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation(topics)
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # consommee ici : pas d'avertissement sans attente concurrente
+            raise
+        else:
+            self._store(key, value, topics, invalidated=generation != self._generation(topics))
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _store(self, key: str, value: Any, topics: frozenset[str], *, invalidated: bool) -> None:
+        self._entries[key] = _Entry(value=value, topics=topics, stored_at=self._clock(), invalidated=invalidated)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_refresh(self, key: str, refresher: Loader, topics: frozenset[str]) -> None:
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._load(key, refresher, topics), name=f"aggregate_cache_refresh:{key}")
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Aggregate cache refresh failed", exc_info=task.exception())
+
+    async def aclose(self) -> None:
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        if self._refresh_tasks:
+            await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+
+
+def aggregate_cache_key(route: str, params: Mapping[str, Any], scope: str) -> str:
+    encoded = "&".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+    return f"{scope}:{route}?{encoded}"
+
+
+def with_read_session(compute: Callable[..., Awaitable[Any]], **kwargs: Any) -> Loader:
+    """Loader de rafraichissement : `compute(db=..., **kwargs)` sur sa propre session de lecture."""
+
+    async def _load() -> Any:
+        async with read_session() as db:
+            return await compute(db=db, **kwargs)
+
+    return _load
+
+
+# Dependance FastAPI : None hors lifespan (tests) ou quand la requete exige le primaire.
+def get_aggregate_cache(
+    request: Request,
+    x_read_consistency: str | None = Header(default=None),
+) -> AggregateCache | None:
+    if (x_read_consistency or "").strip().lower() == "primary":
+        return None
+    return getattr(request.app.state, "aggregate_cache", None)
+
+
+async def cached_aggregate(
+    cache: AggregateCache | None,
+    key: str,
+    loader: Loader,
+    *,
+    topics: Iterable[str],
+    refresher: Loader | None = None,
+) -> Any:
+    if cache is None:
+        return await loader()
+    return await cache.get_or_compute(key, loader, topics=topics, refresher=refresher)
@@ -1,18 +1,201 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from fastapi import Header
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+
 from app.core.config import settings
+from app.core.db_metrics import InstrumentedAsyncPool, register_pool_gauges
+
 
-# Création de l'engine Asynchrone
-engine = create_async_engine(
-    settings.effective_database_url,
-    echo=settings.SQL_ECHO,
-    future=True
+logger = logging.getLogger(__name__)
+
+# Retard de rejeu d'un standby PostgreSQL ; 0 quand tout le WAL recu est rejoue
+# (sinon un primaire inactif ferait croire a un replica en retard).
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
 )
 
-# Fabrique de session
+
+def _pgbouncer_statement_name() -> str:
+    # PgBouncer (transaction pooling) peut router deux requetes d'une meme
+    # session vers deux backends differents : les noms doivent etre uniques.
+    return f"__asyncpg_{uuid.uuid4().hex}__"
+
+
+def build_engine_options(database_url: str, *, pool_label: str = "primary") -> dict[str, Any]:
+    """Options `create_async_engine` derivees de `Settings` pour une URL donnee."""
+    options: dict[str, Any] = {"echo": settings.SQL_ECHO}
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "sqlite":
+        return options
+
+    connect_args: dict[str, Any] = {}
+    if url.get_driver_name() == "asyncpg":
+        if settings.DB_PGBOUNCER_MODE:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = _pgbouncer_statement_name
+        else:
+            connect_args["statement_cache_size"] = max(0, settings.DB_STATEMENT_CACHE_SIZE)
+            connect_args["prepared_statement_cache_size"] = max(0, settings.DB_PREPARED_STATEMENT_CACHE_SIZE)
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    if settings.DB_POOL_SIZE <= 0:
+        # Pool desactive : chaque session ouvre sa propre connexion (PgBouncer session pool externe).
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncPool,
+        pool_logging_name=pool_label,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=max(0, settings.DB_MAX_OVERFLOW),
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def _create_engine(database_url: str, pool_label: str) -> AsyncEngine:
+    created = create_async_engine(database_url, **build_engine_options(database_url, pool_label=pool_label))
+    register_pool_gauges(created, pool_label)
+    return created
+
+
+# Création de l'engine Asynchrone (partagé par l'API et les consumers en arrière-plan)
+engine = _create_engine(settings.effective_database_url, "primary")
+
+# Engine lecture seule optionnel (dashboards, exports) ; retombe sur le primaire sinon
+read_engine = (
+    _create_engine(settings.effective_read_database_url, "replica")
+    if settings.effective_read_database_url
+    else engine
+)
+
+# Fabriques de session
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+AsyncReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+class ReadReplicaRouter:
+    """Choisit la fabrique de session pour une lecture : replica si sain et a jour, primaire sinon.
+
+    L'etat du replica (joignable, retard de rejeu) est verifie au plus une fois
+    par `check_interval_seconds` et partage par toutes les requetes du process.
+    Une seule sonde tourne a la fois ; une lecture ne l'attend pas plus de
+    `probe_wait_seconds` et part sur le primaire si le replica tarde a repondre.
+    """
+
+    def __init__(
+        self,
+        *,
+        primary_sessionmaker: Callable[[], AsyncSession],
+        replica_sessionmaker: Callable[[], AsyncSession] | None = None,
+        replica_engine: AsyncEngine | None = None,
+        max_lag_seconds: float = 5.0,
+        check_interval_seconds: float = 10.0,
+        probe_wait_seconds: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._primary_sessionmaker = primary_sessionmaker
+        self._replica_sessionmaker = replica_sessionmaker
+        self._replica_engine = replica_engine
+        self._max_lag_seconds = max_lag_seconds
+        self._check_interval_seconds = check_interval_seconds
+        self._probe_wait_seconds = probe_wait_seconds
+        self._clock = clock
+        self._checked_at: float | None = None
+        self._replica_ok = False
+        self._probe_task: asyncio.Task[bool] | None = None
+
+    @property
+    def has_replica(self) -> bool:
+        return self._replica_sessionmaker is not None and self._replica_engine is not None
+
+    def _check_is_fresh(self) -> bool:
+        return self._checked_at is not None and self._clock() - self._checked_at < self._check_interval_seconds
+
+    async def _probe_replica(self) -> bool:
+        assert self._replica_engine is not None
+        try:
+            async with self._replica_engine.connect() as conn:
+                if conn.dialect.name != "postgresql":
+                    await conn.execute(text("SELECT 1"))
+                    return True
+                lag_seconds = (await conn.execute(REPLICA_LAG_SQL)).scalar()
+        except Exception:
+            logger.warning("Read replica unreachable, routing reads to primary", exc_info=True)
+            return False
+
+        if lag_seconds is not None and float(lag_seconds) > self._max_lag_seconds:
+            logger.warning(
+                "Read replica lagging beyond tolerance, routing reads to primary",
+                extra={"lag_seconds": float(lag_seconds), "max_lag_seconds": self._max_lag_seconds},
+            )
+            return False
+        return True
+
+    async def replica_available(self) -> bool:
+        if not self.has_replica:
+            return False
+        if self._check_is_fresh():
+            return self._replica_ok
+        probe = self._current_probe()
+        try:
+            # shield : le delai d'un appelant n'annule pas la sonde partagee
+            return await asyncio.wait_for(asyncio.shield(probe), timeout=self._probe_wait_seconds)
+        except asyncio.TimeoutError:
+            return False
+
+    def _current_probe(self) -> "asyncio.Task[bool]":
+        # Sans await entre le test et la creation : une seule sonde en vol par boucle
+        task = self._probe_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._refresh_replica_state())
+            self._probe_task = task
+        return task
+
+    async def _refresh_replica_state(self) -> bool:
+        replica_ok = await self._probe_replica()
+        self._replica_ok = replica_ok
+        self._checked_at = self._clock()
+        return replica_ok
+
+    async def sessionmaker_for(self, *, read_only: bool, require_primary: bool = False) -> Callable[[], AsyncSession]:
+        if read_only and not require_primary and await self.replica_available():
+            assert self._replica_sessionmaker is not None
+            return self._replica_sessionmaker
+        return self._primary_sessionmaker
+
+
+session_router = ReadReplicaRouter(
+    primary_sessionmaker=AsyncSessionLocal,
+    replica_sessionmaker=AsyncReadSessionLocal if read_engine is not engine else None,
+    replica_engine=read_engine if read_engine is not engine else None,
+    max_lag_seconds=settings.DATABASE_READ_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.DATABASE_READ_HEALTHCHECK_SECONDS,
+    probe_wait_seconds=settings.DATABASE_READ_PROBE_WAIT_SECONDS,
+)
 
 Base = declarative_base()
 
@@ -23,3 +206,29 @@ async def get_db():
             yield session
         finally:
             await session.close()
+
+
+# Dépendance FastAPI pour les agrégations lourdes en lecture seule.
+# `X-Read-Consistency: primary` force le primaire (lecture de ses propres écritures).
+async def get_read_db(x_read_consistency: str | None = Header(default=None)):
+    require_primary = (x_read_consistency or "").strip().lower() == "primary"
+    session_factory = await session_router.sessionmaker_for(read_only=True, require_primary=require_primary)
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def read_session():
+    """Session de lecture hors requete (rafraichissements en arriere-plan)."""
+    session_factory = await session_router.sessionmaker_for(read_only=True)
+    async with session_factory() as session:
+        yield session
+
+
+async def dispose_engines() -> None:
+    if read_engine is not engine:
+        await read_engine.dispose()
+    await engine.dispose()
@@ -15,7 +15,7 @@ from sqlalchemy import text
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.database import AsyncSessionLocal
+from app.database import AsyncSessionLocal, dispose_engines
 from app.services.auth_bootstrap import ensure_default_auth_users
 
 
@@ -34,8 +34,14 @@ if settings.SENTRY_DSN:
 async def lifespan(app: FastAPI):
     """Startup/shutdown lifecycle."""
     from app.database import Base, engine
+    from app.core.response_cache import AggregateCache
     from app.models import Alert, Evidence, MonitoringSource, Report, User  # noqa: F401
+    from app.services.live_feed import LiveFeedHub
+    from app.services.write_events import listen_write_events
+    from app.workers.dashboard_rollup_compactor import start_dashboard_rollup_compactor
     from app.workers.external_transmission_consumer import start_external_transmission_consumer
+    from app.workers.forensic_bundle_consumer import start_forensic_bundle_consumer
+    from app.workers.forensic_export_consumer import start_forensic_export_consumer
     from app.workers.result_consumer import start_result_consumer
 
     if settings.AUTO_CREATE_TABLES:
@@ -51,6 +57,32 @@ async def lifespan(app: FastAPI):
         logger.warning("Skipped auth user bootstrap", error=str(exc))
 
     background_tasks: list[asyncio.Task] = []
+    aggregate_cache = None
+    if settings.ENABLE_AGGREGATE_CACHE:
+        aggregate_cache = AggregateCache(
+            ttl_seconds=settings.AGGREGATE_CACHE_TTL_SECONDS,
+            stale_seconds=settings.AGGREGATE_CACHE_STALE_SECONDS,
+            max_entries=settings.AGGREGATE_CACHE_MAX_ENTRIES,
+        )
+        app.state.aggregate_cache = aggregate_cache
+        background_tasks.append(
+            asyncio.create_task(
+                listen_write_events(
+                    lambda event: aggregate_cache.invalidate(*event["topics"]),
+                    on_subscribed=aggregate_cache.invalidate_all,
+                ),
+                name="aggregate_cache_invalidation",
+            )
+        )
+        logger.info("Background worker started", worker="aggregate_cache_invalidation")
+    if settings.ENABLE_LIVE_FEED:
+        live_feed = LiveFeedHub(
+            replay_size=settings.LIVE_FEED_REPLAY_SIZE,
+            queue_size=settings.LIVE_FEED_QUEUE_SIZE,
+        )
+        app.state.live_feed = live_feed
+        background_tasks.append(asyncio.create_task(live_feed.run(), name="live_feed"))
+        logger.info("Background worker started", worker="live_feed")
     if settings.ENABLE_RESULT_CONSUMER:
         background_tasks.append(asyncio.create_task(start_result_consumer(), name="result_consumer"))
         logger.info("Background worker started", worker="result_consumer")
@@ -59,6 +91,21 @@ async def lifespan(app: FastAPI):
             asyncio.create_task(start_external_transmission_consumer(), name="external_transmission_consumer")
         )
         logger.info("Background worker started", worker="external_transmission_consumer")
+    if settings.ENABLE_FORENSIC_BUNDLE_CONSUMER and "pytest" not in sys.modules:
+        background_tasks.append(
+            asyncio.create_task(start_forensic_bundle_consumer(), name="forensic_bundle_consumer")
+        )
+        logger.info("Background worker started", worker="forensic_bundle_consumer")
+    if settings.ENABLE_FORENSIC_EXPORT_CONSUMER and "pytest" not in sys.modules:
+        background_tasks.append(
+            asyncio.create_task(start_forensic_export_consumer(), name="forensic_export_consumer")
+        )
+        logger.info("Background worker started", worker="forensic_export_consumer")
+    if settings.ENABLE_DASHBOARD_ROLLUP_COMPACTOR and "pytest" not in sys.modules:
+        background_tasks.append(
+            asyncio.create_task(start_dashboard_rollup_compactor(), name="dashboard_rollup_compactor")
+        )
+        logger.info("Background worker started", worker="dashboard_rollup_compactor")
 
     logger.info("OSINT-SCOUT Shield API started")
     try:
@@ -68,6 +115,9 @@ async def lifespan(app: FastAPI):
             task.cancel()
         if background_tasks:
             await asyncio.gather(*background_tasks, return_exceptions=True)
+        if aggregate_cache is not None:
+            await aggregate_cache.aclose()
+        await dispose_engines()
         logger.info("OSINT-SCOUT Shield API shutting down")
 
 
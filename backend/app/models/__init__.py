@@ -1,11 +1,12 @@
 from .alert import Alert, AnalysisResult
-from .evidence import Evidence
+from .evidence import Evidence, EvidenceBlob
 from .memory_domain import (
     BusinessProfile,
     CitizenMessage,
     EvidenceItem,
     ExternalTransmission,
     ForensicBundle,
+    ForensicExportJob,
     FormalReport,
     ImpersonationIncident,
     MessageAnalysis,
@@ -16,3 +17,4 @@ from .report import Report
 from .user import User
 from .threat_indicator import ThreatIndicator
 from .campaign_alert import CampaignAlert
+from .dashboard_rollup import ReportDailyRollup, RollupWatermark, TransmissionDailyRollup
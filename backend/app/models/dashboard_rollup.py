@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Date, DateTime, Integer, String
+
+from app.database import Base
+
+
+class ReportDailyRollup(Base):
+    """Compteur de signalements par jour de creation, departement, categorie, risque et statut."""
+
+    __tablename__ = "report_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    department = Column(String(32), primary_key=True)
+    category = Column(String(128), primary_key=True)
+    risk_bucket = Column(String(8), primary_key=True)
+    status = Column(String(24), primary_key=True)
+    report_count = Column(Integer, nullable=False, default=0)
+    latest_report_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class TransmissionDailyRollup(Base):
+    """Compteur de transmissions externes par jour de creation, cible et statut."""
+
+    __tablename__ = "transmission_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    target_type = Column(String(32), primary_key=True)
+    status = Column(String(24), primary_key=True)
+    transmission_count = Column(Integer, nullable=False, default=0)
+
+
+class RollupWatermark(Base):
+    """Dernier passage du compacteur : les lignes sources modifiees depuis sont a recompter."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(64), primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+    rebuilt_at = Column(DateTime(timezone=True), nullable=True)
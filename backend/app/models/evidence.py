@@ -30,3 +30,16 @@ class Evidence(Base):
     sealed_at = Column(DateTime(timezone=True), nullable=True)
 
     alert = relationship("Alert", back_populates="evidences")
+
+
+class EvidenceBlob(Base):
+    """Fichier de preuve stocke une seule fois par contenu (SHA-256), partage par reference."""
+
+    __tablename__ = "evidence_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String, nullable=False)
+    size_bytes = Column(Integer, nullable=True)
+    content_type = Column(String(128), nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -68,6 +68,20 @@ class SuspectNumber(Base):
 
 class FormalReport(Base):
     __tablename__ = "formal_reports"
+    __table_args__ = (
+        # Liste des incidents citoyens : pagination par cle (created_at desc, id desc),
+        # globale, par declarant (scope=me) et par statut.
+        Index("ix_formal_reports_created_at_id", "created_at", "id"),
+        Index("ix_formal_reports_reporter_created_at_id", "reporter_user_id", "created_at", "id"),
+        Index("ix_formal_reports_status_created_at_id", "status", "created_at", "id"),
+        # Recherche LIKE '%terme%' : index trigramme PostgreSQL (simple index ailleurs).
+        Index(
+            "ix_formal_reports_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, index=True)
@@ -78,9 +92,14 @@ class FormalReport(Base):
     reporter_user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     status = Column(String(24), nullable=False, default="NEW", index=True)
     custody_hash = Column(String(64), nullable=False, index=True)
+    # Departement resolu a la creation (saisie ou prefixe du numero), "UNKNOWN" sinon.
+    # NULL : rapport anterieur, resolu par le compacteur des rollups.
+    department = Column(String(32), nullable=True, index=True)
     legacy_alert_uuid = Column(UUID(as_uuid=True), nullable=True, index=True)
+    # Contenu, URL et reference replies (accents, casse) : voir services/search_text.py.
+    search_text = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)
 
     message = relationship("CitizenMessage", back_populates="reports")
     analysis = relationship("MessageAnalysis", back_populates="reports")
@@ -149,16 +168,42 @@ class ImpersonationIncident(Base):
 
 class ForensicBundle(Base):
     __tablename__ = "forensic_bundles"
+    # Un seul job de rendu actif par contenu de snapshot (coalescence des doubles clics).
+    __table_args__ = (
+        Index(
+            "uq_forensic_bundles_active_content_hash",
+            "content_hash",
+            unique=True,
+            postgresql_where=text("status IN ('PENDING', 'RENDERING')"),
+            sqlite_where=text("status IN ('PENDING', 'RENDERING')"),
+        ),
+        # Pagination par cle de la liste des rapports (tri created_at desc, id desc).
+        Index("ix_forensic_bundles_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, index=True)
     report_id = Column(Integer, ForeignKey("formal_reports.id"), nullable=False, index=True)
-    global_hash = Column(String(64), nullable=False, index=True)
+    # Hash du ZIP final ; vide tant que le job de rendu n'est pas termine.
+    global_hash = Column(String(64), nullable=True, index=True)
+    # Hash du snapshot hors horodatage de generation : cle de coalescence des jobs.
+    content_hash = Column(String(64), nullable=True, index=True)
+    # Champs chauds du snapshot, recopies hors de manifest_json pour les listes
+    # et jointures : le JSON complet n'est lu que pour le detail et les telechargements.
+    alert_uuid = Column(UUID(as_uuid=True), nullable=True, index=True)
+    public_reference = Column(String(32), nullable=True, index=True)
+    snapshot_hash_sha256 = Column(String(64), nullable=True, index=True)
+    snapshot_version = Column(String(16), nullable=True)
+    risk_score = Column(Integer, nullable=True, index=True)
+    alert_url = Column(String, nullable=True)
     manifest_json = Column(JSON, nullable=False, default=dict)
     zip_path = Column(String, nullable=True)
     pdf_path = Column(String, nullable=True)
     json_path = Column(String, nullable=True)
     status = Column(String(24), nullable=False, default="PENDING", index=True)
+    last_error = Column(Text, nullable=True)
+    # Prise du job par un worker (RENDERING) : au-dela du delai, le job est repris.
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     transmitted_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -166,8 +211,38 @@ class ForensicBundle(Base):
     transmissions = relationship("ExternalTransmission", back_populates="bundle", cascade="all, delete-orphan")
 
 
+class ForensicExportJob(Base):
+    """Export en masse de dossiers forensiques (filtre -> archive unique signee)."""
+
+    __tablename__ = "forensic_export_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, index=True)
+    requested_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    filters_json = Column(JSON, nullable=False, default=dict)
+    status = Column(String(24), nullable=False, default="PENDING", index=True)
+    total_items = Column(Integer, nullable=False, default=0)
+    processed_items = Column(Integer, nullable=False, default=0)
+    rendered_items = Column(Integer, nullable=False, default=0)
+    failed_items = Column(Integer, nullable=False, default=0)
+    zip_path = Column(String, nullable=True)
+    archive_hash = Column(String(64), nullable=True)
+    manifest_hash = Column(String(64), nullable=True)
+    last_error = Column(Text, nullable=True)
+    # Prise du job (RUNNING), rafraichie periodiquement par le worker qui l'execute.
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+
 class ExternalTransmission(Base):
     __tablename__ = "external_transmissions"
+    __table_args__ = (
+        # Console des transmissions : pagination par cle (created_at desc, id desc),
+        # globale et filtree par statut.
+        Index("ix_external_transmissions_created_at_id", "created_at", "id"),
+        Index("ix_external_transmissions_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, index=True)
@@ -180,8 +255,8 @@ class ExternalTransmission(Base):
     ack_reference = Column(String(128), nullable=True)
     next_retry_at = Column(DateTime(timezone=True), nullable=True)
     last_error = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)
     delivered_at = Column(DateTime(timezone=True), nullable=True)
 
     bundle = relationship("ForensicBundle", back_populates="transmissions")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
@@ -7,6 +7,8 @@ from app.database import Base
 
 class Report(Base):
     __tablename__ = "reports"
+    # Pagination par cle de la liste des rapports (tri generated_at desc, id desc).
+    __table_args__ = (Index("ix_reports_generated_at_id", "generated_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, index=True)
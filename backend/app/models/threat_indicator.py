@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
@@ -13,6 +13,17 @@ class ThreatIndicator(Base):
     __table_args__ = (
         Index("ix_threat_indicators_phone_hash_region", "phone_hash", "region"),
         Index("ix_threat_indicators_url_hash_region", "url_hash", "region"),
+        # Top des indicateurs recurrents d'un type (tableau de bord) : lecture ordonnee bornee.
+        Index("ix_threat_indicators_type_occurrence", "indicator_type", text("occurrence_count DESC")),
+        # Menaces actives (compteur, export) : index partiel, une faible fraction de la table.
+        Index(
+            "ix_threat_indicators_alert_occurrence",
+            text("occurrence_count DESC"),
+            postgresql_where=text("alert_triggered"),
+            sqlite_where=text("alert_triggered"),
+        ),
+        # Carte publique : regroupement region x categorie couvert par l'index.
+        Index("ix_threat_indicators_region_category", "region", "dominant_category"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
@@ -104,3 +104,5 @@ class AdminTransmissionListData(BaseModel):
     retrying_count: int
     failed_count: int
     delivered_count: int
+    # Page suivante (pagination par cle) ; None en fin de liste.
+    next_cursor: str | None = None
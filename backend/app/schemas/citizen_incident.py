@@ -18,6 +18,9 @@ class CitizenIncidentListItem(BaseModel):
     created_at: datetime
     attachments_count: int
     reports_for_phone: int
+    open_reports_for_phone: int = 0
+    confirmed_reports_for_phone: int = 0
+    blocked_reports_for_phone: int = 0
 
 
 class CitizenIncidentListData(BaseModel):
@@ -25,6 +28,10 @@ class CitizenIncidentListData(BaseModel):
     total: int
     skip: int
     limit: int
+    # Page suivante (pagination par cle) ; None en fin de liste.
+    next_cursor: str | None = None
+    # total estime par le planificateur (count=estimate) plutot que compte.
+    total_is_estimate: bool = False
 
 
 class CitizenTopNumberItem(BaseModel):
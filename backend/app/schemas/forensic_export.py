@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field, UUID4, model_validator
+
+
+class ForensicExportRequest(BaseModel):
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    category: str | None = Field(default=None, max_length=128)
+    suspect_number: str | None = Field(default=None, max_length=32)
+    campaign_id: UUID4 | None = None
+
+    @model_validator(mode="after")
+    def _check_filter(self) -> "ForensicExportRequest":
+        if not any((self.date_from, self.date_to, self.category, self.suspect_number, self.campaign_id)):
+            raise ValueError("At least one export filter is required")
+        if self.date_from and self.date_to and self.date_from >= self.date_to:
+            raise ValueError("date_from must be before date_to")
+        return self
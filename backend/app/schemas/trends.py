@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+TrendBucket = Literal["hour", "day", "week", "month"]
+TrendDimension = Literal["department", "category", "risk", "status"]
+TrendSource = Literal["rollups", "reports"]
+
+
+class TrendPoint(BaseModel):
+    bucket_start: datetime
+    count: int
+
+
+class TrendSeries(BaseModel):
+    # Valeur de la dimension ; None pour la serie unique sans dimension.
+    key: str | None = None
+    total: int
+    points: list[TrendPoint] = Field(default_factory=list)
+
+
+class TrendData(BaseModel):
+    bucket: TrendBucket
+    start: datetime
+    end: datetime
+    dimension: TrendDimension | None = None
+    source: TrendSource
+    department: str | None = None
+    category: str | None = None
+    risk: str | None = None
+    status: str | None = None
+    total: int
+    series: list[TrendSeries] = Field(default_factory=list)
@@ -4,14 +4,17 @@ import csv
 import json
 import re
 import uuid
-from datetime import datetime, time, timedelta, timezone
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from io import StringIO
 from typing import Any
 
-from sqlalchemy import desc, func, or_, select
+from sqlalchemy import desc, func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.counters import Counter, CounterSource, run_counters
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.risk_levels import risk_level_from_score
 from app.models import (
     BusinessProfile,
@@ -19,7 +22,6 @@ from app.models import (
     FormalReport,
     ForensicBundle,
     ImpersonationIncident,
-    MessageAnalysis,
     SuspectNumber,
 )
 from app.schemas.admin_console import (
@@ -33,6 +35,7 @@ from app.schemas.admin_console import (
     AdminTransmissionListData,
     AdminTransmissionListItem,
 )
+from app.services.dashboard_rollups import read_dashboard_rollups
 from app.services.phone_privacy import decrypt_phone, derive_phone_hash, mask_phone, normalize_phone
 
 
@@ -41,6 +44,35 @@ REPORT_STATUS_ORDER = ["NEW", "IN_REVIEW", "CONFIRMED", "DISMISSED", "BLOCKED_SI
 TRANSMISSION_STATUS_ORDER = ["PENDING", "QUEUED", "SENT", "RETRYING", "FAILED", "DELIVERED"]
 
 
+_BUNDLES = CounterSource("forensic_bundles", ForensicBundle)
+_BUSINESSES = CounterSource("business_profiles", BusinessProfile)
+_SUSPECT_NUMBERS = CounterSource("suspect_numbers", SuspectNumber)
+
+ADMIN_DASHBOARD_COUNTERS = (
+    Counter(
+        "bundles_ready",
+        _BUNDLES,
+        filter=or_(
+            ForensicBundle.status != "PENDING",
+            ForensicBundle.pdf_path.is_not(None),
+            ForensicBundle.json_path.is_not(None),
+            ForensicBundle.zip_path.is_not(None),
+        ),
+    ),
+    Counter("active_businesses", _BUSINESSES, filter=BusinessProfile.validation_status == "ACTIVE"),
+    Counter("pending_businesses", _BUSINESSES, filter=BusinessProfile.validation_status == "PENDING_APPROVAL"),
+    Counter("active_campaigns", _SUSPECT_NUMBERS, filter=SuspectNumber.report_count >= 3),
+)
+
+
+@dataclass(frozen=True)
+class AdminDashboardCounters:
+    bundles_ready: int
+    active_businesses: int
+    pending_businesses: int
+    active_campaigns: int
+
+
 def _status_map(order: list[str]) -> dict[str, int]:
     return {status: 0 for status in order}
 
@@ -125,112 +157,38 @@ async def _load_export_reports(db: AsyncSession) -> list[FormalReport]:
 async def get_admin_dashboard(db: AsyncSession) -> AdminDashboardData:
     now = datetime.now(timezone.utc)
     start_date = (now - timedelta(days=6)).date()
-    start_dt = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
-    today_start = datetime.combine(now.date(), time.min, tzinfo=timezone.utc)
-
-    total_reports = int((await db.execute(select(func.count(FormalReport.id)))).scalar_one() or 0)
-    daily_reports = int(
-        (
-            await db.execute(
-                select(func.count(FormalReport.id)).where(FormalReport.created_at >= today_start)
-            )
-        ).scalar_one()
-        or 0
-    )
-    open_reports = int(
-        (
-            await db.execute(
-                select(func.count(FormalReport.id)).where(FormalReport.status.in_(["NEW", "IN_REVIEW"]))
-            )
-        ).scalar_one()
-        or 0
-    )
-    confirmed_reports = int(
-        (
-            await db.execute(
-                select(func.count(FormalReport.id)).where(FormalReport.status == "CONFIRMED")
-            )
-        ).scalar_one()
-        or 0
-    )
-    bundles_ready = int(
-        (
-            await db.execute(
-                select(func.count(ForensicBundle.id)).where(
-                    or_(
-                        ForensicBundle.status != "PENDING",
-                        ForensicBundle.pdf_path.is_not(None),
-                        ForensicBundle.json_path.is_not(None),
-                        ForensicBundle.zip_path.is_not(None),
-                    )
-                )
-            )
-        ).scalar_one()
-        or 0
-    )
-    active_businesses = int(
-        (
-            await db.execute(
-                select(func.count(BusinessProfile.id)).where(BusinessProfile.validation_status == "ACTIVE")
-            )
-        ).scalar_one()
-        or 0
-    )
-    pending_businesses = int(
-        (
-            await db.execute(
-                select(func.count(BusinessProfile.id)).where(BusinessProfile.validation_status == "PENDING_APPROVAL")
-            )
-        ).scalar_one()
-        or 0
-    )
 
-    reports_by_day_rows = (
-        await db.execute(
-            select(func.date(FormalReport.created_at).label("day"), func.count(FormalReport.id).label("count"))
-            .where(FormalReport.created_at >= start_dt)
-            .group_by(func.date(FormalReport.created_at))
-            .order_by(func.date(FormalReport.created_at).asc())
-        )
-    ).all()
-    day_map = {str(day): int(count) for day, count in reports_by_day_rows}
+    # Compteurs de signalements et de transmissions : rollups tenus par le compacteur.
+    rollups = await read_dashboard_rollups(db, since_day=start_date)
+    total_reports = rollups.total_reports
+    daily_reports = rollups.reports_by_day.get(now.date(), 0)
+    open_reports = sum(rollups.reports_by_status.get(status, 0) for status in ("NEW", "IN_REVIEW"))
+    confirmed_reports = rollups.reports_by_status.get("CONFIRMED", 0)
+
+    counters = await run_counters(db, ADMIN_DASHBOARD_COUNTERS, AdminDashboardCounters)
+    bundles_ready = counters.bundles_ready
+    active_businesses = counters.active_businesses
+    pending_businesses = counters.pending_businesses
+
     reports_by_day = [
         AdminDailyCount(
             date=(start_date + timedelta(days=offset)).isoformat(),
-            count=day_map.get((start_date + timedelta(days=offset)).isoformat(), 0),
+            count=rollups.reports_by_day.get(start_date + timedelta(days=offset), 0),
         )
         for offset in range(7)
     ]
 
     reports_by_status = _status_map(REPORT_STATUS_ORDER)
-    for status, count in (
-        await db.execute(select(FormalReport.status, func.count(FormalReport.id)).group_by(FormalReport.status))
-    ).all():
+    for status, count in rollups.reports_by_status.items():
         if status in reports_by_status:
-            reports_by_status[str(status)] = int(count or 0)
+            reports_by_status[str(status)] = count
 
     transmissions_by_status = _status_map(TRANSMISSION_STATUS_ORDER)
-    for status, count in (
-        await db.execute(
-            select(ExternalTransmission.status, func.count(ExternalTransmission.id)).group_by(ExternalTransmission.status)
-        )
-    ).all():
+    for status, count in rollups.transmissions_by_status.items():
         if status in transmissions_by_status:
-            transmissions_by_status[str(status)] = int(count or 0)
+            transmissions_by_status[str(status)] = count
 
-    reports_by_category_rows = (
-        await db.execute(
-            select(
-                func.coalesce(MessageAnalysis.primary_category, "non_classe").label("category"),
-                func.count(FormalReport.id).label("count"),
-            )
-            .select_from(FormalReport)
-            .join(MessageAnalysis, FormalReport.analysis_id == MessageAnalysis.id)
-            .group_by("category")
-            .order_by(desc("count"), "category")
-            .limit(5)
-        )
-    ).all()
+    reports_by_category = sorted(rollups.reports_by_category.items(), key=lambda item: (-item[1], item[0]))[:5]
 
     recent_reports_stmt = (
         select(FormalReport)
@@ -285,15 +243,6 @@ async def get_admin_dashboard(db: AsyncSession) -> AdminDashboardData:
         (transmissions_delivered / transmissions_total) * 100 if transmissions_total else 0.0,
         1,
     )
-    active_campaigns = int(
-        (
-            await db.execute(
-                select(func.count(SuspectNumber.id)).where(SuspectNumber.report_count >= 3)
-            )
-        ).scalar_one()
-        or 0
-    )
-
     return AdminDashboardData(
         total_reports=total_reports,
         daily_reports=daily_reports,
@@ -305,11 +254,11 @@ async def get_admin_dashboard(db: AsyncSession) -> AdminDashboardData:
         transmissions_pending=transmissions_pending,
         transmissions_failed=transmissions_failed,
         transmission_success_rate=transmission_success_rate,
-        active_campaigns=active_campaigns,
+        active_campaigns=counters.active_campaigns,
         reports_by_day=reports_by_day,
         reports_by_category=[
-            AdminCategoryCount(category=str(row.category or "non_classe"), count=int(row.count or 0))
-            for row in reports_by_category_rows
+            AdminCategoryCount(category=str(category or "non_classe"), count=count)
+            for category, count in reports_by_category
         ],
         reports_by_status=reports_by_status,
         transmissions_by_status=transmissions_by_status,
@@ -360,6 +309,55 @@ async def get_admin_dashboard(db: AsyncSession) -> AdminDashboardData:
     )
 
 
+def _transmission_search_clause(search_value: str):
+    """Recherche en EXISTS correles : aucune jointure ne demultiplie les transmissions."""
+    term = f"%{search_value}%"
+    report_filters = [FormalReport.public_reference.ilike(term)]
+    try:
+        normalized_phone = normalize_phone(search_value)
+        if PHONE_PATTERN.match(normalized_phone):
+            report_filters.append(
+                FormalReport.suspect_number_id.in_(
+                    select(SuspectNumber.id).where(SuspectNumber.phone_hash == derive_phone_hash(normalized_phone))
+                )
+            )
+    except Exception:
+        pass
+
+    report_matches = (
+        select(ForensicBundle.id)
+        .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
+        .where(ForensicBundle.id == ExternalTransmission.bundle_id, or_(*report_filters))
+        .exists()
+    )
+    business_matches = (
+        select(ForensicBundle.id)
+        .join(ImpersonationIncident, ImpersonationIncident.formal_report_id == ForensicBundle.report_id)
+        .join(BusinessProfile, ImpersonationIncident.business_profile_id == BusinessProfile.id)
+        .where(ForensicBundle.id == ExternalTransmission.bundle_id, BusinessProfile.official_name.ilike(term))
+        .exists()
+    )
+    return or_(
+        ExternalTransmission.ack_reference.ilike(term),
+        ExternalTransmission.target_endpoint.ilike(term),
+        report_matches,
+        business_matches,
+    )
+
+
+def _transmission_counters(summary_filters: list, status_filter: str | None) -> tuple[Counter, ...]:
+    # total (filtre de statut compris) et repartition par statut (sans) : une seule requete.
+    transmissions = CounterSource("external_transmissions", ExternalTransmission, where=tuple(summary_filters))
+    total_filter = ExternalTransmission.status == status_filter if status_filter else None
+    return (
+        Counter("total", transmissions, filter=total_filter),
+        *(
+            Counter(f"{status.lower()}_count", transmissions, filter=ExternalTransmission.status == status)
+            for status in TRANSMISSION_STATUS_ORDER
+        ),
+    )
+
+
 async def list_admin_transmissions(
     db: AsyncSession,
     *,
@@ -368,95 +366,50 @@ async def list_admin_transmissions(
     status_filter: str | None = None,
     target_filter: str | None = None,
     search: str | None = None,
+    cursor: str | None = None,
 ) -> AdminTransmissionListData:
-    filters = []
-    summary_filters = []
+    """Console des transmissions, triee par (created_at desc, id desc).
 
+    `cursor` (valeur `next_cursor` de la page precedente) remplace `skip`.
+    """
+    summary_filters = []
     if target_filter:
-        target_clause = ExternalTransmission.target_type == target_filter
-        filters.append(target_clause)
-        summary_filters.append(target_clause)
-
+        summary_filters.append(ExternalTransmission.target_type == target_filter)
     if search and search.strip():
-        search_value = search.strip()
-        term = f"%{search_value}%"
-        search_filters = [
-            FormalReport.public_reference.ilike(term),
-            ExternalTransmission.ack_reference.ilike(term),
-            ExternalTransmission.target_endpoint.ilike(term),
-            BusinessProfile.official_name.ilike(term),
-        ]
-        try:
-            normalized_phone = normalize_phone(search_value)
-            if PHONE_PATTERN.match(normalized_phone):
-                search_filters.append(SuspectNumber.phone_hash == derive_phone_hash(normalized_phone))
-        except Exception:
-            pass
-        search_clause = or_(*search_filters)
-        filters.append(search_clause)
-        summary_filters.append(search_clause)
+        summary_filters.append(_transmission_search_clause(search.strip()))
 
+    filters = list(summary_filters)
     if status_filter:
         filters.append(ExternalTransmission.status == status_filter)
 
-    base_query = (
-        select(ExternalTransmission)
-        .join(ForensicBundle, ExternalTransmission.bundle_id == ForensicBundle.id)
-        .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
-        .join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id)
-        .outerjoin(ImpersonationIncident, ImpersonationIncident.formal_report_id == FormalReport.id)
-        .outerjoin(BusinessProfile, ImpersonationIncident.business_profile_id == BusinessProfile.id)
-    )
+    counts = await run_counters(db, _transmission_counters(summary_filters, status_filter))
 
-    total = int(
-        (
-            await db.execute(
-                select(func.count(func.distinct(ExternalTransmission.id)))
-                .select_from(ExternalTransmission)
-                .join(ForensicBundle, ExternalTransmission.bundle_id == ForensicBundle.id)
-                .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
-                .join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id)
-                .outerjoin(ImpersonationIncident, ImpersonationIncident.formal_report_id == FormalReport.id)
-                .outerjoin(BusinessProfile, ImpersonationIncident.business_profile_id == BusinessProfile.id)
-                .where(*filters)
-            )
-        ).scalar_one()
-        or 0
-    )
-
-    transmissions = (
-        await db.execute(
-            base_query.options(
-                selectinload(ExternalTransmission.bundle)
-                .selectinload(ForensicBundle.report)
-                .selectinload(FormalReport.analysis),
-                selectinload(ExternalTransmission.bundle)
-                .selectinload(ForensicBundle.report)
-                .selectinload(FormalReport.suspect_number),
-            )
-            .where(*filters)
-            .order_by(ExternalTransmission.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+    stmt = (
+        select(ExternalTransmission)
+        .options(
+            selectinload(ExternalTransmission.bundle)
+            .selectinload(ForensicBundle.report)
+            .selectinload(FormalReport.analysis),
+            selectinload(ExternalTransmission.bundle)
+            .selectinload(ForensicBundle.report)
+            .selectinload(FormalReport.suspect_number),
         )
-    ).scalars().unique().all()
-
-    status_counts = _status_map(TRANSMISSION_STATUS_ORDER)
-    for status, count in (
-        await db.execute(
-            select(ExternalTransmission.status, func.count(func.distinct(ExternalTransmission.id)))
-            .select_from(ExternalTransmission)
-            .join(ForensicBundle, ExternalTransmission.bundle_id == ForensicBundle.id)
-            .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
-            .join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id)
-            .outerjoin(ImpersonationIncident, ImpersonationIncident.formal_report_id == FormalReport.id)
-            .outerjoin(BusinessProfile, ImpersonationIncident.business_profile_id == BusinessProfile.id)
-            .where(*summary_filters)
-            .group_by(ExternalTransmission.status)
+        .where(*filters)
+        .order_by(ExternalTransmission.created_at.desc(), ExternalTransmission.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        position = decode_cursor(cursor, datetime_keys=("t",), int_keys=("i",))
+        stmt = stmt.where(
+            tuple_(ExternalTransmission.created_at, ExternalTransmission.id) < tuple_(position["t"], position["i"])
         )
-    ).all():
-        if status in status_counts:
-            status_counts[str(status)] = int(count or 0)
+    else:
+        stmt = stmt.offset(skip)
+    transmissions = (await db.execute(stmt)).scalars().all()
+    next_cursor = None
+    if len(transmissions) > limit:
+        transmissions = transmissions[:limit]
+        next_cursor = encode_cursor({"t": transmissions[-1].created_at, "i": transmissions[-1].id})
 
     items = []
     for transmission in transmissions:
@@ -488,16 +441,7 @@ async def list_admin_transmissions(
             )
         )
 
-    return AdminTransmissionListData(
-        items=items,
-        total=total,
-        pending_count=status_counts["PENDING"],
-        queued_count=status_counts["QUEUED"],
-        sent_count=status_counts["SENT"],
-        retrying_count=status_counts["RETRYING"],
-        failed_count=status_counts["FAILED"],
-        delivered_count=status_counts["DELIVERED"],
-    )
+    return AdminTransmissionListData(items=items, next_cursor=next_cursor, **counts)
 
 
 async def build_admin_csv_export(db: AsyncSession) -> tuple[str, bytes]:
@@ -19,6 +19,9 @@ BENIN_DEPARTMENTS: list[str] = [
     "Zou",
 ]
 
+# Departement non resolu (choix "unknown" ou numero sans prefixe connu).
+UNKNOWN_DEPARTMENT = "UNKNOWN"
+
 BENIN_DEPARTMENT_COORDS: dict[str, tuple[float, float]] = {
     "Alibori": (11.33, 2.78),
     "Atacora": (10.63, 1.65),
@@ -70,7 +73,7 @@ def normalize_department_name(value: str | None) -> str | None:
     normalized = _strip_accents(raw).lower().replace("-", " ").replace("_", " ")
     normalized = re.sub(r"\s+", " ", normalized).strip()
     if normalized == "unknown":
-        return "UNKNOWN"
+        return UNKNOWN_DEPARTMENT
 
     aliases = {
         "alibori": "Alibori",
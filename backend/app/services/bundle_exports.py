@@ -0,0 +1,614 @@
+"""Export en masse de dossiers forensiques.
+
+Un job `ForensicExportJob` selectionne les signalements formels d'un filtre
+(periode, categorie, numero suspect, campagne). Les bundles deja rendus dont
+le contenu n'a pas change sont reutilises tels quels ; les manquants passent
+par la file de rendu habituelle, en parallele sur un pool de processus. Le
+tout est assemble en flux dans une archive unique, fermee par un manifest
+agrege signe (HMAC-SHA256).
+
+Le worker rafraichit `claimed_at` tant qu'il execute le job ; un job RUNNING
+sans nouvelle depuis `FORENSIC_JOB_STALE_SECONDS` est remis en PENDING par
+`reclaim_stale_export_jobs`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import uuid
+import zipfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import redis.asyncio as redis
+from sqlalchemy import String, func, literal_column, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.models import CampaignAlert, ForensicBundle, ForensicExportJob, FormalReport, MessageAnalysis, SuspectNumber
+from app.services.bundle_jobs import (
+    ACTIVE_BUNDLE_JOB_STATUSES,
+    BUNDLE_JOB_READY,
+    bundle_job_status,
+    enqueue_bundle_job,
+    process_bundle_job,
+    spawn_process_pool,
+    wait_for_bundle_job,
+)
+from app.services.campaign_detector import CAMPAIGN_WINDOW_SECONDS
+from app.services.case_bundle import BUNDLE_CHUNK_BYTES, ZipStream, iter_source, write_chunks_atomically
+
+
+logger = logging.getLogger(__name__)
+FORENSIC_EXPORT_QUEUE = "forensic_export_queue"
+
+EXPORT_PENDING = "PENDING"
+EXPORT_RUNNING = "RUNNING"
+EXPORT_READY = "READY"
+EXPORT_FAILED = "FAILED"
+ACTIVE_EXPORT_STATUSES = frozenset({EXPORT_PENDING, EXPORT_RUNNING})
+
+EXPORT_MANIFEST_NAME = "manifest_export.json"
+EXPORT_SIGNATURE_NAME = "manifest_export.sig"
+EXPORT_SIGNATURE_ALGORITHM = "HMAC-SHA256"
+# Bundle rendu par le consommateur de bundles pendant l'export : on l'attend.
+FOREIGN_BUNDLE_JOB_TIMEOUT_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class BundleExportFilter:
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+    category: str | None = None
+    # Jamais le numero en clair : seul son hash est conserve sur le job.
+    suspect_phone_hash: str | None = None
+    campaign_id: uuid.UUID | None = None
+
+    def is_empty(self) -> bool:
+        return not any(
+            (self.date_from, self.date_to, self.category, self.suspect_phone_hash, self.campaign_id)
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "date_from": self.date_from.isoformat() if self.date_from else None,
+            "date_to": self.date_to.isoformat() if self.date_to else None,
+            "category": self.category,
+            "suspect_phone_hash": self.suspect_phone_hash,
+            "campaign_id": str(self.campaign_id) if self.campaign_id else None,
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, Any] | None) -> BundleExportFilter:
+        payload = payload or {}
+        return cls(
+            date_from=datetime.fromisoformat(payload["date_from"]) if payload.get("date_from") else None,
+            date_to=datetime.fromisoformat(payload["date_to"]) if payload.get("date_to") else None,
+            category=payload.get("category") or None,
+            suspect_phone_hash=payload.get("suspect_phone_hash") or None,
+            campaign_id=uuid.UUID(payload["campaign_id"]) if payload.get("campaign_id") else None,
+        )
+
+
+@dataclass
+class ExportItem:
+    report: FormalReport
+    bundle: ForensicBundle | None = None
+    # Job de rendu a executer quand aucun bundle reutilisable n'existe.
+    job_uuid: uuid.UUID | None = None
+    rendered: bool = False
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class ExportDossier:
+    archive_name: str
+    source: Path
+    expected_sha256: str
+    public_reference: str
+    report_uuid: str
+    bundle_uuid: str
+    snapshot_hash_sha256: str | None
+    rendered: bool
+
+
+def _signing_key() -> bytes:
+    return (settings.FORENSIC_EXPORT_SIGNING_KEY or settings.SECRET_KEY).encode("utf-8")
+
+
+def sign_export_manifest(manifest_bytes: bytes, key: bytes | None = None) -> str:
+    return hmac.new(key or _signing_key(), manifest_bytes, hashlib.sha256).hexdigest()
+
+
+def verify_export_manifest(manifest_bytes: bytes, signature: str, key: bytes | None = None) -> bool:
+    return hmac.compare_digest(sign_export_manifest(manifest_bytes, key), signature)
+
+
+class ExportArchiveWriter:
+    """Archive d'export : un ZIP par dossier, puis le manifest agrege et sa signature.
+
+    Les dossiers sont recopies par blocs sans recompression (ce sont deja des
+    ZIP) ; leur SHA-256 est recalcule au passage et compare a celui enregistre
+    sur le bundle.
+    """
+
+    def __init__(
+        self,
+        *,
+        export_uuid: uuid.UUID,
+        filters: dict[str, Any],
+        dossiers: list[ExportDossier],
+        failures: list[dict[str, Any]],
+        signing_key: bytes | None = None,
+        chunk_size: int = BUNDLE_CHUNK_BYTES,
+    ) -> None:
+        self.export_uuid = export_uuid
+        self.filters = filters
+        self.dossiers = dossiers
+        self.failures = failures
+        self.signing_key = signing_key
+        self.chunk_size = chunk_size
+        self.entry_hashes: dict[str, tuple[str, int]] = {}
+        self.archive_sha256: str | None = None
+        self.manifest_sha256: str | None = None
+
+    def _record(self, name: str, sha256: str, size_bytes: int) -> None:
+        self.entry_hashes[name] = (sha256, size_bytes)
+
+    def build_manifest(self) -> dict[str, Any]:
+        dossiers = []
+        for dossier in self.dossiers:
+            sha256, size_bytes = self.entry_hashes[dossier.archive_name]
+            dossiers.append(
+                {
+                    "file": dossier.archive_name,
+                    "sha256": sha256,
+                    "size_bytes": size_bytes,
+                    "verified": sha256 == dossier.expected_sha256,
+                    "public_reference": dossier.public_reference,
+                    "report_uuid": dossier.report_uuid,
+                    "bundle_uuid": dossier.bundle_uuid,
+                    "snapshot_hash_sha256": dossier.snapshot_hash_sha256,
+                    "rendered_for_export": dossier.rendered,
+                }
+            )
+        # Meme forme qu'une sortie `sha256sum` triee : recalculable sans outil maison.
+        listing = "".join(f"{item['sha256']}  {item['file']}\n" for item in sorted(dossiers, key=lambda item: item["file"]))
+        return {
+            "export_uuid": str(self.export_uuid),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "source": "BENIN CYBER SHIELD v3.0",
+            "filters": self.filters,
+            "dossier_count": len(dossiers),
+            "aggregate_sha256": hashlib.sha256(listing.encode("utf-8")).hexdigest(),
+            "dossiers": dossiers,
+            "failures": self.failures,
+        }
+
+    def _signature_bytes(self, manifest_bytes: bytes) -> bytes:
+        signature = {
+            "algorithm": EXPORT_SIGNATURE_ALGORITHM,
+            "signed_file": EXPORT_MANIFEST_NAME,
+            "manifest_sha256": hashlib.sha256(manifest_bytes).hexdigest(),
+            "signature": sign_export_manifest(manifest_bytes, self.signing_key),
+        }
+        return json.dumps(signature, indent=2).encode("utf-8")
+
+    def _entries(self) -> Iterator[tuple[str, Iterator[bytes], int]]:
+        for dossier in self.dossiers:
+            yield dossier.archive_name, iter_source(dossier.source, self.chunk_size), zipfile.ZIP_STORED
+        manifest_bytes = json.dumps(self.build_manifest(), ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+        self.manifest_sha256 = hashlib.sha256(manifest_bytes).hexdigest()
+        yield EXPORT_MANIFEST_NAME, iter([manifest_bytes]), zipfile.ZIP_DEFLATED
+        yield EXPORT_SIGNATURE_NAME, iter([self._signature_bytes(manifest_bytes)]), zipfile.ZIP_DEFLATED
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        stream = ZipStream(on_entry=self._record)
+        yield from stream.iter_chunks(self._entries())
+        self.archive_sha256 = stream.sha256
+
+    def write_to(self, target: Path) -> str:
+        write_chunks_atomically(self.iter_chunks(), target)
+        return str(self.archive_sha256)
+
+
+def build_pdf_process_pool() -> Executor | None:
+    """Pool de rendu PDF ; None (threads) si FORENSIC_EXPORT_PROCESSES <= 1."""
+    if settings.FORENSIC_EXPORT_PROCESSES <= 1:
+        return None
+    return spawn_process_pool(settings.FORENSIC_EXPORT_PROCESSES)
+
+
+async def create_export_job(
+    db: AsyncSession,
+    *,
+    filters: BundleExportFilter,
+    requested_by_user_id: int | None = None,
+) -> ForensicExportJob:
+    job = ForensicExportJob(
+        uuid=uuid.uuid4(),
+        requested_by_user_id=requested_by_user_id,
+        filters_json=filters.to_json(),
+        status=EXPORT_PENDING,
+    )
+    db.add(job)
+    await db.commit()
+    return job
+
+
+async def push_export_job(job_uuid: uuid.UUID) -> None:
+    redis_client = None
+    try:
+        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        await redis_client.rpush(FORENSIC_EXPORT_QUEUE, str(job_uuid))
+    except Exception:
+        logger.exception("Failed to queue forensic export job", extra={"export_uuid": str(job_uuid)})
+    finally:
+        if redis_client is not None:
+            try:
+                await redis_client.aclose()
+            except Exception:
+                pass
+
+
+async def pending_export_job_uuids(db: AsyncSession) -> list[uuid.UUID]:
+    stmt = select(ForensicExportJob.uuid).where(ForensicExportJob.status == EXPORT_PENDING).order_by(ForensicExportJob.id)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def reclaim_stale_export_jobs(
+    db: AsyncSession,
+    *,
+    stale_after: timedelta | None = None,
+    now: datetime | None = None,
+) -> list[uuid.UUID]:
+    """Remet en PENDING les exports RUNNING dont le worker ne rafraichit plus `claimed_at`."""
+    if stale_after is None:
+        stale_after = timedelta(seconds=settings.FORENSIC_JOB_STALE_SECONDS)
+    cutoff = (now or datetime.now(timezone.utc)) - stale_after
+    stmt = (
+        update(ForensicExportJob)
+        .where(
+            ForensicExportJob.status == EXPORT_RUNNING,
+            or_(ForensicExportJob.claimed_at.is_(None), ForensicExportJob.claimed_at < cutoff),
+        )
+        .values(
+            status=EXPORT_PENDING,
+            claimed_at=None,
+            total_items=0,
+            processed_items=0,
+            rendered_items=0,
+            failed_items=0,
+        )
+        .returning(ForensicExportJob.uuid)
+    )
+    job_uuids = list((await db.execute(stmt)).scalars().all())
+    await db.commit()
+    for job_uuid in job_uuids:
+        logger.warning("Reclaimed stale forensic export job", extra={"export_uuid": str(job_uuid)})
+    return job_uuids
+
+
+async def _heartbeat(session_factory: Callable[[], AsyncSession], job_id: int) -> None:
+    # Preuve de vie du worker : tant que l'export tourne, le job n'est pas repris.
+    interval = max(1.0, settings.FORENSIC_JOB_STALE_SECONDS / 3)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await db.execute(
+                    update(ForensicExportJob)
+                    .where(ForensicExportJob.id == job_id, ForensicExportJob.status == EXPORT_RUNNING)
+                    .values(claimed_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+        except Exception:
+            logger.warning("Forensic export heartbeat failed", extra={"export_job_id": job_id})
+
+
+def export_progress(job: ForensicExportJob) -> float:
+    if job.status == EXPORT_READY:
+        return 1.0
+    total = int(job.total_items or 0)
+    if total == 0:
+        return 0.0
+    return round(min(1.0, int(job.processed_items or 0) / total), 4)
+
+
+def _campaign_type_expression(dialect_name: str):
+    """`campaign_type_for_rules` en SQL : les deux premieres regles (ordre des
+    points de code, comme `sorted`) jointes par `_`, en majuscules."""
+    if dialect_name == "postgresql":
+        return literal_column(
+            """(SELECT upper(string_agg(first_rules.rule, '_' ORDER BY first_rules.rule COLLATE "C"))
+            FROM (SELECT value #>> '{}' AS rule FROM json_array_elements(analyses.matched_rules)
+                  WHERE json_typeof(value) = 'string' ORDER BY 1 COLLATE "C" LIMIT 2) AS first_rules)""",
+            String,
+        )
+    return literal_column(
+        """(SELECT upper(group_concat(first_rules.rule, '_'))
+        FROM (SELECT value AS rule FROM json_each(analyses.matched_rules)
+              WHERE type = 'text' ORDER BY value LIMIT 2) AS first_rules)""",
+        String,
+    )
+
+
+async def _export_report_ids_query(db: AsyncSession, filters: BundleExportFilter):
+    stmt = select(FormalReport.id).join(MessageAnalysis, FormalReport.analysis_id == MessageAnalysis.id)
+    if filters.date_from is not None:
+        stmt = stmt.where(FormalReport.created_at >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(FormalReport.created_at < filters.date_to)
+    if filters.category:
+        stmt = stmt.where(MessageAnalysis.primary_category == filters.category)
+    if filters.suspect_phone_hash:
+        stmt = stmt.join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id).where(
+            SuspectNumber.phone_hash == filters.suspect_phone_hash
+        )
+    if filters.campaign_id is not None:
+        campaign = await db.get(CampaignAlert, filters.campaign_id)
+        if campaign is None:
+            raise LookupError(f"Unknown campaign {filters.campaign_id}")
+        # Une campagne n'est pas liee aux signalements : elle regroupe ceux dont
+        # les regles correspondent, dans sa fenetre de detection.
+        stmt = stmt.where(
+            FormalReport.created_at >= campaign.first_seen - timedelta(seconds=CAMPAIGN_WINDOW_SECONDS),
+            FormalReport.created_at <= campaign.last_seen,
+            _campaign_type_expression(db.get_bind().dialect.name) == campaign.campaign_type,
+        )
+    return stmt
+
+
+async def select_export_reports(
+    db: AsyncSession,
+    filters: BundleExportFilter,
+    *,
+    max_items: int | None = None,
+) -> list[FormalReport]:
+    """Signalements du filtre, relations chargees.
+
+    Le filtre est compte en SQL d'abord : au-dela de `max_items`, ValueError
+    avant tout chargement du graphe ORM.
+    """
+    ids_stmt = await _export_report_ids_query(db, filters)
+    if max_items is not None:
+        matched = int(await db.scalar(select(func.count()).select_from(ids_stmt.subquery())) or 0)
+        if matched > max_items:
+            raise ValueError(f"Export matches {matched} reports (max {max_items}); narrow the filter")
+    report_ids = list((await db.execute(ids_stmt)).scalars().all())
+    if not report_ids:
+        return []
+    stmt = (
+        select(FormalReport)
+        .where(FormalReport.id.in_(report_ids))
+        .options(
+            selectinload(FormalReport.message),
+            selectinload(FormalReport.analysis),
+            selectinload(FormalReport.suspect_number),
+            selectinload(FormalReport.evidence_items),
+        )
+        .order_by(FormalReport.created_at, FormalReport.id)
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def _resolve_item(db: AsyncSession, report: FormalReport) -> ExportItem:
+    from app.api.v1.endpoints.reports import _build_formal_report_snapshot, _load_legacy_alert_with_evidences
+
+    item = ExportItem(report=report)
+    legacy_alert = await _load_legacy_alert_with_evidences(db, report.legacy_alert_uuid)
+    snapshot = await _build_formal_report_snapshot(db=db, formal_report=report, legacy_alert=legacy_alert)
+    # Bundle deja rendu pour ce contenu : reutilise sans nouveau rendu.
+    bundle, _ = await enqueue_bundle_job(db, formal_report=report, snapshot=snapshot)
+    if bundle_job_status(bundle) == BUNDLE_JOB_READY:
+        item.bundle = bundle
+    else:
+        item.job_uuid = bundle.uuid
+    return item
+
+
+async def _bump_progress(db: AsyncSession, job_id: int, *, rendered: int = 0, failed: int = 0) -> None:
+    await db.execute(
+        update(ForensicExportJob)
+        .where(ForensicExportJob.id == job_id)
+        .values(
+            processed_items=ForensicExportJob.processed_items + 1,
+            rendered_items=ForensicExportJob.rendered_items + rendered,
+            failed_items=ForensicExportJob.failed_items + failed,
+        )
+    )
+    await db.commit()
+
+
+async def _load_bundle(db: AsyncSession, bundle_uuid: uuid.UUID) -> ForensicBundle | None:
+    return (await db.execute(select(ForensicBundle).where(ForensicBundle.uuid == bundle_uuid))).scalars().first()
+
+
+async def _render_item(
+    item: ExportItem,
+    *,
+    job_id: int,
+    session_factory: Callable[[], AsyncSession],
+    pdf_executor: Executor | None,
+) -> None:
+    assert item.job_uuid is not None
+    async with session_factory() as db:
+        bundle = await process_bundle_job(db, item.job_uuid, pdf_executor=pdf_executor)
+        if bundle is None:
+            bundle = await _load_bundle(db, item.job_uuid)
+            if bundle is not None and bundle.status in ACTIVE_BUNDLE_JOB_STATUSES:
+                # Job deja pris par le consommateur de bundles : on attend son resultat.
+                async def _is_settled() -> bool:
+                    await db.refresh(bundle)
+                    await db.commit()
+                    return bundle.status not in ACTIVE_BUNDLE_JOB_STATUSES
+
+                await wait_for_bundle_job(
+                    item.job_uuid,
+                    timeout=FOREIGN_BUNDLE_JOB_TIMEOUT_SECONDS,
+                    is_settled=_is_settled,
+                )
+                await db.refresh(bundle)
+
+        if bundle is not None and bundle.global_hash and bundle.status not in ACTIVE_BUNDLE_JOB_STATUSES:
+            item.bundle = bundle
+            item.rendered = True
+        else:
+            item.error = (bundle.last_error if bundle is not None else None) or "Bundle rendering failed"
+        await _bump_progress(db, job_id, rendered=int(item.rendered), failed=int(item.error is not None))
+
+
+def _archive_name(report: FormalReport, bundle: ForensicBundle) -> str:
+    return f"dossiers/{report.public_reference}_{str(bundle.uuid)[:8]}.zip"
+
+
+async def process_export_job(
+    db: AsyncSession,
+    job_uuid: uuid.UUID,
+    *,
+    session_factory: Callable[[], AsyncSession],
+    pdf_executor: Executor | None = None,
+) -> ForensicExportJob | None:
+    """Execute un job PENDING ; retourne None si un autre worker l'a deja pris.
+
+    `session_factory` ouvre une session par rendu concurrent ; `db` sert a la
+    selection et au suivi du job.
+    """
+    claimed = await db.execute(
+        update(ForensicExportJob)
+        .where(ForensicExportJob.uuid == job_uuid, ForensicExportJob.status == EXPORT_PENDING)
+        .values(status=EXPORT_RUNNING, claimed_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    if claimed.rowcount == 0:
+        return None
+
+    job = (await db.execute(select(ForensicExportJob).where(ForensicExportJob.uuid == job_uuid))).scalars().one()
+    job_id = job.id
+    heartbeat = asyncio.create_task(_heartbeat(session_factory, job_id))
+    try:
+        return await _run_export_job(db, job, session_factory=session_factory, pdf_executor=pdf_executor)
+    finally:
+        heartbeat.cancel()
+        try:
+            await heartbeat
+        except asyncio.CancelledError:
+            pass
+
+
+async def _run_export_job(
+    db: AsyncSession,
+    job: ForensicExportJob,
+    *,
+    session_factory: Callable[[], AsyncSession],
+    pdf_executor: Executor | None,
+) -> ForensicExportJob | None:
+    from app.api.v1.endpoints.reports import _artifact_path, _resolve_artifact_path
+
+    job_id, job_uuid = job.id, job.uuid
+    try:
+        reports = await select_export_reports(
+            db, BundleExportFilter.from_json(job.filters_json), max_items=settings.FORENSIC_EXPORT_MAX_ITEMS
+        )
+        job.total_items = len(reports)
+        await db.commit()
+
+        items: list[ExportItem] = []
+        for report in reports:
+            try:
+                item = await _resolve_item(db, report)
+            except SQLAlchemyError:
+                raise
+            except Exception as exc:
+                # Donnees incompletes ou numero indechiffrable : le dossier est
+                # signale dans le manifest, l'export continue.
+                logger.exception("Unable to prepare report for export", extra={"report_uuid": str(report.uuid)})
+                item = ExportItem(report=report, error=str(getattr(exc, "detail", exc))[:500])
+            items.append(item)
+            if item.job_uuid is None:
+                await _bump_progress(db, job_id, failed=int(item.error is not None))
+
+        to_render = [item for item in items if item.job_uuid is not None and item.error is None]
+        semaphore = asyncio.Semaphore(max(1, settings.FORENSIC_EXPORT_PROCESSES))
+
+        async def _bounded(item: ExportItem) -> None:
+            async with semaphore:
+                try:
+                    await _render_item(item, job_id=job_id, session_factory=session_factory, pdf_executor=pdf_executor)
+                except Exception as exc:
+                    logger.exception("Export bundle rendering failed", extra={"bundle_uuid": str(item.job_uuid)})
+                    item.error = str(exc)[:500]
+                    async with session_factory() as progress_db:
+                        await _bump_progress(progress_db, job_id, failed=1)
+
+        await asyncio.gather(*(_bounded(item) for item in to_render))
+
+        dossiers: list[ExportDossier] = []
+        failures: list[dict[str, Any]] = []
+        seen_hashes: set[str] = set()
+        for item in items:
+            report = item.report
+            source = _resolve_artifact_path(item.bundle.zip_path) if item.bundle is not None else None
+            if item.bundle is None or source is None:
+                failures.append(
+                    {
+                        "public_reference": report.public_reference,
+                        "report_uuid": str(report.uuid),
+                        "error": item.error or "Bundle archive missing",
+                    }
+                )
+                continue
+            if item.bundle.global_hash in seen_hashes:
+                continue
+            seen_hashes.add(item.bundle.global_hash)
+            dossiers.append(
+                ExportDossier(
+                    archive_name=_archive_name(report, item.bundle),
+                    source=source,
+                    expected_sha256=item.bundle.global_hash,
+                    public_reference=report.public_reference,
+                    report_uuid=str(report.uuid),
+                    bundle_uuid=str(item.bundle.uuid),
+                    snapshot_hash_sha256=item.bundle.snapshot_hash_sha256,
+                    rendered=item.rendered,
+                )
+            )
+
+        writer = ExportArchiveWriter(
+            export_uuid=job_uuid,
+            filters=job.filters_json or {},
+            dossiers=dossiers,
+            failures=failures,
+        )
+        zip_relative_path = f"forensic_exports/{job_uuid}/export_{str(job_uuid)[:8]}.zip"
+        archive_hash = await asyncio.to_thread(writer.write_to, _artifact_path(zip_relative_path))
+    except Exception as exc:
+        logger.exception("Forensic export failed", extra={"export_uuid": str(job_uuid)})
+        await db.rollback()
+        await db.execute(
+            update(ForensicExportJob)
+            .where(ForensicExportJob.id == job_id)
+            .values(status=EXPORT_FAILED, last_error=str(exc)[:2000], completed_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+        return None
+
+    await db.refresh(job)
+    job.status = EXPORT_READY
+    job.zip_path = zip_relative_path
+    job.archive_hash = archive_hash
+    job.manifest_hash = writer.manifest_sha256
+    job.last_error = None
+    job.completed_at = datetime.now(timezone.utc)
+    await db.commit()
+    return job
@@ -0,0 +1,414 @@
+"""File d'attente du rendu des bundles forensiques.
+
+La ligne `ForensicBundle` sert elle-meme de job : PENDING -> RENDERING -> READY
+(FAILED si le rendu echoue, avec les transmissions qui l'attendaient). Le PDF et le ZIP sont produits par le worker
+`forensic_bundle_consumer`, jamais dans la requete HTTP qui demande le bundle.
+Un job RENDERING dont le worker a disparu (`claimed_at` trop ancien) est remis
+en PENDING par `reclaim_stale_bundle_jobs`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import redis.asyncio as redis
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.models import FormalReport, ForensicBundle, ImpersonationIncident
+from app.services.hashing import compute_snapshot_hash
+
+
+logger = logging.getLogger(__name__)
+FORENSIC_BUNDLE_QUEUE = "forensic_bundle_queue"
+BUNDLE_JOB_CHANNEL_PREFIX = "forensic_bundle_job:"
+
+BUNDLE_JOB_PENDING = "PENDING"
+BUNDLE_JOB_RENDERING = "RENDERING"
+BUNDLE_JOB_READY = "READY"
+BUNDLE_JOB_FAILED = "FAILED"
+ACTIVE_BUNDLE_JOB_STATUSES = frozenset({BUNDLE_JOB_PENDING, BUNDLE_JOB_RENDERING})
+
+
+def snapshot_content_hash(snapshot: dict[str, Any]) -> str:
+    """Hash du contenu du snapshot (cle de coalescence et de reutilisation).
+
+    Ignore l'horodatage de generation et le statut des preuves, que le rendu
+    lui-meme fait passer a SEALED : a contenu egal, le hash ne bouge pas.
+    """
+    content = {key: value for key, value in snapshot.items() if key != "generated_at"}
+    data = content.get("data")
+    if isinstance(data, dict) and data.get("evidences"):
+        content["data"] = {
+            **data,
+            "evidences": [
+                {key: value for key, value in evidence.items() if key != "status"} if isinstance(evidence, dict) else evidence
+                for evidence in data["evidences"]
+            ],
+        }
+    return compute_snapshot_hash(content)
+
+
+def apply_snapshot_columns(
+    bundle: ForensicBundle,
+    snapshot: dict[str, Any],
+    *,
+    formal_report: FormalReport,
+    snapshot_hash: str | None = None,
+) -> None:
+    """Recopie les champs chauds du snapshot dans les colonnes indexees du bundle.
+
+    `snapshot_hash` est fourni par le rendu, qui encode deja le snapshot : il
+    reste vide tant que le job est en attente.
+    """
+    alert = (snapshot.get("data") or {}).get("alert") or {}
+    risk_score = alert.get("risk_score")
+    bundle.alert_uuid = formal_report.legacy_alert_uuid or formal_report.uuid
+    bundle.public_reference = formal_report.public_reference
+    if snapshot_hash is not None:
+        bundle.snapshot_hash_sha256 = snapshot_hash
+    bundle.snapshot_version = snapshot.get("snapshot_version", "2.0")
+    bundle.risk_score = int(risk_score) if risk_score is not None else None
+    bundle.alert_url = alert.get("url")
+
+
+def bundle_job_status(bundle: ForensicBundle) -> str:
+    # Une fois rendu, le statut du bundle suit les transmissions (QUEUED, DELIVERED...) ;
+    # cote job seul compte la presence des artefacts.
+    if bundle.status in ACTIVE_BUNDLE_JOB_STATUSES:
+        return str(bundle.status)
+    if not bundle.global_hash:
+        return BUNDLE_JOB_FAILED
+    return BUNDLE_JOB_READY
+
+
+def _job_channel(bundle_uuid: uuid.UUID) -> str:
+    return f"{BUNDLE_JOB_CHANNEL_PREFIX}{bundle_uuid}"
+
+
+async def _find_active_job(db: AsyncSession, content_hash: str) -> ForensicBundle | None:
+    stmt = select(ForensicBundle).where(
+        ForensicBundle.content_hash == content_hash,
+        ForensicBundle.status.in_(ACTIVE_BUNDLE_JOB_STATUSES),
+    )
+    return (await db.execute(stmt)).scalars().first()
+
+
+def reusable_bundle(
+    bundles: list[ForensicBundle],
+    content_hash: str,
+    artifact_exists: Callable[[str | None], bool],
+) -> ForensicBundle | None:
+    """Bundle deja rendu pour ce contenu de snapshot, artefacts encore presents."""
+    for bundle in sorted(bundles, key=lambda item: item.id or 0, reverse=True):
+        if bundle.status in ACTIVE_BUNDLE_JOB_STATUSES or not bundle.global_hash:
+            continue
+        bundle_hash = bundle.content_hash
+        if bundle_hash is None:
+            # Bundles anterieurs a la file de rendu : hash recalcule depuis le manifest.
+            bundle_hash = snapshot_content_hash((bundle.manifest_json or {}).get("snapshot") or {})
+        if bundle_hash == content_hash and artifact_exists(bundle.zip_path):
+            return bundle
+    return None
+
+
+def _artifact_exists(path: str | None) -> bool:
+    from app.api.v1.endpoints.reports import _resolve_artifact_path
+
+    return _resolve_artifact_path(path) is not None
+
+
+async def _find_existing_bundle(
+    db: AsyncSession,
+    *,
+    report_id: int,
+    content_hash: str,
+    artifact_exists: Callable[[str | None], bool],
+) -> ForensicBundle | None:
+    """Bundle READY reutilisable du rapport, sinon job actif de meme contenu (une seule requete)."""
+    stmt = select(ForensicBundle).where(
+        or_(
+            and_(
+                ForensicBundle.content_hash == content_hash,
+                ForensicBundle.status.in_(ACTIVE_BUNDLE_JOB_STATUSES),
+            ),
+            and_(
+                ForensicBundle.report_id == report_id,
+                ForensicBundle.global_hash.is_not(None),
+                ForensicBundle.status.not_in(ACTIVE_BUNDLE_JOB_STATUSES),
+                or_(ForensicBundle.content_hash == content_hash, ForensicBundle.content_hash.is_(None)),
+            ),
+        )
+    )
+    bundles = list((await db.execute(stmt)).scalars().all())
+    ready = reusable_bundle(bundles, content_hash, artifact_exists)
+    if ready is not None:
+        return ready
+    return next((bundle for bundle in bundles if bundle.status in ACTIVE_BUNDLE_JOB_STATUSES), None)
+
+
+async def enqueue_bundle_job(
+    db: AsyncSession,
+    *,
+    formal_report: FormalReport,
+    snapshot: dict[str, Any],
+    commit: bool = True,
+    artifact_exists: Callable[[str | None], bool] | None = None,
+) -> tuple[ForensicBundle, bool]:
+    """Cree un job PENDING, sauf si le meme contenu est deja rendu ou en cours.
+
+    Retourne `(bundle, created)` : un bundle READY de meme hash de contenu (dont
+    le ZIP existe encore) est reutilise tel quel, sans nouveau rendu ; a defaut,
+    le job actif pour ce contenu. Le job cree n'est pousse sur la file qu'apres
+    commit (`push_bundle_job`), par l'appelant.
+    """
+    content_hash = snapshot_content_hash(snapshot)
+    existing = await _find_existing_bundle(
+        db,
+        report_id=formal_report.id,
+        content_hash=content_hash,
+        artifact_exists=artifact_exists or _artifact_exists,
+    )
+    if existing is not None:
+        return existing, False
+
+    bundle = ForensicBundle(
+        uuid=uuid.uuid4(),
+        report_id=formal_report.id,
+        content_hash=content_hash,
+        manifest_json={
+            "snapshot": snapshot,
+            "public_reference": formal_report.public_reference,
+            "legacy_alert_uuid": str(formal_report.legacy_alert_uuid) if formal_report.legacy_alert_uuid else None,
+        },
+        status=BUNDLE_JOB_PENDING,
+        transmissions=[],
+    )
+    apply_snapshot_columns(bundle, snapshot, formal_report=formal_report)
+    db.add(bundle)
+    if not commit:
+        await db.flush()
+        return bundle, True
+
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Double clic concurrent : l'index unique partiel a garde l'autre job.
+        await db.rollback()
+        existing = await _find_active_job(db, content_hash)
+        if existing is None:
+            raise
+        return existing, False
+    return bundle, True
+
+
+async def _redis_call(action: str, bundle_uuid: uuid.UUID, operation: Callable[[Any], Awaitable[Any]]) -> None:
+    redis_client = None
+    try:
+        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        await operation(redis_client)
+    except Exception:
+        logger.exception(f"Failed to {action}", extra={"bundle_uuid": str(bundle_uuid)})
+    finally:
+        if redis_client is not None:
+            try:
+                await redis_client.aclose()
+            except Exception:
+                pass
+
+
+async def push_bundle_job(bundle_uuid: uuid.UUID) -> None:
+    # A appeler apres le commit : le worker relit le job par UUID.
+    await _redis_call(
+        "queue forensic bundle job",
+        bundle_uuid,
+        lambda client: client.rpush(FORENSIC_BUNDLE_QUEUE, str(bundle_uuid)),
+    )
+
+
+async def publish_bundle_job_status(bundle_uuid: uuid.UUID, job_status: str) -> None:
+    await _redis_call(
+        "publish forensic bundle job status",
+        bundle_uuid,
+        lambda client: client.publish(_job_channel(bundle_uuid), job_status),
+    )
+
+
+async def wait_for_bundle_job(
+    bundle_uuid: uuid.UUID,
+    *,
+    timeout: float,
+    is_settled: Callable[[], Awaitable[bool]],
+) -> None:
+    """Attend (au plus `timeout` s) la notification de fin d'un job.
+
+    L'abonnement precede la verification `is_settled` pour ne pas manquer une
+    notification publiee entre les deux. Sans Redis, retourne aussitot.
+    """
+    redis_client = None
+    pubsub = None
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(_job_channel(bundle_uuid))
+        if await is_settled():
+            return
+        while (remaining := deadline - loop.time()) > 0:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is not None and message.get("data") not in ACTIVE_BUNDLE_JOB_STATUSES:
+                return
+    except Exception:
+        logger.warning("Bundle job notification unavailable", extra={"bundle_uuid": str(bundle_uuid)})
+    finally:
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+        if redis_client is not None:
+            try:
+                await redis_client.aclose()
+            except Exception:
+                pass
+
+
+async def pending_bundle_job_uuids(db: AsyncSession) -> list[uuid.UUID]:
+    stmt = select(ForensicBundle.uuid).where(ForensicBundle.status == BUNDLE_JOB_PENDING).order_by(ForensicBundle.id)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def reclaim_stale_bundle_jobs(
+    db: AsyncSession,
+    *,
+    stale_after: timedelta | None = None,
+    now: datetime | None = None,
+) -> list[uuid.UUID]:
+    """Remet en PENDING les jobs RENDERING dont le worker est mort en cours de rendu.
+
+    Un job pris avant `now - stale_after` (ou sans date de prise, anterieur a la
+    colonne) est considere abandonne. Retourne les UUID a repousser sur la file.
+    """
+    if stale_after is None:
+        stale_after = timedelta(seconds=settings.FORENSIC_JOB_STALE_SECONDS)
+    cutoff = (now or datetime.now(timezone.utc)) - stale_after
+    stmt = (
+        update(ForensicBundle)
+        .where(
+            ForensicBundle.status == BUNDLE_JOB_RENDERING,
+            or_(ForensicBundle.claimed_at.is_(None), ForensicBundle.claimed_at < cutoff),
+        )
+        .values(status=BUNDLE_JOB_PENDING, claimed_at=None)
+        .returning(ForensicBundle.uuid)
+    )
+    bundle_uuids = list((await db.execute(stmt)).scalars().all())
+    await db.commit()
+    for bundle_uuid in bundle_uuids:
+        logger.warning("Reclaimed stale forensic bundle job", extra={"bundle_uuid": str(bundle_uuid)})
+    return bundle_uuids
+
+
+async def _load_bundle_for_render(db: AsyncSession, bundle_uuid: uuid.UUID) -> ForensicBundle | None:
+    stmt = (
+        select(ForensicBundle)
+        .options(
+            selectinload(ForensicBundle.transmissions),
+            selectinload(ForensicBundle.report).selectinload(FormalReport.message),
+            selectinload(ForensicBundle.report).selectinload(FormalReport.analysis),
+            selectinload(ForensicBundle.report).selectinload(FormalReport.suspect_number),
+            selectinload(ForensicBundle.report).selectinload(FormalReport.evidence_items),
+            selectinload(ForensicBundle.report)
+            .selectinload(FormalReport.impersonation_incidents)
+            .selectinload(ImpersonationIncident.business_profile),
+        )
+        .where(ForensicBundle.uuid == bundle_uuid)
+    )
+    return (await db.execute(stmt)).scalars().first()
+
+
+def spawn_process_pool(max_workers: int) -> Executor:
+    # spawn : pas de fork d'un processus qui porte une boucle asyncio et des connexions.
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def build_bundle_pdf_executor() -> Executor | None:
+    """Pool de rendu PDF du consommateur ; None (thread) si FORENSIC_BUNDLE_PDF_PROCESSES <= 0."""
+    if settings.FORENSIC_BUNDLE_PDF_PROCESSES <= 0:
+        return None
+    return spawn_process_pool(settings.FORENSIC_BUNDLE_PDF_PROCESSES)
+
+
+async def process_bundle_job(
+    db: AsyncSession,
+    bundle_uuid: uuid.UUID,
+    *,
+    pdf_executor: Executor | None = None,
+) -> ForensicBundle | None:
+    """Rend un job PENDING ; retourne None si un autre worker l'a deja pris."""
+    from app.api.v1.endpoints.reports import _load_legacy_alert_with_evidences, _render_bundle_artifacts
+    from app.services.external_transmissions import (
+        fail_bundle_transmissions,
+        publish_transmission_status,
+        queue_external_transmissions,
+        refresh_transmission_payloads,
+    )
+
+    claimed = await db.execute(
+        update(ForensicBundle)
+        .where(ForensicBundle.uuid == bundle_uuid, ForensicBundle.status == BUNDLE_JOB_PENDING)
+        .values(status=BUNDLE_JOB_RENDERING, claimed_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    if claimed.rowcount == 0:
+        return None
+    await publish_bundle_job_status(bundle_uuid, BUNDLE_JOB_RENDERING)
+
+    bundle = await _load_bundle_for_render(db, bundle_uuid)
+    if bundle is None:
+        return None
+
+    try:
+        legacy_alert = await _load_legacy_alert_with_evidences(db, bundle.report.legacy_alert_uuid)
+        await _render_bundle_artifacts(
+            db,
+            bundle=bundle,
+            formal_report=bundle.report,
+            legacy_alert=legacy_alert,
+            pdf_executor=pdf_executor,
+        )
+    except Exception as exc:
+        logger.exception("Forensic bundle rendering failed", extra={"bundle_uuid": str(bundle_uuid)})
+        await db.rollback()
+        await db.execute(
+            update(ForensicBundle)
+            .where(ForensicBundle.uuid == bundle_uuid)
+            .values(status=BUNDLE_JOB_FAILED, last_error=str(exc)[:2000])
+        )
+        # Les transmissions differees jusqu'au rendu ne partiront jamais : echec visible.
+        failed_transmissions = await fail_bundle_transmissions(db, bundle_uuid, str(exc))
+        await db.commit()
+        await publish_bundle_job_status(bundle_uuid, BUNDLE_JOB_FAILED)
+        for transmission_uuid, target_type, attempts in failed_transmissions:
+            await publish_transmission_status(transmission_uuid, target_type, "FAILED", attempts)
+        return None
+
+    queued = [transmission for transmission in bundle.transmissions if transmission.status == "QUEUED"]
+    bundle.status = "QUEUED" if queued else BUNDLE_JOB_READY
+    bundle.last_error = None
+    refresh_transmission_payloads(bundle)
+    await db.commit()
+
+    await publish_bundle_job_status(bundle_uuid, BUNDLE_JOB_READY)
+    await queue_external_transmissions(queued)
+    return bundle
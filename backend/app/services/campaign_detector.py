@@ -9,6 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import CampaignAlert
+from app.services.write_events import TOPIC_CAMPAIGNS, publish_write_event
 
 
 CAMPAIGN_WINDOW_SECONDS = 7200
@@ -21,6 +22,10 @@ def _rules_hash(matched_rules: list[str]) -> str:
     return hashlib.md5(payload).hexdigest()[:8]
 
 
+def campaign_type_for_rules(matched_rules: list[str]) -> str:
+    return "_".join(sorted(matched_rules)[:2]).upper()
+
+
 async def register_signal(
     redis_client,
     incident_id: str,
@@ -39,7 +44,7 @@ async def register_signal(
     await redis_client.zadd(redis_key, {f"{incident_id}:{region or 'unknown'}": now_ts})
     await redis_client.expire(redis_key, CAMPAIGN_WINDOW_SECONDS + 60)
     count = int(await redis_client.zcard(redis_key))
-    campaign_type = "_".join(sorted(matched_rules)[:2]).upper()
+    campaign_type = campaign_type_for_rules(matched_rules)
 
     return {
         "campaign_detected": count >= CAMPAIGN_THRESHOLD,
@@ -53,7 +58,10 @@ async def create_or_update_campaign(
     db: AsyncSession,
     campaign_data: dict,
     dominant_region: str | None = None,
+    commit: bool = True,
 ) -> CampaignAlert | None:
+    # commit=False : l'appelant garde la main sur la transaction (flush seulement)
+    # et publie l'evenement d'ecriture apres son propre commit.
     if not campaign_data.get("campaign_detected"):
         return None
 
@@ -73,7 +81,12 @@ async def create_or_update_campaign(
         if dominant_region:
             existing.dominant_region = dominant_region
         db.add(existing)
-        await db.commit()
+        if commit:
+            delta = _campaign_delta(existing)
+            await db.commit()
+            await publish_write_event(TOPIC_CAMPAIGNS, kind="campaign.detected", data=delta)
+        else:
+            await db.flush()
         return existing
 
     new_campaign = CampaignAlert(
@@ -86,6 +99,18 @@ async def create_or_update_campaign(
         last_seen=datetime.utcnow(),
     )
     db.add(new_campaign)
-    await db.commit()
-    await db.refresh(new_campaign)
+    if commit:
+        await db.commit()
+        await db.refresh(new_campaign)
+        await publish_write_event(TOPIC_CAMPAIGNS, kind="campaign.detected", data=_campaign_delta(new_campaign))
+    else:
+        await db.flush()
     return new_campaign
+
+
+def _campaign_delta(campaign: CampaignAlert) -> dict:
+    return {
+        "type": campaign.campaign_type,
+        "count": int(campaign.incident_count or 0),
+        "region": campaign.dominant_region,
+    }
@@ -0,0 +1,56 @@
+"""Encodage JSON des snapshots : forme canonique (hash) et artefact lisible.
+
+La forme canonique est celle qui a scelle tous les bundles et rapports
+existants (cles triees, separateurs compacts, ASCII echappe). Elle reste
+produite par le module `json` standard : orjson n'echappe pas le non-ASCII et
+ecrit les exposants sans `+` (`1e16` contre `1e+16`), ce qui changerait les
+hashes deja scelles.
+
+orjson (optionnel) accelere en revanche l'artefact indente, dont les octets
+ne sont pas scelles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependance optionnelle
+    orjson = None
+
+PRETTY_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson else 0
+)
+
+
+@dataclass(frozen=True)
+class CanonicalDocument:
+    data: bytes
+    sha256: str
+
+
+def canonical_json_bytes(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True).encode("ascii")
+
+
+def canonical_encode(value: Any) -> CanonicalDocument:
+    """Serialise une seule fois et retourne les octets canoniques avec leur SHA-256."""
+    data = canonical_json_bytes(value)
+    return CanonicalDocument(data=data, sha256=hashlib.sha256(data).hexdigest())
+
+
+def pretty_json_bytes(value: Any, *, default: Callable[[Any], Any] | None = None) -> bytes:
+    """Artefact JSON lisible (UTF-8, indentation de 2), a partir du meme graphe d'objets."""
+    if orjson is not None:
+        try:
+            # Dates et dataclasses passent par `default`, comme avec le module standard.
+            return orjson.dumps(value, default=default, option=PRETTY_ORJSON_OPTIONS)
+        except TypeError:
+            # Cles non textuelles ou entiers hors 64 bits : le module standard sait faire.
+            pass
+    return json.dumps(value, ensure_ascii=False, indent=2, default=default).encode("utf-8")
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 from app.core.config import settings
 from app.models import Alert, Report
 from app.schemas.deletion import AlertDeletionData
+from app.services.evidence_store import get_evidence_store, purge_blobs, release_blobs
 from app.services.legacy_memory_bridge import delete_linked_memory_domain_reports
 
 
@@ -110,11 +111,10 @@ async def delete_alert_cascade(
     ).all()
     report_ids = [int(report_id) for report_id, _pdf_path in report_rows]
 
-    evidence_paths: set[str] = {
-        str(evidence.file_path).strip()
+    evidence_refs = [
+        (str(evidence.file_hash or ""), str(evidence.file_path or "").strip())
         for evidence in (alert.evidences or [])
-        if evidence.file_path
-    }
+    ]
     report_paths: set[str] = {
         str(pdf_path).strip()
         for _report_id, pdf_path in report_rows
@@ -129,14 +129,26 @@ async def delete_alert_cascade(
         alert_uuid=alert_uuid,
     )
 
+    released_blobs, untracked_hashes = await release_blobs(
+        db,
+        [file_hash for file_hash, _path in evidence_refs] + memory_domain_summary.evidence_hashes,
+    )
+    # Preuves anterieures au comptage de references : suppression directe du fichier.
+    evidence_paths: set[str] = {
+        path
+        for file_hash, path in evidence_refs
+        if path and (not file_hash or file_hash in untracked_hashes)
+    }
+
     if report_ids:
         await db.execute(delete(Report).where(Report.id.in_(report_ids)))
 
     await db.delete(alert)
     await db.commit()
 
-    deleted_files_count = 0
-    missing_files_count = 0
+    purged_blobs_count = await purge_blobs(get_evidence_store(), released_blobs)
+    deleted_files_count = purged_blobs_count
+    missing_files_count = len(released_blobs) - purged_blobs_count
 
     for relative_path in sorted(evidence_paths):
         deleted, found = _delete_file_from_candidates(_build_candidates(relative_path, report_file=False))
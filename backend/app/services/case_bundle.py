@@ -1,8 +1,188 @@
 import hashlib
 import io
-import json
+import os
+import tempfile
+import time
 import zipfile
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
+from pathlib import Path
+
+from app.services.canonical_json import pretty_json_bytes
+
+
+BUNDLE_CHUNK_BYTES = 64 * 1024
+
+
+class _ChunkSink(io.RawIOBase):
+    """Flux non seekable : zipfile y ecrit, on recupere les octets au fil de l'eau."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_source(source: Path | bytes, chunk_size: int) -> Iterator[bytes]:
+    if isinstance(source, bytes):
+        for offset in range(0, len(source), chunk_size):
+            yield source[offset : offset + chunk_size]
+        return
+    with open(source, "rb") as handle:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+
+
+class ZipStream:
+    """Archive ZIP produite a la volee a partir d'entrees lues par blocs.
+
+    `entries` est consomme paresseusement : une entree peut dependre des
+    hashes des precedentes (rappel `on_entry(nom, sha256, taille)`).
+    """
+
+    def __init__(self, *, on_entry: Callable[[str, str, int], None] | None = None) -> None:
+        self.on_entry = on_entry
+        self.sha256: str | None = None
+        self.size_bytes = 0
+
+    def iter_chunks(self, entries: Iterable[tuple[str, Iterable[bytes], int]]) -> Iterator[bytes]:
+        sink = _ChunkSink()
+        zip_digest = hashlib.sha256()
+        self.size_bytes = 0
+
+        def _drain() -> bytes:
+            data = sink.drain()
+            zip_digest.update(data)
+            self.size_bytes += len(data)
+            return data
+
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, chunks, compress_type in entries:
+                entry_digest = hashlib.sha256()
+                entry_size = 0
+                info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                info.compress_type = compress_type
+                with archive.open(info, "w") as entry:
+                    for chunk in chunks:
+                        entry_digest.update(chunk)
+                        entry_size += len(chunk)
+                        entry.write(chunk)
+                        if data := _drain():
+                            yield data
+                if self.on_entry is not None:
+                    self.on_entry(name, entry_digest.hexdigest(), entry_size)
+                if data := _drain():
+                    yield data
+        if data := _drain():
+            yield data
+        self.sha256 = zip_digest.hexdigest()
+
+
+def write_chunks_atomically(chunks: Iterable[bytes], target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, raw_temp = tempfile.mkstemp(dir=target.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+        os.replace(raw_temp, target)
+    except BaseException:
+        Path(raw_temp).unlink(missing_ok=True)
+        raise
+
+
+class CaseBundleWriter:
+    """Dossier ZIP (PDF, snapshot JSON, manifest) produit entree par entree.
+
+    Le PDF est lu par blocs depuis le disque et chaque entree est hachee
+    pendant son ecriture : la memoire reste constante quelle que soit la
+    taille du dossier. `entry_hashes`, `zip_sha256` et `size_bytes` sont
+    renseignes une fois le flux consomme.
+    """
+
+    def __init__(
+        self,
+        incident_data: dict,
+        report_data: dict,
+        pdf_source: Path | bytes,
+        *,
+        chunk_size: int = BUNDLE_CHUNK_BYTES,
+    ) -> None:
+        self.incident_data = incident_data
+        self.report_data = report_data
+        self.pdf_source = pdf_source
+        self.chunk_size = chunk_size
+        self.uuid_short = str(incident_data.get("id", "unknown"))[:8]
+        self.entry_hashes: dict[str, str] = {}
+        self.zip_sha256: str | None = None
+        self.size_bytes = 0
+
+    @property
+    def pdf_name(self) -> str:
+        return f"rapport_forensique_{self.uuid_short}.pdf"
+
+    @property
+    def snapshot_name(self) -> str:
+        return f"snapshot_{self.uuid_short}.json"
+
+    def _snapshot_bytes(self) -> bytes:
+        snapshot = {
+            "generated_at": datetime.utcnow().isoformat() + "Z",
+            "source": "BENIN CYBER SHIELD v3.0",
+            "incident": self.incident_data,
+            "report": self.report_data,
+        }
+        return pretty_json_bytes(snapshot, default=str)
+
+    def _manifest_bytes(self) -> bytes:
+        manifest_lines = [
+            "BENIN CYBER SHIELD - MANIFEST D'INTEGRITE",
+            f"Genere le : {datetime.utcnow().isoformat()}Z",
+            "Source    : BENIN CYBER SHIELD v3.0",
+            "",
+            self.pdf_name,
+            f"  SHA-256 : {self.entry_hashes[self.pdf_name]}",
+            "",
+            self.snapshot_name,
+            f"  SHA-256 : {self.entry_hashes[self.snapshot_name]}",
+            "",
+            "Ce manifest certifie l'integrite des fichiers ci-dessus.",
+            "Transmissible a bjCSIRT, OCRC, CRIET.",
+        ]
+        return "\n".join(manifest_lines).encode("utf-8")
+
+    def _entries(self) -> Iterator[tuple[str, Iterator[bytes]]]:
+        yield self.pdf_name, iter_source(self.pdf_source, self.chunk_size)
+        yield self.snapshot_name, iter_source(self._snapshot_bytes(), self.chunk_size)
+        # Construit apres les deux entrees precedentes, dont il reprend les hashes.
+        yield "manifest_integrite.txt", iter_source(self._manifest_bytes(), self.chunk_size)
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        def _record(name: str, sha256: str, _size: int) -> None:
+            self.entry_hashes[name] = sha256
+
+        stream = ZipStream(on_entry=_record)
+        yield from stream.iter_chunks(
+            (name, chunks, zipfile.ZIP_DEFLATED) for name, chunks in self._entries()
+        )
+        self.zip_sha256 = stream.sha256
+        self.size_bytes = stream.size_bytes
+
+    def write_to(self, target: Path) -> str:
+        """Ecrit le ZIP de facon atomique dans `target` ; retourne son SHA-256."""
+        write_chunks_atomically(self.iter_chunks(), target)
+        return str(self.zip_sha256)
 
 
 async def generate_case_bundle(
@@ -10,45 +190,4 @@ async def generate_case_bundle(
     report_data: dict,
     pdf_bytes: bytes,
 ) -> bytes:
-    uuid_short = str(incident_data.get("id", "unknown"))[:8]
-
-    pdf_hash = hashlib.sha256(pdf_bytes).hexdigest()
-
-    snapshot = {
-        "generated_at": datetime.utcnow().isoformat() + "Z",
-        "source": "BENIN CYBER SHIELD v3.0",
-        "incident": incident_data,
-        "report": report_data,
-    }
-    snapshot_bytes = json.dumps(
-        snapshot,
-        ensure_ascii=False,
-        indent=2,
-        default=str,
-    ).encode("utf-8")
-    snapshot_hash = hashlib.sha256(snapshot_bytes).hexdigest()
-
-    manifest_lines = [
-        "BENIN CYBER SHIELD - MANIFEST D'INTEGRITE",
-        f"Genere le : {datetime.utcnow().isoformat()}Z",
-        "Source    : BENIN CYBER SHIELD v3.0",
-        "",
-        f"rapport_forensique_{uuid_short}.pdf",
-        f"  SHA-256 : {pdf_hash}",
-        "",
-        f"snapshot_{uuid_short}.json",
-        f"  SHA-256 : {snapshot_hash}",
-        "",
-        "Ce manifest certifie l'integrite des fichiers ci-dessus.",
-        "Transmissible a bjCSIRT, OCRC, CRIET.",
-    ]
-    manifest_bytes = "\n".join(manifest_lines).encode("utf-8")
-
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as archive:
-        archive.writestr(f"rapport_forensique_{uuid_short}.pdf", pdf_bytes)
-        archive.writestr(f"snapshot_{uuid_short}.json", snapshot_bytes)
-        archive.writestr("manifest_integrite.txt", manifest_bytes)
-
-    zip_buffer.seek(0)
-    return zip_buffer.read()
+    return b"".join(CaseBundleWriter(incident_data, report_data, pdf_bytes).iter_chunks())
@@ -1,10 +1,8 @@
-import hashlib
 import json
 import logging
 import re
 import uuid
 from datetime import datetime, timezone
-from pathlib import Path
 
 import redis.asyncio as redis
 from fastapi import HTTPException, UploadFile, status
@@ -27,13 +25,23 @@ from app.models import (
     SuspectNumber,
 )
 from app.schemas.signal import IncidentReportData, IncidentReportRequest, VerifySignalData, VerifySignalRequest
-from app.services.benin_geography import resolve_department
+from app.services.benin_geography import UNKNOWN_DEPARTMENT, resolve_department
 from app.services.campaign_detector import create_or_update_campaign, register_signal
 from app.services.detection import score_signal
-from app.services.external_transmissions import schedule_external_transmissions_for_report
+from app.services.evidence_store import get_evidence_store, retain_blob, retain_staged_blob
+from app.services.external_transmissions import queue_external_transmissions, schedule_external_transmissions_for_report
 from app.services.hashing import compute_snapshot_hash
 from app.services.legacy_memory_bridge import build_legacy_analysis_payload
 from app.services.phone_privacy import derive_phone_hash, encrypt_phone, mask_phone, normalize_phone
+from app.services.search_text import build_report_search_text
+from app.services.upload_streaming import stage_upload
+from app.services.write_events import (
+    ADMIN_AND_OWNER,
+    TOPIC_CAMPAIGNS,
+    TOPIC_REPORTS,
+    TOPIC_TRANSMISSIONS,
+    publish_write_event,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -196,7 +204,6 @@ async def create_citizen_report(
         analysis.fon_alert = fon_alert
         db.add(message)
         db.add(analysis)
-        await db.flush()
     else:
         message = CitizenMessage(
             uuid=_new_uuid(),
@@ -209,12 +216,9 @@ async def create_citizen_report(
             department_source=department_source,
             submitted_url=(request.url or "").strip() or None,
         )
-        db.add(message)
-        await db.flush()
-
         analysis = MessageAnalysis(
             uuid=_new_uuid(),
-            message_id=message.id,
+            message=message,
             risk_score=max(0, min(risk_score, 100)),
             risk_level=risk_level,
             primary_category=_primary_category(categories_detected),
@@ -225,8 +229,8 @@ async def create_citizen_report(
             highlighted_spans=highlighted_spans,
             fon_alert=fon_alert,
         )
+        db.add(message)
         db.add(analysis)
-        await db.flush()
 
     public_reference = _generate_public_reference()
     custody_hash = compute_snapshot_hash(
@@ -248,8 +252,22 @@ async def create_citizen_report(
         reporter_user_id=owner_user_id,
         status="NEW",
         custody_hash=custody_hash,
+        department=resolved_department or UNKNOWN_DEPARTMENT,
+        legacy_alert_uuid=uuid.uuid4(),
+        search_text=build_report_search_text(
+            content=message.content,
+            submitted_url=message.submitted_url,
+            public_reference=public_reference,
+        ),
+        # Rapport reutilise tel quel jusqu'aux transmissions externes : colonnes et
+        # collections initialisees pour eviter tout rechargement ou lazy load.
+        updated_at=None,
+        evidence_items=[],
+        impersonation_incidents=[],
+        forensic_bundles=[],
     )
     db.add(formal_report)
+    # Un seul flush pour numero, message, analyse et rapport (ids via RETURNING).
     await db.flush()
 
     if screenshots:
@@ -274,15 +292,6 @@ async def create_citizen_report(
         phone=normalized_phone,
         owner_user_id=owner_user_id,
     )
-    formal_report.legacy_alert_uuid = legacy_alert.uuid if legacy_alert else None
-    db.add(formal_report)
-
-    queued_for_osint = await _enqueue_forensic_capture(
-        report_uuid=str(formal_report.uuid),
-        legacy_alert_uuid=str(legacy_alert.uuid) if legacy_alert else None,
-        source_type=f"CITIZEN_{request.channel}",
-        url=(request.url or "").strip() or None,
-    )
 
     campaign_detected = await _register_campaign_detection(
         db=db,
@@ -290,14 +299,41 @@ async def create_citizen_report(
         matched_rules=[str(rule) for rule in matched_rules],
     )
 
+    transmissions = await schedule_external_transmissions_for_report(
+        db=db,
+        report=formal_report,
+        campaign_detected=campaign_detected,
+        legacy_alert=legacy_alert,
+    )
+
+    # Unique commit du signalement ; les files Redis ne sont alimentees qu'ensuite
+    # pour que les workers ne lisent jamais une ligne non commitee.
     await db.commit()
-    await db.refresh(formal_report)
-    if formal_report.id is not None:
-        await schedule_external_transmissions_for_report(
-            db=db,
-            report_id=int(formal_report.id),
-            campaign_detected=campaign_detected,
-        )
+    await queue_external_transmissions(transmissions)
+    await publish_write_event(
+        TOPIC_REPORTS,
+        *((TOPIC_TRANSMISSIONS,) if transmissions else ()),
+        *((TOPIC_CAMPAIGNS,) if campaign_detected else ()),
+        kind="report.created",
+        data={
+            "reference": formal_report.public_reference,
+            "department": formal_report.department,
+            "category": analysis.primary_category,
+            "risk_score": analysis.risk_score,
+            "risk_level": analysis.risk_level,
+            "campaign_detected": campaign_detected,
+            "transmissions": len(transmissions),
+        },
+        audience=ADMIN_AND_OWNER,
+        owner_user_id=owner_user_id,
+    )
+
+    queued_for_osint = await _enqueue_forensic_capture(
+        report_uuid=str(formal_report.uuid),
+        legacy_alert_uuid=str(legacy_alert.uuid) if legacy_alert else None,
+        source_type=f"CITIZEN_{request.channel}",
+        url=(request.url or "").strip() or None,
+    )
 
     return IncidentReportData(
         alert_uuid=legacy_alert.uuid if legacy_alert else formal_report.uuid,
@@ -361,14 +397,12 @@ async def _upsert_suspect_number(db: AsyncSession, phone: str) -> SuspectNumber:
             report_count=1,
         )
         db.add(suspect_number)
-        await db.flush()
         return suspect_number
 
     suspect_number.report_count = int(suspect_number.report_count or 0) + 1
     suspect_number.phone_ciphertext = encrypt_phone(phone)
     suspect_number.last_seen = datetime.now(timezone.utc)
     db.add(suspect_number)
-    await db.flush()
     return suspect_number
 
 
@@ -383,9 +417,7 @@ async def _store_citizen_screenshots(
             detail=f"Maximum {MAX_SCREENSHOTS_PER_REPORT} screenshots allowed per report",
         )
 
-    base_dir = Path("evidences_store")
-    uploads_dir = base_dir / "citizen_uploads"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+    store = get_evidence_store()
 
     for idx, screenshot in enumerate(screenshots):
         content_type = (screenshot.content_type or "").lower()
@@ -395,31 +427,16 @@ async def _store_citizen_screenshots(
                 detail=f"Unsupported screenshot content type: {content_type or 'unknown'}",
             )
 
-        file_bytes = await screenshot.read()
-        if not file_bytes:
+        staged = await stage_upload(screenshot, base_dir=store.staging_root, max_bytes=MAX_SCREENSHOT_BYTES)
+        if staged is None:
             continue
-        if len(file_bytes) > MAX_SCREENSHOT_BYTES:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"Screenshot too large (max {MAX_SCREENSHOT_BYTES // (1024 * 1024)}MB per file)",
-            )
-
-        digest = hashlib.sha256(file_bytes).hexdigest()
-        duplicate = await db.scalar(select(EvidenceItem).where(EvidenceItem.file_hash == digest))
-        if duplicate is not None:
-            continue
-        ext = Path(screenshot.filename or "").suffix.lower()
-        if not ext:
-            ext = ".png" if content_type == "image/png" else ".jpg"
 
-        relative_path = f"citizen_uploads/{report.uuid}_{idx}_{digest[:12]}{ext}"
-        absolute_path = base_dir / relative_path
-        absolute_path.parent.mkdir(parents=True, exist_ok=True)
-        absolute_path.write_bytes(file_bytes)
+        digest = staged.sha256
+        # Contenu deja recu : nouvelle reference sur le meme blob, jamais d'upload ignore.
+        relative_path = await retain_staged_blob(db, store, staged, content_type=content_type)
 
-        db.add(
+        report.evidence_items.append(
             EvidenceItem(
-                report_id=report.id,
                 type="CITIZEN_SCREENSHOT",
                 file_path=relative_path,
                 file_hash=digest,
@@ -428,14 +445,12 @@ async def _store_citizen_screenshots(
                     "origin": "citizen_upload",
                     "filename": screenshot.filename,
                     "content_type": content_type,
-                    "size_bytes": len(file_bytes),
+                    "size_bytes": staged.size_bytes,
                     "sha256": digest,
                 },
             )
         )
 
-    await db.flush()
-
 
 async def _create_impersonation_incidents_if_needed(
     db: AsyncSession,
@@ -465,10 +480,9 @@ async def _create_impersonation_incidents_if_needed(
                         "phone_hash": derive_phone_hash(phone),
                     }
                 )
-                db.add(
+                report.impersonation_incidents.append(
                     ImpersonationIncident(
-                        business_profile_id=profile.id,
-                        formal_report_id=report.id,
+                        business_profile=profile,
                         status="NEW",
                         detection_reason=f"keyword_match:{normalized_keyword}",
                         custody_hash=custody_hash,
@@ -476,8 +490,6 @@ async def _create_impersonation_incidents_if_needed(
                 )
                 break
 
-    await db.flush()
-
 
 async def _mirror_legacy_alert(
     db: AsyncSession,
@@ -488,8 +500,10 @@ async def _mirror_legacy_alert(
     owner_user_id: int | None,
 ) -> Alert:
     categories, entities = build_legacy_analysis_payload(analysis)
+    # Graphe complet (alerte, analyse, preuves) ecrit au prochain flush, sans
+    # relire les preuves du rapport deja presentes en memoire.
     legacy_alert = Alert(
-        uuid=uuid.uuid4(),
+        uuid=report.legacy_alert_uuid,
         url=message.submitted_url or "citizen://text-signal",
         source_type=f"CITIZEN_{message.channel}",
         phone_number=phone,
@@ -499,33 +513,23 @@ async def _mirror_legacy_alert(
         risk_score=analysis.risk_score,
         status=report.status,
         analysis_note=f"[TRANSITION_REF={report.public_reference}] {message.content[:220]}",
-    )
-    db.add(legacy_alert)
-    await db.flush()
-    db.add(
-        AnalysisResult(
-            alert_id=legacy_alert.id,
-            categories=categories,
-            entities=entities,
-        )
-    )
-
-    evidence_items = (
-        await db.execute(select(EvidenceItem).where(EvidenceItem.report_id == report.id))
-    ).scalars().all()
-    for item in evidence_items:
-        db.add(
+        updated_at=None,
+        analysis_results=AnalysisResult(categories=categories, entities=entities),
+        evidences=[
             Evidence(
-                alert_id=legacy_alert.id,
                 type=item.type,
                 file_path=item.file_path,
                 file_hash=item.file_hash,
                 content_text_preview=item.content_text_preview,
                 metadata_json=item.metadata_json,
             )
-        )
-
-    await db.flush()
+            for item in report.evidence_items
+        ],
+    )
+    db.add(legacy_alert)
+    # La preuve miroir partage le blob de l'EvidenceItem : une reference de plus.
+    for item in report.evidence_items:
+        await retain_blob(db, sha256=item.file_hash, storage_key=item.file_path)
     return legacy_alert
 
 
@@ -548,7 +552,7 @@ async def _register_campaign_detection(
             region=None,
         )
         if campaign_data.get("campaign_detected"):
-            await create_or_update_campaign(db=db, campaign_data=campaign_data, dominant_region=None)
+            await create_or_update_campaign(db=db, campaign_data=campaign_data, dominant_region=None, commit=False)
             return True
         return False
     except Exception:
@@ -0,0 +1,330 @@
+"""Compteurs pre-agreges du tableau de bord national.
+
+Les rollups (jour x departement x categorie x tranche de risque x statut pour
+les signalements, jour x cible x statut pour les transmissions) sont recalcules par jour entier
+depuis les tables sources : chaque jour touche depuis le dernier passage
+(creation ou mise a jour d'une ligne) est efface puis regroupe a nouveau. Le
+recalcul est idempotent, donc rejouable, et la reconstruction complete n'est
+que le meme regroupement sans filtre.
+
+Le departement d'un signalement est celui persiste a sa creation. Les
+rapports anterieurs a cette colonne sont resolus par lots au debut de chaque
+passage (dechiffrement du numero), ce qui les marque comme modifies.
+
+Le compacteur tourne hors du chemin d'ecriture citoyen : aucune requete n'est
+ajoutee a la creation d'un signalement. Les suppressions (purge d'une alerte
+historique) ne laissent pas de trace datee et sont rattrapees par la
+reconstruction periodique.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import Date, and_, case, delete, func, insert, literal_column, or_, select, text, type_coerce, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    CitizenMessage,
+    ExternalTransmission,
+    FormalReport,
+    MessageAnalysis,
+    ReportDailyRollup,
+    RollupWatermark,
+    SuspectNumber,
+    TransmissionDailyRollup,
+)
+from app.services.benin_geography import UNKNOWN_DEPARTMENT, derive_department_from_phone, normalize_department_name
+from app.services.phone_privacy import decrypt_phone
+
+
+DASHBOARD_ROLLUP = "admin_dashboard"
+UNCLASSIFIED_CATEGORY = "non_classe"
+# Seuils de la carte nationale (filtres high / medium / low).
+HIGH_RISK_THRESHOLD = 65
+MEDIUM_RISK_THRESHOLD = 35
+DEPARTMENT_BATCH_SIZE = 500
+# Une transaction ouverte avant le passage precedent porte un horodatage
+# anterieur au filigrane : on recompte les jours touches avec cette marge.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+# Cle du verrou consultatif PostgreSQL : un seul compacteur a la fois.
+_COMPACTION_LOCK_KEY = 4_107_021
+
+
+def _inline(value: str | int):
+    # Constantes rendues en litteral : le meme texte SQL dans SELECT et GROUP BY.
+    return literal_column(f"'{value}'" if isinstance(value, str) else str(value))
+
+
+def risk_bucket_expression(score_column):
+    return case(
+        (score_column >= _inline(HIGH_RISK_THRESHOLD), _inline("high")),
+        (score_column >= _inline(MEDIUM_RISK_THRESHOLD), _inline("medium")),
+        else_=_inline("low"),
+    )
+
+
+@dataclass(frozen=True)
+class RollupRefresh:
+    full_rebuild: bool
+    report_days: int = 0
+    transmission_days: int = 0
+
+
+@dataclass
+class DashboardRollupTotals:
+    total_reports: int = 0
+    reports_by_status: dict[str, int] = field(default_factory=dict)
+    reports_by_day: dict[date, int] = field(default_factory=dict)
+    reports_by_category: dict[str, int] = field(default_factory=dict)
+    transmissions_by_status: dict[str, int] = field(default_factory=dict)
+
+
+def _day(column, dialect_name: str):
+    # Jour UTC, quel que soit le fuseau de la session PostgreSQL : les bornes de
+    # `_within_days` et les jours lus par le tableau de bord sont en UTC.
+    if dialect_name == "postgresql":
+        return func.date(func.timezone(_inline("UTC"), column))
+    # SQLite stocke l'horodatage UTC naif et renvoie date() sous forme de texte :
+    # le type Date le reconvertit.
+    return type_coerce(func.date(column), Date)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite restitue des datetimes naifs.
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _within_days(column, days: Iterable[date]):
+    # Intervalles sur la colonne brute plutot que date(colonne) IN (...) : l'index reste utilisable.
+    bounds = []
+    for day in sorted(set(days)):
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        bounds.append(and_(column >= start, column < start + timedelta(days=1)))
+    return or_(*bounds)
+
+
+def _report_rollup_select(dialect_name: str, days: Iterable[date] | None = None):
+    day = _day(FormalReport.created_at, dialect_name)
+    department = func.coalesce(FormalReport.department, _inline(UNKNOWN_DEPARTMENT))
+    category = func.coalesce(MessageAnalysis.primary_category, _inline(UNCLASSIFIED_CATEGORY))
+    risk_bucket = risk_bucket_expression(MessageAnalysis.risk_score)
+    stmt = (
+        select(
+            day,
+            department,
+            category,
+            risk_bucket,
+            FormalReport.status,
+            func.count(FormalReport.id),
+            func.max(FormalReport.created_at),
+        )
+        .select_from(FormalReport)
+        .join(MessageAnalysis, FormalReport.analysis_id == MessageAnalysis.id)
+        .group_by(day, department, category, risk_bucket, FormalReport.status)
+    )
+    if days is not None:
+        stmt = stmt.where(_within_days(FormalReport.created_at, days))
+    return stmt
+
+
+def _transmission_rollup_select(dialect_name: str, days: Iterable[date] | None = None):
+    day = _day(ExternalTransmission.created_at, dialect_name)
+    stmt = select(
+        day,
+        ExternalTransmission.target_type,
+        ExternalTransmission.status,
+        func.count(ExternalTransmission.id),
+    ).group_by(day, ExternalTransmission.target_type, ExternalTransmission.status)
+    if days is not None:
+        stmt = stmt.where(_within_days(ExternalTransmission.created_at, days))
+    return stmt
+
+
+async def _insert_report_rollups(db: AsyncSession, days: Iterable[date] | None = None) -> None:
+    await db.execute(
+        insert(ReportDailyRollup).from_select(
+            ["day", "department", "category", "risk_bucket", "status", "report_count", "latest_report_at"],
+            _report_rollup_select(db.get_bind().dialect.name, days),
+        )
+    )
+
+
+async def _insert_transmission_rollups(db: AsyncSession, days: Iterable[date] | None = None) -> None:
+    await db.execute(
+        insert(TransmissionDailyRollup).from_select(
+            ["day", "target_type", "status", "transmission_count"],
+            _transmission_rollup_select(db.get_bind().dialect.name, days),
+        )
+    )
+
+
+async def _touched_days(db: AsyncSession, model, since: datetime) -> list[date]:
+    day = _day(model.created_at, db.get_bind().dialect.name)
+    stmt = select(day).where(or_(model.created_at >= since, model.updated_at >= since)).distinct()
+    return sorted(value for value in (await db.execute(stmt)).scalars() if value is not None)
+
+
+def _stored_department(message_department: str | None, phone_ciphertext: str | None) -> str:
+    explicit_department = normalize_department_name(message_department)
+    if explicit_department:
+        return explicit_department
+    if not phone_ciphertext:
+        return UNKNOWN_DEPARTMENT
+    try:
+        phone = decrypt_phone(phone_ciphertext)
+    except Exception:
+        return UNKNOWN_DEPARTMENT
+    return derive_department_from_phone(phone) or UNKNOWN_DEPARTMENT
+
+
+async def resolve_pending_report_departments(db: AsyncSession, *, limit: int = DEPARTMENT_BATCH_SIZE) -> int:
+    """Persiste le departement d'un lot de rapports anterieurs a la colonne (sans commit)."""
+    rows = (
+        await db.execute(
+            select(FormalReport.id, CitizenMessage.department, SuspectNumber.phone_ciphertext)
+            .join(CitizenMessage, FormalReport.message_id == CitizenMessage.id)
+            .join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id)
+            .where(FormalReport.department.is_(None))
+            .order_by(FormalReport.id)
+            .limit(limit)
+        )
+    ).all()
+    report_ids_by_department: dict[str, list[int]] = {}
+    for report_id, message_department, phone_ciphertext in rows:
+        department = _stored_department(message_department, phone_ciphertext)
+        report_ids_by_department.setdefault(department, []).append(report_id)
+    # Une mise a jour par departement ; updated_at bouge, le jour sera recompte.
+    for department, report_ids in report_ids_by_department.items():
+        await db.execute(update(FormalReport).where(FormalReport.id.in_(report_ids)).values(department=department))
+    return len(rows)
+
+
+async def _try_compaction_lock(db: AsyncSession) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    # Libere au commit : deux processus API ne recomptent jamais les memes jours.
+    acquired = await db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _COMPACTION_LOCK_KEY})
+    return bool(acquired.scalar())
+
+
+async def _save_watermark(db: AsyncSession, now: datetime, *, rebuilt: bool) -> None:
+    watermark = await db.get(RollupWatermark, DASHBOARD_ROLLUP)
+    if watermark is None:
+        watermark = RollupWatermark(name=DASHBOARD_ROLLUP)
+        db.add(watermark)
+    watermark.refreshed_at = now
+    if rebuilt:
+        watermark.rebuilt_at = now
+
+
+async def refresh_rollup_days(
+    db: AsyncSession,
+    *,
+    report_days: Iterable[date] = (),
+    transmission_days: Iterable[date] = (),
+) -> None:
+    """Recompte les jours donnes depuis les tables sources (sans commit)."""
+    report_days = sorted(set(report_days))
+    transmission_days = sorted(set(transmission_days))
+    if report_days:
+        await db.execute(delete(ReportDailyRollup).where(ReportDailyRollup.day.in_(report_days)))
+        await _insert_report_rollups(db, report_days)
+    if transmission_days:
+        await db.execute(delete(TransmissionDailyRollup).where(TransmissionDailyRollup.day.in_(transmission_days)))
+        await _insert_transmission_rollups(db, transmission_days)
+
+
+async def rebuild_dashboard_rollups(db: AsyncSession, *, now: datetime | None = None) -> RollupRefresh | None:
+    """Reconstruit tous les rollups depuis les tables sources. None si un autre compacteur tourne."""
+    now = now or datetime.now(timezone.utc)
+    if not await _try_compaction_lock(db):
+        return None
+    await resolve_pending_report_departments(db)
+    await db.execute(delete(ReportDailyRollup))
+    await db.execute(delete(TransmissionDailyRollup))
+    await _insert_report_rollups(db)
+    await _insert_transmission_rollups(db)
+    await _save_watermark(db, now, rebuilt=True)
+    await db.commit()
+    return RollupRefresh(full_rebuild=True)
+
+
+async def compact_dashboard_rollups(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    rebuild_after: timedelta | None = None,
+) -> RollupRefresh | None:
+    """Passage incremental : recompte les jours touches depuis le filigrane.
+
+    Sans filigrane, ou si la derniere reconstruction date de plus de
+    `rebuild_after`, tout est reconstruit.
+    """
+    now = now or datetime.now(timezone.utc)
+    watermark = await db.get(RollupWatermark, DASHBOARD_ROLLUP)
+    rebuild_due = (
+        watermark is None
+        or (
+            rebuild_after is not None
+            and (watermark.rebuilt_at is None or _as_utc(watermark.rebuilt_at) <= now - rebuild_after)
+        )
+    )
+    if rebuild_due:
+        return await rebuild_dashboard_rollups(db, now=now)
+    if not await _try_compaction_lock(db):
+        return None
+
+    await resolve_pending_report_departments(db)
+    since = _as_utc(watermark.refreshed_at) - WATERMARK_OVERLAP
+    report_days = await _touched_days(db, FormalReport, since)
+    transmission_days = await _touched_days(db, ExternalTransmission, since)
+    await refresh_rollup_days(db, report_days=report_days, transmission_days=transmission_days)
+    await _save_watermark(db, now, rebuilt=False)
+    await db.commit()
+    return RollupRefresh(full_rebuild=False, report_days=len(report_days), transmission_days=len(transmission_days))
+
+
+async def read_dashboard_rollups(db: AsyncSession, *, since_day: date) -> DashboardRollupTotals:
+    """Lit les compteurs du tableau de bord en deux requetes.
+
+    Les jours anterieurs a `since_day` sont replies en un seul groupe : le
+    nombre de lignes lues ne depend pas de l'historique.
+    """
+    bucketed = select(
+        case((ReportDailyRollup.day >= since_day, ReportDailyRollup.day), else_=None).label("day"),
+        ReportDailyRollup.status,
+        ReportDailyRollup.category,
+        ReportDailyRollup.report_count,
+    ).subquery()
+    report_rows = (
+        await db.execute(
+            select(
+                type_coerce(bucketed.c.day, Date),
+                bucketed.c.status,
+                bucketed.c.category,
+                func.sum(bucketed.c.report_count),
+            ).group_by(bucketed.c.day, bucketed.c.status, bucketed.c.category)
+        )
+    ).all()
+    transmission_rows = (
+        await db.execute(
+            select(TransmissionDailyRollup.status, func.sum(TransmissionDailyRollup.transmission_count)).group_by(
+                TransmissionDailyRollup.status
+            )
+        )
+    ).all()
+
+    totals = DashboardRollupTotals()
+    for day, status, category, count in report_rows:
+        count = int(count or 0)
+        totals.total_reports += count
+        totals.reports_by_status[status] = totals.reports_by_status.get(status, 0) + count
+        totals.reports_by_category[category] = totals.reports_by_category.get(category, 0) + count
+        if day is not None:
+            totals.reports_by_day[day] = totals.reports_by_day.get(day, 0) + count
+    for status, count in transmission_rows:
+        totals.transmissions_by_status[status] = int(count or 0)
+    return totals
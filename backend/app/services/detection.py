@@ -277,14 +277,15 @@ SUSPICIOUS_LINK_PATTERNS = (
 PHONE_IN_TEXT_PATTERN = re.compile(r"(?:(?:\+229|00229)\s*)?\d(?:[\s.-]?\d){7,11}")
 
 
-def _normalize_text(value: str) -> str:
+def fold_text(value: str) -> str:
+    # Repli accents + casse, partage avec l'index de recherche des signalements.
     normalized = unicodedata.normalize("NFKD", value or "")
     return normalized.encode("ascii", "ignore").decode("ascii").lower()
 
 
 def _contains_any(text: str, keywords: tuple[str, ...]) -> bool:
-    normalized_text = _normalize_text(text)
-    return any(_normalize_text(keyword) in normalized_text for keyword in keywords)
+    normalized_text = fold_text(text)
+    return any(fold_text(keyword) in normalized_text for keyword in keywords)
 
 
 @lru_cache(maxsize=1)
@@ -312,7 +313,7 @@ def _load_rule_categories() -> tuple[dict, ...]:
 
 
 def _detect_rule_categories(text: str) -> list[dict]:
-    normalized_text = _normalize_text(text)
+    normalized_text = fold_text(text)
     detected: list[dict] = []
 
     for category in _load_rule_categories():
@@ -327,7 +328,7 @@ def _detect_rule_categories(text: str) -> list[dict]:
             term = str(keyword_obj.get("term") or "").strip()
             if not term:
                 continue
-            if _normalize_text(term) in normalized_text:
+            if fold_text(term) in normalized_text:
                 try:
                     category_score += int(keyword_obj.get("weight", 0))
                 except Exception:
@@ -384,7 +385,7 @@ def _match_urgency(text: str) -> bool:
     )
     if _contains_any(text, keywords):
         return True
-    return re.search(r"\b\d+\s*(minute|minutes|heure|heures|jour|jours)\b", _normalize_text(text)) is not None
+    return re.search(r"\b\d+\s*(minute|minutes|heure|heures|jour|jours)\b", fold_text(text)) is not None
 
 
 def _match_unexpected_gain(text: str) -> bool:
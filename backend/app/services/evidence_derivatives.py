@@ -0,0 +1,116 @@
+"""Rendus derives des preuves images, generes une seule fois par contenu.
+
+L'annexe du PDF forensique n'a besoin que d'une image a resolution
+d'impression : le derive est calcule a partir de l'original, range dans le
+stockage des preuves sous une cle derivee de son SHA-256, puis reutilise par
+tous les rendus suivants. L'original reste la reference de custody.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+from app.core.config import settings
+from app.services.evidence_store import EvidenceStore, LocalEvidenceBackend, derivative_key
+
+
+logger = logging.getLogger(__name__)
+CM_PER_INCH = 2.54
+# Cadre de l'annexe captures dans generate_forensic_pdf.
+ANNEX_FRAME_CM = (15.6, 9.2)
+PALETTE_MAX_COLORS = 256
+
+
+def print_variant() -> str:
+    return f"print-{int(settings.PDF_IMAGE_DPI)}dpi"
+
+
+def derivative_variants() -> tuple[str, ...]:
+    return (print_variant(),)
+
+
+def _print_box_px() -> tuple[int, int]:
+    dpi = int(settings.PDF_IMAGE_DPI)
+    return tuple(max(1, round(size_cm / CM_PER_INCH * dpi)) for size_cm in ANNEX_FRAME_CM)
+
+
+def render_print_rendition(original: bytes) -> bytes:
+    """Reduit l'image au cadre de l'annexe et la recompresse.
+
+    Les captures a palette reduite (texte, interface) restent en PNG pour
+    garder un texte net ; les photos et pages riches passent en JPEG.
+    """
+    with PILImage.open(io.BytesIO(original)) as source:
+        image = source.convert("RGBA") if source.mode in {"P", "LA"} else source.copy()
+    image.thumbnail(_print_box_px(), PILImage.Resampling.LANCZOS)
+
+    if image.mode in {"RGBA", "LA"}:
+        flattened = PILImage.new("RGB", image.size, "white")
+        flattened.paste(image, mask=image.getchannel("A"))
+        image = flattened
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    output = io.BytesIO()
+    if image.getcolors(PALETTE_MAX_COLORS) is not None:
+        image.quantize(colors=PALETTE_MAX_COLORS).save(output, format="PNG", optimize=True)
+    else:
+        image.save(output, format="JPEG", quality=int(settings.PDF_IMAGE_JPEG_QUALITY), optimize=True, progressive=True)
+    return output.getvalue()
+
+
+def _read_original(store: EvidenceStore, source_key: str) -> bytes | None:
+    local = store.local_path(source_key)
+    if local is not None:
+        return local.read_bytes()
+    if isinstance(store.backend, LocalEvidenceBackend) or Path(source_key).is_absolute():
+        return None
+    try:
+        return store.backend.read_bytes(source_key)
+    except Exception:
+        return None
+
+
+def print_rendition(store: EvidenceStore, *, source_key: str, sha256: str | None = None) -> str | io.BytesIO | None:
+    """Source ReportLab du derive d'impression (chemin local ou octets).
+
+    Synchrone : appele depuis le rendu PDF, qui tourne deja hors de la boucle
+    d'evenements. Retourne None si l'original est introuvable ou illisible.
+    """
+    original: bytes | None = None
+    if not sha256:
+        original = _read_original(store, source_key)
+        if original is None:
+            return None
+        sha256 = hashlib.sha256(original).hexdigest()
+
+    key = derivative_key(sha256, print_variant())
+    cached = store.local_path(key)
+    if cached is not None:
+        return str(cached)
+    if not isinstance(store.backend, LocalEvidenceBackend):
+        try:
+            return io.BytesIO(store.backend.read_bytes(key))
+        except Exception:
+            pass
+
+    if original is None:
+        original = _read_original(store, source_key)
+    if original is None:
+        return None
+    try:
+        rendition = render_print_rendition(original)
+    except Exception:
+        logger.warning("Unable to build print rendition", extra={"source_key": source_key})
+        return None
+
+    try:
+        store.backend.put_bytes(key, rendition)
+    except Exception:
+        logger.exception("Unable to cache print rendition", extra={"storage_key": key})
+    return io.BytesIO(rendition)
@@ -0,0 +1,360 @@
+"""Stockage des preuves adresse par contenu.
+
+Chaque fichier est range sous `sha256/<aa>/<bb>/<sha256>` : un meme contenu
+n'est ecrit qu'une fois, quel que soit le nombre de signalements qui le
+citent. La table `evidence_blobs` compte les references ; un blob n'est
+supprime du stockage que lorsque sa derniere reference disparait.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import EvidenceBlob
+from app.services.upload_streaming import StagedUpload, discard_staged_upload
+
+
+logger = logging.getLogger(__name__)
+BLOB_KEY_PREFIX = "sha256"
+DERIVATIVE_KEY_PREFIX = "derivatives"
+
+
+def blob_key(sha256: str) -> str:
+    digest = sha256.lower()
+    return f"{BLOB_KEY_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+def derivative_key(sha256: str, variant: str) -> str:
+    """Cle d'un rendu derive (ex. impression) d'un original identifie par son hash."""
+    digest = sha256.lower()
+    return f"{DERIVATIVE_KEY_PREFIX}/{variant}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+def _validate_key(key: str) -> PurePosixPath:
+    relative = PurePosixPath(str(key).strip())
+    if not relative.parts or relative.is_absolute() or ".." in relative.parts:
+        raise ValueError(f"Invalid evidence storage key: {key!r}")
+    return relative
+
+
+class EvidenceStoreBackend(ABC):
+    """Operations bloquantes d'un backend ; `EvidenceStore` les deporte dans un thread."""
+
+    name: str
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def put_file(self, key: str, source: Path) -> None:
+        """Publie `source` sous `key` puis supprime `source` (idempotent si `key` existe)."""
+
+    @abstractmethod
+    def put_bytes(self, key: str, payload: bytes) -> None: ...
+
+    @abstractmethod
+    def read_bytes(self, key: str) -> bytes: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> bool: ...
+
+    def local_path(self, key: str) -> Path | None:
+        return None
+
+
+class LocalEvidenceBackend(EvidenceStoreBackend):
+    name = "local"
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def path_for(self, key: str) -> Path:
+        return self.root.joinpath(*_validate_key(key).parts)
+
+    def exists(self, key: str) -> bool:
+        return self.path_for(key).is_file()
+
+    def put_file(self, key: str, source: Path) -> None:
+        target = self.path_for(key)
+        if target.exists():
+            source.unlink(missing_ok=True)
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+
+    def put_bytes(self, key: str, payload: bytes) -> None:
+        target = self.path_for(key)
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, raw_temp = tempfile.mkstemp(dir=target.parent, suffix=".part")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(raw_temp, target)
+
+    def read_bytes(self, key: str) -> bytes:
+        return self.path_for(key).read_bytes()
+
+    def delete(self, key: str) -> bool:
+        try:
+            self.path_for(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def local_path(self, key: str) -> Path | None:
+        target = self.path_for(key)
+        return target if target.is_file() else None
+
+
+class S3EvidenceBackend(EvidenceStoreBackend):
+    """Backend S3 compatible (AWS, MinIO...) ; `client` suit l'API boto3."""
+
+    name = "s3"
+
+    def __init__(self, client: Any, bucket: str, prefix: str = "") -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def object_key(self, key: str) -> str:
+        relative = str(_validate_key(key))
+        return f"{self.prefix}/{relative}" if self.prefix else relative
+
+    @staticmethod
+    def _is_not_found(exc: Exception) -> bool:
+        error = getattr(exc, "response", {}).get("Error", {})
+        return str(error.get("Code")) in {"404", "NoSuchKey", "NotFound"}
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+            return True
+        except Exception as exc:
+            if self._is_not_found(exc):
+                return False
+            raise
+
+    def put_file(self, key: str, source: Path) -> None:
+        if not self.exists(key):
+            self.client.upload_file(str(source), self.bucket, self.object_key(key))
+        source.unlink(missing_ok=True)
+
+    def put_bytes(self, key: str, payload: bytes) -> None:
+        if not self.exists(key):
+            self.client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=payload)
+
+    def read_bytes(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))
+        return response["Body"].read()
+
+    def delete(self, key: str) -> bool:
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+        return True
+
+
+class EvidenceStore:
+    def __init__(self, backend: EvidenceStoreBackend, staging_root: Path) -> None:
+        self.backend = backend
+        # Zone de transit des uploads ; sur le meme disque que le backend local
+        # pour que la publication soit un simple rename atomique.
+        self.staging_root = staging_root
+
+    async def put_staged(self, staged: StagedUpload) -> str:
+        key = blob_key(staged.sha256)
+        await asyncio.to_thread(self.backend.put_file, key, staged.temp_path)
+        return key
+
+    async def put_bytes(self, sha256: str, payload: bytes) -> str:
+        key = blob_key(sha256)
+        await asyncio.to_thread(self.backend.put_bytes, key, payload)
+        return key
+
+    async def read_bytes(self, key: str) -> bytes:
+        return await asyncio.to_thread(self.backend.read_bytes, key)
+
+    async def delete(self, key: str) -> bool:
+        return await asyncio.to_thread(self.backend.delete, key)
+
+    def local_path(self, key: str | None) -> Path | None:
+        """Chemin disque d'une cle (une seule verification), None si absent ou distant."""
+        if not key:
+            return None
+        raw = Path(str(key).strip())
+        if raw.is_absolute():
+            return raw if raw.is_file() else None
+        try:
+            return self.backend.local_path(str(key))
+        except ValueError:
+            return None
+
+
+def _build_s3_client() -> Any:
+    try:
+        import boto3
+    except ImportError as exc:  # pragma: no cover - dependance optionnelle
+        raise RuntimeError("EVIDENCE_STORE_BACKEND=s3 requires the boto3 package") from exc
+
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.EVIDENCE_S3_ENDPOINT_URL,
+        region_name=settings.EVIDENCE_S3_REGION,
+        aws_access_key_id=settings.EVIDENCE_S3_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.EVIDENCE_S3_SECRET_ACCESS_KEY,
+    )
+
+
+def build_evidence_store() -> EvidenceStore:
+    root = Path(settings.EVIDENCE_STORE_ROOT)
+    backend_name = settings.EVIDENCE_STORE_BACKEND.strip().lower()
+    if backend_name == "s3":
+        if not settings.EVIDENCE_S3_BUCKET:
+            raise RuntimeError("EVIDENCE_S3_BUCKET must be set when EVIDENCE_STORE_BACKEND=s3")
+        backend: EvidenceStoreBackend = S3EvidenceBackend(
+            _build_s3_client(),
+            settings.EVIDENCE_S3_BUCKET,
+            settings.EVIDENCE_S3_PREFIX,
+        )
+    elif backend_name == "local":
+        backend = LocalEvidenceBackend(root)
+    else:
+        raise RuntimeError(f"Unknown EVIDENCE_STORE_BACKEND: {settings.EVIDENCE_STORE_BACKEND}")
+    return EvidenceStore(backend, staging_root=root)
+
+
+@lru_cache(maxsize=1)
+def get_evidence_store() -> EvidenceStore:
+    return build_evidence_store()
+
+
+async def retain_blob(
+    db: AsyncSession,
+    *,
+    sha256: str,
+    storage_key: str,
+    size_bytes: int | None = None,
+    content_type: str | None = None,
+) -> str:
+    """Ajoute une reference au blob `sha256` (cree la ligne au premier usage).
+
+    Une seule instruction INSERT ... ON CONFLICT : deux premiers uploads
+    concurrents du meme contenu ne se heurtent pas sur la cle primaire.
+    Retourne la cle de stockage du blob, celle deja enregistree s'il existait.
+    """
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(EvidenceBlob).values(
+        sha256=sha256,
+        storage_key=storage_key,
+        size_bytes=size_bytes,
+        content_type=content_type,
+        ref_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[EvidenceBlob.sha256],
+        set_={
+            "ref_count": EvidenceBlob.ref_count + 1,
+            "content_type": func.coalesce(EvidenceBlob.content_type, stmt.excluded.content_type),
+        },
+    ).returning(EvidenceBlob.storage_key)
+    return str((await db.execute(stmt)).scalar_one())
+
+
+async def retain_staged_blob(
+    db: AsyncSession,
+    store: EvidenceStore,
+    staged: StagedUpload,
+    *,
+    content_type: str | None = None,
+) -> str:
+    """Reference un upload en transit et retourne la cle a inscrire sur la preuve.
+
+    Un contenu deja connu n'est pas reecrit : la preuve pointe vers le blob
+    existant, y compris sous une ancienne cle par chemin.
+    """
+    storage_key = await retain_blob(
+        db,
+        sha256=staged.sha256,
+        storage_key=blob_key(staged.sha256),
+        size_bytes=staged.size_bytes,
+        content_type=content_type,
+    )
+    if storage_key == blob_key(staged.sha256):
+        await store.put_staged(staged)
+    else:
+        await discard_staged_upload(staged)
+    return storage_key
+
+
+@dataclass(frozen=True)
+class OrphanBlob:
+    """Blob sans reference : fichier et derives a purger apres commit."""
+
+    sha256: str
+    storage_key: str
+
+
+async def release_blobs(db: AsyncSession, sha256s: Iterable[str]) -> tuple[list[OrphanBlob], set[str]]:
+    """Retire une reference par hash fourni.
+
+    Retourne les blobs devenus orphelins (lignes supprimees, a purger du
+    stockage apres commit) et les hashes inconnus de `evidence_blobs`.
+    """
+    counts: dict[str, int] = {}
+    for sha256 in sha256s:
+        if sha256:
+            counts[sha256] = counts.get(sha256, 0) + 1
+    if not counts:
+        return [], set()
+
+    # populate_existing : ref_count a pu bouger via retain_blob (SQL direct) dans cette session.
+    stmt = (
+        select(EvidenceBlob)
+        .where(EvidenceBlob.sha256.in_(list(counts)))
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    rows = (await db.execute(stmt)).scalars().all()
+    known = {row.sha256 for row in rows}
+    orphans: list[OrphanBlob] = []
+    for row in rows:
+        row.ref_count = max(0, int(row.ref_count or 0) - counts[row.sha256])
+        if row.ref_count == 0:
+            orphans.append(OrphanBlob(sha256=row.sha256, storage_key=row.storage_key))
+            await db.delete(row)
+    return orphans, set(counts) - known
+
+
+async def purge_blobs(store: EvidenceStore, orphans: Iterable[OrphanBlob]) -> int:
+    deleted = 0
+    for orphan in orphans:
+        try:
+            if await store.delete(orphan.storage_key):
+                deleted += 1
+        except Exception:
+            logger.exception("Unable to delete evidence blob", extra={"storage_key": orphan.storage_key})
+            continue
+        await _purge_derivatives(store, orphan.sha256)
+    return deleted
+
+
+async def _purge_derivatives(store: EvidenceStore, sha256: str) -> None:
+    # Derives indexes par hash : valable aussi pour les blobs a cle par chemin.
+    from app.services.evidence_derivatives import derivative_variants
+
+    for variant in derivative_variants():
+        try:
+            await store.delete(derivative_key(sha256, variant))
+        except Exception:
+            logger.exception("Unable to delete evidence derivative", extra={"sha256": sha256, "variant": variant})
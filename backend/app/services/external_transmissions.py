@@ -8,14 +8,16 @@ from typing import Any
 
 import httpx
 import redis.asyncio as redis
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.risk_levels import risk_level_from_score
-from app.models import ExternalTransmission, FormalReport, ForensicBundle, ImpersonationIncident
+from app.models import Alert, ExternalTransmission, FormalReport, ForensicBundle
+from app.services.bundle_jobs import ACTIVE_BUNDLE_JOB_STATUSES, push_bundle_job
 from app.services.phone_privacy import decrypt_phone, mask_phone
+from app.services.write_events import TOPIC_TRANSMISSIONS, publish_write_event
 
 
 logger = logging.getLogger(__name__)
@@ -136,23 +138,11 @@ def _build_payload_for_target(
     }
 
 
-async def _load_report_for_transmission(db: AsyncSession, report_id: int) -> FormalReport | None:
-    stmt = (
-        select(FormalReport)
-        .options(
-            selectinload(FormalReport.message),
-            selectinload(FormalReport.analysis),
-            selectinload(FormalReport.suspect_number),
-            selectinload(FormalReport.evidence_items),
-            selectinload(FormalReport.forensic_bundles).selectinload(ForensicBundle.transmissions),
-            selectinload(FormalReport.impersonation_incidents).selectinload(ImpersonationIncident.business_profile),
-        )
-        .where(FormalReport.id == report_id)
-    )
-    return (await db.execute(stmt)).scalars().first()
-
-
-async def _ensure_forensic_bundle(db: AsyncSession, report: FormalReport) -> ForensicBundle:
+async def _ensure_forensic_bundle(
+    db: AsyncSession,
+    report: FormalReport,
+    legacy_alert: Alert | None = None,
+) -> ForensicBundle:
     if report.forensic_bundles:
         return sorted(
             report.forensic_bundles,
@@ -160,10 +150,18 @@ async def _ensure_forensic_bundle(db: AsyncSession, report: FormalReport) -> For
             reverse=True,
         )[0]
 
-    from app.api.v1.endpoints.reports import _create_bundle_for_formal_report, _load_legacy_alert_with_evidences
+    from app.api.v1.endpoints.reports import _enqueue_bundle_for_formal_report, _load_legacy_alert_with_evidences
 
-    legacy_alert = await _load_legacy_alert_with_evidences(db, report.legacy_alert_uuid)
-    return await _create_bundle_for_formal_report(db=db, formal_report=report, legacy_alert=legacy_alert)
+    if legacy_alert is None:
+        legacy_alert = await _load_legacy_alert_with_evidences(db, report.legacy_alert_uuid)
+    # Le rendu est differe au worker de bundles ; les transmissions partent une fois le bundle pret.
+    bundle, _created = await _enqueue_bundle_for_formal_report(
+        db=db,
+        formal_report=report,
+        legacy_alert=legacy_alert,
+        commit=False,
+    )
+    return bundle
 
 
 async def _push_transmission_to_queue(transmission_uuid: uuid.UUID) -> None:
@@ -184,11 +182,18 @@ async def _push_transmission_to_queue(transmission_uuid: uuid.UUID) -> None:
 async def schedule_external_transmissions_for_report(
     *,
     db: AsyncSession,
-    report_id: int,
+    report: FormalReport,
     campaign_detected: bool = False,
+    legacy_alert: Alert | None = None,
 ) -> list[ExternalTransmission]:
-    report = await _load_report_for_transmission(db, report_id)
-    if report is None or report.suspect_number is None:
+    """Ajoute les transmissions externes du signalement a la transaction courante.
+
+    Le signalement doit avoir ses relations deja chargees (message, analyse,
+    numero, preuves, bundles et leurs transmissions, usurpations) : c'est le cas
+    de l'objet construit par `create_citizen_report`. Rien n'est commite ici ;
+    l'appelant commite puis appelle `queue_external_transmissions`.
+    """
+    if report.suspect_number is None:
         return []
 
     reasons = compute_transmission_reasons(
@@ -198,21 +203,14 @@ async def schedule_external_transmissions_for_report(
     if not reasons:
         return []
 
-    bundle = await _ensure_forensic_bundle(db, report)
-    existing_targets_stmt = select(ExternalTransmission.target_type).where(
-        ExternalTransmission.bundle_id == bundle.id,
-    )
-    existing_targets = {
-        str(target_type)
-        for target_type in (await db.execute(existing_targets_stmt)).scalars().all()
-        if target_type
-    }
+    bundle = await _ensure_forensic_bundle(db, report, legacy_alert)
+    existing_targets = {str(item.target_type) for item in bundle.transmissions if item.target_type}
     created: list[ExternalTransmission] = []
     for target_type in ("ANSSI_OCRC", "OPERATORS"):
         if target_type in existing_targets:
             continue
         transmission = ExternalTransmission(
-            bundle_id=bundle.id,
+            uuid=uuid.uuid4(),
             target_type=target_type,
             target_endpoint=_target_endpoint(target_type),
             payload_json=_build_payload_for_target(
@@ -224,21 +222,81 @@ async def schedule_external_transmissions_for_report(
             status="QUEUED",
             attempts=0,
         )
-        db.add(transmission)
+        bundle.transmissions.append(transmission)
         created.append(transmission)
 
     if not created:
         return []
 
-    bundle.status = "QUEUED"
+    if bundle.status not in ACTIVE_BUNDLE_JOB_STATUSES:
+        bundle.status = "QUEUED"
     db.add(bundle)
-    await db.commit()
-    for transmission in created:
-        await db.refresh(transmission)
-        await _push_transmission_to_queue(transmission.uuid)
     return created
 
 
+def refresh_transmission_payloads(bundle: ForensicBundle) -> None:
+    """Reporte dans les payloads en attente l'etat du bundle une fois rendu."""
+    artifacts = {
+        "pdf_path": bundle.pdf_path,
+        "json_path": bundle.json_path,
+        "zip_path": bundle.zip_path,
+    }
+    for transmission in bundle.transmissions or []:
+        if transmission.status not in {"PENDING", "QUEUED"}:
+            continue
+        payload = dict(transmission.payload_json or {})
+        payload["bundle_hash_sha256"] = bundle.global_hash
+        payload["bundle_status"] = "QUEUED"
+        payload["artifacts"] = artifacts
+        if "manifest" in payload:
+            payload["manifest"] = bundle.manifest_json or {}
+        transmission.payload_json = payload
+
+
+async def queue_external_transmissions(transmissions: list[ExternalTransmission]) -> None:
+    # A appeler apres le commit : le consumer relit la transmission par UUID.
+    # Bundle pas encore rendu : on pousse le job, le worker enverra les transmissions.
+    pending_bundles: dict[uuid.UUID, None] = {}
+    for transmission in transmissions:
+        bundle = transmission.bundle
+        if bundle is not None and bundle.status in ACTIVE_BUNDLE_JOB_STATUSES:
+            pending_bundles[bundle.uuid] = None
+            continue
+        await _push_transmission_to_queue(transmission.uuid)
+    for bundle_uuid in pending_bundles:
+        await push_bundle_job(bundle_uuid)
+
+
+async def fail_bundle_transmissions(db: AsyncSession, bundle_uuid: uuid.UUID, error: str) -> list[tuple[uuid.UUID, str, int]]:
+    """Passe en FAILED les transmissions en attente d'un bundle dont le rendu a echoue.
+
+    Sans artefacts il n'y a rien a envoyer : elles apparaissent en echec dans la
+    console au lieu de rester QUEUED. Le commit et `publish_transmission_status`
+    reviennent a l'appelant.
+    """
+    bundle_id = select(ForensicBundle.id).where(ForensicBundle.uuid == bundle_uuid).scalar_subquery()
+    stmt = (
+        update(ExternalTransmission)
+        .where(ExternalTransmission.bundle_id == bundle_id, ExternalTransmission.status.in_(("PENDING", "QUEUED")))
+        .values(status="FAILED", next_retry_at=None, last_error=f"Bundle rendering failed: {error}"[:2000])
+        .returning(ExternalTransmission.uuid, ExternalTransmission.target_type, ExternalTransmission.attempts)
+    )
+    return [(row.uuid, row.target_type, int(row.attempts or 0)) for row in (await db.execute(stmt)).all()]
+
+
+async def publish_transmission_status(transmission_uuid: uuid.UUID, target_type: str, status: str, attempts: int) -> None:
+    await publish_write_event(
+        TOPIC_TRANSMISSIONS,
+        kind="transmission.status",
+        data={
+            "uuid": str(transmission_uuid),
+            "target": target_type,
+            "status": status,
+            "attempts": attempts,
+        },
+    )
+
+
 async def send_external_payload(
     *,
     target_url: str,
@@ -332,6 +390,9 @@ async def process_external_transmission(
 
     await db.commit()
     await db.refresh(transmission)
+    await publish_transmission_status(
+        transmission.uuid, transmission.target_type, transmission.status, int(transmission.attempts or 0)
+    )
     return transmission
 
 
@@ -1,30 +1,32 @@
 import json
 import logging
 import uuid
-import hashlib
 from datetime import datetime, timezone
-from pathlib import Path
 import re
 
 from fastapi import HTTPException, UploadFile, status
 import redis.asyncio as redis
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
-from app.models import Alert, CitizenMessage, Evidence, EvidenceItem, FormalReport, MessageAnalysis, SuspectNumber
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models import Alert, Evidence, EvidenceItem, FormalReport, MessageAnalysis, SuspectNumber
 from app.schemas.citizen_incident import (
     CitizenIncidentAttachment,
     CitizenIncidentDetailData,
     CitizenIncidentListData,
     CitizenIncidentListItem,
-    CitizenIncidentStats,
     RelatedCitizenIncident,
 )
 from app.schemas.signal import IncidentReportRequest, IncidentReportData
 from app.services.detection import score_signal
+from app.services.evidence_store import get_evidence_store, retain_staged_blob
 from app.services.phone_privacy import decrypt_phone, derive_phone_hash, mask_phone, normalize_phone
+from app.services.search_text import search_like_pattern
+from app.services.suspect_number_stats import EMPTY_SUSPECT_NUMBER_STATS, load_suspect_number_stats
+from app.services.upload_streaming import stage_upload
 
 
 logger = logging.getLogger(__name__)
@@ -32,6 +34,8 @@ PHONE_PATTERN = re.compile(r"^\+?[0-9]{8,15}$")
 MAX_SCREENSHOTS_PER_REPORT = 5
 MAX_SCREENSHOT_BYTES = 5 * 1024 * 1024
 SUPPORTED_IMAGE_CONTENT_TYPES = {"image/png", "image/jpeg", "image/jpg", "image/webp"}
+INCIDENT_COUNT_EXACT = "exact"
+INCIDENT_COUNT_ESTIMATE = "estimate"
 
 
 def _normalize_signal_channel(value: str | None) -> str:
@@ -206,12 +210,7 @@ async def _store_citizen_screenshots(
             detail=f"Maximum {MAX_SCREENSHOTS_PER_REPORT} screenshots allowed per report",
         )
 
-    base_dir = Path("evidences_store")
-    uploads_dir = base_dir / "citizen_uploads"
-    uploads_dir.mkdir(parents=True, exist_ok=True)
-
-    duplicates_skipped = 0
-    inserted = 0
+    store = get_evidence_store()
 
     for idx, screenshot in enumerate(screenshots):
         content_type = (screenshot.content_type or "").lower()
@@ -221,30 +220,13 @@ async def _store_citizen_screenshots(
                 detail=f"Unsupported screenshot content type: {content_type or 'unknown'}",
             )
 
-        file_bytes = await screenshot.read()
-        if not file_bytes:
-            continue
-        if len(file_bytes) > MAX_SCREENSHOT_BYTES:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"Screenshot too large (max {MAX_SCREENSHOT_BYTES // (1024 * 1024)}MB per file)",
-            )
-
-        digest = hashlib.sha256(file_bytes).hexdigest()
-        duplicate_stmt = select(Evidence).where(Evidence.file_hash == digest)
-        duplicate = (await db.execute(duplicate_stmt)).scalars().first()
-        if duplicate:
-            duplicates_skipped += 1
+        staged = await stage_upload(screenshot, base_dir=store.staging_root, max_bytes=MAX_SCREENSHOT_BYTES)
+        if staged is None:
             continue
 
-        ext = Path(screenshot.filename or "").suffix.lower()
-        if not ext:
-            ext = ".png" if content_type == "image/png" else ".jpg"
-
-        relative_path = f"citizen_uploads/{alert.uuid}_{idx}_{digest[:12]}{ext}"
-        absolute_path = base_dir / relative_path
-        absolute_path.parent.mkdir(parents=True, exist_ok=True)
-        absolute_path.write_bytes(file_bytes)
+        digest = staged.sha256
+        # Contenu deja recu : nouvelle reference sur le meme blob, jamais d'upload ignore.
+        relative_path = await retain_staged_blob(db, store, staged, content_type=content_type)
 
         evidence = Evidence(
             alert_id=alert.id,
@@ -256,28 +238,21 @@ async def _store_citizen_screenshots(
                 "origin": "citizen_upload",
                 "filename": screenshot.filename,
                 "content_type": content_type,
-                "size_bytes": len(file_bytes),
+                "size_bytes": staged.size_bytes,
                 "sha256": digest,
             },
         )
         db.add(evidence)
-        inserted += 1
 
-    if duplicates_skipped > 0:
-        suffix = f"\n[CITIZEN_UPLOAD] duplicate_images_skipped={duplicates_skipped}"
-        alert.analysis_note = f"{(alert.analysis_note or '').strip()}{suffix}".strip()
-        db.add(alert)
 
 
-
-async def list_citizen_incidents(
-    db: AsyncSession,
-    skip: int,
-    limit: int,
-    status_filter: str | None = None,
-    search: str | None = None,
-    owner_user_id: int | None = None,
-) -> CitizenIncidentListData:
+def _citizen_incident_filters(
+    *,
+    status_filter: str | None,
+    search: str | None,
+    owner_user_id: int | None,
+) -> list:
+    # Filtres sur formal_reports seul : ni jointure ni ILIKE a joker initial.
     filters = []
     if owner_user_id is not None:
         filters.append(FormalReport.reporter_user_id == owner_user_id)
@@ -285,27 +260,70 @@ async def list_citizen_incidents(
         filters.append(FormalReport.status == status_filter)
     if search and search.strip():
         search_value = search.strip()
-        term = f"%{search_value}%"
-        search_filters = [
-            CitizenMessage.content.ilike(term),
-            CitizenMessage.submitted_url.ilike(term),
-        ]
+        search_filters = []
+        pattern = search_like_pattern(search_value)
+        if pattern is not None:
+            search_filters.append(FormalReport.search_text.like(pattern, escape="\\"))
         try:
             normalized_phone = normalize_phone(search_value)
             if PHONE_PATTERN.match(normalized_phone):
-                search_filters.append(SuspectNumber.phone_hash == derive_phone_hash(normalized_phone))
+                search_filters.append(
+                    FormalReport.suspect_number_id.in_(
+                        select(SuspectNumber.id).where(SuspectNumber.phone_hash == derive_phone_hash(normalized_phone))
+                    )
+                )
         except Exception:
             logger.debug("Unable to normalize search phone for citizen incident list", exc_info=True)
-        filters.append(or_(*search_filters))
+        if search_filters:
+            filters.append(or_(*search_filters))
+    return filters
+
+
+async def _estimate_row_count(db: AsyncSession, filters: list) -> int | None:
+    """Nombre de lignes estime par le planificateur PostgreSQL (EXPLAIN, sans execution)."""
+    connection = await db.connection()
+    if connection.dialect.name != "postgresql":
+        return None
+    compiled = select(FormalReport.id).where(*filters).compile(dialect=connection.dialect)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    try:
+        # Savepoint : un EXPLAIN en echec n'interrompt pas la transaction, le
+        # comptage exact de repli peut encore s'executer.
+        async with db.begin_nested():
+            plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", parameters)).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:
+        logger.warning("Unable to estimate citizen incident count, falling back to exact count", exc_info=True)
+        return None
 
-    total_stmt = (
-        select(func.count(FormalReport.id))
-        .select_from(FormalReport)
-        .join(CitizenMessage, FormalReport.message_id == CitizenMessage.id)
-        .join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id)
-        .where(*filters)
-    )
-    total = int((await db.execute(total_stmt)).scalar_one() or 0)
+
+async def list_citizen_incidents(
+    db: AsyncSession,
+    skip: int,
+    limit: int,
+    status_filter: str | None = None,
+    search: str | None = None,
+    owner_user_id: int | None = None,
+    cursor: str | None = None,
+    count_mode: str = INCIDENT_COUNT_EXACT,
+) -> CitizenIncidentListData:
+    """Liste paginee des incidents citoyens (tri created_at desc, id desc).
+
+    Avec `cursor` (valeur `next_cursor` d'une page precedente), la page part
+    apres le dernier element servi et `skip` est ignore. `count_mode="estimate"`
+    remplace le comptage exact par l'estimation du planificateur.
+    """
+    filters = _citizen_incident_filters(status_filter=status_filter, search=search, owner_user_id=owner_user_id)
+
+    total = None
+    if count_mode == INCIDENT_COUNT_ESTIMATE:
+        total = await _estimate_row_count(db, filters)
+    total_is_estimate = total is not None
+    if total is None:
+        total_stmt = select(func.count(FormalReport.id)).where(*filters)
+        total = int((await db.execute(total_stmt)).scalar_one() or 0)
 
     stmt = (
         select(FormalReport)
@@ -315,28 +333,27 @@ async def list_citizen_incidents(
             selectinload(FormalReport.suspect_number),
             selectinload(FormalReport.evidence_items),
         )
-        .join(CitizenMessage, FormalReport.message_id == CitizenMessage.id)
-        .join(SuspectNumber, FormalReport.suspect_number_id == SuspectNumber.id)
         .where(*filters)
-        .order_by(FormalReport.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+        .order_by(FormalReport.created_at.desc(), FormalReport.id.desc())
+        .limit(limit + 1)
     )
+    if cursor:
+        position = decode_cursor(cursor, datetime_keys=("t",), int_keys=("i",))
+        stmt = stmt.where(tuple_(FormalReport.created_at, FormalReport.id) < tuple_(position["t"], position["i"]))
+        skip = 0
+    else:
+        stmt = stmt.offset(skip)
     reports = (await db.execute(stmt)).scalars().all()
-
-    report_counts_by_number: dict[int, int] = {}
-    suspect_number_ids = sorted({report.suspect_number_id for report in reports if report.suspect_number_id is not None})
-    if suspect_number_ids:
-        count_stmt = (
-            select(FormalReport.suspect_number_id, func.count(FormalReport.id))
-            .where(FormalReport.suspect_number_id.in_(suspect_number_ids))
-            .group_by(FormalReport.suspect_number_id)
-        )
-        if owner_user_id is not None:
-            count_stmt = count_stmt.where(FormalReport.reporter_user_id == owner_user_id)
-        for suspect_number_id, count in (await db.execute(count_stmt)).all():
-            if suspect_number_id is not None:
-                report_counts_by_number[int(suspect_number_id)] = int(count)
+    next_cursor = None
+    if len(reports) > limit:
+        reports = reports[:limit]
+        next_cursor = encode_cursor({"t": reports[-1].created_at, "i": reports[-1].id})
+
+    stats_by_number = await load_suspect_number_stats(
+        db,
+        (report.suspect_number_id for report in reports),
+        owner_user_id=owner_user_id,
+    )
 
     attachment_count_map: dict[uuid.UUID, int] = {}
     legacy_alert_uuid_map = {
@@ -371,6 +388,7 @@ async def list_citizen_incidents(
                 phone_number = decrypt_phone(suspect_number.phone_ciphertext)
             except Exception:
                 logger.warning("Unable to decrypt suspect phone for incident list", extra={"report_uuid": str(report.uuid)})
+        number_stats = stats_by_number.get(int(report.suspect_number_id or 0))
         items.append(
             CitizenIncidentListItem(
                 alert_uuid=incident_uuid,
@@ -381,11 +399,21 @@ async def list_citizen_incidents(
                 status=report.status,
                 created_at=report.created_at,
                 attachments_count=attachment_count_map.get(report.legacy_alert_uuid, 0) if report.legacy_alert_uuid else len(report.evidence_items or []),
-                reports_for_phone=report_counts_by_number.get(int(report.suspect_number_id or 0), 1),
+                reports_for_phone=number_stats.reports_for_phone if number_stats else 1,
+                open_reports_for_phone=number_stats.open_reports_for_phone if number_stats else 0,
+                confirmed_reports_for_phone=number_stats.confirmed_reports_for_phone if number_stats else 0,
+                blocked_reports_for_phone=number_stats.blocked_reports_for_phone if number_stats else 0,
             )
         )
 
-    return CitizenIncidentListData(items=items, total=total, skip=skip, limit=limit)
+    return CitizenIncidentListData(
+        items=items,
+        total=total,
+        skip=skip,
+        limit=limit,
+        next_cursor=next_cursor,
+        total_is_estimate=total_is_estimate,
+    )
 
 
 async def get_citizen_incident_detail(
@@ -435,10 +463,7 @@ async def get_citizen_incident_detail(
             )
         ]
 
-        reports_for_phone = 0
-        open_reports_for_phone = 0
-        confirmed_reports_for_phone = 0
-        blocked_reports_for_phone = 0
+        stats = EMPTY_SUSPECT_NUMBER_STATS
         related_incidents: list[RelatedCitizenIncident] = []
 
         try:
@@ -448,48 +473,8 @@ async def get_citizen_incident_detail(
                     select(SuspectNumber).where(SuspectNumber.phone_hash == derive_phone_hash(normalized_phone))
                 )
                 if suspect_number is not None:
-                    reports_for_phone = int(
-                        (
-                            await db.execute(
-                                select(func.count(FormalReport.id)).where(
-                                    FormalReport.suspect_number_id == suspect_number.id,
-                                )
-                            )
-                        ).scalar_one()
-                        or 0
-                    )
-                    open_reports_for_phone = int(
-                        (
-                            await db.execute(
-                                select(func.count(FormalReport.id)).where(
-                                    FormalReport.suspect_number_id == suspect_number.id,
-                                    FormalReport.status.in_(("NEW", "IN_REVIEW")),
-                                )
-                            )
-                        ).scalar_one()
-                        or 0
-                    )
-                    confirmed_reports_for_phone = int(
-                        (
-                            await db.execute(
-                                select(func.count(FormalReport.id)).where(
-                                    FormalReport.suspect_number_id == suspect_number.id,
-                                    FormalReport.status == "CONFIRMED",
-                                )
-                            )
-                        ).scalar_one()
-                        or 0
-                    )
-                    blocked_reports_for_phone = int(
-                        (
-                            await db.execute(
-                                select(func.count(FormalReport.id)).where(
-                                    FormalReport.suspect_number_id == suspect_number.id,
-                                    FormalReport.status == "BLOCKED_SIMULATED",
-                                )
-                            )
-                        ).scalar_one()
-                        or 0
+                    stats = (await load_suspect_number_stats(db, (suspect_number.id,))).get(
+                        suspect_number.id, EMPTY_SUSPECT_NUMBER_STATS
                     )
         except Exception:
             logger.warning("Unable to compute legacy incident stats", extra={"alert_uuid": str(legacy_alert.uuid)})
@@ -505,12 +490,7 @@ async def get_citizen_incident_detail(
             analysis_note=legacy_alert.analysis_note,
             created_at=legacy_alert.created_at,
             attachments=attachments,
-            stats=CitizenIncidentStats(
-                reports_for_phone=reports_for_phone,
-                open_reports_for_phone=open_reports_for_phone,
-                confirmed_reports_for_phone=confirmed_reports_for_phone,
-                blocked_reports_for_phone=blocked_reports_for_phone,
-            ),
+            stats=stats,
             related_incidents=related_incidents,
         )
 
@@ -538,34 +518,12 @@ async def get_citizen_incident_detail(
         except Exception:
             logger.warning("Unable to decrypt suspect phone for incident detail", extra={"report_uuid": str(report.uuid)})
 
-    reports_for_phone = 0
-    open_reports_for_phone = 0
-    confirmed_reports_for_phone = 0
-    blocked_reports_for_phone = 0
+    stats = EMPTY_SUSPECT_NUMBER_STATS
     related_reports = []
     if report.suspect_number_id is not None:
-        reports_for_phone_stmt = select(func.count(FormalReport.id)).where(
-            FormalReport.suspect_number_id == report.suspect_number_id,
-        )
-        reports_for_phone = int((await db.execute(reports_for_phone_stmt)).scalar_one() or 0)
-
-        open_reports_stmt = select(func.count(FormalReport.id)).where(
-            FormalReport.suspect_number_id == report.suspect_number_id,
-            FormalReport.status.in_(("NEW", "IN_REVIEW")),
-        )
-        open_reports_for_phone = int((await db.execute(open_reports_stmt)).scalar_one() or 0)
-
-        confirmed_reports_stmt = select(func.count(FormalReport.id)).where(
-            FormalReport.suspect_number_id == report.suspect_number_id,
-            FormalReport.status == "CONFIRMED",
-        )
-        confirmed_reports_for_phone = int((await db.execute(confirmed_reports_stmt)).scalar_one() or 0)
-
-        blocked_reports_stmt = select(func.count(FormalReport.id)).where(
-            FormalReport.suspect_number_id == report.suspect_number_id,
-            FormalReport.status == "BLOCKED_SIMULATED",
+        stats = (await load_suspect_number_stats(db, (report.suspect_number_id,))).get(
+            report.suspect_number_id, EMPTY_SUSPECT_NUMBER_STATS
         )
-        blocked_reports_for_phone = int((await db.execute(blocked_reports_stmt)).scalar_one() or 0)
 
         related_stmt = (
             select(FormalReport)
@@ -630,12 +588,7 @@ async def get_citizen_incident_detail(
         analysis_note=(legacy_alert.analysis_note if legacy_alert else None),
         created_at=report.created_at,
         attachments=attachments,
-        stats=CitizenIncidentStats(
-            reports_for_phone=reports_for_phone,
-            open_reports_for_phone=open_reports_for_phone,
-            confirmed_reports_for_phone=confirmed_reports_for_phone,
-            blocked_reports_for_phone=blocked_reports_for_phone,
-        ),
+        stats=stats,
         related_incidents=related_incidents,
     )
 
@@ -8,6 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import ThreatIndicator
+from app.services.write_events import TOPIC_THREAT_INTEL, publish_write_event
 
 
 ALERT_THRESHOLD = 3
@@ -97,7 +98,9 @@ async def upsert_threat_indicator(
         if not existing.region and region:
             existing.region = region
         db.add(existing)
+        delta = _indicator_delta(existing)
         await db.commit()
+        await publish_write_event(TOPIC_THREAT_INTEL, kind="threat_indicator.updated", data=delta)
         return existing
 
     new_indicator = ThreatIndicator(
@@ -116,4 +119,16 @@ async def upsert_threat_indicator(
     db.add(new_indicator)
     await db.commit()
     await db.refresh(new_indicator)
+    await publish_write_event(TOPIC_THREAT_INTEL, kind="threat_indicator.updated", data=_indicator_delta(new_indicator))
     return new_indicator
+
+
+def _indicator_delta(indicator: ThreatIndicator) -> dict:
+    return {
+        "type": indicator.indicator_type,
+        "masked": indicator.raw_value_masked,
+        "count": int(indicator.occurrence_count or 0),
+        "region": indicator.region,
+        "category": indicator.dominant_category,
+        "alert": bool(indicator.alert_triggered),
+    }
@@ -26,6 +26,7 @@ class MemoryDomainDeletionSummary:
     deleted_external_transmissions_count: int = 0
     deleted_suspect_numbers_count: int = 0
     artifact_paths: list[str] = field(default_factory=list)
+    evidence_hashes: list[str] = field(default_factory=list)
 
 
 def _normalize_memory_status(status: str | None) -> str:
@@ -154,6 +155,7 @@ async def delete_linked_memory_domain_reports(
     for report in reports:
         summary.deleted_reports_count += 1
         summary.deleted_evidence_items_count += len(report.evidence_items or [])
+        summary.evidence_hashes.extend(item.file_hash for item in report.evidence_items or [] if item.file_hash)
         summary.deleted_impersonation_incidents_count += len(report.impersonation_incidents or [])
         summary.deleted_forensic_bundles_count += len(report.forensic_bundles or [])
 
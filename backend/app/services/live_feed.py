@@ -0,0 +1,224 @@
+"""Flux temps reel de l'ecran `/live` (server-sent events).
+
+Un seul lecteur Redis par process API (`LiveFeedHub.run`) suit le flux
+`write_events_log` et redistribue chaque evenement aux connexions SSE locales,
+filtre selon le role de chacune. Les identifiants du flux Redis servent
+d'`id:` SSE : un client qui se reconnecte avec `Last-Event-ID` rejoue ce qu'il
+a manque, depuis le tampon local ou, a defaut, depuis Redis.
+
+Contre-pression : chaque connexion a une file bornee. Un client trop lent est
+deconnecte plutot que de faire grossir la memoire ; il revient avec son
+`Last-Event-ID` et rattrape par rejeu.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.core.security import AuthenticatedPrincipal
+from app.services.write_events import WRITE_EVENTS_STREAM, decode_write_event, event_visible_to
+
+
+logger = logging.getLogger(__name__)
+
+LiveEvent = tuple[str, dict[str, Any]]
+
+# Evenement de controle : l'historique demande n'est plus disponible, le client
+# recharge ses agregats par l'API REST avant de suivre le flux.
+RESYNC_EVENT = "resync"
+
+
+def stream_id_key(event_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def is_valid_stream_id(event_id: str | None) -> bool:
+    if not event_id:
+        return False
+    try:
+        stream_id_key(event_id)
+    except ValueError:
+        return False
+    return True
+
+
+class LiveFeedSubscriber:
+    def __init__(self, principal: AuthenticatedPrincipal, queue_size: int) -> None:
+        self.principal = principal
+        self.overflowed = False
+        self._queue: asyncio.Queue[LiveEvent | None] = asyncio.Queue(maxsize=max(1, queue_size))
+
+    def accepts(self, event: dict[str, Any]) -> bool:
+        return event_visible_to(event, role=self.principal.role, user_id=self.principal.id)
+
+    def offer(self, item: LiveEvent) -> None:
+        if self.overflowed or not self.accepts(item[1]):
+            return
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # Client trop lent : on libere la file et on ferme la connexion.
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    async def get(self) -> LiveEvent | None:
+        return await self._queue.get()
+
+
+class LiveFeedHub:
+    def __init__(self, *, replay_size: int, queue_size: int) -> None:
+        self._queue_size = queue_size
+        self._recent: deque[LiveEvent] = deque(maxlen=max(1, replay_size))
+        self._replay_size = max(1, replay_size)
+        self._subscribers: set[LiveFeedSubscriber] = set()
+        self.last_event_id: str | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, principal: AuthenticatedPrincipal) -> LiveFeedSubscriber:
+        subscriber = LiveFeedSubscriber(principal, self._queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: LiveFeedSubscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def dispatch(self, event_id: str, event: dict[str, Any]) -> None:
+        item = (event_id, event)
+        self._recent.append(item)
+        self.last_event_id = event_id
+        for subscriber in tuple(self._subscribers):
+            subscriber.offer(item)
+
+    def _replay_from_buffer(self, last_event_id: str) -> list[LiveEvent] | None:
+        if not self._recent or stream_id_key(self._recent[0][0]) > stream_id_key(last_event_id):
+            return None
+        after = stream_id_key(last_event_id)
+        return [item for item in self._recent if stream_id_key(item[0]) > after]
+
+    async def replay(self, last_event_id: str) -> tuple[list[LiveEvent], bool]:
+        """Evenements posterieurs a `last_event_id` et indicateur de continuite.
+
+        Le second element vaut False quand une partie de l'historique a ete
+        purgee (flux plafonne) : le client doit se resynchroniser.
+        """
+        buffered = self._replay_from_buffer(last_event_id)
+        if buffered is not None:
+            return buffered, True
+
+        redis_client = None
+        try:
+            redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+            # Borne inclusive : la presence de `last_event_id` prouve l'absence de trou.
+            entries = await redis_client.xrange(WRITE_EVENTS_STREAM, min=last_event_id, count=self._replay_size + 1)
+        except Exception:
+            logger.warning("Live feed replay unavailable", extra={"last_event_id": last_event_id})
+            return [], False
+        finally:
+            if redis_client is not None:
+                try:
+                    await redis_client.aclose()
+                except Exception:
+                    pass
+
+        continuous = bool(entries) and entries[0][0] == last_event_id
+        replayed = []
+        for entry_id, fields in entries:
+            if entry_id == last_event_id:
+                continue
+            event = decode_write_event(fields.get("event"))
+            if event is not None:
+                replayed.append((entry_id, event))
+        return replayed, continuous
+
+    async def run(self, *, block_ms: int = 5000, retry_delay_seconds: float = 2.0) -> None:
+        """Suit le flux Redis et redistribue ; reprend au dernier identifiant apres une panne."""
+        cursor = "$"
+        while True:
+            redis_client = None
+            try:
+                redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+                while True:
+                    response = await redis_client.xread({WRITE_EVENTS_STREAM: cursor}, block=block_ms, count=100)
+                    for _stream, entries in response or ():
+                        for entry_id, fields in entries:
+                            cursor = entry_id
+                            event = decode_write_event(fields.get("event"))
+                            if event is not None:
+                                self.dispatch(entry_id, event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Live feed reader lost Redis, retrying", exc_info=True)
+            finally:
+                if redis_client is not None:
+                    try:
+                        await redis_client.aclose()
+                    except Exception:
+                        pass
+            await asyncio.sleep(retry_delay_seconds)
+
+
+def format_sse(event_id: str | None, kind: str, payload: dict[str, Any]) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {kind}")
+    lines.append(f"data: {json.dumps(payload, default=str, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _client_payload(event: dict[str, Any]) -> dict[str, Any]:
+    # L'audience reste cote serveur.
+    return {"topics": event.get("topics", []), "at": event.get("at"), "data": event.get("data", {})}
+
+
+async def stream_live_events(
+    hub: LiveFeedHub,
+    principal: AuthenticatedPrincipal,
+    *,
+    last_event_id: str | None = None,
+    heartbeat_seconds: float = 15.0,
+) -> AsyncIterator[str]:
+    # Abonnement avant le rejeu : rien n'est perdu entre les deux, les doublons sont ecartes par id.
+    subscriber = hub.subscribe(principal)
+    try:
+        yield f"retry: {settings.LIVE_FEED_RETRY_MS}\n\n"
+        last_sent = last_event_id if is_valid_stream_id(last_event_id) else None
+        if last_sent is not None:
+            replayed, continuous = await hub.replay(last_sent)
+            if not continuous:
+                yield format_sse(None, RESYNC_EVENT, {"last_event_id": hub.last_event_id})
+            for event_id, event in replayed:
+                if subscriber.accepts(event):
+                    yield format_sse(event_id, event.get("kind", "message"), _client_payload(event))
+                last_sent = event_id
+
+        while True:
+            try:
+                item = await asyncio.wait_for(subscriber.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if item is None:
+                return
+            event_id, event = item
+            if last_sent is not None and stream_id_key(event_id) <= stream_id_key(last_sent):
+                continue
+            last_sent = event_id
+            yield format_sse(event_id, event.get("kind", "message"), _client_payload(event))
+    finally:
+        hub.unsubscribe(subscriber)
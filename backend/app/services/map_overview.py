@@ -1,16 +1,15 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, time, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.models import ExternalTransmission, ForensicBundle, FormalReport
+from app.models import ExternalTransmission, ForensicBundle, FormalReport, MessageAnalysis, ReportDailyRollup
 from app.schemas.map_overview import DepartmentMapPoint, MapOverviewData, MapOverviewTransmissionItem, RiskFilter, WindowFilter
-from app.services.benin_geography import BENIN_DEPARTMENT_COORDS, derive_department_from_phone, normalize_department_name
-from app.services.phone_privacy import decrypt_phone
+from app.services.benin_geography import BENIN_DEPARTMENT_COORDS, UNKNOWN_DEPARTMENT
+from app.services.dashboard_rollups import UNCLASSIFIED_CATEGORY, risk_bucket_expression
 
 
 def _window_to_days(value: str | None) -> tuple[WindowFilter, int]:
@@ -25,30 +24,37 @@ def _normalize_risk(value: str | None) -> RiskFilter:
     return "all"
 
 
-def _risk_matches(risk_filter: RiskFilter, risk_score: int) -> bool:
-    if risk_filter == "high":
-        return risk_score >= 65
-    if risk_filter == "medium":
-        return 35 <= risk_score < 65
-    if risk_filter == "low":
-        return risk_score < 35
-    return True
-
-
-def _resolve_report_department(report: FormalReport) -> str | None:
-    message = report.message
-    explicit_department = normalize_department_name(message.department if message else None)
-    if explicit_department:
-        return explicit_department
-
-    suspect_number = report.suspect_number
-    if suspect_number is None:
-        return None
-    try:
-        phone = decrypt_phone(suspect_number.phone_ciphertext)
-    except Exception:
-        return None
-    return derive_department_from_phone(phone)
+async def _recent_transmissions(
+    db: AsyncSession,
+    *,
+    start_dt: datetime,
+    risk_filter: RiskFilter,
+    category_filter: str | None,
+) -> list[MapOverviewTransmissionItem]:
+    stmt = (
+        select(ExternalTransmission, FormalReport.public_reference, FormalReport.department)
+        .join(ForensicBundle, ExternalTransmission.bundle_id == ForensicBundle.id)
+        .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
+        .join(MessageAnalysis, FormalReport.analysis_id == MessageAnalysis.id)
+        .where(FormalReport.created_at >= start_dt)
+        .order_by(ExternalTransmission.created_at.desc())
+        .limit(6)
+    )
+    if risk_filter != "all":
+        stmt = stmt.where(risk_bucket_expression(MessageAnalysis.risk_score) == risk_filter)
+    if category_filter:
+        stmt = stmt.where(func.lower(func.trim(MessageAnalysis.primary_category)) == category_filter)
+    return [
+        MapOverviewTransmissionItem(
+            transmission_uuid=transmission.uuid,
+            public_reference=public_reference,
+            department=department if department != UNKNOWN_DEPARTMENT else None,
+            target_type=transmission.target_type,
+            status=transmission.status,
+            created_at=transmission.created_at,
+        )
+        for transmission, public_reference, department in (await db.execute(stmt)).all()
+    ]
 
 
 async def get_map_overview(
@@ -58,83 +64,77 @@ async def get_map_overview(
     risk: str | None = None,
     category: str | None = None,
 ) -> MapOverviewData:
+    """Carte nationale lue dans les rollups (departement x jour x categorie x risque).
+
+    La fenetre couvre des jours calendaires entiers, aujourd'hui compris : le
+    cout ne depend que du nombre de departements et de categories.
+    """
     normalized_window, days = _window_to_days(window)
     normalized_risk = _normalize_risk(risk)
     category_filter = (category or "").strip().lower() or None
 
-    start_dt = datetime.now(timezone.utc) - timedelta(days=days)
+    start_day = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    high_risk_count = func.sum(
+        case((ReportDailyRollup.risk_bucket == "high", ReportDailyRollup.report_count), else_=0)
+    )
     stmt = (
-        select(FormalReport)
-        .where(FormalReport.created_at >= start_dt)
-        .options(
-            selectinload(FormalReport.message),
-            selectinload(FormalReport.analysis),
-            selectinload(FormalReport.suspect_number),
-            selectinload(FormalReport.forensic_bundles).selectinload(ForensicBundle.transmissions),
+        select(
+            ReportDailyRollup.department,
+            ReportDailyRollup.category,
+            func.sum(ReportDailyRollup.report_count),
+            high_risk_count,
+            func.max(ReportDailyRollup.latest_report_at),
         )
-        .order_by(FormalReport.created_at.desc())
+        .where(ReportDailyRollup.day >= start_day)
+        .group_by(ReportDailyRollup.department, ReportDailyRollup.category)
     )
-    reports = (await db.execute(stmt)).scalars().unique().all()
+    if normalized_risk != "all":
+        stmt = stmt.where(ReportDailyRollup.risk_bucket == normalized_risk)
+    if category_filter:
+        stmt = stmt.where(func.lower(ReportDailyRollup.category) == category_filter)
+    rows = (await db.execute(stmt)).all()
 
     department_buckets: dict[str, dict[str, object]] = {}
     overall_category_counts: Counter[str] = Counter()
     total_reports = 0
     high_risk_reports = 0
-    recent_transmissions: list[MapOverviewTransmissionItem] = []
 
-    for report in reports:
-        analysis = report.analysis
-        if analysis is None:
-            continue
-
-        risk_score = int(analysis.risk_score or 0)
-        if not _risk_matches(normalized_risk, risk_score):
-            continue
+    for department, category_name, count, high_count, latest_report_at in rows:
+        count = int(count or 0)
+        high_count = int(high_count or 0)
+        primary_category = category_name if category_name != UNCLASSIFIED_CATEGORY else None
+        total_reports += count
+        high_risk_reports += high_count
+        if primary_category:
+            overall_category_counts[primary_category] += count
 
-        primary_category = (analysis.primary_category or "").strip() or None
-        if category_filter and (primary_category or "").lower() != category_filter:
+        if department not in BENIN_DEPARTMENT_COORDS:
             continue
-
-        total_reports += 1
-        if risk_score >= 65:
-            high_risk_reports += 1
+        bucket = department_buckets.setdefault(
+            department,
+            {
+                "count": 0,
+                "high_risk_count": 0,
+                "latest_report_at": None,
+                "category_counts": Counter(),
+            },
+        )
+        bucket["count"] = int(bucket["count"]) + count
+        bucket["high_risk_count"] = int(bucket["high_risk_count"]) + high_count
         if primary_category:
-            overall_category_counts[primary_category] += 1
-
-        department = _resolve_report_department(report)
-        if department and department in BENIN_DEPARTMENT_COORDS:
-            bucket = department_buckets.setdefault(
-                department,
-                {
-                    "count": 0,
-                    "high_risk_count": 0,
-                    "latest_report_at": None,
-                    "category_counts": Counter(),
-                },
-            )
-            bucket["count"] = int(bucket["count"]) + 1
-            if risk_score >= 65:
-                bucket["high_risk_count"] = int(bucket["high_risk_count"]) + 1
-            if primary_category:
-                category_counts = bucket["category_counts"]
-                assert isinstance(category_counts, Counter)
-                category_counts[primary_category] += 1
-            latest_report_at = bucket["latest_report_at"]
-            if latest_report_at is None or (report.created_at and report.created_at > latest_report_at):
-                bucket["latest_report_at"] = report.created_at
-
-        for bundle in report.forensic_bundles or []:
-            for transmission in bundle.transmissions or []:
-                recent_transmissions.append(
-                    MapOverviewTransmissionItem(
-                        transmission_uuid=transmission.uuid,
-                        public_reference=report.public_reference,
-                        department=department,
-                        target_type=transmission.target_type,
-                        status=transmission.status,
-                        created_at=transmission.created_at,
-                    )
-                )
+            category_counts = bucket["category_counts"]
+            assert isinstance(category_counts, Counter)
+            category_counts[primary_category] += count
+        current_latest = bucket["latest_report_at"]
+        if latest_report_at is not None and (current_latest is None or latest_report_at > current_latest):
+            bucket["latest_report_at"] = latest_report_at
+
+    recent_transmissions = await _recent_transmissions(
+        db,
+        start_dt=datetime.combine(start_day, time.min, tzinfo=timezone.utc),
+        risk_filter=normalized_risk,
+        category_filter=category_filter,
+    )
 
     department_points: list[DepartmentMapPoint] = []
     for department, payload in department_buckets.items():
@@ -156,7 +156,6 @@ async def get_map_overview(
         )
 
     department_points.sort(key=lambda item: (-item.count, item.department))
-    recent_transmissions.sort(key=lambda item: item.created_at, reverse=True)
 
     dominant_category = overall_category_counts.most_common(1)[0][0] if overall_category_counts else None
 
@@ -170,5 +169,5 @@ async def get_map_overview(
         dominant_category=dominant_category,
         departments=department_points,
         top_departments=department_points[:4],
-        recent_transmissions=recent_transmissions[:6],
+        recent_transmissions=recent_transmissions,
     )
@@ -1,17 +1,20 @@
 ﻿from pathlib import Path
 import io
 from datetime import datetime, timezone
+from functools import lru_cache
 from xml.sax.saxutils import escape
 
 import qrcode
-from PIL import Image as PILImage
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import cm
 from reportlab.platypus import Image, Image as RLImage, KeepTogether, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
 
+from app.core.config import settings
 from app.core.risk_levels import normalize_risk_level, risk_level_from_score
+from app.services.evidence_derivatives import print_rendition
+from app.services.evidence_store import LocalEvidenceBackend, get_evidence_store
 
 
 BRAND_NAVY = colors.HexColor("#071827")
@@ -23,26 +26,244 @@ BRAND_GREEN = colors.HexColor("#047857")
 BRAND_GOLD = colors.HexColor("#C48A12")
 BRAND_RED = colors.HexColor("#C62828")
 BRAND_BLUE = colors.HexColor("#0F5E8C")
+DEFAULT_VERIFY_BASE_URL = "https://benincybershield.bj"
+QR_SIZE_POINTS = 80
 
 
-def _safe_text(value: object) -> str:
-    return escape(str(value)) if value is not None else ""
+def _render_qr_png(url: str) -> bytes | None:
+    try:
+        buffer = io.BytesIO()
+        qrcode.make(url).save(buffer, format="PNG")
+        return buffer.getvalue()
+    except Exception:
+        return None
+
+
+class ForensicPdfTemplate:
+    """Ressources de mise en page independantes du dossier rendu.
+
+    Styles de paragraphes et de tableaux, QR code de verification : construits
+    une fois par processus (`get_pdf_template`) puis partages par tous les
+    rendus. Ils ne sont que lus pendant `doc.build`, ce qui permet de les
+    partager entre threads.
+    """
+
+    def __init__(self, verify_base_url: str = DEFAULT_VERIFY_BASE_URL) -> None:
+        base = getSampleStyleSheet()
+        self.brand = ParagraphStyle(
+            "BrandCustom",
+            parent=base["Normal"],
+            fontName="Helvetica-Bold",
+            fontSize=18,
+            leading=21,
+            textColor=colors.white,
+            alignment=0,
+        )
+        self.title = ParagraphStyle(
+            "TitleCustom",
+            parent=base["Title"],
+            fontName="Helvetica-Bold",
+            fontSize=17,
+            leading=21,
+            textColor=BRAND_INK,
+            alignment=0,
+            spaceAfter=4,
+        )
+        self.subtitle = ParagraphStyle(
+            "SubtitleCustom",
+            parent=base["Normal"],
+            fontName="Helvetica",
+            fontSize=9,
+            leading=12,
+            textColor=BRAND_MUTED,
+        )
+        self.section = ParagraphStyle(
+            "SectionCustom",
+            parent=base["Heading2"],
+            fontName="Helvetica-Bold",
+            fontSize=10.5,
+            leading=13,
+            textColor=BRAND_BLUE,
+            spaceBefore=12,
+            spaceAfter=7,
+        )
+        self.body = ParagraphStyle(
+            "BodyCustom",
+            parent=base["Normal"],
+            fontName="Helvetica",
+            fontSize=10,
+            leading=14,
+            textColor=BRAND_INK,
+        )
+        self.panel_title = ParagraphStyle(
+            "PanelTitleCustom",
+            parent=base["Normal"],
+            fontName="Helvetica-Bold",
+            fontSize=9,
+            leading=11,
+            textColor=BRAND_NAVY,
+        )
+        self.caption = ParagraphStyle(
+            "CaptionCustom",
+            parent=self.subtitle,
+            fontName="Helvetica",
+            fontSize=7,
+            leading=9,
+            textColor=BRAND_MUTED,
+            alignment=1,
+        )
+        self.badge_text = ParagraphStyle(
+            "BadgeText",
+            fontName="Helvetica-Bold",
+            fontSize=8.5,
+            leading=10,
+            textColor=colors.white,
+            alignment=1,
+        )
+        self.custody_header = ParagraphStyle(
+            "CustodyHeader",
+            parent=self.body,
+            fontName="Helvetica-Bold",
+            fontSize=8,
+            leading=10,
+            textColor=colors.white,
+        )
+        self.custody_cell = ParagraphStyle(
+            "CustodyCell",
+            parent=self.body,
+            fontName="Helvetica",
+            fontSize=7.5,
+            leading=9.5,
+            textColor=BRAND_INK,
+        )
+
+        self.header_table_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
+                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
+                ("BOX", (0, 0), (-1, -1), 0.8, BRAND_LINE),
+                ("LINEBELOW", (0, 0), (-1, 0), 0.5, BRAND_NAVY),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 9),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 9),
+            ]
+        )
+        self.section_table_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), BRAND_SURFACE),
+                ("LINEBELOW", (0, 0), (-1, -1), 0.35, BRAND_LINE),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("LEFTPADDING", (0, 0), (-1, -1), 9),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 9),
+                ("TOPPADDING", (0, 0), (-1, -1), 7),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
+            ]
+        )
+        self.panel_table_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
+                ("BOX", (0, 0), (-1, -1), 0.8, BRAND_LINE),
+                ("LINEBELOW", (0, 0), (-1, 0), 0.6, BRAND_LINE),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 8),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+        self.message_box_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#FFF7ED")),
+                ("BOX", (0, 0), (-1, -1), 0.8, colors.HexColor("#FED7AA")),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
+            ]
+        )
+        self.transmission_box_style = TableStyle(
+            [
+                ("BOX", (0, 0), (-1, -1), 0.8, BRAND_LINE),
+                ("BACKGROUND", (0, 0), (-1, -1), BRAND_SURFACE),
+                ("LEFTPADDING", (0, 0), (-1, -1), 12),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
+                ("TOPPADDING", (0, 0), (-1, -1), 8),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+            ]
+        )
+        self.custody_table_commands = (
+            ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
+            ("GRID", (0, 0), (-1, -1), 0.35, BRAND_LINE),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 6),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 5),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+        )
+        self.custody_row_backgrounds = (colors.HexColor("#FFFFFF"), colors.HexColor("#F8FAFC"))
+        self._badge_styles: dict[str, TableStyle] = {}
+
+        self.verify_url = f"{verify_base_url}/verify"
+        self.qr_png = _render_qr_png(self.verify_url)
 
+    def badge_style(self, background_color) -> TableStyle:
+        key = background_color.hexval()
+        style = self._badge_styles.get(key)
+        if style is None:
+            style = TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, -1), background_color),
+                    ("BOX", (0, 0), (-1, -1), 0.6, background_color),
+                    ("LEFTPADDING", (0, 0), (-1, -1), 8),
+                    ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+                    ("TOPPADDING", (0, 0), (-1, -1), 4),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+                ]
+            )
+            self._badge_styles[key] = style
+        return style
 
-def _resolve_evidence_path(file_path: str) -> Path | None:
-    raw = Path(str(file_path).strip())
-    candidates: list[Path] = []
+    def qr_image(self) -> RLImage | None:
+        # Un flowable par rendu ; seuls les octets PNG sont partages.
+        if self.qr_png is None:
+            return None
+        image = RLImage(io.BytesIO(self.qr_png), width=QR_SIZE_POINTS, height=QR_SIZE_POINTS)
+        image.hAlign = "CENTER"
+        return image
 
-    if raw.is_absolute():
-        candidates.append(raw)
-    else:
-        candidates.append(Path("/app/evidences_store") / raw)
-        candidates.append(Path("evidences_store") / raw)
 
-    for candidate in candidates:
-        if candidate.exists():
-            return candidate
-    return None
+@lru_cache(maxsize=4)
+def get_pdf_template(verify_base_url: str = DEFAULT_VERIFY_BASE_URL) -> ForensicPdfTemplate:
+    return ForensicPdfTemplate(verify_base_url)
+
+
+def _safe_text(value: object) -> str:
+    return escape(str(value)) if value is not None else ""
+
+
+def _evidence_image_source(evidence: dict) -> tuple[str | io.BytesIO | None, bool]:
+    """Derive d'impression de la capture ; l'original sert de repli si le derive echoue.
+
+    Le booleen indique si la source est le derive reduit plutot que l'original.
+    """
+    file_path = str(evidence.get("file_path") or "").strip()
+    if not file_path:
+        return None, False
+    store = get_evidence_store()
+    rendition = print_rendition(store, source_key=file_path, sha256=str(evidence.get("file_hash") or "") or None)
+    if rendition is not None:
+        return rendition, True
+    local = store.local_path(file_path)
+    if local is not None:
+        return str(local), False
+    if isinstance(store.backend, LocalEvidenceBackend) or Path(file_path).is_absolute():
+        return None, False
+    try:
+        return io.BytesIO(store.backend.read_bytes(file_path)), False
+    except Exception:
+        return None, False
 
 
 def _is_image_evidence(evidence: dict) -> bool:
@@ -108,75 +329,31 @@ def _compact_hash(value: object, head: int = 18, tail: int = 10) -> str:
     return f"{text[:head]}...{text[-tail:]}"
 
 
-def _build_badge(label: str, background_color, text_color=colors.white) -> Table:
-    badge_style = ParagraphStyle(
-        "BadgeText",
-        fontName="Helvetica-Bold",
-        fontSize=8.5,
-        leading=10,
-        textColor=text_color,
-        alignment=1,
-    )
-    badge = Table([[Paragraph(escape(label), badge_style)]], hAlign="RIGHT")
-    badge.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, -1), background_color),
-                ("BOX", (0, 0), (-1, -1), 0.6, background_color),
-                ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ]
-        )
-    )
+def _build_badge(label: str, background_color, template: ForensicPdfTemplate) -> Table:
+    badge = Table([[Paragraph(escape(label), template.badge_text)]], hAlign="RIGHT")
+    badge.setStyle(template.badge_style(background_color))
     return badge
 
 
-def _render_section_table(rows: list[list[str]], value_style: ParagraphStyle) -> Table:
+def _render_section_table(rows: list[list[str]], template: ForensicPdfTemplate) -> Table:
     paragraph_rows = [
         [
-            Paragraph(f"<b>{escape(label)}</b>", value_style),
-            Paragraph(escape(value), value_style),
+            Paragraph(f"<b>{escape(label)}</b>", template.body),
+            Paragraph(escape(value), template.body),
         ]
         for label, value in rows
     ]
 
     table = Table(paragraph_rows, colWidths=[5.0 * cm, 10.7 * cm], hAlign="LEFT")
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (0, -1), BRAND_SURFACE),
-                ("LINEBELOW", (0, 0), (-1, -1), 0.35, BRAND_LINE),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("LEFTPADDING", (0, 0), (-1, -1), 9),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 9),
-                ("TOPPADDING", (0, 0), (-1, -1), 7),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
-            ]
-        )
-    )
+    table.setStyle(template.section_table_style)
     return table
 
 
-def _render_panel(title: str, body: list, styles) -> Table:
-    panel_rows = [[Paragraph(escape(title), styles["panel_title"])]]
+def _render_panel(title: str, body: list, template: ForensicPdfTemplate) -> Table:
+    panel_rows = [[Paragraph(escape(title), template.panel_title)]]
     panel_rows.extend([[item] for item in body])
     panel = Table(panel_rows, colWidths=[15.7 * cm], hAlign="LEFT")
-    panel.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, -1), colors.white),
-                ("BOX", (0, 0), (-1, -1), 0.8, BRAND_LINE),
-                ("LINEBELOW", (0, 0), (-1, 0), 0.6, BRAND_LINE),
-                ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                ("TOPPADDING", (0, 0), (-1, -1), 8),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-            ]
-        )
-    )
+    panel.setStyle(template.panel_table_style)
     return panel
 
 
@@ -189,30 +366,16 @@ def _format_utc_timestamp(value: object) -> str:
 
 def _generate_custody_table(
     story: list,
-    styles,
+    template: ForensicPdfTemplate,
     custody_events: list[dict],
 ) -> None:
-    story.append(Paragraph("CHAINE DE CUSTODY", styles["section"]))
+    story.append(Paragraph("CHAINE DE CUSTODY", template.section))
     if not custody_events:
-        story.append(Paragraph("Evenements non disponibles", styles["body"]))
+        story.append(Paragraph("Evenements non disponibles", template.body))
         return
 
-    header_style = ParagraphStyle(
-        "CustodyHeader",
-        parent=styles["body"],
-        fontName="Helvetica-Bold",
-        fontSize=8,
-        leading=10,
-        textColor=colors.white,
-    )
-    cell_style = ParagraphStyle(
-        "CustodyCell",
-        parent=styles["body"],
-        fontName="Helvetica",
-        fontSize=7.5,
-        leading=9.5,
-        textColor=BRAND_INK,
-    )
+    header_style = template.custody_header
+    cell_style = template.custody_cell
     rows = [
         [
             Paragraph("<b>Horodatage UTC</b>", header_style),
@@ -232,18 +395,11 @@ def _generate_custody_table(
     )
 
     table = Table(rows, colWidths=[3.5 * cm, 2.8 * cm, 3.2 * cm, 6.2 * cm], hAlign="LEFT")
-    table_styles = [
-        ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-        ("GRID", (0, 0), (-1, -1), 0.35, BRAND_LINE),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("LEFTPADDING", (0, 0), (-1, -1), 6),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-        ("TOPPADDING", (0, 0), (-1, -1), 5),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-    ]
+    table_styles = list(template.custody_table_commands)
+    odd_background, even_background = template.custody_row_backgrounds
     for row_index in range(1, len(rows)):
-        background = "#FFFFFF" if row_index % 2 == 1 else "#F8FAFC"
-        table_styles.append(("BACKGROUND", (0, row_index), (-1, row_index), colors.HexColor(background)))
+        background = odd_background if row_index % 2 == 1 else even_background
+        table_styles.append(("BACKGROUND", (0, row_index), (-1, row_index), background))
 
     table.setStyle(TableStyle(table_styles))
     story.append(table)
@@ -252,55 +408,43 @@ def _generate_custody_table(
 
 def _generate_section_6(
     story: list,
-    styles,
+    template: ForensicPdfTemplate,
     matched_rules: list[str],
     report_uuid: str,
-    base_url: str = "https://benincybershield.bj",
 ) -> None:
     from app.services.detection import RECOMMENDATION_MAPPING
 
-    story.append(Paragraph("RECOMMANDATIONS CITOYENNES", styles["section"]))
+    story.append(Paragraph("RECOMMANDATIONS CITOYENNES", template.section))
 
     rendered_items = 0
     for rule in matched_rules[:5]:
         recommendation = RECOMMENDATION_MAPPING.get(rule)
         if not recommendation:
             continue
-        story.append(Paragraph(f"&#8226; {escape(recommendation)}", styles["body"]))
+        story.append(Paragraph(f"&#8226; {escape(recommendation)}", template.body))
         story.append(Spacer(1, 0.08 * cm))
         rendered_items += 1
 
     if rendered_items == 0:
-        story.append(Paragraph("Aucune recommandation supplementaire disponible.", styles["body"]))
+        story.append(Paragraph("Aucune recommandation supplementaire disponible.", template.body))
 
     story.append(Spacer(1, 0.15 * cm))
     story.append(
         Paragraph(
             "Ce rapport a ete genere par BENIN CYBER SHIELD v3.0. Il est transmissible a bjCSIRT, "
             "l'OCRC et la CRIET comme piece d'information complementaire.",
-            styles["body"],
+            template.body,
         )
     )
 
-    url = f"{base_url}/verify"
-    try:
-        qr = qrcode.make(url)
-        buffer = io.BytesIO()
-        qr.save(buffer, format="PNG")
-        buffer.seek(0)
-        pil_img = PILImage.open(buffer)
-        rl_img_buffer = io.BytesIO()
-        pil_img.save(rl_img_buffer, format="PNG")
-        rl_img_buffer.seek(0)
-        qr_image = RLImage(rl_img_buffer, width=80, height=80)
-        qr_image.hAlign = "CENTER"
-        story.append(Spacer(1, 0.2 * cm))
+    qr_image = template.qr_image()
+    story.append(Spacer(1, 0.2 * cm))
+    if qr_image is not None:
         story.append(qr_image)
-    except Exception:
-        story.append(Spacer(1, 0.2 * cm))
-        story.append(Paragraph("QR code indisponible pour cette generation.", styles["caption"]))
+    else:
+        story.append(Paragraph("QR code indisponible pour cette generation.", template.caption))
 
-    story.append(Paragraph("Scanner pour verifier un autre message", styles["caption"]))
+    story.append(Paragraph("Scanner pour verifier un autre message", template.caption))
 
 
 def generate_forensic_pdf(
@@ -308,7 +452,12 @@ def generate_forensic_pdf(
     output_path: str,
     report_hash: str,
     report_uuid: str | None = None,
+    page_compression: bool | None = None,
+    template: ForensicPdfTemplate | None = None,
 ) -> str:
+    template = template or get_pdf_template()
+    if page_compression is None:
+        page_compression = settings.PDF_PAGE_COMPRESSION
     doc = SimpleDocTemplate(
         output_path,
         pagesize=A4,
@@ -318,78 +467,15 @@ def generate_forensic_pdf(
         bottomMargin=1.8 * cm,
         title="BENIN CYBER SHIELD - Rapport d'investigation numerique",
         author="BENIN CYBER SHIELD",
-        pageCompression=0,
+        pageCompression=1 if page_compression else 0,
     )
 
-    styles = getSampleStyleSheet()
-    style_brand = ParagraphStyle(
-        "BrandCustom",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        fontSize=18,
-        leading=21,
-        textColor=colors.white,
-        alignment=0,
-    )
-    style_title = ParagraphStyle(
-        "TitleCustom",
-        parent=styles["Title"],
-        fontName="Helvetica-Bold",
-        fontSize=17,
-        leading=21,
-        textColor=BRAND_INK,
-        alignment=0,
-        spaceAfter=4,
-    )
-    style_subtitle = ParagraphStyle(
-        "SubtitleCustom",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=9,
-        leading=12,
-        textColor=BRAND_MUTED,
-    )
-    style_section = ParagraphStyle(
-        "SectionCustom",
-        parent=styles["Heading2"],
-        fontName="Helvetica-Bold",
-        fontSize=10.5,
-        leading=13,
-        textColor=BRAND_BLUE,
-        spaceBefore=12,
-        spaceAfter=7,
-    )
-    style_body = ParagraphStyle(
-        "BodyCustom",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=10,
-        leading=14,
-        textColor=BRAND_INK,
-    )
-    style_panel_title = ParagraphStyle(
-        "PanelTitleCustom",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        fontSize=9,
-        leading=11,
-        textColor=BRAND_NAVY,
-    )
-    style_caption = ParagraphStyle(
-        "CaptionCustom",
-        parent=style_subtitle,
-        fontName="Helvetica",
-        fontSize=7,
-        leading=9,
-        textColor=BRAND_MUTED,
-        alignment=1,
-    )
-    pdf_styles = {
-        "section": style_section,
-        "body": style_body,
-        "caption": style_caption,
-        "panel_title": style_panel_title,
-    }
+    style_brand = template.brand
+    style_title = template.title
+    style_subtitle = template.subtitle
+    style_section = template.section
+    style_body = template.body
+    style_caption = template.caption
 
     data = snapshot_data.get("data") or {}
     alert = data.get("alert") or {}
@@ -424,7 +510,7 @@ def generate_forensic_pdf(
 
     story = []
 
-    risk_badge = _build_badge(_risk_label(risk_level), risk_color)
+    risk_badge = _build_badge(_risk_label(risk_level), risk_color, template)
     header_table = Table(
         [
             [
@@ -442,21 +528,7 @@ def generate_forensic_pdf(
         ],
         colWidths=[11.4 * cm, 4.3 * cm],
     )
-    header_table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), BRAND_NAVY),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.white),
-                ("BOX", (0, 0), (-1, -1), 0.8, BRAND_LINE),
-                ("LINEBELOW", (0, 0), (-1, 0), 0.5, BRAND_NAVY),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                ("TOPPADDING", (0, 0), (-1, -1), 9),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 9),
-            ]
-        )
-    )
+    header_table.setStyle(template.header_table_style)
     story.append(header_table)
     story.append(Spacer(1, 0.35 * cm))
 
@@ -473,8 +545,8 @@ def generate_forensic_pdf(
     _append_summary_row(section_1_rows, "Statut", status_value)
 
     if section_1_rows:
-        section_1_table = _render_section_table(section_1_rows, style_body)
-        story.append(_render_panel("Vue probatoire", [section_1_table], pdf_styles))
+        section_1_table = _render_section_table(section_1_rows, template)
+        story.append(_render_panel("Vue probatoire", [section_1_table], template))
 
     # SECTION 2 - Message suspect
     message_text = str(alert.get("reported_message") or "").strip()
@@ -484,18 +556,7 @@ def generate_forensic_pdf(
             [[Paragraph(escape(message_text).replace("\n", "<br/>"), style_body)]],
             colWidths=[15.7 * cm],
         )
-        message_box.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor("#FFF7ED")),
-                    ("BOX", (0, 0), (-1, -1), 0.8, colors.HexColor("#FED7AA")),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                    ("TOPPADDING", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 10),
-                ]
-            )
-        )
+        message_box.setStyle(template.message_box_style)
         story.append(message_box)
 
     # SECTION 3 - Analyse technique
@@ -507,7 +568,7 @@ def generate_forensic_pdf(
 
     if section_3_rows:
         story.append(Paragraph("ANALYSE TECHNIQUE", style_section))
-        story.append(_render_panel("Signaux detectes", [_render_section_table(section_3_rows, style_body)], pdf_styles))
+        story.append(_render_panel("Signaux detectes", [_render_section_table(section_3_rows, template)], template))
 
     # SECTION 4 - Integrite
     section_4_rows: list[list[str]] = []
@@ -516,7 +577,7 @@ def generate_forensic_pdf(
 
     if section_4_rows:
         story.append(Paragraph("INTEGRITE DU DOSSIER", style_section))
-        story.append(_render_panel("Scellement numerique", [_render_section_table(section_4_rows, style_body)], pdf_styles))
+        story.append(_render_panel("Scellement numerique", [_render_section_table(section_4_rows, template)], template))
 
     # SECTION 5 - Transmission
     story.append(Paragraph("TRANSMISSION", style_section))
@@ -529,18 +590,7 @@ def generate_forensic_pdf(
         ],
         colWidths=[15.7 * cm],
     )
-    transmission_box.setStyle(
-        TableStyle(
-            [
-                ("BOX", (0, 0), (-1, -1), 0.8, BRAND_LINE),
-                ("BACKGROUND", (0, 0), (-1, -1), BRAND_SURFACE),
-                ("LEFTPADDING", (0, 0), (-1, -1), 12),
-                ("RIGHTPADDING", (0, 0), (-1, -1), 12),
-                ("TOPPADDING", (0, 0), (-1, -1), 8),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-            ]
-        )
-    )
+    transmission_box.setStyle(template.transmission_box_style)
     story.append(transmission_box)
 
     # Optional annex for screenshots if available.
@@ -551,18 +601,23 @@ def generate_forensic_pdf(
         for index, evidence in enumerate(image_evidences, start=1):
             evidence_label = f"Capture {index} | Hash: {str(evidence.get('file_hash') or '')[:24]}..."
             story.append(Paragraph(escape(evidence_label), style_subtitle))
-            resolved_path = _resolve_evidence_path(str(evidence.get("file_path") or ""))
-            if resolved_path:
+            image_source, is_rendition = _evidence_image_source(evidence)
+            if image_source:
                 try:
-                    story.append(
-                        KeepTogether(
-                            [
-                                Spacer(1, 0.1 * cm),
-                                Image(str(resolved_path), width=15.6 * cm, height=9.2 * cm, kind="proportional"),
-                                Spacer(1, 0.2 * cm),
-                            ]
+                    flowables = [
+                        Spacer(1, 0.1 * cm),
+                        Image(image_source, width=15.6 * cm, height=9.2 * cm, kind="proportional"),
+                    ]
+                    if is_rendition:
+                        # Mention reservee au derive : l'original embarque est la piece elle-meme.
+                        flowables.append(
+                            Paragraph(
+                                escape(f"Rendu reduit pour impression - SHA-256 original : {evidence.get('file_hash') or 'N/A'}"),
+                                style_caption,
+                            )
                         )
-                    )
+                    flowables.append(Spacer(1, 0.2 * cm))
+                    story.append(KeepTogether(flowables))
                 except Exception:
                     continue
 
@@ -585,8 +640,8 @@ def generate_forensic_pdf(
         }
     )
 
-    _generate_custody_table(story, pdf_styles, custody_events)
-    _generate_section_6(story, pdf_styles, matched_rules, report_uuid or short_ref)
+    _generate_custody_table(story, template, custody_events)
+    _generate_section_6(story, template, matched_rules, report_uuid or short_ref)
 
     def draw_footer(canvas, _doc) -> None:
         canvas.saveState()
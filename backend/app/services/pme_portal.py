@@ -1,12 +1,14 @@
 import re
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, join, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.counters import Counter, CounterSource, run_counters
 from app.core.security import get_password_hash
 from app.models import BusinessProfile, FormalReport, ForensicBundle, ImpersonationIncident, User
 from app.schemas.pme import (
@@ -32,6 +34,15 @@ from app.services.phone_privacy import decrypt_phone, mask_phone, normalize_phon
 PHONE_PATTERN = re.compile(r"^\+?[0-9]{8,15}$")
 
 
+_BUSINESSES = CounterSource("business_profiles", BusinessProfile)
+BUSINESS_STATUS_COUNTERS = (
+    Counter("pending_count", _BUSINESSES, filter=BusinessProfile.validation_status == "PENDING_APPROVAL"),
+    Counter("active_count", _BUSINESSES, filter=BusinessProfile.validation_status == "ACTIVE"),
+    Counter("rejected_count", _BUSINESSES, filter=BusinessProfile.validation_status == "REJECTED"),
+    Counter("disabled_count", _BUSINESSES, filter=BusinessProfile.validation_status == "DISABLED"),
+)
+
+
 def _clean_string(value: str | None) -> str | None:
     cleaned = (value or "").strip()
     return cleaned or None
@@ -395,46 +406,52 @@ async def list_business_bundles(db: AsyncSession, user_id: int, skip: int, limit
     return PmeBundleListData(items=items, total=total, skip=skip, limit=limit)
 
 
-async def get_business_dashboard(db: AsyncSession, user_id: int) -> PmeDashboardData:
-    profile, _user = await _get_profile_with_user_by_user_id(db, user_id)
+@dataclass(frozen=True)
+class BusinessDashboardCounters:
+    total_incidents: int
+    new_incidents: int
+    linked_reports: int
+    bundles_ready: int
+    last_incident_at: datetime | None
 
-    total_incidents_stmt = (
-        select(func.count(ImpersonationIncident.id))
-        .where(ImpersonationIncident.business_profile_id == profile.id)
-    )
-    new_incidents_stmt = (
-        select(func.count(ImpersonationIncident.id))
-        .where(
-            ImpersonationIncident.business_profile_id == profile.id,
-            ImpersonationIncident.status == "NEW",
-        )
-    )
-    linked_reports_stmt = (
-        select(func.count(func.distinct(ImpersonationIncident.formal_report_id)))
-        .where(ImpersonationIncident.business_profile_id == profile.id)
+
+def _business_dashboard_counters(business_profile_id: int) -> tuple[Counter, ...]:
+    incidents = CounterSource(
+        "impersonation_incidents",
+        ImpersonationIncident,
+        where=(ImpersonationIncident.business_profile_id == business_profile_id,),
     )
-    bundles_ready_stmt = (
-        select(func.count(func.distinct(ForensicBundle.id)))
-        .select_from(ForensicBundle)
-        .join(FormalReport, ForensicBundle.report_id == FormalReport.id)
-        .join(ImpersonationIncident, ImpersonationIncident.formal_report_id == FormalReport.id)
-        .where(ImpersonationIncident.business_profile_id == profile.id)
+    bundles = CounterSource(
+        "forensic_bundles",
+        join(ForensicBundle, FormalReport, ForensicBundle.report_id == FormalReport.id).join(
+            ImpersonationIncident, ImpersonationIncident.formal_report_id == FormalReport.id
+        ),
+        where=(ImpersonationIncident.business_profile_id == business_profile_id,),
     )
-    last_incident_stmt = (
-        select(func.max(ImpersonationIncident.created_at))
-        .where(ImpersonationIncident.business_profile_id == profile.id)
+    return (
+        Counter("total_incidents", incidents),
+        Counter("new_incidents", incidents, filter=ImpersonationIncident.status == "NEW"),
+        Counter("linked_reports", incidents, column=ImpersonationIncident.formal_report_id, distinct=True),
+        Counter("last_incident_at", incidents, column=ImpersonationIncident.created_at, kind="max"),
+        Counter("bundles_ready", bundles, column=ForensicBundle.id, distinct=True),
     )
 
+
+async def get_business_dashboard(db: AsyncSession, user_id: int) -> PmeDashboardData:
+    profile, _user = await _get_profile_with_user_by_user_id(db, user_id)
+
+    counters = await run_counters(db, _business_dashboard_counters(profile.id), BusinessDashboardCounters)
+
     recent = await list_business_incidents(db=db, user_id=user_id, skip=0, limit=5)
 
     return PmeDashboardData(
         official_name=profile.official_name,
         validation_status=profile.validation_status,
-        total_incidents=int((await db.execute(total_incidents_stmt)).scalar_one() or 0),
-        new_incidents=int((await db.execute(new_incidents_stmt)).scalar_one() or 0),
-        linked_reports=int((await db.execute(linked_reports_stmt)).scalar_one() or 0),
-        bundles_ready=int((await db.execute(bundles_ready_stmt)).scalar_one() or 0),
-        last_incident_at=(await db.execute(last_incident_stmt)).scalar_one_or_none(),
+        total_incidents=counters.total_incidents,
+        new_incidents=counters.new_incidents,
+        linked_reports=counters.linked_reports,
+        bundles_ready=counters.bundles_ready,
+        last_incident_at=counters.last_incident_at,
         recent_incidents=recent.items,
     )
 
@@ -482,17 +499,10 @@ async def list_admin_businesses(
         for profile, user in rows
     ]
 
-    async def _count_with_status(status_value: str) -> int:
-        count_stmt = select(func.count(BusinessProfile.id)).where(BusinessProfile.validation_status == status_value)
-        return int((await db.execute(count_stmt)).scalar_one() or 0)
-
     return AdminBusinessListData(
         items=items,
         total=len(items),
-        pending_count=await _count_with_status("PENDING_APPROVAL"),
-        active_count=await _count_with_status("ACTIVE"),
-        rejected_count=await _count_with_status("REJECTED"),
-        disabled_count=await _count_with_status("DISABLED"),
+        **(await run_counters(db, BUSINESS_STATUS_COUNTERS)),
     )
 
 
@@ -0,0 +1,37 @@
+"""Texte de recherche des signalements, replie comme le moteur de detection.
+
+`formal_reports.search_text` concatene contenu du message, URL soumise et
+reference publique, sans accents ni majuscules. Sur PostgreSQL un index
+trigramme (pg_trgm, GIN) sert les recherches `LIKE '%terme%'` sur ce texte.
+"""
+
+from __future__ import annotations
+
+import re
+
+from app.services.detection import fold_text
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fold_search_text(value: str | None) -> str:
+    return _WHITESPACE.sub(" ", fold_text(value or "")).strip()
+
+
+def build_report_search_text(
+    *,
+    content: str | None,
+    submitted_url: str | None,
+    public_reference: str | None,
+) -> str:
+    return fold_search_text(" ".join(part for part in (content, submitted_url, public_reference) if part))
+
+
+def search_like_pattern(term: str | None) -> str | None:
+    """Motif `LIKE` (echappement `\\`) pour un terme saisi ; None s'il est vide une fois replie."""
+    folded = fold_search_text(term)
+    if not folded:
+        return None
+    escaped = folded.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
@@ -20,6 +20,7 @@ from app.schemas.shield import (
     ShieldDispatchRequest,
 )
 from app.services.legacy_memory_bridge import sync_memory_domain_status_from_legacy_alert
+from app.services.write_events import ADMIN_AND_OWNER, TOPIC_REPORTS, publish_write_event
 
 
 def _utc_now_iso() -> str:
@@ -72,6 +73,13 @@ async def apply_incident_decision(
     )
     await db.commit()
     await db.refresh(alert)
+    await publish_write_event(
+        TOPIC_REPORTS,
+        kind="report.status",
+        data={"alert_uuid": str(alert.uuid), "status": alert.status},
+        audience=ADMIN_AND_OWNER,
+        owner_user_id=alert.owner_user_id,
+    )
 
     return IncidentDecisionData(
         incident_id=alert.uuid,
@@ -214,6 +222,13 @@ async def operator_callback_action_status(
     )
     await db.commit()
     await db.refresh(alert)
+    await publish_write_event(
+        TOPIC_REPORTS,
+        kind="report.status",
+        data={"alert_uuid": str(alert.uuid), "status": alert.status},
+        audience=ADMIN_AND_OWNER,
+        owner_user_id=alert.owner_user_id,
+    )
 
     dispatch_payload["operator_status"] = request.operator_status
     dispatch_payload["decision_status"] = decision_status
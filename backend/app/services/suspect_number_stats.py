@@ -0,0 +1,66 @@
+"""Statistiques des signalements par numero suspect.
+
+Tous les compteurs d'un numero (total, ouverts, confirmes, bloques) sortent
+d'un seul `SELECT ... count(*) FILTER (WHERE ...) GROUP BY suspect_number_id`,
+pour un numero (fiche incident) comme pour une page de liste entiere.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.counters import Counter, CounterSource
+from app.models import FormalReport
+from app.schemas.citizen_incident import CitizenIncidentStats
+
+
+OPEN_REPORT_STATUSES = ("NEW", "IN_REVIEW")
+
+_REPORTS = CounterSource("formal_reports", FormalReport)
+SUSPECT_NUMBER_COUNTERS = (
+    Counter("reports_for_phone", _REPORTS),
+    Counter("open_reports_for_phone", _REPORTS, filter=FormalReport.status.in_(OPEN_REPORT_STATUSES)),
+    Counter("confirmed_reports_for_phone", _REPORTS, filter=FormalReport.status == "CONFIRMED"),
+    Counter("blocked_reports_for_phone", _REPORTS, filter=FormalReport.status == "BLOCKED_SIMULATED"),
+)
+
+EMPTY_SUSPECT_NUMBER_STATS = CitizenIncidentStats(
+    reports_for_phone=0,
+    open_reports_for_phone=0,
+    confirmed_reports_for_phone=0,
+    blocked_reports_for_phone=0,
+)
+
+
+async def load_suspect_number_stats(
+    db: AsyncSession,
+    suspect_number_ids: Iterable[int | None],
+    *,
+    owner_user_id: int | None = None,
+) -> dict[int, CitizenIncidentStats]:
+    """Statistiques de chaque numero demande, en une requete.
+
+    Un numero sans signalement (dans le perimetre `owner_user_id`) est absent
+    du resultat : utiliser `EMPTY_SUSPECT_NUMBER_STATS` par defaut.
+    """
+    ids = sorted({int(suspect_number_id) for suspect_number_id in suspect_number_ids if suspect_number_id is not None})
+    if not ids:
+        return {}
+
+    stmt = (
+        select(FormalReport.suspect_number_id, *(counter.expression() for counter in SUSPECT_NUMBER_COUNTERS))
+        .where(FormalReport.suspect_number_id.in_(ids))
+        .group_by(FormalReport.suspect_number_id)
+    )
+    if owner_user_id is not None:
+        stmt = stmt.where(FormalReport.reporter_user_id == owner_user_id)
+
+    stats: dict[int, CitizenIncidentStats] = {}
+    for row in (await db.execute(stmt)).mappings():
+        stats[int(row["suspect_number_id"])] = CitizenIncidentStats(
+            **{counter.name: int(row[counter.name] or 0) for counter in SUSPECT_NUMBER_COUNTERS}
+        )
+    return stats
@@ -0,0 +1,262 @@
+"""Series temporelles des signalements (heure, jour, semaine, mois).
+
+Les pas d'un jour et plus sont lus dans les rollups journaliers : le cout ne
+depend que du nombre de jours et de valeurs de la dimension, pas du volume de
+signalements. Les valeurs refletent donc le dernier passage du compacteur,
+comme le tableau de bord. Le pas horaire, absent des rollups, parcourt
+`formal_reports` sur l'intervalle demande via l'index `created_at` ; le nombre
+de pas est borne par `TREND_MAX_BUCKETS`.
+
+Les bornes sont alignees sur les pas (UTC) et chaque serie est completee par
+des zeros : le client recoit exactement un point par pas.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import FormalReport, MessageAnalysis, ReportDailyRollup
+from app.schemas.trends import TrendBucket, TrendData, TrendDimension, TrendPoint, TrendSeries
+from app.services.benin_geography import UNKNOWN_DEPARTMENT, normalize_department_name
+from app.services.admin_console import REPORT_STATUS_ORDER
+from app.services.dashboard_rollups import UNCLASSIFIED_CATEGORY, risk_bucket_expression
+
+
+TREND_MAX_BUCKETS = 1000
+DEFAULT_TREND_SPANS: dict[str, timedelta] = {
+    "hour": timedelta(hours=48),
+    "day": timedelta(days=30),
+    "week": timedelta(weeks=12),
+    "month": timedelta(days=365),
+}
+RISK_BUCKETS = ("high", "medium", "low")
+
+
+def _to_utc(value: datetime) -> datetime:
+    # Horodatage naif (SQLite, parametre sans fuseau) : considere comme UTC.
+    return value.astimezone(timezone.utc) if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def bucket_floor(value: datetime, bucket: TrendBucket) -> datetime:
+    value = _to_utc(value)
+    if bucket == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day_start = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        # Semaines ISO : debut le lundi.
+        return day_start - timedelta(days=day_start.weekday())
+    if bucket == "month":
+        return day_start.replace(day=1)
+    return day_start
+
+
+def next_bucket(value: datetime, bucket: TrendBucket) -> datetime:
+    if bucket == "hour":
+        return value + timedelta(hours=1)
+    if bucket == "day":
+        return value + timedelta(days=1)
+    if bucket == "week":
+        return value + timedelta(weeks=1)
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def bucket_starts(start: datetime, end: datetime, bucket: TrendBucket) -> list[datetime]:
+    """Debuts des pas couvrant [start, end), au plus TREND_MAX_BUCKETS (sinon 400)."""
+    starts = []
+    cursor = bucket_floor(start, bucket)
+    while cursor < end:
+        if len(starts) == TREND_MAX_BUCKETS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Intervalle trop long pour un pas '{bucket}' (maximum {TREND_MAX_BUCKETS} points)",
+            )
+        starts.append(cursor)
+        cursor = next_bucket(cursor, bucket)
+    return starts
+
+
+def _as_utc_bucket(value: datetime | date | str, bucket: TrendBucket) -> datetime:
+    # SQLite renvoie du texte, PostgreSQL un timestamp ; les rollups une date.
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    return bucket_floor(value, bucket)
+
+
+def _rollup_query(
+    *,
+    first_day: date,
+    end_day: date,
+    dimension: TrendDimension | None,
+    department: str | None,
+    category: str | None,
+    risk: str | None,
+    status: str | None,
+):
+    dimension_columns = {
+        "department": ReportDailyRollup.department,
+        "category": ReportDailyRollup.category,
+        "risk": ReportDailyRollup.risk_bucket,
+        "status": ReportDailyRollup.status,
+    }
+    key = dimension_columns[dimension] if dimension else None
+    columns = [ReportDailyRollup.day, func.sum(ReportDailyRollup.report_count)]
+    group_by = [ReportDailyRollup.day]
+    if key is not None:
+        columns.append(key)
+        group_by.append(key)
+    stmt = (
+        select(*columns)
+        .where(ReportDailyRollup.day >= first_day, ReportDailyRollup.day < end_day)
+        .group_by(*group_by)
+    )
+    if department:
+        stmt = stmt.where(ReportDailyRollup.department == department)
+    if category:
+        stmt = stmt.where(func.lower(ReportDailyRollup.category) == category)
+    if risk:
+        stmt = stmt.where(ReportDailyRollup.risk_bucket == risk)
+    if status:
+        stmt = stmt.where(ReportDailyRollup.status == status)
+    return stmt
+
+
+def _constant(value: str):
+    # Rendue en litteral : le meme texte SQL dans SELECT et GROUP BY (PostgreSQL).
+    return literal(value, literal_execute=True)
+
+
+def _hour_expression(column, dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.date_trunc(_constant("hour"), func.timezone(_constant("UTC"), column))
+    return func.strftime(_constant("%Y-%m-%d %H:00:00"), column)
+
+
+def _hourly_query(
+    *,
+    start: datetime,
+    end: datetime,
+    dialect_name: str,
+    dimension: TrendDimension | None,
+    department: str | None,
+    category: str | None,
+    risk: str | None,
+    status: str | None,
+):
+    hour = _hour_expression(FormalReport.created_at, dialect_name)
+    category_column = func.coalesce(MessageAnalysis.primary_category, _constant(UNCLASSIFIED_CATEGORY))
+    risk_column = risk_bucket_expression(MessageAnalysis.risk_score)
+    dimension_columns = {
+        "department": func.coalesce(FormalReport.department, _constant(UNKNOWN_DEPARTMENT)),
+        "category": category_column,
+        "risk": risk_column,
+        "status": FormalReport.status,
+    }
+    key = dimension_columns[dimension] if dimension else None
+    columns = [hour, func.count(FormalReport.id)]
+    group_by = [hour]
+    if key is not None:
+        columns.append(key)
+        group_by.append(key)
+    stmt = (
+        select(*columns)
+        .select_from(FormalReport)
+        .where(FormalReport.created_at >= start, FormalReport.created_at < end)
+        .group_by(*group_by)
+    )
+    if dimension in ("category", "risk") or category or risk:
+        stmt = stmt.join(MessageAnalysis, FormalReport.analysis_id == MessageAnalysis.id)
+    if department:
+        stmt = stmt.where(func.coalesce(FormalReport.department, _constant(UNKNOWN_DEPARTMENT)) == department)
+    if category:
+        stmt = stmt.where(func.lower(category_column) == category)
+    if risk:
+        stmt = stmt.where(risk_column == risk)
+    if status:
+        stmt = stmt.where(FormalReport.status == status)
+    return stmt
+
+
+async def get_report_trends(
+    db: AsyncSession,
+    *,
+    bucket: TrendBucket = "day",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    dimension: TrendDimension | None = None,
+    department: str | None = None,
+    category: str | None = None,
+    risk: str | None = None,
+    status: str | None = None,
+) -> TrendData:
+    """Nombre de signalements par pas de temps, eventuellement ventile par dimension."""
+    end = _to_utc(end) if end else datetime.now(timezone.utc)
+    start = _to_utc(start) if start else end - DEFAULT_TREND_SPANS[bucket]
+    if start >= end:
+        raise HTTPException(status_code=400, detail="`start` doit preceder `end`")
+
+    starts = bucket_starts(start, end, bucket)
+    range_start, range_end = starts[0], next_bucket(starts[-1], bucket)
+
+    department_filter = normalize_department_name(department) if department else None
+    if department and department.strip() and department_filter is None:
+        # Filtre ignore en silence = totaux nationaux presentes comme departementaux.
+        raise HTTPException(status_code=400, detail=f"Departement inconnu : {department}")
+    category_filter = (category or "").strip().lower() or None
+    risk_filter = risk if risk in RISK_BUCKETS else None
+    status_filter = (status or "").strip().upper() or None
+    if status_filter is not None and status_filter not in REPORT_STATUS_ORDER:
+        raise HTTPException(status_code=400, detail=f"Statut inconnu : {status}")
+    filters = {
+        "dimension": dimension,
+        "department": department_filter,
+        "category": category_filter,
+        "risk": risk_filter,
+        "status": status_filter,
+    }
+
+    if bucket == "hour":
+        source = "reports"
+        stmt = _hourly_query(start=range_start, end=range_end, dialect_name=db.get_bind().dialect.name, **filters)
+    else:
+        source = "rollups"
+        stmt = _rollup_query(first_day=range_start.date(), end_day=range_end.date(), **filters)
+
+    counts: dict[str | None, dict[datetime, int]] = defaultdict(lambda: defaultdict(int))
+    for row in (await db.execute(stmt)).all():
+        key = str(row[2]) if dimension else None
+        counts[key][_as_utc_bucket(row[0], bucket)] += int(row[1] or 0)
+    if dimension is None and None not in counts:
+        counts[None] = defaultdict(int)
+
+    series = [
+        TrendSeries(
+            key=key,
+            total=sum(per_bucket.values()),
+            points=[TrendPoint(bucket_start=bucket_start, count=per_bucket.get(bucket_start, 0)) for bucket_start in starts],
+        )
+        for key, per_bucket in counts.items()
+    ]
+    series.sort(key=lambda item: (-item.total, item.key or ""))
+
+    return TrendData(
+        bucket=bucket,
+        start=range_start,
+        end=range_end,
+        dimension=dimension,
+        source=source,
+        department=department_filter,
+        category=category_filter,
+        risk=risk_filter,
+        status=status_filter,
+        total=sum(item.total for item in series),
+        series=series,
+    )
@@ -0,0 +1,86 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+STAGING_DIRNAME = ".staging"
+
+
+@dataclass(frozen=True)
+class StagedUpload:
+    """Fichier recu en flux dans la zone de transit, pas encore publie."""
+
+    temp_path: Path
+    sha256: str
+    size_bytes: int
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Screenshot too large (max {max_bytes // (1024 * 1024)}MB per file)",
+    )
+
+
+def _open_staging_file(staging_dir: Path):
+    staging_dir.mkdir(parents=True, exist_ok=True)
+    fd, raw_path = tempfile.mkstemp(dir=staging_dir, suffix=".part")
+    return os.fdopen(fd, "wb"), Path(raw_path)
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+async def stage_upload(
+    upload: UploadFile,
+    *,
+    base_dir: Path,
+    max_bytes: int,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> StagedUpload | None:
+    """Copie `upload` par blocs dans `base_dir/.staging` en calculant le SHA-256.
+
+    Le flux est abandonne des que `max_bytes` est depasse (HTTP 413) et le
+    fichier partiel supprime. Retourne None pour un fichier vide. Les ecritures
+    disque passent par un thread pour ne pas bloquer la boucle d'evenements.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    handle, temp_path = await asyncio.to_thread(_open_staging_file, base_dir / STAGING_DIRNAME)
+    digest = hashlib.sha256()
+    size_bytes = 0
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            size_bytes += len(chunk)
+            if size_bytes > max_bytes:
+                raise _too_large(max_bytes)
+            digest.update(chunk)
+            await asyncio.to_thread(handle.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(handle.close)
+        await asyncio.to_thread(_unlink_quietly, temp_path)
+        raise
+    await asyncio.to_thread(handle.close)
+
+    if size_bytes == 0:
+        await asyncio.to_thread(_unlink_quietly, temp_path)
+        return None
+    return StagedUpload(temp_path=temp_path, sha256=digest.hexdigest(), size_bytes=size_bytes)
+
+
+async def discard_staged_upload(staged: StagedUpload) -> None:
+    await asyncio.to_thread(_unlink_quietly, staged.temp_path)
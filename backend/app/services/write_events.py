@@ -0,0 +1,164 @@
+"""Evenements d'ecriture publies sur Redis apres commit.
+
+Un evenement par transaction : sujets touches (`topics`), type (`kind`), delta
+compact (`data`) et audience (roles autorises, proprietaire eventuel). Il part
+en un seul aller-retour sur deux supports :
+
+- le canal pub/sub `write_events`, ecoute par le cache des agregats ;
+- le flux plafonne `write_events_log`, relu par le flux temps reel (`live_feed`)
+  dont les identifiants permettent la reprise apres reconnexion.
+
+La publication est best-effort : une panne Redis ne bloque jamais l'ecriture,
+les caches retombent alors sur leur TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+WRITE_EVENTS_CHANNEL = "write_events"
+WRITE_EVENTS_STREAM = "write_events_log"
+
+TOPIC_REPORTS = "reports"
+TOPIC_TRANSMISSIONS = "transmissions"
+TOPIC_CAMPAIGNS = "campaigns"
+TOPIC_THREAT_INTEL = "threat_intel"
+TOPIC_OSINT = "osint"
+# Publie par le compacteur quand les rollups du tableau de bord ont bouge.
+TOPIC_ROLLUPS = "rollups"
+
+ADMIN_ONLY = ("ADMIN",)
+# Roles non admin : seulement les evenements dont ils sont proprietaires.
+ADMIN_AND_OWNER = ("ADMIN", "SME")
+
+
+def build_write_event(
+    topics: Iterable[str],
+    *,
+    kind: str,
+    data: dict[str, Any] | None = None,
+    audience: Iterable[str] = ADMIN_ONLY,
+    owner_user_id: int | None = None,
+) -> dict[str, Any]:
+    return {
+        "topics": list(topics),
+        "kind": kind,
+        "at": datetime.now(timezone.utc).isoformat(),
+        "audience": list(audience),
+        "owner_user_id": owner_user_id,
+        "data": data or {},
+    }
+
+
+def encode_write_event(event: dict[str, Any]) -> str:
+    return json.dumps(event, default=str, separators=(",", ":"))
+
+
+def decode_write_event(raw: str | bytes | None) -> dict[str, Any] | None:
+    try:
+        event = json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(event, dict) or not isinstance(event.get("topics"), list):
+        return None
+    return event
+
+
+def event_visible_to(event: dict[str, Any], *, role: str, user_id: int | None) -> bool:
+    if role not in (event.get("audience") or ()):
+        return False
+    if role == "ADMIN":
+        return True
+    owner_user_id = event.get("owner_user_id")
+    return owner_user_id is not None and owner_user_id == user_id
+
+
+async def publish_write_event(
+    *topics: str,
+    kind: str,
+    data: dict[str, Any] | None = None,
+    audience: Iterable[str] = ADMIN_ONLY,
+    owner_user_id: int | None = None,
+) -> None:
+    # A appeler apres le commit : un abonne peut relire la base aussitot.
+    if not topics:
+        return
+    payload = encode_write_event(
+        build_write_event(topics, kind=kind, data=data, audience=audience, owner_user_id=owner_user_id)
+    )
+    redis_client = None
+    try:
+        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.publish(WRITE_EVENTS_CHANNEL, payload)
+        pipe.xadd(
+            WRITE_EVENTS_STREAM,
+            {"event": payload},
+            maxlen=settings.LIVE_FEED_REPLAY_SIZE,
+            approximate=True,
+        )
+        await pipe.execute()
+    except Exception:
+        logger.warning("Failed to publish write event", extra={"topics": list(topics), "kind": kind})
+    finally:
+        if redis_client is not None:
+            try:
+                await redis_client.aclose()
+            except Exception:
+                pass
+
+
+async def listen_write_events(
+    on_event: Callable[[dict[str, Any]], None],
+    *,
+    on_subscribed: Callable[[], None] | None = None,
+    retry_delay_seconds: float = 2.0,
+) -> None:
+    """Boucle d'abonnement au canal, reconnectee apres chaque panne Redis.
+
+    `on_subscribed` est appele a chaque (re)abonnement : les evenements publies
+    pendant la coupure sont perdus, l'abonne doit se resynchroniser.
+    """
+    while True:
+        redis_client = None
+        pubsub = None
+        try:
+            redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+            pubsub = redis_client.pubsub()
+            await pubsub.subscribe(WRITE_EVENTS_CHANNEL)
+            if on_subscribed is not None:
+                on_subscribed()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                event = decode_write_event(message.get("data"))
+                if event is not None:
+                    on_event(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("Write events subscription lost, retrying", exc_info=True)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+            if redis_client is not None:
+                try:
+                    await redis_client.aclose()
+                except Exception:
+                    pass
+        await asyncio.sleep(retry_delay_seconds)
@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.services.dashboard_rollups import compact_dashboard_rollups
+from app.services.write_events import TOPIC_ROLLUPS, publish_write_event
+
+
+logger = logging.getLogger(__name__)
+
+
+async def start_dashboard_rollup_compactor() -> None:
+    logger.info("Starting dashboard rollup compactor")
+    rebuild_after = timedelta(hours=settings.DASHBOARD_ROLLUP_REBUILD_HOURS)
+
+    try:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    refresh = await compact_dashboard_rollups(db, rebuild_after=rebuild_after)
+                if refresh is not None and (refresh.full_rebuild or refresh.report_days or refresh.transmission_days):
+                    logger.info(
+                        "Dashboard rollups refreshed",
+                        extra={
+                            "full_rebuild": refresh.full_rebuild,
+                            "report_days": refresh.report_days,
+                            "transmission_days": refresh.transmission_days,
+                        },
+                    )
+                    # Les caches d'agregats lus depuis les rollups ne sont perimes qu'a present.
+                    await publish_write_event(
+                        TOPIC_ROLLUPS,
+                        kind="rollups.refreshed",
+                        data={"report_days": refresh.report_days, "transmission_days": refresh.transmission_days},
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Dashboard rollup compaction failed")
+            await asyncio.sleep(settings.DASHBOARD_ROLLUP_INTERVAL_SECONDS)
+    except asyncio.CancelledError:
+        logger.info("Dashboard rollup compactor cancelled")
+
+
+if __name__ == "__main__":
+    # Worker dedie : python -m app.workers.dashboard_rollup_compactor
+    asyncio.run(start_dashboard_rollup_compactor())
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import uuid
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.services.bundle_jobs import (
+    FORENSIC_BUNDLE_QUEUE,
+    build_bundle_pdf_executor,
+    pending_bundle_job_uuids,
+    process_bundle_job,
+    reclaim_stale_bundle_jobs,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _requeue_pending_jobs(redis_client, *, reclaimed_only: bool = False) -> None:
+    # Jobs RENDERING d'un worker mort, remis en PENDING, puis jobs restes PENDING
+    # (Redis indisponible au moment du commit, redemarrage...). Le passage
+    # periodique ne repousse que les jobs repris : les autres sont deja en file.
+    async with AsyncSessionLocal() as db:
+        bundle_uuids = await reclaim_stale_bundle_jobs(db)
+        if not reclaimed_only:
+            bundle_uuids = await pending_bundle_job_uuids(db)
+    for bundle_uuid in bundle_uuids:
+        await redis_client.rpush(FORENSIC_BUNDLE_QUEUE, str(bundle_uuid))
+    if bundle_uuids:
+        logger.info("Requeued pending forensic bundle jobs", extra={"count": len(bundle_uuids)})
+
+
+async def start_forensic_bundle_consumer() -> None:
+    logger.info("Starting forensic bundle consumer")
+    redis_client = None
+    # Rendu ReportLab hors du processus : dans l'API, la boucle reste disponible.
+    pdf_executor = build_bundle_pdf_executor()
+    loop = asyncio.get_running_loop()
+    next_reclaim_at = loop.time() + settings.FORENSIC_JOB_RECLAIM_INTERVAL_SECONDS
+
+    try:
+        while True:
+            try:
+                if redis_client is None:
+                    redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+                    await redis_client.ping()
+                    logger.info("Forensic bundle consumer connected to Redis")
+                    await _requeue_pending_jobs(redis_client)
+                elif loop.time() >= next_reclaim_at:
+                    next_reclaim_at = loop.time() + settings.FORENSIC_JOB_RECLAIM_INTERVAL_SECONDS
+                    await _requeue_pending_jobs(redis_client, reclaimed_only=True)
+
+                item = await redis_client.blpop(FORENSIC_BUNDLE_QUEUE, timeout=1)
+                if item:
+                    _, raw_uuid = item
+                    try:
+                        bundle_uuid = uuid.UUID(str(raw_uuid))
+                    except ValueError:
+                        logger.error("Invalid bundle job uuid on queue", extra={"value": raw_uuid})
+                        continue
+
+                    async with AsyncSessionLocal() as db:
+                        await process_bundle_job(db, bundle_uuid, pdf_executor=pdf_executor)
+
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Forensic bundle consumer loop error, reconnecting")
+                if redis_client is not None:
+                    try:
+                        await redis_client.aclose()
+                    except Exception:
+                        pass
+                    redis_client = None
+                await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        logger.info("Forensic bundle consumer cancelled")
+    finally:
+        if redis_client is not None:
+            await redis_client.aclose()
+        if pdf_executor is not None:
+            pdf_executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    # Worker dedie : python -m app.workers.forensic_bundle_consumer
+    asyncio.run(start_forensic_bundle_consumer())
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import uuid
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+from app.database import AsyncSessionLocal
+from app.services.bundle_exports import (
+    FORENSIC_EXPORT_QUEUE,
+    build_pdf_process_pool,
+    pending_export_job_uuids,
+    process_export_job,
+    reclaim_stale_export_jobs,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _requeue_pending_jobs(redis_client, *, reclaimed_only: bool = False) -> None:
+    # Exports RUNNING d'un worker mort, remis en PENDING, puis exports restes PENDING ;
+    # le passage periodique ne repousse que les exports repris.
+    async with AsyncSessionLocal() as db:
+        job_uuids = await reclaim_stale_export_jobs(db)
+        if not reclaimed_only:
+            job_uuids = await pending_export_job_uuids(db)
+    for job_uuid in job_uuids:
+        await redis_client.rpush(FORENSIC_EXPORT_QUEUE, str(job_uuid))
+    if job_uuids:
+        logger.info("Requeued pending forensic export jobs", extra={"count": len(job_uuids)})
+
+
+async def start_forensic_export_consumer() -> None:
+    logger.info("Starting forensic export consumer")
+    redis_client = None
+    # Pool de processus partage par tous les exports du worker (rendu ReportLab).
+    pdf_executor = build_pdf_process_pool()
+    loop = asyncio.get_running_loop()
+    next_reclaim_at = loop.time() + settings.FORENSIC_JOB_RECLAIM_INTERVAL_SECONDS
+
+    try:
+        while True:
+            try:
+                if redis_client is None:
+                    redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+                    await redis_client.ping()
+                    logger.info("Forensic export consumer connected to Redis")
+                    await _requeue_pending_jobs(redis_client)
+                elif loop.time() >= next_reclaim_at:
+                    next_reclaim_at = loop.time() + settings.FORENSIC_JOB_RECLAIM_INTERVAL_SECONDS
+                    await _requeue_pending_jobs(redis_client, reclaimed_only=True)
+
+                item = await redis_client.blpop(FORENSIC_EXPORT_QUEUE, timeout=1)
+                if item:
+                    _, raw_uuid = item
+                    try:
+                        job_uuid = uuid.UUID(str(raw_uuid))
+                    except ValueError:
+                        logger.error("Invalid export job uuid on queue", extra={"value": raw_uuid})
+                        continue
+
+                    async with AsyncSessionLocal() as db:
+                        await process_export_job(
+                            db,
+                            job_uuid,
+                            session_factory=AsyncSessionLocal,
+                            pdf_executor=pdf_executor,
+                        )
+
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Forensic export consumer loop error, reconnecting")
+                if redis_client is not None:
+                    try:
+                        await redis_client.aclose()
+                    except Exception:
+                        pass
+                    redis_client = None
+                await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        logger.info("Forensic export consumer cancelled")
+    finally:
+        if redis_client is not None:
+            await redis_client.aclose()
+        if pdf_executor is not None:
+            pdf_executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    # Worker dedie : python -m app.workers.forensic_export_consumer
+    asyncio.run(start_forensic_export_consumer())
@@ -11,6 +11,8 @@ from app.core.config import settings
 from app.database import AsyncSessionLocal
 from app.models import Alert, AnalysisResult, Evidence
 from app.models.source import ScrapingRun
+from app.services.evidence_store import retain_blob
+from app.services.write_events import ADMIN_AND_OWNER, TOPIC_OSINT, publish_write_event
 
 
 logger = logging.getLogger(__name__)
@@ -42,6 +44,23 @@ def _append_analysis_note(existing_note: str | None, new_line: str) -> str:
     return f"{current}\n{addition}"
 
 
+async def _publish_osint_result(alert: Alert | None, status: str, is_alert: bool) -> None:
+    if alert is None:
+        return
+    await publish_write_event(
+        TOPIC_OSINT,
+        kind="osint.result",
+        data={
+            "alert_uuid": str(alert.uuid),
+            "status": status,
+            "is_alert": is_alert,
+            "risk_score": alert.risk_score,
+        },
+        audience=ADMIN_AND_OWNER,
+        owner_user_id=alert.owner_user_id,
+    )
+
+
 def _build_failure_message(status: str, error_code: str, error: str) -> str:
     code = error_code or "UNKNOWN_ERROR"
     text = error or "No details"
@@ -122,6 +141,7 @@ async def process_result(result_data: dict) -> None:
                     db.add(scraping_run)
 
                 await db.commit()
+                await _publish_osint_result(alert, status, is_alert)
                 logger.warning(
                     "Result processed as failure",
                     extra={"task_id": str(task_uuid), "status": status, "error_code": error_code},
@@ -173,6 +193,9 @@ async def process_result(result_data: dict) -> None:
                             metadata_json=metadata,
                         )
                     )
+                    # Fichier ecrit par le scraper sur le volume partage : il est
+                    # reference tel quel (cle = chemin relatif) pour le comptage.
+                    await retain_blob(db, sha256=str(evidence_hash), storage_key=resolved_file_path)
                 else:
                     duplicate_note = (
                         f"Evidence hash already exists ({str(evidence_hash)[:16]}...), "
@@ -218,6 +241,7 @@ async def process_result(result_data: dict) -> None:
 
             await db.commit()
             logger.info("Result processed", extra={"task_id": str(task_uuid), "alert_id": alert.id})
+            await _publish_osint_result(alert, status, is_alert)
 
         except Exception:
             await db.rollback()
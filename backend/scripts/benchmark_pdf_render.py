@@ -0,0 +1,91 @@
+"""Micro-benchmark du rendu PDF forensique (regeneration en masse).
+
+Compare le temps par PDF quand les ressources de mise en page sont
+reconstruites a chaque rendu (comportement historique) et quand le
+`ForensicPdfTemplate` du processus est reutilise.
+
+Usage (depuis backend/) : python scripts/benchmark_pdf_render.py --runs 50
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.pdf_generator import ForensicPdfTemplate, generate_forensic_pdf, get_pdf_template  # noqa: E402
+
+
+SNAPSHOT = {
+    "snapshot_version": "2.0",
+    "engine_version": "v2.0.0",
+    "generated_at": "2026-10-19T10:00:00",
+    "data": {
+        "alert": {
+            "uuid": "b84c753d-5ddf-4fef-88bd-99e6f8f915d7",
+            "phone_number": "+22990000001",
+            "reported_message": "Agent MTN: renvoyez le code OTP recu pour debloquer votre compte.",
+            "citizen_channel": "WEB_PORTAL",
+            "created_at": "2026-10-19T09:50:00",
+            "risk_score": 88,
+            "status_at_snapshot": "CONFIRMED",
+            "recurrence_count": 4,
+        },
+        "analysis": {
+            "matched_rules": ["otp_request", "urgency"],
+            "factors_detected": ["Demande OTP", "Urgence artificielle"],
+            "risk_score": 88,
+            "generated_at": "2026-10-19T09:55:00",
+            "categories": [{"name": "Hameconnage mobile"}],
+        },
+        "evidences": [],
+    },
+}
+
+
+def _measure(runs: int, output_dir: Path, template_factory) -> list[float]:
+    durations: list[float] = []
+    for index in range(runs):
+        started = time.perf_counter()
+        generate_forensic_pdf(
+            SNAPSHOT,
+            str(output_dir / f"report_{index}.pdf"),
+            "a" * 64,
+            report_uuid=f"bench-{index}",
+            template=template_factory(),
+        )
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def _summary(label: str, durations: list[float]) -> str:
+    return (
+        f"{label:<22} mean={statistics.mean(durations):7.2f} ms"
+        f"  median={statistics.median(durations):7.2f} ms"
+        f"  total={sum(durations) / 1000:6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as raw_dir:
+        output_dir = Path(raw_dir)
+        # Echauffement : imports ReportLab, polices standard, cache du template.
+        _measure(2, output_dir, get_pdf_template)
+        rebuilt = _measure(args.runs, output_dir, ForensicPdfTemplate)
+        shared = _measure(args.runs, output_dir, get_pdf_template)
+
+    print(f"{args.runs} PDF par mode")
+    print(_summary("template reconstruit", rebuilt))
+    print(_summary("template partage", shared))
+    print(f"gain par PDF: {statistics.mean(rebuilt) - statistics.mean(shared):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401 - enregistre toutes les tables sur Base.metadata
+from app.database import Base
+
+
+IN_MEMORY_DATABASE_URL = "sqlite+aiosqlite://"
+
+
+@dataclass(frozen=True)
+class ScenarioDatabase:
+    engine: AsyncEngine
+    session_factory: sessionmaker
+
+
+@pytest.fixture
+def run_with_database() -> Callable[..., Any]:
+    """Execute `scenario(database)` sur une base SQLite neuve, toutes tables creees.
+
+    Base en memoire par defaut ; passer `database_url` (fichier sous `tmp_path`)
+    quand plusieurs sessions travaillent en parallele, la base en memoire
+    partageant une seule connexion. L'engine est libere apres le scenario.
+    """
+
+    def _run(
+        scenario: Callable[[ScenarioDatabase], Awaitable[Any]],
+        *,
+        database_url: str = IN_MEMORY_DATABASE_URL,
+    ) -> Any:
+        async def _wrapper() -> Any:
+            engine = create_async_engine(database_url)
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+                return await scenario(ScenarioDatabase(engine=engine, session_factory=session_factory))
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(_wrapper())
+
+    return _run
+
+
+@pytest.fixture
+def run_in_session(run_with_database) -> Callable[..., Any]:
+    """Execute `scenario(db)` dans une session, apres `seed(db)` s'il est fourni.
+
+    Le jeu de donnees est commite dans sa propre session : le scenario part
+    d'une session vierge, comme une requete HTTP.
+    """
+
+    def _run(
+        scenario: Callable[[AsyncSession], Awaitable[Any]],
+        *,
+        seed: Callable[[AsyncSession], Awaitable[Any]] | None = None,
+        database_url: str = IN_MEMORY_DATABASE_URL,
+    ) -> Any:
+        async def _in_session(database: ScenarioDatabase) -> Any:
+            if seed is not None:
+                async with database.session_factory() as db:
+                    await seed(db)
+                    await db.commit()
+            async with database.session_factory() as db:
+                return await scenario(db)
+
+        return run_with_database(_in_session, database_url=database_url)
+
+    return _run
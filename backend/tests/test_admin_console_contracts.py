@@ -5,7 +5,7 @@ from fastapi.testclient import TestClient
 
 from app.core.config import settings
 from app.core.security import create_access_token, get_current_active_principal
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.main import app
 
 
@@ -22,6 +22,7 @@ def build_client(fake_session: FakeSession | None = None) -> TestClient:
 
     app.dependency_overrides.clear()
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     return TestClient(app)
 
 
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import encode_cursor
+from app.models import (
+    BusinessProfile,
+    CitizenMessage,
+    ExternalTransmission,
+    ForensicBundle,
+    FormalReport,
+    ImpersonationIncident,
+    MessageAnalysis,
+    SuspectNumber,
+)
+from app.services.admin_console import list_admin_transmissions
+
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+async def _add_bundle(db: AsyncSession, index: int, *, businesses: tuple[BusinessProfile, ...] = ()) -> ForensicBundle:
+    message = CitizenMessage(content=f"Message {index}")
+    suspect = SuspectNumber(phone_hash=f"{index:064d}", phone_ciphertext="cipher")
+    db.add_all([message, suspect])
+    await db.flush()
+    analysis = MessageAnalysis(message_id=message.id, risk_score=80, risk_level="HIGH")
+    db.add(analysis)
+    await db.flush()
+    report = FormalReport(
+        public_reference=f"SIG-2026-{index:06d}",
+        message_id=message.id,
+        analysis_id=analysis.id,
+        suspect_number_id=suspect.id,
+        custody_hash="c" * 64,
+    )
+    db.add(report)
+    await db.flush()
+    for business in businesses:
+        db.add(ImpersonationIncident(business_profile_id=business.id, formal_report_id=report.id, custody_hash="i" * 64))
+    bundle = ForensicBundle(report_id=report.id, status="READY", manifest_json={})
+    db.add(bundle)
+    await db.flush()
+    return bundle
+
+
+async def _seed(db: AsyncSession) -> None:
+    mtn = BusinessProfile(user_id=1, official_name="MTN Benin")
+    moov = BusinessProfile(user_id=2, official_name="Moov Africa")
+    db.add_all([mtn, moov])
+    await db.flush()
+    # Deux incidents d'usurpation sur le meme rapport : l'ancienne jointure dupliquait ses transmissions.
+    impersonated = await _add_bundle(db, 1, businesses=(mtn, moov))
+    plain = await _add_bundle(db, 2)
+    db.add_all(
+        [
+            ExternalTransmission(bundle_id=impersonated.id, target_type="ANSSI_OCRC", status="DELIVERED", created_at=NOW),
+            ExternalTransmission(bundle_id=impersonated.id, target_type="OPERATORS", status="FAILED", created_at=NOW),
+            ExternalTransmission(
+                bundle_id=plain.id,
+                target_type="OPERATORS",
+                status="PENDING",
+                ack_reference="ACK-42",
+                created_at=NOW - timedelta(hours=1),
+            ),
+            ExternalTransmission(
+                bundle_id=plain.id, target_type="ANSSI_OCRC", status="DELIVERED", created_at=NOW - timedelta(hours=2)
+            ),
+        ]
+    )
+
+
+def test_business_search_does_not_duplicate_transmissions(run_in_session) -> None:
+    async def _scenario(db):
+        return (
+            await list_admin_transmissions(db, search="benin"),
+            await list_admin_transmissions(db, search="ACK-42"),
+            await list_admin_transmissions(db, search="SIG-2026-000002", status_filter="DELIVERED"),
+        )
+
+    business, ack, reference = run_in_session(_scenario, seed=_seed)
+
+    assert business.total == 2
+    assert [item.public_reference for item in business.items] == ["SIG-2026-000001", "SIG-2026-000001"]
+    assert (business.delivered_count, business.failed_count, business.pending_count) == (1, 1, 0)
+    assert [item.status for item in ack.items] == ["PENDING"]
+    # Le filtre de statut borne le total, pas la repartition par statut.
+    assert reference.total == 1
+    assert (reference.pending_count, reference.delivered_count) == (1, 1)
+
+
+def test_counts_come_from_one_query_and_pages_follow_the_cursor(run_in_session) -> None:
+    async def _scenario(db):
+        statements: list[str] = []
+
+        def _record(_conn, _cursor, statement, *_args) -> None:
+            if "count(" in statement:
+                statements.append(statement)
+
+        event.listen(db.bind.sync_engine, "before_cursor_execute", _record)
+        first = await list_admin_transmissions(db, limit=3)
+        event.remove(db.bind.sync_engine, "before_cursor_execute", _record)
+        second = await list_admin_transmissions(db, limit=3, cursor=first.next_cursor)
+        return first, second, statements
+
+    first, second, count_statements = run_in_session(_scenario, seed=_seed)
+
+    assert len(count_statements) == 1
+    assert first.total == 4
+    assert (first.delivered_count, first.failed_count, first.pending_count) == (2, 1, 1)
+    assert [item.status for item in first.items] == ["FAILED", "DELIVERED", "PENDING"]
+    assert [item.status for item in second.items] == ["DELIVERED"]
+    assert second.next_cursor is None
+    seen = {item.transmission_uuid for item in first.items + second.items}
+    assert len(seen) == 4
+
+
+def test_cursor_without_integer_id_is_rejected(run_in_session) -> None:
+    async def _scenario(db):
+        return await list_admin_transmissions(db, cursor=encode_cursor({"t": NOW, "i": None}))
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_in_session(_scenario, seed=_seed)
+
+    assert exc_info.value.status_code == 400
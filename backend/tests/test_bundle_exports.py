@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import (
+    CampaignAlert,
+    CitizenMessage,
+    ForensicBundle,
+    ForensicExportJob,
+    FormalReport,
+    MessageAnalysis,
+    SuspectNumber,
+)
+from app.services import bundle_exports, bundle_jobs
+from app.services.bundle_exports import (
+    EXPORT_MANIFEST_NAME,
+    EXPORT_SIGNATURE_NAME,
+    BundleExportFilter,
+    ExportArchiveWriter,
+    ExportDossier,
+    create_export_job,
+    process_export_job,
+    reclaim_stale_export_jobs,
+    select_export_reports,
+    verify_export_manifest,
+)
+from app.services.phone_privacy import derive_phone_hash, encrypt_phone
+from app.workers import forensic_export_consumer
+
+
+async def _add_report(
+    db: AsyncSession,
+    index: int,
+    *,
+    created_at: datetime,
+    phone: str,
+    category: str = "MOBILE_MONEY",
+    rules: list[str] | None = None,
+) -> FormalReport:
+    message = CitizenMessage(content=f"Message suspect {index}", channel="WEB_PORTAL", created_at=created_at)
+    db.add(message)
+    await db.flush()
+    analysis = MessageAnalysis(
+        message_id=message.id,
+        risk_score=80,
+        risk_level="HIGH",
+        primary_category=category,
+        matched_rules=rules or ["momo_pin"],
+    )
+    suspect = (
+        await db.execute(select(SuspectNumber).where(SuspectNumber.phone_hash == derive_phone_hash(phone)))
+    ).scalars().first()
+    if suspect is None:
+        suspect = SuspectNumber(phone_hash=derive_phone_hash(phone), phone_ciphertext=encrypt_phone(phone))
+        db.add(suspect)
+    db.add(analysis)
+    await db.flush()
+    report = FormalReport(
+        public_reference=f"SIG-2026-{index:06d}",
+        message_id=message.id,
+        analysis_id=analysis.id,
+        suspect_number_id=suspect.id,
+        custody_hash="c" * 64,
+        created_at=created_at,
+    )
+    db.add(report)
+    await db.flush()
+    return report
+
+
+def test_select_export_reports_applies_each_filter(run_in_session) -> None:
+    async def _scenario(db):
+        await _add_report(db, 1, created_at=datetime(2026, 9, 3, 10), phone="+22990000001")
+        await _add_report(db, 2, created_at=datetime(2026, 10, 2, 10), phone="+22990000001", category="PHISHING")
+        await _add_report(
+            db, 3, created_at=datetime(2026, 10, 5, 10), phone="+22990000002", rules=["fake_agent", "otp_request"]
+        )
+        await _add_report(
+            db, 4, created_at=datetime(2026, 10, 20, 10), phone="+22990000003", rules=["otp_request", "fake_agent"]
+        )
+        campaign = CampaignAlert(
+            campaign_type="FAKE_AGENT_OTP_REQUEST",
+            first_seen=datetime(2026, 10, 5, 11),
+            last_seen=datetime(2026, 10, 6, 10),
+        )
+        db.add(campaign)
+        await db.commit()
+
+        async def _refs(filters: BundleExportFilter) -> list[str]:
+            return [report.public_reference for report in await select_export_reports(db, filters)]
+
+        results = {
+            "october": await _refs(BundleExportFilter(date_from=datetime(2026, 10, 1), date_to=datetime(2026, 11, 1))),
+            "category": await _refs(BundleExportFilter(category="PHISHING")),
+            "suspect": await _refs(BundleExportFilter(suspect_phone_hash=derive_phone_hash("+229 90 00 00 01"))),
+            "campaign": await _refs(BundleExportFilter(campaign_id=campaign.id)),
+        }
+        return results
+
+    results = run_in_session(_scenario)
+
+    assert results["october"] == ["SIG-2026-000002", "SIG-2026-000003", "SIG-2026-000004"]
+    assert results["category"] == ["SIG-2026-000002"]
+    assert results["suspect"] == ["SIG-2026-000001", "SIG-2026-000002"]
+    # Report 4 a les memes regles mais tombe hors de la fenetre de la campagne.
+    assert results["campaign"] == ["SIG-2026-000003"]
+
+
+def test_select_export_reports_stops_at_the_cap_before_loading_reports(run_in_session) -> None:
+    async def _seed(db):
+        for index in range(3):
+            await _add_report(db, index + 1, created_at=datetime(2026, 10, index + 1, 10), phone="+22990000001")
+
+    async def _scenario(db):
+        statements: list[str] = []
+
+        def listener(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+        try:
+            with pytest.raises(ValueError, match="matches 3 reports"):
+                await select_export_reports(db, BundleExportFilter(), max_items=2)
+        finally:
+            event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+        return statements
+
+    statements = run_in_session(_scenario, seed=_seed)
+
+    # Un seul COUNT : ni liste d'ids ni chargement des relations.
+    assert len(statements) == 1 and "count(" in statements[0]
+
+
+def test_export_archive_streams_dossiers_with_signed_manifest(tmp_path: Path) -> None:
+    dossiers = []
+    for index in range(2):
+        source = tmp_path / f"dossier_{index}.zip"
+        source.write_bytes(f"zip-{index}".encode("utf-8") * 1000)
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()
+        dossiers.append(
+            ExportDossier(
+                archive_name=f"dossiers/SIG-2026-00000{index}_abcd1234.zip",
+                source=source,
+                # Le second dossier a ete altere depuis son rendu.
+                expected_sha256=digest if index == 0 else "0" * 64,
+                public_reference=f"SIG-2026-00000{index}",
+                report_uuid=str(uuid.uuid4()),
+                bundle_uuid=str(uuid.uuid4()),
+                snapshot_hash_sha256="s" * 64,
+                rendered=False,
+            )
+        )
+    writer = ExportArchiveWriter(
+        export_uuid=uuid.uuid4(),
+        filters={"category": "PHISHING"},
+        dossiers=dossiers,
+        failures=[{"public_reference": "SIG-2026-000009", "report_uuid": "x", "error": "boom"}],
+        signing_key=b"export-key",
+        chunk_size=512,
+    )
+    target = tmp_path / "exports" / "export.zip"
+
+    archive_hash = writer.write_to(target)
+
+    assert archive_hash == hashlib.sha256(target.read_bytes()).hexdigest()
+    with zipfile.ZipFile(target) as archive:
+        assert archive.getinfo(dossiers[0].archive_name).compress_type == zipfile.ZIP_STORED
+        assert archive.read(dossiers[1].archive_name) == dossiers[1].source.read_bytes()
+        manifest_bytes = archive.read(EXPORT_MANIFEST_NAME)
+        signature = json.loads(archive.read(EXPORT_SIGNATURE_NAME))
+
+    manifest = json.loads(manifest_bytes)
+    assert signature["manifest_sha256"] == hashlib.sha256(manifest_bytes).hexdigest() == writer.manifest_sha256
+    assert verify_export_manifest(manifest_bytes, signature["signature"], key=b"export-key")
+    assert not verify_export_manifest(manifest_bytes + b" ", signature["signature"], key=b"export-key")
+    assert [item["verified"] for item in manifest["dossiers"]] == [True, False]
+    listing = "".join(f"{item['sha256']}  {item['file']}\n" for item in manifest["dossiers"])
+    assert manifest["aggregate_sha256"] == hashlib.sha256(listing.encode("utf-8")).hexdigest()
+    assert manifest["failures"][0]["public_reference"] == "SIG-2026-000009"
+
+
+def test_export_job_renders_missing_bundles_then_reuses_them(run_with_database, monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(settings, "EVIDENCE_STORE_ROOT", str(tmp_path))
+    rendered: list[str] = []
+
+    def _fake_generate_forensic_pdf(_snapshot, output_path: str, _hash: str, report_uuid: str | None = None):
+        rendered.append(report_uuid)
+        Path(output_path).write_bytes(f"pdf-for-{report_uuid}".encode("utf-8"))
+        return output_path
+
+    async def _no_publish(*_args, **_kwargs) -> None:
+        return None
+
+    monkeypatch.setattr("app.api.v1.endpoints.reports.generate_forensic_pdf", _fake_generate_forensic_pdf)
+    monkeypatch.setattr(bundle_jobs, "publish_bundle_job_status", _no_publish)
+
+    async def _scenario(database):
+        async with database.session_factory() as db:
+            for index in range(3):
+                await _add_report(db, index + 1, created_at=datetime(2026, 10, index + 1, 9), phone="+22990000001")
+            await db.commit()
+
+            filters = BundleExportFilter(date_from=datetime(2026, 10, 1), date_to=datetime(2026, 11, 1))
+            first_job = await create_export_job(db, filters=filters)
+            first = await process_export_job(db, first_job.uuid, session_factory=database.session_factory)
+            renders_after_first = len(rendered)
+
+            second_job = await create_export_job(db, filters=filters)
+            second = await process_export_job(db, second_job.uuid, session_factory=database.session_factory)
+            bundle_count = len((await db.execute(select(ForensicBundle))).scalars().all())
+        return first, second, renders_after_first, bundle_count
+
+    # Base sur fichier : les rendus concurrents ouvrent chacun leur session.
+    first, second, renders_after_first, bundle_count = run_with_database(
+        _scenario, database_url=f"sqlite+aiosqlite:///{tmp_path / 'exports.db'}"
+    )
+
+    assert first.status == "READY" and second.status == "READY"
+    assert (first.total_items, first.processed_items, first.rendered_items, first.failed_items) == (3, 3, 3, 0)
+    assert (second.total_items, second.processed_items, second.rendered_items) == (3, 3, 0)
+    assert renders_after_first == len(rendered) == 3
+    assert bundle_count == 3
+
+    def _manifest(job) -> dict:
+        payload = (tmp_path / job.zip_path).read_bytes()
+        assert hashlib.sha256(payload).hexdigest() == job.archive_hash
+        with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+            return json.loads(archive.read(EXPORT_MANIFEST_NAME))
+
+    first_manifest, second_manifest = _manifest(first), _manifest(second)
+    assert first_manifest["dossier_count"] == 3
+    assert all(item["verified"] and item["rendered_for_export"] for item in first_manifest["dossiers"])
+    assert not any(item["rendered_for_export"] for item in second_manifest["dossiers"])
+    assert second_manifest["aggregate_sha256"] == first_manifest["aggregate_sha256"]
+
+
+class _WorkerCrash(BaseException):
+    """Arret brutal du worker pendant l'export."""
+
+
+def test_export_left_running_by_a_dead_worker_is_reclaimed(run_with_database, monkeypatch) -> None:
+    async def _crash(*_args, **_kwargs):
+        raise _WorkerCrash
+
+    class _FakeRedis:
+        def __init__(self) -> None:
+            self.pushed: list[str] = []
+
+        async def rpush(self, _queue: str, value: str) -> None:
+            self.pushed.append(value)
+
+    async def _scenario(database):
+        monkeypatch.setattr(bundle_exports, "select_export_reports", _crash)
+        monkeypatch.setattr(forensic_export_consumer, "AsyncSessionLocal", database.session_factory)
+        async with database.session_factory() as db:
+            job = await create_export_job(db, filters=BundleExportFilter())
+            with pytest.raises(_WorkerCrash):
+                await process_export_job(db, job.uuid, session_factory=database.session_factory)
+
+        async with database.session_factory() as db:
+            running = (await db.execute(select(ForensicExportJob).where(ForensicExportJob.uuid == job.uuid))).scalars().one()
+            state = (running.status, running.claimed_at)
+            fresh = await reclaim_stale_export_jobs(db, stale_after=timedelta(minutes=15), now=running.claimed_at + timedelta(minutes=1))
+        redis_client = _FakeRedis()
+        monkeypatch.setattr(settings, "FORENSIC_JOB_STALE_SECONDS", 0)
+        await forensic_export_consumer._requeue_pending_jobs(redis_client, reclaimed_only=True)
+        async with database.session_factory() as db:
+            reclaimed = (await db.execute(select(ForensicExportJob).where(ForensicExportJob.uuid == job.uuid))).scalars().one()
+        return job.uuid, state, fresh, redis_client.pushed, reclaimed
+
+    job_uuid, (status, claimed_at), fresh, pushed, reclaimed = run_with_database(_scenario)
+
+    assert status == "RUNNING" and claimed_at is not None
+    assert fresh == []
+    assert pushed == [str(job_uuid)]
+    assert (reclaimed.status, reclaimed.claimed_at) == ("PENDING", None)
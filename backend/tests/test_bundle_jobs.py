@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Request
+from sqlalchemy import select, update
+
+from app.api.v1.endpoints import reports
+from app.models import ExternalTransmission, ForensicBundle
+from app.services import bundle_jobs, external_transmissions
+from app.services.bundle_jobs import bundle_job_status, enqueue_bundle_job, process_bundle_job, reclaim_stale_bundle_jobs
+from app.workers import forensic_bundle_consumer
+
+
+REPORT = SimpleNamespace(id=1, public_reference="SIG-2026-000001", legacy_alert_uuid=uuid.uuid4())
+
+
+def _snapshot(generated_at: str, risk_score: int = 80) -> dict:
+    return {
+        "snapshot_version": "2.0",
+        "generated_at": generated_at,
+        "data": {"alert": {"uuid": str(REPORT.legacy_alert_uuid), "risk_score": risk_score}, "evidences": []},
+    }
+
+
+def test_enqueue_coalesces_jobs_with_identical_snapshot_content(run_in_session) -> None:
+    async def _scenario(db):
+        first, first_created = await enqueue_bundle_job(db, formal_report=REPORT, snapshot=_snapshot("2026-10-19T10:00:00"))
+        # Double clic : seul l'horodatage de generation differe.
+        second, second_created = await enqueue_bundle_job(db, formal_report=REPORT, snapshot=_snapshot("2026-10-19T10:00:01"))
+        changed, changed_created = await enqueue_bundle_job(
+            db, formal_report=REPORT, snapshot=_snapshot("2026-10-19T10:00:02", risk_score=95)
+        )
+        return (first, first_created), (second, second_created), (changed, changed_created)
+
+    (first, first_created), (second, second_created), (changed, changed_created) = run_in_session(_scenario)
+
+    assert first_created and not second_created and changed_created
+    assert second.uuid == first.uuid
+    assert changed.uuid != first.uuid
+    assert bundle_job_status(first) == "PENDING"
+
+
+def test_concurrent_enqueue_falls_back_to_the_active_job(run_with_database, monkeypatch) -> None:
+    async def _scenario(database):
+        async with database.session_factory() as winner:
+            first, _ = await enqueue_bundle_job(winner, formal_report=REPORT, snapshot=_snapshot("t0"))
+
+        async def _precheck_misses(db, **_kwargs):
+            return None
+
+        # La verification prealable rate le job du gagnant ; l'index unique tranche.
+        monkeypatch.setattr(bundle_jobs, "_find_existing_bundle", _precheck_misses)
+        async with database.session_factory() as loser:
+            second, created = await enqueue_bundle_job(loser, formal_report=REPORT, snapshot=_snapshot("t1"))
+        return first, second, created
+
+    first, second, created = run_with_database(_scenario)
+
+    assert created is False
+    assert second.uuid == first.uuid
+
+
+def test_bundle_job_status_ignores_transmission_states() -> None:
+    assert bundle_job_status(SimpleNamespace(status="RENDERING", global_hash=None)) == "RENDERING"
+    assert bundle_job_status(SimpleNamespace(status="QUEUED", global_hash="a" * 64)) == "READY"
+    assert bundle_job_status(SimpleNamespace(status="DELIVERED", global_hash="a" * 64)) == "READY"
+    assert bundle_job_status(SimpleNamespace(status="FAILED", global_hash=None)) == "FAILED"
+
+
+def test_enqueue_reuses_ready_bundle_until_the_snapshot_content_changes(run_in_session) -> None:
+    def _with_evidence(snapshot: dict, *, status: str, file_hash: str = "e" * 64) -> dict:
+        snapshot["data"]["evidences"] = [{"id": 1, "file_hash": file_hash, "status": status}]
+        return snapshot
+
+    async def _scenario(db):
+        first, _ = await enqueue_bundle_job(
+            db, formal_report=REPORT, snapshot=_with_evidence(_snapshot("t0"), status="ACTIVE")
+        )
+        first.status, first.global_hash, first.zip_path = "READY", "z" * 64, "forensic_bundles/first.zip"
+        await db.commit()
+
+        # Seuls l'horodatage et le scellement des preuves ont bouge : pas de rendu.
+        reused, reused_created = await enqueue_bundle_job(
+            db,
+            formal_report=REPORT,
+            snapshot=_with_evidence(_snapshot("t1"), status="SEALED"),
+            artifact_exists=lambda path: True,
+        )
+        missing_zip, missing_zip_created = await enqueue_bundle_job(
+            db,
+            formal_report=REPORT,
+            snapshot=_with_evidence(_snapshot("t2"), status="SEALED"),
+            artifact_exists=lambda path: False,
+        )
+        new_evidence, new_evidence_created = await enqueue_bundle_job(
+            db,
+            formal_report=REPORT,
+            snapshot=_with_evidence(_snapshot("t3"), status="SEALED", file_hash="f" * 64),
+            artifact_exists=lambda path: True,
+        )
+        return first, (reused, reused_created), (missing_zip, missing_zip_created), (new_evidence, new_evidence_created)
+
+    first, reused, missing_zip, new_evidence = run_in_session(_scenario)
+
+    assert reused == (first, False)
+    assert missing_zip[1] is True and missing_zip[0].uuid != first.uuid
+    assert new_evidence[1] is True and new_evidence[0].uuid not in {first.uuid, missing_zip[0].uuid}
+
+
+class _WorkerCrash(BaseException):
+    """Arret brutal du worker (OOM, SIGKILL) entre la prise du job et la fin du rendu."""
+
+
+def test_job_of_a_crashed_worker_is_reclaimed_and_requeued(run_with_database, monkeypatch) -> None:
+    async def _no_publish(*_args) -> None:
+        return None
+
+    async def _crash(*_args):
+        raise _WorkerCrash
+
+    class _FakeRedis:
+        def __init__(self) -> None:
+            self.pushed: list[str] = []
+
+        async def rpush(self, _queue: str, value: str) -> None:
+            self.pushed.append(value)
+
+    async def _scenario(database):
+        monkeypatch.setattr(bundle_jobs, "publish_bundle_job_status", _no_publish)
+        monkeypatch.setattr(bundle_jobs, "_load_bundle_for_render", _crash)
+        monkeypatch.setattr(forensic_bundle_consumer, "AsyncSessionLocal", database.session_factory)
+        async with database.session_factory() as db:
+            job, _ = await enqueue_bundle_job(db, formal_report=REPORT, snapshot=_snapshot("t0"))
+            with pytest.raises(_WorkerCrash):
+                await process_bundle_job(db, job.uuid)
+
+        async with database.session_factory() as db:
+            claimed = (await db.execute(select(ForensicBundle).where(ForensicBundle.uuid == job.uuid))).scalars().one()
+            claimed_at = claimed.claimed_at
+            # Un rendu encore dans les temps n'est pas repris.
+            fresh = await reclaim_stale_bundle_jobs(db, stale_after=timedelta(minutes=15), now=claimed_at + timedelta(minutes=1))
+            stale = await reclaim_stale_bundle_jobs(db, stale_after=timedelta(minutes=15), now=claimed_at + timedelta(minutes=20))
+            await db.refresh(claimed)
+            reclaimed = (claimed.status, claimed.claimed_at)
+
+            # Job RENDERING sans date de prise (anterieur a la colonne) : repris au demarrage.
+            await db.execute(update(ForensicBundle).where(ForensicBundle.uuid == job.uuid).values(status="RENDERING"))
+            await db.commit()
+        redis_client = _FakeRedis()
+        await forensic_bundle_consumer._requeue_pending_jobs(redis_client)
+        async with database.session_factory() as db:
+            requeued = (await db.execute(select(ForensicBundle).where(ForensicBundle.uuid == job.uuid))).scalars().one()
+        return job.uuid, claimed_at, fresh, stale, reclaimed, redis_client.pushed, requeued
+
+    job_uuid, claimed_at, fresh, stale, reclaimed, pushed, requeued = run_with_database(_scenario)
+
+    assert claimed_at is not None
+    assert fresh == []
+    assert stale == [job_uuid]
+    assert reclaimed == ("PENDING", None)
+    assert pushed == [str(job_uuid)]
+    assert requeued.status == "PENDING"
+
+
+def test_failed_render_fails_the_transmissions_waiting_for_the_bundle(run_with_database, monkeypatch) -> None:
+    published: list[dict] = []
+
+    async def _no_publish(*_args) -> None:
+        return None
+
+    async def _record_event(_topic, *, kind, data) -> None:
+        published.append(data)
+
+    async def _stub_bundle(_db, bundle_uuid):
+        return SimpleNamespace(uuid=bundle_uuid, report=SimpleNamespace(legacy_alert_uuid=None))
+
+    async def _render_fails(*_args, **_kwargs):
+        raise RuntimeError("disk full")
+
+    async def _scenario(database):
+        monkeypatch.setattr(bundle_jobs, "publish_bundle_job_status", _no_publish)
+        monkeypatch.setattr(bundle_jobs, "_load_bundle_for_render", _stub_bundle)
+        monkeypatch.setattr(reports, "_load_legacy_alert_with_evidences", _render_fails)
+        monkeypatch.setattr(external_transmissions, "publish_write_event", _record_event)
+        async with database.session_factory() as db:
+            job, _ = await enqueue_bundle_job(db, formal_report=REPORT, snapshot=_snapshot("t0"))
+            db.add_all(
+                [
+                    ExternalTransmission(bundle_id=job.id, target_type="ANSSI_OCRC", status="QUEUED"),
+                    ExternalTransmission(bundle_id=job.id, target_type="OPERATORS", status="PENDING"),
+                ]
+            )
+            await db.commit()
+            result = await process_bundle_job(db, job.uuid)
+
+        async with database.session_factory() as db:
+            bundle = (await db.execute(select(ForensicBundle).where(ForensicBundle.uuid == job.uuid))).scalars().one()
+            transmissions = (await db.execute(select(ExternalTransmission))).scalars().all()
+        return result, bundle, transmissions
+
+    result, bundle, transmissions = run_with_database(_scenario)
+
+    assert result is None
+    assert bundle.status == "FAILED"
+    assert {transmission.status for transmission in transmissions} == {"FAILED"}
+    assert all("disk full" in transmission.last_error for transmission in transmissions)
+    assert sorted(event["target"] for event in published) == ["ANSSI_OCRC", "OPERATORS"]
+    assert {event["status"] for event in published} == {"FAILED"}
+
+
+def test_downloads_report_the_job_status_while_the_bundle_renders(run_in_session) -> None:
+    async def _scenario(db):
+        bundle, _created = await enqueue_bundle_job(db, formal_report=REPORT, snapshot=_snapshot("2026-10-19T10:00:00"))
+        await db.commit()
+        request = Request({"type": "http", "method": "GET", "headers": []})
+        return (
+            await reports.download_pdf(bundle.uuid, request, db=db),
+            await reports.download_case_bundle(bundle.uuid, request, db=db, _=None),
+            bundle.uuid,
+        )
+
+    pdf_response, zip_response, bundle_uuid = run_in_session(_scenario)
+
+    for response in (pdf_response, zip_response):
+        assert response.status_code == 202
+        payload = json.loads(response.body)
+        assert payload["data"]["status"] == "PENDING"
+        assert payload["data"]["status_url"].endswith(f"/reports/jobs/{bundle_uuid}")
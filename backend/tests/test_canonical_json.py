@@ -0,0 +1,104 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+
+from app.services import canonical_json
+from app.services.canonical_json import canonical_encode, pretty_json_bytes
+from app.services.hashing import compute_snapshot_hash
+
+
+# Hashes produits par l'implementation d'origine de `compute_snapshot_hash`
+# (json.dumps trie, compact, ASCII) : les bundles deja scelles doivent verifier.
+SEALED_VECTORS = {
+    "empty": ({}, "44136fa355b3678a1146ad16f7e8649e94fb4fc21fe77e8310c060f61caaff8a"),
+    "legacy_v1": (
+        {
+            "snapshot_version": "1.0",
+            "generated_at": "2026-04-02T08:15:00",
+            "data": {
+                "alert": {
+                    "id": 12,
+                    "uuid": "7d9f3c2e-2a61-4b8e-9a51-0c4f1d2e3b4a",
+                    "url": "https://momo-bonus.example/promo",
+                    "risk_score": 85,
+                    "status_at_snapshot": "CONFIRMED",
+                },
+                "evidences": [{"id": 3, "type": "SCREENSHOT", "file_hash": "3e5a" + "0" * 60, "status": "SEALED"}],
+                "analysis": {"risk_score": 85, "categories": ["MOBILE_MONEY"], "generated_at": "2026-04-02T08:14:59"},
+            },
+        },
+        "7ecfd4ec4b23c48fc3577a63545bd4567224524574d09ada170ada4eed9b4cdd",
+    ),
+    "formal_v2_unicode": (
+        {
+            "snapshot_version": "2.0",
+            "engine_version": "v2.0.0",
+            "generated_at": "2026-10-19T10:00:00+00:00",
+            "data": {
+                "alert": {
+                    "uuid": "1b2c3d4e-5f60-4718-9a0b-1c2d3e4f5a6b",
+                    "reported_message": "Félicitations ! Vous avez gagné 50 000 FCFA — envoyez votre code",
+                    "phone_number": "+22990000001",
+                    "risk_score": 92,
+                    "public_reference": "SIG-2026-000042",
+                },
+                "evidences": [],
+                "analysis": {
+                    "entities": {"phones": ["+22990000001"]},
+                    "factors_detected": ["urgence", "récompense"],
+                    "matched_rules": ["momo_pin", "fake_agent"],
+                },
+            },
+        },
+        "3f733b83d3f9cdfb6015cd8a4e52f832baae3386689b89437187996d855a9d99",
+    ),
+    "edge_values": (
+        {
+            "floats": [0.1, 1e-05, 1e16, -2.5e300, 100.0],
+            "control": "tab\tnl\ndel\x7f",
+            "nested": [[], {}, None, True, False],
+            "big": 2**70,
+            "zz": {"b": 1, "a": 2, "A": 3, "é": 4},
+        },
+        "ea13bbbf36dc228979bb997981262f27e637837aa0593f11aa65c62c4f0193bf",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(SEALED_VECTORS))
+def test_sealed_snapshot_hashes_still_verify(name: str) -> None:
+    snapshot, expected = SEALED_VECTORS[name]
+
+    document = canonical_encode(snapshot)
+
+    assert document.sha256 == compute_snapshot_hash(snapshot) == expected
+    assert hashlib.sha256(document.data).hexdigest() == expected
+
+
+def test_canonical_bytes_are_sorted_compact_and_ascii() -> None:
+    document = canonical_encode({"b": [1, 2.5e20], "a": "é"})
+
+    assert document.data == b'{"a":"\\u00e9","b":[1,2.5e+20]}'
+
+
+@dataclass
+class _Marker:
+    label: str
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_pretty_artifact_matches_the_standard_encoder(monkeypatch, use_orjson: bool) -> None:
+    if use_orjson and canonical_json.orjson is None:
+        pytest.skip("orjson non installe")
+    if not use_orjson:
+        monkeypatch.setattr(canonical_json, "orjson", None)
+    snapshot = SEALED_VECTORS["formal_v2_unicode"][0]
+    with_objects = {"at": datetime(2026, 10, 19, 10, 0), "marker": _Marker("x"), "ids": {1: "int key"}}
+
+    assert pretty_json_bytes(snapshot) == json.dumps(snapshot, ensure_ascii=False, indent=2).encode("utf-8")
+    assert pretty_json_bytes(with_objects, default=str) == json.dumps(
+        with_objects, ensure_ascii=False, indent=2, default=str
+    ).encode("utf-8")
@@ -6,6 +6,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from types import SimpleNamespace
 import hashlib
+import os
+import tracemalloc
 import uuid
 
 import pytest
@@ -15,7 +17,7 @@ from app.core.config import settings
 from app.core.security import create_access_token
 from app.database import get_db
 from app.main import app
-from app.services.case_bundle import generate_case_bundle
+from app.services.case_bundle import CaseBundleWriter, generate_case_bundle
 
 
 class FakeResult:
@@ -178,6 +180,42 @@ async def test_snapshot_has_required_fields() -> None:
     assert "report" in snapshot
 
 
+def test_streaming_writer_hashes_entries_while_streaming(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "large.pdf"
+    pdf_path.write_bytes(os.urandom(3 * 1024 * 1024))
+    writer = CaseBundleWriter({"id": "12345678-alert"}, {"id": "report-1"}, pdf_path)
+
+    chunks = list(writer.iter_chunks())
+
+    assert max(len(chunk) for chunk in chunks) < 512 * 1024
+    payload = b"".join(chunks)
+    assert writer.zip_sha256 == hashlib.sha256(payload).hexdigest()
+    assert writer.size_bytes == len(payload)
+    with zipfile.ZipFile(io.BytesIO(payload), "r") as archive:
+        assert archive.read(writer.pdf_name) == pdf_path.read_bytes()
+        manifest = archive.read("manifest_integrite.txt").decode("utf-8")
+    assert writer.entry_hashes[writer.pdf_name] == hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+    assert writer.entry_hashes[writer.pdf_name] in manifest
+    assert writer.entry_hashes[writer.snapshot_name] in manifest
+
+
+def test_streaming_writer_memory_stays_flat(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "large.pdf"
+    pdf_path.write_bytes(os.urandom(12 * 1024 * 1024))
+    target = tmp_path / "bundles" / "dossier.zip"
+
+    tracemalloc.start()
+    try:
+        zip_hash = CaseBundleWriter({"id": "12345678-alert"}, {"id": "report-1"}, pdf_path).write_to(target)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 2 * 1024 * 1024
+    assert zip_hash == hashlib.sha256(target.read_bytes()).hexdigest()
+    assert not list(target.parent.glob("*.part"))
+
+
 def test_endpoint_returns_zip(monkeypatch, tmp_path: Path) -> None:
     fake_report = build_fake_report(tmp_path / "report_case_bundle.pdf")
     fake_session = FakeSession(fake_report)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import encode_cursor
+from app.models import CitizenMessage, FormalReport, MessageAnalysis, SuspectNumber
+from app.services.incidents import list_citizen_incidents
+from app.services.search_text import build_report_search_text, search_like_pattern
+
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+CONTENTS = (
+    "Faux agent MTN au Bénin, demande de code",
+    "Promo 100% gratuite sur https://promo.example",
+    "Appel suspect depuis COTONOU",
+    "Transfert bloque, rappeler le service client",
+    "Lien de paiement https://pay.example/verif",
+)
+
+
+async def _seed(db: AsyncSession) -> None:
+    for index, content in enumerate(CONTENTS, start=1):
+        message = CitizenMessage(content=content)
+        suspect = SuspectNumber(phone_hash=f"{index:064d}", phone_ciphertext="cipher")
+        db.add_all([message, suspect])
+        await db.flush()
+        analysis = MessageAnalysis(message_id=message.id, risk_score=70, risk_level="HIGH")
+        db.add(analysis)
+        await db.flush()
+        public_reference = f"SIG-2026-{index:06d}"
+        db.add(
+            FormalReport(
+                public_reference=public_reference,
+                message_id=message.id,
+                analysis_id=analysis.id,
+                suspect_number_id=suspect.id,
+                custody_hash="c" * 64,
+                reporter_user_id=7 if index % 2 else 8,
+                # Deux rapports au meme instant : l'id departage l'ordre.
+                created_at=NOW - timedelta(hours=min(index, 4)),
+                search_text=build_report_search_text(
+                    content=content, submitted_url=None, public_reference=public_reference
+                ),
+            )
+        )
+
+
+def _numbers(page) -> list[int]:
+    return [CONTENTS.index(item.message_preview) + 1 for item in page.items]
+
+
+def test_search_text_is_folded_and_like_pattern_escaped() -> None:
+    assert build_report_search_text(content="Arnaque  au BÉNIN", submitted_url=None, public_reference="SIG-1") == (
+        "arnaque au benin sig-1"
+    )
+    assert search_like_pattern("  100%_Gratuit ") == "%100\\%\\_gratuit%"
+    assert search_like_pattern("   ") is None
+
+
+def test_search_matches_without_accents_or_case(run_in_session) -> None:
+    async def _scenario(db):
+        return (
+            await list_citizen_incidents(db, skip=0, limit=10, search="benin"),
+            await list_citizen_incidents(db, skip=0, limit=10, search="cotonou"),
+            await list_citizen_incidents(db, skip=0, limit=10, search="100%"),
+            await list_citizen_incidents(db, skip=0, limit=10, search="sig-2026-000005"),
+        )
+
+    benin, cotonou, percent, reference = run_in_session(_scenario, seed=_seed)
+
+    assert _numbers(benin) == [1]
+    assert _numbers(cotonou) == [3]
+    assert _numbers(percent) == [2]
+    assert _numbers(reference) == [5]
+
+
+def test_cursor_pages_follow_created_at_then_id_without_overlap(run_in_session) -> None:
+    async def _scenario(db):
+        pages = []
+        cursor = None
+        while True:
+            page = await list_citizen_incidents(db, skip=0, limit=2, cursor=cursor)
+            pages.append(page)
+            cursor = page.next_cursor
+            if cursor is None:
+                return pages
+
+    pages = run_in_session(_scenario, seed=_seed)
+
+    assert [number for page in pages for number in _numbers(page)] == [1, 2, 3, 5, 4]
+    assert [page.total for page in pages] == [5, 5, 5]
+    assert all(not page.total_is_estimate for page in pages)
+
+
+def test_cursor_combines_with_owner_scope_and_estimate_falls_back_to_exact(run_in_session) -> None:
+    async def _scenario(db):
+        first = await list_citizen_incidents(db, skip=0, limit=1, owner_user_id=7, count_mode="estimate")
+        second = await list_citizen_incidents(db, skip=0, limit=5, owner_user_id=7, cursor=first.next_cursor)
+        return first, second
+
+    first, second = run_in_session(_scenario, seed=_seed)
+
+    assert first.total == 3
+    assert first.total_is_estimate is False
+    assert _numbers(second) == [3, 5]
+    assert second.next_cursor is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor({"t": NOW}), encode_cursor({"t": NOW, "i": "abc"})])
+def test_invalid_cursor_is_rejected(run_in_session, cursor: str) -> None:
+    async def _scenario(db):
+        return await list_citizen_incidents(db, skip=0, limit=5, cursor=cursor)
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_in_session(_scenario, seed=_seed)
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from functools import partial
+
+from sqlalchemy import event, func, select
+
+from app.models import BusinessProfile, ExternalTransmission, ForensicBundle, FormalReport, ImpersonationIncident, SuspectNumber
+from app.schemas.signal import IncidentReportRequest
+from app.services.bundle_jobs import process_bundle_job
+from app.services.citizen_flow import create_citizen_report
+from app.services.phone_privacy import derive_phone_hash, encrypt_phone
+from app.services.write_events import WRITE_EVENTS_CHANNEL
+
+
+PHONE = "+22990000042"
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeRedis") -> None:
+        self._client = client
+        self._published: list[tuple[str, str]] = []
+
+    def publish(self, channel: str, message: str) -> None:
+        self._published.append((channel, message))
+
+    def xadd(self, *_args, **_kwargs) -> None:
+        return None
+
+    async def execute(self) -> None:
+        self._client.published.extend(self._published)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.rpush_calls: list[tuple[str, str]] = []
+        self.published: list[tuple[str, str]] = []
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def rpush(self, queue: str, payload: str) -> None:
+        self.rpush_calls.append((queue, payload))
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+
+    async def aclose(self) -> None:
+        return None
+
+
+async def _run_report(monkeypatch, database, *, render_bundle: bool = False) -> tuple[list[str], int, FakeRedis]:
+    engine, session_factory = database.engine, database.session_factory
+    async with session_factory() as seed:
+        seed.add(SuspectNumber(phone_hash=derive_phone_hash(PHONE), phone_ciphertext=encrypt_phone(PHONE), report_count=2))
+        seed.add(BusinessProfile(user_id=1, official_name="MTN Benin", keywords_json=["mtn"], validation_status="ACTIVE"))
+        await seed.commit()
+
+    fake_redis = FakeRedis()
+
+    async def _fake_register_signal(**_kwargs):
+        return {"campaign_detected": True, "count": 5, "type": "MOMO_OTP", "rules": ["otp"]}
+
+    monkeypatch.setattr("app.services.citizen_flow.redis.from_url", lambda *_args, **_kwargs: fake_redis)
+    monkeypatch.setattr("app.services.external_transmissions.redis.from_url", lambda *_args, **_kwargs: fake_redis)
+    monkeypatch.setattr("app.services.bundle_jobs.redis.from_url", lambda *_args, **_kwargs: fake_redis)
+    monkeypatch.setattr("app.services.citizen_flow.register_signal", _fake_register_signal)
+
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement.split(None, 1)[0].upper())
+
+    def _record_commit(_conn) -> None:
+        statements.append("COMMIT")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    event.listen(engine.sync_engine, "commit", _record_commit)
+    async with session_factory() as db:
+        await create_citizen_report(
+            IncidentReportRequest(
+                message="Agent MTN: renvoyez le code OTP recu pour debloquer votre compte",
+                phone=PHONE,
+                channel="WEB_PORTAL",
+                department="Littoral",
+            ),
+            db,
+        )
+    event.remove(engine.sync_engine, "before_cursor_execute", _record)
+    event.remove(engine.sync_engine, "commit", _record_commit)
+
+    async with session_factory() as check:
+        transmissions = int(await check.scalar(select(func.count(ExternalTransmission.id))) or 0)
+        assert await check.scalar(select(func.count(FormalReport.id))) == 1
+        assert await check.scalar(select(func.count(ImpersonationIncident.id))) == 1
+        bundle_uuid = await check.scalar(select(ForensicBundle.uuid))
+
+    if render_bundle:
+        async with session_factory() as worker_db:
+            bundle = await process_bundle_job(worker_db, bundle_uuid)
+            assert bundle is not None
+            assert bundle.status == "QUEUED"
+            assert bundle.global_hash and bundle.pdf_path and bundle.zip_path
+            payloads = [transmission.payload_json for transmission in bundle.transmissions]
+            assert {payload["bundle_hash_sha256"] for payload in payloads} == {bundle.global_hash}
+            assert all(payload["artifacts"]["zip_path"] == bundle.zip_path for payload in payloads)
+        async with session_factory() as worker_db:
+            assert await process_bundle_job(worker_db, bundle_uuid) is None
+    return statements, transmissions, fake_redis
+
+
+def test_citizen_report_is_a_single_unit_of_work(monkeypatch, run_with_database, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    statements, transmissions, fake_redis = run_with_database(partial(_run_report, monkeypatch))
+
+    assert transmissions == 2
+    # Le rendu du bundle est differe : seul le job part sur la file, pas les transmissions.
+    assert [queue for queue, _ in fake_redis.rpush_calls] == ["forensic_bundle_queue"]
+    assert statements.count("COMMIT") == 1
+    # Un seul evenement d'ecriture, publie apres le commit.
+    events = [json.loads(message) for channel, message in fake_redis.published if channel == WRITE_EVENTS_CHANNEL]
+    assert [event["topics"] for event in events] == [["reports", "transmissions", "campaigns"]]
+    assert events[0]["kind"] == "report.created"
+    assert events[0]["data"]["campaign_detected"] is True
+    # Avant regroupement : 38 instructions dont 4 COMMIT (refresh + rechargement du rapport).
+    assert len(statements) <= 17, statements
+
+
+def test_bundle_worker_renders_then_releases_transmissions(monkeypatch, run_with_database, tmp_path) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    _statements, _transmissions, fake_redis = run_with_database(partial(_run_report, monkeypatch, render_bundle=True))
+
+    assert [queue for queue, _ in fake_redis.rpush_calls] == [
+        "forensic_bundle_queue",
+        "external_transmissions_queue",
+        "external_transmissions_queue",
+    ]
+    assert [message for channel, message in fake_redis.published if channel != WRITE_EVENTS_CHANNEL] == [
+        "RENDERING",
+        "READY",
+    ]
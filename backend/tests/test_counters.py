@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+import app.core.counters as counters_module
+from app.core.counters import Counter, CounterSource, compile_counters, run_counters
+from app.models import BusinessProfile, SuspectNumber, User
+
+
+BUSINESSES = CounterSource("business_profiles", BusinessProfile)
+NUMBERS = CounterSource("suspect_numbers", SuspectNumber, where=(SuspectNumber.report_count > 0,))
+COUNTERS = (
+    Counter("active", BUSINESSES, filter=BusinessProfile.validation_status == "ACTIVE"),
+    Counter("pending", BUSINESSES, filter=BusinessProfile.validation_status == "PENDING_APPROVAL"),
+    Counter("campaigns", NUMBERS, filter=SuspectNumber.report_count >= 3),
+    Counter("reports", NUMBERS, column=SuspectNumber.report_count, kind="sum"),
+    Counter("last_seen", NUMBERS, column=SuspectNumber.last_seen, kind="max"),
+)
+
+
+@dataclass(frozen=True)
+class Totals:
+    active: int
+    pending: int
+    campaigns: int
+    reports: int
+    last_seen: datetime | None
+
+
+def test_counters_compile_to_one_filtered_select_per_source() -> None:
+    statements = compile_counters(COUNTERS)
+
+    assert [source.name for source, _stmt in statements] == ["business_profiles", "suspect_numbers"]
+    business_sql = str(statements[0][1].compile(dialect=postgresql.dialect()))
+    assert business_sql.count("count(*) FILTER (WHERE") == 2
+    assert "FROM business_profiles" in business_sql
+    numbers_sql = str(statements[1][1].compile(dialect=postgresql.dialect()))
+    assert "WHERE suspect_numbers.report_count >" in numbers_sql
+
+
+async def _seed(db) -> None:
+    users = [User(email=f"pme{index}@local.test", password_hash="x", role="SME") for index in range(3)]
+    db.add_all(users)
+    await db.flush()
+    db.add_all(
+        [
+            BusinessProfile(user_id=users[0].id, official_name="A", validation_status="ACTIVE"),
+            BusinessProfile(user_id=users[1].id, official_name="B", validation_status="ACTIVE"),
+            BusinessProfile(user_id=users[2].id, official_name="C", validation_status="PENDING_APPROVAL"),
+            SuspectNumber(phone_hash="1" * 64, phone_ciphertext="x", report_count=4),
+            SuspectNumber(phone_hash="2" * 64, phone_ciphertext="x", report_count=1),
+            SuspectNumber(phone_hash="3" * 64, phone_ciphertext="x", report_count=0),
+        ]
+    )
+
+
+async def _count(db) -> Totals:
+    return await run_counters(db, COUNTERS, Totals)
+
+
+async def _count_concurrently(db) -> Totals:
+    # Chemin PostgreSQL : une connexion du pool par source.
+    original = counters_module._concurrent_engine
+    counters_module._concurrent_engine = lambda session: session.bind
+    try:
+        return await run_counters(db, COUNTERS, Totals)
+    finally:
+        counters_module._concurrent_engine = original
+
+
+def test_run_counters_returns_typed_results(run_in_session) -> None:
+    totals = run_in_session(_count, seed=_seed)
+
+    assert (totals.active, totals.pending, totals.campaigns, totals.reports) == (2, 1, 1, 5)
+    assert totals.last_seen is not None
+
+
+def test_run_counters_runs_sources_on_separate_connections(run_in_session, tmp_path) -> None:
+    # Base sur fichier : chaque source ouvre sa propre connexion.
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'counters.db'}"
+    totals = run_in_session(_count_concurrently, seed=_seed, database_url=database_url)
+
+    assert (totals.active, totals.pending, totals.campaigns, totals.reports) == (2, 1, 1, 5)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    CitizenMessage,
+    ExternalTransmission,
+    ForensicBundle,
+    FormalReport,
+    MessageAnalysis,
+    ReportDailyRollup,
+    SuspectNumber,
+)
+from app.services.admin_console import get_admin_dashboard
+from app.services.map_overview import get_map_overview
+from app.services.dashboard_rollups import (
+    _report_rollup_select,
+    compact_dashboard_rollups,
+    read_dashboard_rollups,
+    rebuild_dashboard_rollups,
+)
+
+
+NOW = datetime.now(timezone.utc).replace(microsecond=0)
+
+
+async def _add_report(
+    db: AsyncSession,
+    index: int,
+    *,
+    created_at: datetime,
+    status: str = "NEW",
+    department: str | None = "Littoral",
+    message_department: str | None = None,
+    category: str | None = "mobile_money",
+    risk_score: int = 80,
+) -> FormalReport:
+    message = CitizenMessage(content=f"Message {index}", department=message_department)
+    suspect = SuspectNumber(phone_hash=f"{index:064d}", phone_ciphertext="cipher")
+    db.add_all([message, suspect])
+    await db.flush()
+    analysis = MessageAnalysis(message_id=message.id, risk_score=risk_score, risk_level="HIGH", primary_category=category)
+    db.add(analysis)
+    await db.flush()
+    report = FormalReport(
+        public_reference=f"SIG-2026-{index:06d}",
+        message_id=message.id,
+        analysis_id=analysis.id,
+        suspect_number_id=suspect.id,
+        custody_hash="c" * 64,
+        status=status,
+        department=department,
+        created_at=created_at,
+    )
+    db.add(report)
+    await db.flush()
+    return report
+
+
+async def _seed(db: AsyncSession) -> list[FormalReport]:
+    reports = [
+        await _add_report(db, 1, created_at=NOW),
+        # Rapport anterieur a la colonne department : resolu par le compacteur.
+        await _add_report(db, 2, created_at=NOW, status="CONFIRMED", department=None, message_department="oueme"),
+        await _add_report(db, 3, created_at=NOW - timedelta(days=2), category=None, risk_score=20),
+        await _add_report(db, 4, created_at=NOW - timedelta(days=30), status="DISMISSED"),
+    ]
+    bundle = ForensicBundle(report_id=reports[0].id, status="READY", manifest_json={})
+    db.add(bundle)
+    await db.flush()
+    db.add_all(
+        [
+            ExternalTransmission(bundle_id=bundle.id, target_type="ANSSI_OCRC", status="DELIVERED", created_at=NOW),
+            ExternalTransmission(bundle_id=bundle.id, target_type="OPERATORS", status="FAILED", created_at=NOW),
+        ]
+    )
+    await db.commit()
+    return reports
+
+
+def test_rebuild_groups_reports_by_day_department_category_risk_and_status(run_in_session) -> None:
+    async def _scenario(db):
+        await _seed(db)
+        refresh = await rebuild_dashboard_rollups(db, now=NOW)
+        rows = (await db.execute(select(ReportDailyRollup))).scalars().all()
+        totals = await read_dashboard_rollups(db, since_day=(NOW - timedelta(days=6)).date())
+        return refresh, rows, totals
+
+    refresh, rows, totals = run_in_session(_scenario)
+
+    assert refresh.full_rebuild is True
+    keys = {(row.day, row.department, row.category, row.risk_bucket, row.status): row.report_count for row in rows}
+    assert keys[(NOW.date(), "Oueme", "mobile_money", "high", "CONFIRMED")] == 1
+    assert keys[((NOW - timedelta(days=2)).date(), "Littoral", "non_classe", "low", "NEW")] == 1
+    assert totals.total_reports == 4
+    assert totals.reports_by_status == {"NEW": 2, "CONFIRMED": 1, "DISMISSED": 1}
+    # Le rapport hors fenetre compte dans les totaux mais pas dans les jours.
+    assert totals.reports_by_day == {NOW.date(): 2, (NOW - timedelta(days=2)).date(): 1}
+    assert totals.reports_by_category == {"mobile_money": 3, "non_classe": 1}
+    assert totals.transmissions_by_status == {"DELIVERED": 1, "FAILED": 1}
+
+
+def test_compaction_recounts_only_days_touched_since_the_watermark(run_in_session) -> None:
+    async def _scenario(db):
+        reports = await _seed(db)
+        await rebuild_dashboard_rollups(db, now=NOW - timedelta(hours=1))
+
+        # Changement de statut d'un vieux rapport et nouveau signalement du jour.
+        reports[3].status = "CONFIRMED"
+        reports[3].updated_at = NOW
+        await _add_report(db, 5, created_at=NOW, status="IN_REVIEW")
+        await db.commit()
+
+        refresh = await compact_dashboard_rollups(db, now=NOW)
+        totals = await read_dashboard_rollups(db, since_day=(NOW - timedelta(days=6)).date())
+        return refresh, totals
+
+    refresh, totals = run_in_session(_scenario)
+
+    assert refresh.full_rebuild is False
+    assert refresh.report_days == 2
+    assert totals.total_reports == 5
+    assert totals.reports_by_status == {"NEW": 2, "IN_REVIEW": 1, "CONFIRMED": 2}
+    assert totals.reports_by_day[NOW.date()] == 3
+
+
+def test_admin_dashboard_reads_counters_from_rollups(run_in_session) -> None:
+    async def _scenario(db):
+        await _seed(db)
+        await compact_dashboard_rollups(db, now=NOW)
+        # Ecrit apres le passage du compacteur : pas encore visible.
+        await _add_report(db, 6, created_at=NOW)
+        await db.commit()
+        dashboard = await get_admin_dashboard(db)
+        return dashboard
+
+    dashboard = run_in_session(_scenario)
+
+    assert dashboard.total_reports == 4
+    assert dashboard.daily_reports == 2
+    assert dashboard.open_reports == 2
+    assert dashboard.confirmed_reports == 1
+    assert dashboard.reports_by_status["DISMISSED"] == 1
+    assert dashboard.transmissions_by_status["DELIVERED"] == 1
+    assert dashboard.transmission_success_rate == 50.0
+    assert dashboard.reports_by_category[0].category == "mobile_money"
+    assert dashboard.reports_by_day[-1].count == 2
+
+
+def test_map_overview_groups_rollups_by_department(run_in_session) -> None:
+    async def _scenario(db):
+        await _seed(db)
+        await rebuild_dashboard_rollups(db, now=NOW)
+        overview = await get_map_overview(db, window="7d")
+        high_only = await get_map_overview(db, window="7d", risk="high")
+        unclassified = await get_map_overview(db, window="30d", category="NON_CLASSE")
+        return overview, high_only, unclassified
+
+    overview, high_only, unclassified = run_in_session(_scenario)
+
+    assert (overview.total_reports, overview.high_risk_reports) == (3, 2)
+    points = {point.department: point for point in overview.departments}
+    assert (points["Littoral"].count, points["Littoral"].high_risk_count) == (2, 1)
+    assert points["Littoral"].dominant_category == "mobile_money"
+    assert points["Oueme"].count == 1
+    assert overview.dominant_category == "mobile_money"
+    assert [item.department for item in overview.recent_transmissions] == ["Littoral", "Littoral"]
+    assert high_only.total_reports == 2
+    assert unclassified.total_reports == 1
+
+
+def test_postgresql_rollup_days_are_computed_in_utc() -> None:
+    stmt = _report_rollup_select("postgresql", [NOW.date()])
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    # Meme expression dans SELECT et GROUP BY, independante du fuseau de la session.
+    assert sql.count("date(timezone('UTC', formal_reports.created_at))") == 2
@@ -0,0 +1,192 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.db_metrics import POOL_CHECKOUT_SECONDS, InstrumentedAsyncPool
+from app.database import ReadReplicaRouter, build_engine_options
+
+
+POSTGRES_URL = "postgresql+asyncpg://user:pass@db:5432/osint_db"
+
+
+def test_engine_options_use_pool_settings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 15)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 5)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE_SECONDS", 600)
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_MODE", False)
+
+    options = build_engine_options(POSTGRES_URL, pool_label="replica")
+
+    assert options["poolclass"] is InstrumentedAsyncPool
+    assert options["pool_logging_name"] == "replica"
+    assert options["pool_size"] == 15
+    assert options["max_overflow"] == 5
+    assert options["pool_recycle"] == 600
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"]["statement_cache_size"] == settings.DB_STATEMENT_CACHE_SIZE
+
+
+def test_engine_options_pgbouncer_mode_disables_statement_caches(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DB_PGBOUNCER_MODE", True)
+
+    connect_args = build_engine_options(POSTGRES_URL)["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    first_name = connect_args["prepared_statement_name_func"]()
+    assert first_name != connect_args["prepared_statement_name_func"]()
+
+
+def test_engine_options_without_pool(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 0)
+
+    options = build_engine_options(POSTGRES_URL)
+
+    assert options["poolclass"] is NullPool
+    assert "pool_size" not in options
+
+
+def test_engine_options_sqlite_skip_pool_and_driver_args() -> None:
+    options = build_engine_options("sqlite+aiosqlite:///./replica.db")
+
+    assert options == {"echo": settings.SQL_ECHO}
+
+
+def test_instrumented_pool_records_checkout_latency() -> None:
+    pool = InstrumentedAsyncPool(lambda: MagicMock(), pool_size=1, max_overflow=0, logging_name="unit-test")
+    before = POOL_CHECKOUT_SECONDS.labels(pool="unit-test")._sum.get()
+
+    connection = pool.connect()
+    connection.close()
+
+    assert POOL_CHECKOUT_SECONDS.labels(pool="unit-test")._sum.get() > before
+
+
+class FakeConnection:
+    def __init__(self, lag_seconds: float | None) -> None:
+        self.dialect = SimpleNamespace(name="postgresql")
+        self.lag_seconds = lag_seconds
+
+    async def execute(self, _statement):
+        return SimpleNamespace(scalar=lambda: self.lag_seconds)
+
+
+class FakeReplicaEngine:
+    def __init__(self, lag_seconds: float | None = 0.0, *, down: bool = False, delay: float = 0.0) -> None:
+        self.lag_seconds = lag_seconds
+        self.down = down
+        self.delay = delay
+        self.probes = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self.probes += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.down:
+            raise ConnectionRefusedError("replica down")
+        yield FakeConnection(self.lag_seconds)
+
+
+def _primary_factory():
+    return "primary-session"
+
+
+def _replica_factory():
+    return "replica-session"
+
+
+def build_router(
+    replica_engine: FakeReplicaEngine | None,
+    clock=lambda: 100.0,
+    probe_wait_seconds: float = 0.5,
+) -> ReadReplicaRouter:
+    return ReadReplicaRouter(
+        primary_sessionmaker=_primary_factory,
+        replica_sessionmaker=_replica_factory if replica_engine else None,
+        replica_engine=replica_engine,
+        max_lag_seconds=5.0,
+        check_interval_seconds=10.0,
+        probe_wait_seconds=probe_wait_seconds,
+        clock=clock,
+    )
+
+
+def test_router_sends_reads_to_healthy_replica() -> None:
+    router = build_router(FakeReplicaEngine(lag_seconds=1.5))
+
+    factory = asyncio.run(router.sessionmaker_for(read_only=True))
+
+    assert factory is _replica_factory
+
+
+def test_router_keeps_writes_and_strong_reads_on_primary() -> None:
+    replica = FakeReplicaEngine()
+    router = build_router(replica)
+
+    assert asyncio.run(router.sessionmaker_for(read_only=False)) is _primary_factory
+    assert asyncio.run(router.sessionmaker_for(read_only=True, require_primary=True)) is _primary_factory
+    assert replica.probes == 0
+
+
+def test_router_falls_back_to_primary_when_replica_down_or_stale() -> None:
+    assert asyncio.run(build_router(FakeReplicaEngine(down=True)).sessionmaker_for(read_only=True)) is _primary_factory
+    assert asyncio.run(build_router(FakeReplicaEngine(lag_seconds=30.0)).sessionmaker_for(read_only=True)) is _primary_factory
+    assert asyncio.run(build_router(None).sessionmaker_for(read_only=True)) is _primary_factory
+
+
+def test_router_caches_replica_health_between_checks() -> None:
+    now = {"value": 100.0}
+    replica = FakeReplicaEngine(down=True)
+    router = build_router(replica, clock=lambda: now["value"])
+
+    async def _route_twice():
+        first = await router.sessionmaker_for(read_only=True)
+        replica.down = False
+        second = await router.sessionmaker_for(read_only=True)
+        return first, second
+
+    first, second = asyncio.run(_route_twice())
+    assert first is _primary_factory
+    assert second is _primary_factory
+    assert replica.probes == 1
+
+    now["value"] = 111.0
+    assert asyncio.run(router.sessionmaker_for(read_only=True)) is _replica_factory
+    assert replica.probes == 2
+
+
+def test_router_runs_a_single_probe_for_concurrent_reads() -> None:
+    replica = FakeReplicaEngine(delay=0.05)
+    router = build_router(replica)
+
+    async def _route_concurrently():
+        return await asyncio.gather(*(router.sessionmaker_for(read_only=True) for _ in range(10)))
+
+    factories = asyncio.run(_route_concurrently())
+
+    assert all(factory is _replica_factory for factory in factories)
+    assert replica.probes == 1
+
+
+def test_router_does_not_hold_reads_behind_a_slow_probe() -> None:
+    replica = FakeReplicaEngine(delay=0.2)
+    router = build_router(replica, probe_wait_seconds=0.01)
+
+    async def _route_while_probing():
+        first = await router.sessionmaker_for(read_only=True)
+        second = await router.sessionmaker_for(read_only=True)
+        await asyncio.sleep(0.3)
+        third = await router.sessionmaker_for(read_only=True)
+        return first, second, third
+
+    first, second, third = asyncio.run(_route_while_probing())
+
+    assert first is _primary_factory
+    assert second is _primary_factory
+    assert third is _replica_factory
+    assert replica.probes == 1
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+from app.services import evidence_derivatives
+from app.services.evidence_derivatives import print_rendition, print_variant
+from app.services.evidence_store import EvidenceStore, LocalEvidenceBackend, derivative_key
+from app.services.pdf_generator import generate_forensic_pdf
+
+
+def _full_page_capture() -> bytes:
+    # Capture pleine page du scraper : grande, riche en details, stockee en PNG.
+    image = PILImage.frombytes("RGB", (1200, 1800), os.urandom(1200 * 1800 * 3))
+    output = io.BytesIO()
+    image.save(output, format="PNG")
+    return output.getvalue()
+
+
+def _store_with_capture(tmp_path: Path) -> tuple[EvidenceStore, str, str]:
+    store = EvidenceStore(LocalEvidenceBackend(tmp_path / "store"), tmp_path)
+    payload = _full_page_capture()
+    digest = hashlib.sha256(payload).hexdigest()
+    store.backend.put_bytes(f"sha256/{digest[:2]}/{digest[2:4]}/{digest}", payload)
+    return store, f"sha256/{digest[:2]}/{digest[2:4]}/{digest}", digest
+
+
+def test_print_rendition_is_generated_once_per_hash(tmp_path, monkeypatch) -> None:
+    store, source_key, digest = _store_with_capture(tmp_path)
+    renders = {"count": 0}
+    original_render = evidence_derivatives.render_print_rendition
+
+    def _counting_render(original: bytes) -> bytes:
+        renders["count"] += 1
+        return original_render(original)
+
+    monkeypatch.setattr(evidence_derivatives, "render_print_rendition", _counting_render)
+
+    first = print_rendition(store, source_key=source_key, sha256=digest)
+    second = print_rendition(store, source_key=source_key, sha256=digest)
+
+    assert renders["count"] == 1
+    cached = store.local_path(derivative_key(digest, print_variant()))
+    assert second == str(cached)
+    with PILImage.open(first) as rendition:
+        assert rendition.width <= 543 and rendition.height <= 543
+    assert cached.stat().st_size * 10 < store.local_path(source_key).stat().st_size
+
+
+def _snapshot_with_capture(source_key: str, digest: str) -> dict:
+    return {
+        "snapshot_version": "2.0",
+        "generated_at": "2026-10-19T10:00:00",
+        "data": {
+            "alert": {"uuid": "b84c753d-5ddf-4fef-88bd-99e6f8f915d7", "risk_score": 80},
+            "analysis": {"risk_score": 80},
+            "evidences": [{"type": "SCREENSHOT", "file_path": source_key, "file_hash": digest}],
+        },
+    }
+
+
+def test_pdf_annex_embeds_the_print_rendition(tmp_path, monkeypatch) -> None:
+    store, source_key, digest = _store_with_capture(tmp_path)
+    monkeypatch.setattr("app.services.pdf_generator.get_evidence_store", lambda: store)
+    snapshot = _snapshot_with_capture(source_key, digest)
+
+    with_rendition = tmp_path / "rendition.pdf"
+    generate_forensic_pdf(snapshot, str(with_rendition), "a" * 64, page_compression=True)
+    monkeypatch.setattr("app.services.pdf_generator.print_rendition", lambda *_args, **_kwargs: None)
+    with_original = tmp_path / "original.pdf"
+    generate_forensic_pdf(snapshot, str(with_original), "a" * 64, page_compression=True)
+
+    assert with_rendition.stat().st_size * 10 < with_original.stat().st_size
+
+
+def test_reduced_rendition_caption_only_when_the_rendition_is_embedded(tmp_path, monkeypatch) -> None:
+    store, source_key, digest = _store_with_capture(tmp_path)
+    monkeypatch.setattr("app.services.pdf_generator.get_evidence_store", lambda: store)
+    snapshot = _snapshot_with_capture(source_key, digest)
+
+    with_rendition = tmp_path / "rendition.pdf"
+    generate_forensic_pdf(snapshot, str(with_rendition), "a" * 64, page_compression=False)
+    monkeypatch.setattr("app.services.pdf_generator.print_rendition", lambda *_args, **_kwargs: None)
+    with_original = tmp_path / "original.pdf"
+    generate_forensic_pdf(snapshot, str(with_original), "a" * 64, page_compression=False)
+
+    assert b"Rendu reduit pour impression" in with_rendition.read_bytes()
+    assert b"Rendu reduit pour impression" not in with_original.read_bytes()
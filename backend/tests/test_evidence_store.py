@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+from functools import partial
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import select
+from starlette.datastructures import Headers
+
+from app.models import EvidenceBlob, FormalReport
+from app.services import citizen_flow
+from app.services.evidence_derivatives import print_variant
+from app.services.evidence_store import (
+    EvidenceStore,
+    LocalEvidenceBackend,
+    S3EvidenceBackend,
+    blob_key,
+    derivative_key,
+    purge_blobs,
+    release_blobs,
+    retain_blob,
+)
+from app.services.upload_streaming import StagedUpload
+
+
+class FakeClientError(Exception):
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class FakeS3Client:
+    """Sous-ensemble de l'API boto3 utilise par le backend (comportement MinIO)."""
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads = 0
+
+    def head_object(self, *, Bucket: str, Key: str) -> dict:
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError("404")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def upload_file(self, filename: str, bucket: str, key: str) -> None:
+        self.uploads += 1
+        with open(filename, "rb") as handle:
+            self.objects[(bucket, key)] = handle.read()
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes) -> None:
+        self.uploads += 1
+        self.objects[(Bucket, Key)] = Body
+
+    def get_object(self, *, Bucket: str, Key: str) -> dict:
+        if (Bucket, Key) not in self.objects:
+            raise FakeClientError("NoSuchKey")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, *, Bucket: str, Key: str) -> None:
+        self.objects.pop((Bucket, Key), None)
+
+
+def _stage(tmp_path, payload: bytes, name: str) -> StagedUpload:
+    temp_path = tmp_path / name
+    temp_path.write_bytes(payload)
+    return StagedUpload(temp_path=temp_path, sha256=hashlib.sha256(payload).hexdigest(), size_bytes=len(payload))
+
+
+def test_local_store_writes_identical_content_once(tmp_path) -> None:
+    store = EvidenceStore(LocalEvidenceBackend(tmp_path / "store"), tmp_path)
+    payload = b"capture-identique"
+
+    async def _run():
+        first = await store.put_staged(_stage(tmp_path, payload, "a.part"))
+        second = await store.put_staged(_stage(tmp_path, payload, "b.part"))
+        return first, second
+
+    first, second = asyncio.run(_run())
+
+    digest = hashlib.sha256(payload).hexdigest()
+    assert first == second == blob_key(digest) == f"sha256/{digest[:2]}/{digest[2:4]}/{digest}"
+    assert store.local_path(first) == tmp_path / "store" / "sha256" / digest[:2] / digest[2:4] / digest
+    assert not (tmp_path / "a.part").exists() and not (tmp_path / "b.part").exists()
+    assert store.local_path("../etc/passwd") is None
+    assert asyncio.run(store.delete(first)) is True
+    assert store.local_path(first) is None
+
+
+def test_s3_store_deduplicates_and_reads_back(tmp_path) -> None:
+    client = FakeS3Client()
+    store = EvidenceStore(S3EvidenceBackend(client, "evidences", prefix="prod/"), tmp_path)
+    payload = b"\x89PNG-minio"
+
+    async def _run():
+        key = await store.put_staged(_stage(tmp_path, payload, "a.part"))
+        await store.put_staged(_stage(tmp_path, payload, "b.part"))
+        return key, await store.read_bytes(key)
+
+    key, read_back = asyncio.run(_run())
+
+    assert client.uploads == 1
+    assert ("evidences", f"prod/{key}") in client.objects
+    assert read_back == payload
+    assert store.local_path(key) is None
+    assert not store.backend.exists(blob_key("0" * 64))
+    with pytest.raises(ValueError):
+        store.backend.exists("/absolute/key")
+
+
+async def _refcount_scenario(store: EvidenceStore, db) -> tuple[list[int], list[str], set[str], int]:
+    digest = hashlib.sha256(b"partagee").hexdigest()
+    key = await store.put_bytes(digest, b"partagee")
+    counts: list[int] = []
+    await retain_blob(db, sha256=digest, storage_key=key, size_bytes=8)
+    await db.commit()
+    await retain_blob(db, sha256=digest, storage_key=key, size_bytes=8)
+    await db.commit()
+    counts.append(int(await db.scalar(select(EvidenceBlob.ref_count).where(EvidenceBlob.sha256 == digest))))
+
+    orphans, unknown = await release_blobs(db, [digest, "legacy-hash"])
+    await db.commit()
+    assert orphans == []
+    counts.append(int(await db.scalar(select(EvidenceBlob.ref_count).where(EvidenceBlob.sha256 == digest))))
+
+    orphans, _ = await release_blobs(db, [digest])
+    await db.commit()
+    remaining = await db.scalar(select(EvidenceBlob.ref_count).where(EvidenceBlob.sha256 == digest))
+    counts.append(int(remaining or 0))
+    purged = await purge_blobs(store, orphans)
+    return counts, orphans, unknown, purged
+
+
+def test_blob_is_deleted_only_when_last_reference_goes(run_in_session, tmp_path) -> None:
+    store = EvidenceStore(LocalEvidenceBackend(tmp_path / "store"), tmp_path)
+
+    counts, orphans, unknown, purged = run_in_session(partial(_refcount_scenario, store))
+
+    assert counts == [2, 1, 0]
+    assert unknown == {"legacy-hash"}
+    assert len(orphans) == 1 and purged == 1
+    assert orphans[0].sha256 == hashlib.sha256(b"partagee").hexdigest()
+    assert store.local_path(orphans[0].storage_key) is None
+
+
+def test_purge_removes_derivatives_of_path_keyed_blobs(run_in_session, tmp_path) -> None:
+    store = EvidenceStore(LocalEvidenceBackend(tmp_path / "store"), tmp_path)
+    digest = hashlib.sha256(b"capture-scraper").hexdigest()
+    # Capture du scraper enregistree sous son chemin, pas sous `sha256/...`.
+    store.backend.put_bytes("screenshots/scan_42.png", b"capture-scraper")
+    rendition_key = derivative_key(digest, print_variant())
+    store.backend.put_bytes(rendition_key, b"rendu")
+
+    async def _scenario(db):
+        await retain_blob(db, sha256=digest, storage_key="screenshots/scan_42.png")
+        await db.commit()
+        orphans, _ = await release_blobs(db, [digest])
+        await db.commit()
+        return await purge_blobs(store, orphans)
+
+    assert run_in_session(_scenario) == 1
+    assert store.local_path("screenshots/scan_42.png") is None
+    assert store.local_path(rendition_key) is None
+
+
+def test_retain_blob_upserts_and_keeps_the_first_storage_key(run_with_database) -> None:
+    digest = hashlib.sha256(b"capture").hexdigest()
+
+    async def _scenario(database):
+        # Deux sessions : chaque premier upload emet le meme INSERT ... ON CONFLICT.
+        async with database.session_factory() as first, database.session_factory() as second:
+            first_key = await retain_blob(first, sha256=digest, storage_key="screenshots/legacy.png")
+            await first.commit()
+            second_key = await retain_blob(second, sha256=digest, storage_key=blob_key(digest), content_type="image/png")
+            await second.commit()
+            blob = await second.get(EvidenceBlob, digest)
+            return first_key, second_key, blob.ref_count, blob.content_type
+
+    assert run_with_database(_scenario) == ("screenshots/legacy.png", "screenshots/legacy.png", 2, "image/png")
+
+
+def test_identical_screenshots_from_two_reports_share_one_blob(run_in_session, monkeypatch, tmp_path) -> None:
+    store = EvidenceStore(LocalEvidenceBackend(tmp_path / "store"), tmp_path)
+    monkeypatch.setattr(citizen_flow, "get_evidence_store", lambda: store)
+    payload = b"\x89PNG-capture-partagee"
+
+    def _upload() -> UploadFile:
+        return UploadFile(io.BytesIO(payload), filename="capture.png", headers=Headers({"content-type": "image/png"}))
+
+    async def _scenario(db):
+        reports = [FormalReport(), FormalReport()]
+        for report in reports:
+            await citizen_flow._store_citizen_screenshots(report, [_upload()], db)
+        blob = await db.get(EvidenceBlob, hashlib.sha256(payload).hexdigest())
+        return [len(report.evidence_items) for report in reports], blob.ref_count, reports[1].evidence_items[0].file_path
+
+    items, ref_count, file_path = run_in_session(_scenario)
+
+    # Le second signalement garde sa capture, sur le meme blob.
+    assert items == [1, 1]
+    assert ref_count == 2
+    assert file_path == blob_key(hashlib.sha256(payload).hexdigest())
+    assert store.local_path(file_path) is not None
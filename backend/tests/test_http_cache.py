@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import AsyncGenerator
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import evidence as evidence_endpoints
+from app.core.http_cache import (
+    IMMUTABLE_CACHE_CONTROL,
+    cached_bytes_response,
+    cached_file_response,
+    strong_etag,
+    weak_etag,
+)
+from app.database import get_db
+from app.services.evidence_store import EvidenceStore, LocalEvidenceBackend, blob_key
+
+
+PAYLOAD = bytes(range(256)) * 40
+
+
+def _cache_app(tmp_path) -> TestClient:
+    artifact = tmp_path / "artifact.bin"
+    artifact.write_bytes(PAYLOAD)
+    app = FastAPI()
+
+    @app.get("/file")
+    async def _file(request: Request):
+        return await cached_file_response(request, artifact, etag=strong_etag("abc"), media_type="application/pdf")
+
+    @app.get("/file-stat")
+    async def _file_stat(request: Request):
+        return await cached_file_response(request, artifact)
+
+    @app.get("/bytes")
+    async def _bytes(request: Request):
+        return cached_bytes_response(request, PAYLOAD, etag=strong_etag("abc"), media_type="application/json")
+
+    @app.get("/weak")
+    async def _weak(request: Request):
+        return cached_bytes_response(request, PAYLOAD, etag=weak_etag("abc"), media_type="application/json")
+
+    return TestClient(app)
+
+
+def test_file_and_bytes_responses_revalidate_with_etag(tmp_path) -> None:
+    client = _cache_app(tmp_path)
+
+    for path in ("/file", "/bytes"):
+        first = client.get(path)
+        assert first.status_code == 200 and first.content == PAYLOAD
+        assert first.headers["etag"] == '"abc"'
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        revalidated = client.get(path, headers={"If-None-Match": 'W/"other", "abc"'})
+        assert revalidated.status_code == 304 and revalidated.content == b""
+        assert revalidated.headers["etag"] == '"abc"'
+
+    stat_etag = client.get("/file-stat").headers["etag"]
+    assert client.get("/file-stat", headers={"If-None-Match": stat_etag}).status_code == 304
+
+
+def test_file_and_bytes_responses_serve_byte_ranges(tmp_path) -> None:
+    client = _cache_app(tmp_path)
+
+    for path in ("/file", "/bytes"):
+        partial = client.get(path, headers={"Range": "bytes=100-199"})
+        assert partial.status_code == 206
+        assert partial.content == PAYLOAD[100:200]
+        assert partial.headers["content-range"] == f"bytes 100-199/{len(PAYLOAD)}"
+
+        suffix = client.get(path, headers={"Range": "bytes=-10"})
+        assert suffix.status_code == 206 and suffix.content == PAYLOAD[-10:]
+
+        # If-Range perime : le client recoit la representation complete.
+        stale = client.get(path, headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+        assert stale.status_code == 200 and stale.content == PAYLOAD
+
+        assert client.get(path, headers={"Range": f"bytes={len(PAYLOAD)}-"}).status_code == 416
+
+    # Validateur faible : 304 possible, mais jamais de reprise via If-Range.
+    weak = client.get("/weak", headers={"Range": "bytes=0-9", "If-Range": 'W/"abc"'})
+    assert weak.status_code == 200 and weak.content == PAYLOAD
+    assert client.get("/weak", headers={"If-None-Match": 'W/"abc"'}).status_code == 304
+
+
+def test_content_addressed_evidence_is_immutable_and_skips_storage_on_304(monkeypatch, tmp_path) -> None:
+    digest = hashlib.sha256(PAYLOAD).hexdigest()
+    backend = LocalEvidenceBackend(tmp_path / "store")
+    backend.put_bytes(blob_key(digest), PAYLOAD)
+    store = EvidenceStore(backend, tmp_path / "staging")
+    reads = {"count": 0}
+    original_local_path = store.local_path
+
+    def _counting_local_path(key):
+        reads["count"] += 1
+        return original_local_path(key)
+
+    monkeypatch.setattr(store, "local_path", _counting_local_path)
+    monkeypatch.setattr(evidence_endpoints, "get_evidence_store", lambda: store)
+
+    class _Result:
+        def scalars(self):
+            return self
+
+        def first(self):
+            return SimpleNamespace(id=7, file_path=blob_key(digest), file_hash=digest, metadata_json={})
+
+    class _Session:
+        async def execute(self, _query):
+            return _Result()
+
+        async def scalar(self, _query):
+            # EvidenceBlob.content_type enregistre a l'upload.
+            return "image/png"
+
+    async def _override_get_db() -> AsyncGenerator[_Session, None]:
+        yield _Session()
+
+    app = FastAPI()
+    app.include_router(evidence_endpoints.router, prefix="/evidences")
+    app.dependency_overrides[get_db] = _override_get_db
+    client = TestClient(app)
+
+    response = client.get("/evidences/items/view/7")
+    revalidated = client.get("/evidences/items/view/7", headers={"If-None-Match": f'"{digest}"'})
+
+    assert response.status_code == 200 and response.content == PAYLOAD
+    assert response.headers["etag"] == f'"{digest}"'
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert revalidated.status_code == 304
+    assert reads["count"] == 1
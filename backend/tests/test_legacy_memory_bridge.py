@@ -96,7 +96,7 @@ async def test_delete_linked_memory_domain_reports_removes_report_graph_and_upda
         message=message,
         analysis=analysis,
         suspect_number=suspect_number,
-        evidence_items=[SimpleNamespace(id=21)],
+        evidence_items=[SimpleNamespace(id=21, file_hash="a" * 64)],
         impersonation_incidents=[SimpleNamespace(id=31)],
         forensic_bundles=[bundle],
     )
@@ -111,6 +111,7 @@ async def test_delete_linked_memory_domain_reports_removes_report_graph_and_upda
     assert summary.deleted_messages_count == 1
     assert summary.deleted_analyses_count == 1
     assert summary.deleted_evidence_items_count == 1
+    assert summary.evidence_hashes == ["a" * 64]
     assert summary.deleted_impersonation_incidents_count == 1
     assert summary.deleted_forensic_bundles_count == 1
     assert summary.deleted_external_transmissions_count == 2
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.core.security import AuthenticatedPrincipal
+from app.services.live_feed import LiveFeedHub, stream_live_events
+from app.services.write_events import ADMIN_AND_OWNER, build_write_event, encode_write_event
+
+
+ADMIN = AuthenticatedPrincipal(id=1, email="admin@local.test", role="ADMIN", status="ACTIVE")
+SME = AuthenticatedPrincipal(id=7, email="pme@local.test", role="SME", status="ACTIVE")
+
+
+def _report_event(owner_user_id: int | None) -> dict:
+    return build_write_event(
+        ("reports",),
+        kind="report.created",
+        data={"reference": f"SIG-{owner_user_id}"},
+        audience=ADMIN_AND_OWNER,
+        owner_user_id=owner_user_id,
+    )
+
+
+def _transmission_event() -> dict:
+    return build_write_event(("transmissions",), kind="transmission.status", data={"status": "DELIVERED"})
+
+
+def _parse(chunks: list[str]) -> list[dict]:
+    frames = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith((":", "retry")))
+        if fields:
+            frames.append({**fields, "data": json.loads(fields["data"])})
+    return frames
+
+
+async def _collect(stream, count: int) -> list[str]:
+    chunks = []
+    async for chunk in stream:
+        if chunk.startswith("retry"):
+            continue
+        chunks.append(chunk)
+        if len(chunks) == count:
+            break
+    await stream.aclose()
+    return chunks
+
+
+def test_events_are_filtered_by_role_and_owner() -> None:
+    async def _run():
+        hub = LiveFeedHub(replay_size=10, queue_size=10)
+        admin = hub.subscribe(ADMIN)
+        sme = hub.subscribe(SME)
+        hub.dispatch("1-0", _report_event(owner_user_id=7))
+        hub.dispatch("2-0", _report_event(owner_user_id=8))
+        hub.dispatch("3-0", _transmission_event())
+        admin_ids = [(await admin.get())[0] for _ in range(3)]
+        sme_ids = [(await sme.get())[0]]
+        return admin_ids, sme_ids, sme._queue.empty()
+
+    admin_ids, sme_ids, sme_drained = asyncio.run(_run())
+
+    assert admin_ids == ["1-0", "2-0", "3-0"]
+    assert sme_ids == ["1-0"]
+    assert sme_drained
+
+
+def test_slow_subscriber_is_closed_instead_of_buffering() -> None:
+    async def _run():
+        hub = LiveFeedHub(replay_size=10, queue_size=2)
+        subscriber = hub.subscribe(ADMIN)
+        for index in range(5):
+            hub.dispatch(f"{index + 1}-0", _transmission_event())
+        return subscriber.overflowed, await subscriber.get()
+
+    assert asyncio.run(_run()) == (True, None)
+
+
+def test_reconnect_replays_missed_events_then_follows_live() -> None:
+    async def _run():
+        hub = LiveFeedHub(replay_size=10, queue_size=10)
+        for index in range(3):
+            hub.dispatch(f"{index + 1}-0", _transmission_event())
+        stream = stream_live_events(hub, ADMIN, last_event_id="1-0", heartbeat_seconds=1)
+        collector = asyncio.create_task(_collect(stream, 3))
+        await asyncio.sleep(0.01)
+        hub.dispatch("4-0", _transmission_event())
+        chunks = await collector
+        return chunks, hub.subscriber_count
+
+    chunks, subscribers = asyncio.run(_run())
+    frames = _parse(chunks)
+
+    assert [frame["id"] for frame in frames] == ["2-0", "3-0", "4-0"]
+    assert frames[0]["event"] == "transmission.status"
+    assert frames[0]["data"]["data"] == {"status": "DELIVERED"}
+    assert "audience" not in frames[0]["data"]
+    assert subscribers == 0
+
+
+def test_trimmed_history_asks_the_client_to_resync(monkeypatch) -> None:
+    class FakeRedis:
+        async def xrange(self, _stream, min="-", count=None):
+            # "5-0" a ete purge du flux plafonne : le premier element est posterieur.
+            return [(entry_id, {"event": encode_write_event(_transmission_event())}) for entry_id in ("8-0", "9-0")]
+
+        async def aclose(self) -> None:
+            return None
+
+    monkeypatch.setattr("app.services.live_feed.redis.from_url", lambda *_args, **_kwargs: FakeRedis())
+
+    async def _run():
+        hub = LiveFeedHub(replay_size=10, queue_size=10)
+        hub.dispatch("9-0", _transmission_event())
+        return await _collect(stream_live_events(hub, ADMIN, last_event_id="5-0", heartbeat_seconds=1), 3)
+
+    frames = _parse(asyncio.run(_run()))
+
+    assert frames[0]["event"] == "resync"
+    assert [frame.get("id") for frame in frames[1:]] == ["8-0", "9-0"]
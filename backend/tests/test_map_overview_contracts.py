@@ -4,7 +4,7 @@ import uuid
 from fastapi.testclient import TestClient
 
 from app.core.config import settings
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.main import app
 
 
@@ -21,6 +21,7 @@ def build_client(fake_session: FakeSession | None = None) -> TestClient:
 
     app.dependency_overrides.clear()
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     return TestClient(app)
 
 
@@ -149,12 +149,15 @@ def test_mobile_report_reuses_existing_verification(monkeypatch) -> None:
     async def _fake_register(*_args, **_kwargs):
         return False
 
+    async def _fake_schedule(*_args, **_kwargs):
+        return []
+
     monkeypatch.setattr("app.services.citizen_flow._upsert_suspect_number", _fake_upsert)
     monkeypatch.setattr("app.services.citizen_flow._create_impersonation_incidents_if_needed", _fake_noop)
     monkeypatch.setattr("app.services.citizen_flow._mirror_legacy_alert", _fake_noop)
     monkeypatch.setattr("app.services.citizen_flow._enqueue_forensic_capture", _fake_noop)
     monkeypatch.setattr("app.services.citizen_flow._register_campaign_detection", _fake_register)
-    monkeypatch.setattr("app.services.citizen_flow.schedule_external_transmissions_for_report", _fake_noop)
+    monkeypatch.setattr("app.services.citizen_flow.schedule_external_transmissions_for_report", _fake_schedule)
 
     result = __import__("asyncio").run(
         create_citizen_report(
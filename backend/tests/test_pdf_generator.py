@@ -1,6 +1,7 @@
 from pathlib import Path
 
-from app.services.pdf_generator import generate_forensic_pdf
+from app.services import pdf_generator
+from app.services.pdf_generator import ForensicPdfTemplate, generate_forensic_pdf, get_pdf_template
 
 
 def test_generate_forensic_pdf_renders_premium_probative_sections(tmp_path: Path) -> None:
@@ -51,3 +52,23 @@ def test_generate_forensic_pdf_renders_premium_probative_sections(tmp_path: Path
     assert "MESSAGE SUSPECT" in pdf_content
     assert "INTEGRITE DU DOSSIER" in pdf_content
     assert "CHAINE DE CUSTODY" in pdf_content
+
+
+def test_pdf_template_is_built_once_and_reused(tmp_path: Path, monkeypatch) -> None:
+    qr_calls = {"count": 0}
+    original_make = pdf_generator.qrcode.make
+
+    def _counting_make(data):
+        qr_calls["count"] += 1
+        return original_make(data)
+
+    monkeypatch.setattr(pdf_generator.qrcode, "make", _counting_make)
+    template = ForensicPdfTemplate("https://verify.example")
+    snapshot = {"generated_at": "2026-10-19T10:00:00", "data": {"alert": {"risk_score": 40}, "analysis": {}}}
+
+    for index in range(3):
+        generate_forensic_pdf(snapshot, str(tmp_path / f"report_{index}.pdf"), "b" * 64, template=template)
+
+    assert qr_calls["count"] == 1
+    assert template.verify_url == "https://verify.example/verify"
+    assert get_pdf_template() is get_pdf_template()
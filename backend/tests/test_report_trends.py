@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CitizenMessage, FormalReport, MessageAnalysis, SuspectNumber
+from app.services.dashboard_rollups import rebuild_dashboard_rollups
+from app.services.trends import bucket_floor, bucket_starts, get_report_trends, next_bucket
+
+
+# Un lundi, pour des semaines lisibles.
+MONDAY = datetime(2026, 10, 5, tzinfo=timezone.utc)
+
+# (decalage depuis MONDAY, departement, statut, score)
+REPORTS = (
+    (timedelta(hours=9, minutes=5), "Littoral", "NEW", 80),
+    (timedelta(hours=9, minutes=40), "Littoral", "CONFIRMED", 20),
+    (timedelta(hours=11), "Oueme", "NEW", 80),
+    (timedelta(days=2, hours=3), "Littoral", "NEW", 50),
+    (timedelta(days=8), "Borgou", "DISMISSED", 70),
+)
+
+
+async def _seed(db: AsyncSession) -> None:
+    for index, (offset, department, status, score) in enumerate(REPORTS, start=1):
+        message = CitizenMessage(content=f"Message {index}")
+        suspect = SuspectNumber(phone_hash=f"{index:064d}", phone_ciphertext="cipher")
+        db.add_all([message, suspect])
+        await db.flush()
+        analysis = MessageAnalysis(
+            message_id=message.id, risk_score=score, risk_level="HIGH", primary_category="mobile_money"
+        )
+        db.add(analysis)
+        await db.flush()
+        db.add(
+            FormalReport(
+                public_reference=f"SIG-2026-{index:06d}",
+                message_id=message.id,
+                analysis_id=analysis.id,
+                suspect_number_id=suspect.id,
+                custody_hash="c" * 64,
+                status=status,
+                department=department,
+                created_at=MONDAY + offset,
+            )
+        )
+    await db.commit()
+    await rebuild_dashboard_rollups(db, now=MONDAY + timedelta(days=30))
+
+
+def test_bucket_alignment_and_month_rollover() -> None:
+    wednesday = datetime(2026, 12, 30, 17, 42, tzinfo=timezone.utc)
+
+    assert bucket_floor(wednesday, "hour") == datetime(2026, 12, 30, 17, tzinfo=timezone.utc)
+    assert bucket_floor(wednesday, "week") == datetime(2026, 12, 28, tzinfo=timezone.utc)
+    assert next_bucket(bucket_floor(wednesday, "month"), "month") == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert len(bucket_starts(wednesday, wednesday + timedelta(days=1), "day")) == 2
+    with pytest.raises(HTTPException) as exc_info:
+        bucket_starts(wednesday, wednesday + timedelta(days=365), "hour")
+    assert exc_info.value.status_code == 400
+
+
+def test_daily_buckets_come_from_rollups_with_gaps_filled(run_in_session) -> None:
+    async def _scenario(db):
+        return await get_report_trends(db, bucket="day", start=MONDAY, end=MONDAY + timedelta(days=4))
+
+    trends = run_in_session(_scenario, seed=_seed)
+
+    assert trends.source == "rollups"
+    assert len(trends.series) == 1
+    assert [point.count for point in trends.series[0].points] == [3, 0, 1, 0]
+    assert trends.total == 4
+
+
+def test_weekly_buckets_split_by_department(run_in_session) -> None:
+    async def _scenario(db):
+        return await get_report_trends(
+            db, bucket="week", start=MONDAY, end=MONDAY + timedelta(days=14), dimension="department"
+        )
+
+    trends = run_in_session(_scenario, seed=_seed)
+
+    by_key = {series.key: [point.count for point in series.points] for series in trends.series}
+    assert by_key == {"Littoral": [3, 0], "Oueme": [1, 0], "Borgou": [0, 1]}
+    assert [series.key for series in trends.series][0] == "Littoral"
+
+
+def test_hourly_buckets_scan_reports_with_filters(run_in_session) -> None:
+    async def _scenario(db):
+        return (
+            await get_report_trends(db, bucket="hour", start=MONDAY + timedelta(hours=8), end=MONDAY + timedelta(hours=12)),
+            await get_report_trends(
+                db,
+                bucket="hour",
+                start=MONDAY + timedelta(hours=8),
+                end=MONDAY + timedelta(hours=12),
+                dimension="risk",
+                department="littoral",
+            ),
+        )
+
+    hourly, by_risk = run_in_session(_scenario, seed=_seed)
+
+    assert hourly.source == "reports"
+    assert [point.count for point in hourly.series[0].points] == [0, 2, 0, 1]
+    assert hourly.series[0].points[1].bucket_start == MONDAY + timedelta(hours=9)
+    assert by_risk.department == "Littoral"
+    assert {series.key: series.total for series in by_risk.series} == {"high": 1, "low": 1}
+
+
+def test_reversed_range_is_rejected(run_in_session) -> None:
+    async def _scenario(db):
+        return await get_report_trends(db, bucket="day", start=MONDAY, end=MONDAY - timedelta(days=1))
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_in_session(_scenario, seed=_seed)
+
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("filters", [{"department": "Foo"}, {"status": "ARCHIVED"}])
+def test_unknown_department_or_status_is_rejected(run_in_session, filters) -> None:
+    async def _scenario(db):
+        return await get_report_trends(db, bucket="day", start=MONDAY, end=MONDAY + timedelta(days=4), **filters)
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_in_session(_scenario)
+
+    assert exc_info.value.status_code == 400
@@ -21,9 +21,9 @@ class LegacySchemaMismatchSession:
     def __init__(self) -> None:
         self.execute_calls = 0
 
-    async def execute(self, _query):
+    async def execute(self, query):
         self.execute_calls += 1
-        if self.execute_calls == 1:
+        if "FROM reports" not in str(query):
             return EmptyResult()
         raise ProgrammingError(
             "SELECT reports.snapshot_version FROM reports",
@@ -31,6 +31,9 @@ class LegacySchemaMismatchSession:
             Exception("column reports.snapshot_version does not exist"),
         )
 
+    async def rollback(self) -> None:
+        return None
+
     async def close(self) -> None:
         return None
 
@@ -56,9 +59,12 @@ def auth_headers(role: str = "ADMIN", uid: int = 1) -> dict[str, str]:
 
 
 def test_reports_list_returns_empty_when_legacy_report_schema_is_outdated() -> None:
-    client = build_client()
+    fake_session = LegacySchemaMismatchSession()
+    client = build_client(fake_session)
 
     response = client.get("/api/v1/reports/", headers=auth_headers("ADMIN"))
 
     assert response.status_code == 200
-    assert response.json() == []
+    assert response.json() == {"items": [], "next_cursor": None, "limit": 50}
+    # Union refusee par le schema legacy, puis relance sur les seuls bundles.
+    assert fake_session.execute_calls == 2
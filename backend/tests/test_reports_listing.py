@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.reports import _bundle_listing_query, get_report, list_reports
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models import Alert, CitizenMessage, ForensicBundle, FormalReport, MessageAnalysis, Report, SuspectNumber
+from app.schemas.token import TokenPayload
+from app.services.bundle_jobs import apply_snapshot_columns
+
+
+ADMIN = TokenPayload(sub="admin@local.test", uid=1, role="ADMIN")
+BASE_TIME = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+async def _add_bundle(db: AsyncSession, index: int, *, created_at: datetime, legacy_alert_uuid: uuid.UUID | None = None):
+    message = CitizenMessage(content=f"Message {index}", channel="WEB_PORTAL")
+    suspect = SuspectNumber(phone_hash=f"{index:064d}", phone_ciphertext="cipher")
+    db.add_all([message, suspect])
+    await db.flush()
+    analysis = MessageAnalysis(message_id=message.id, risk_score=70 + index, risk_level="HIGH")
+    db.add(analysis)
+    await db.flush()
+    report = FormalReport(
+        public_reference=f"SIG-2026-{index:06d}",
+        message_id=message.id,
+        analysis_id=analysis.id,
+        suspect_number_id=suspect.id,
+        custody_hash="c" * 64,
+        legacy_alert_uuid=legacy_alert_uuid,
+    )
+    db.add(report)
+    await db.flush()
+    bundle = ForensicBundle(
+        uuid=uuid.uuid4(),
+        report_id=report.id,
+        global_hash=f"{index:x}" * 64,
+        status="READY",
+        created_at=created_at,
+        manifest_json={
+            "snapshot_hash_sha256": "s" * 64,
+            "snapshot": {
+                "snapshot_version": "2.0",
+                "data": {"alert": {"uuid": str(legacy_alert_uuid), "url": f"https://b{index}.example", "risk_score": 70 + index}},
+            },
+        },
+    )
+    apply_snapshot_columns(bundle, bundle.manifest_json["snapshot"], formal_report=report, snapshot_hash="s" * 64)
+    db.add(bundle)
+    await db.flush()
+    return bundle
+
+
+async def _add_legacy(db: AsyncSession, index: int, *, generated_at: datetime, alert: Alert):
+    report = Report(
+        uuid=uuid.uuid4(),
+        alert_id=alert.id,
+        snapshot_json={"snapshot_version": "1.0", "data": {"alert": {"uuid": str(alert.uuid), "url": alert.url, "risk_score": 40}}},
+        report_hash=f"legacy-{index}",
+        snapshot_version="1.0",
+        pdf_path=f"report_{index}.pdf",
+        generated_at=generated_at,
+    )
+    db.add(report)
+    await db.flush()
+    return report
+
+
+async def _seed(db: AsyncSession) -> dict:
+    alerts = [Alert(uuid=uuid.uuid4(), url=f"https://alert{index}.example", risk_score=40) for index in range(3)]
+    db.add_all(alerts)
+    await db.flush()
+    seeded = {
+        "legacy_only": await _add_legacy(db, 1, generated_at=BASE_TIME, alert=alerts[0]),
+        # Rapport legacy deja couvert par un bundle : masque de la liste.
+        "legacy_covered": await _add_legacy(db, 2, generated_at=BASE_TIME - timedelta(hours=1), alert=alerts[1]),
+        "covering_bundle": await _add_bundle(db, 2, created_at=BASE_TIME - timedelta(hours=2), legacy_alert_uuid=alerts[1].uuid),
+        # Meme horodatage que `legacy_only` : departage par (kind, id).
+        "same_time_bundle": await _add_bundle(db, 3, created_at=BASE_TIME),
+        "legacy_old": await _add_legacy(db, 4, generated_at=BASE_TIME - timedelta(days=2), alert=alerts[2]),
+    }
+    for index in range(5, 9):
+        seeded[f"bundle_{index}"] = await _add_bundle(db, index, created_at=BASE_TIME - timedelta(days=1, minutes=index))
+    await db.commit()
+    return seeded
+
+
+async def _page(db: AsyncSession, *, limit: int, cursor: str | None = None, alert_uuid: uuid.UUID | None = None) -> dict:
+    return await list_reports(limit=limit, cursor=cursor, alert_uuid=alert_uuid, scope=None, db=db, token_data=ADMIN)
+
+
+def test_keyset_pages_cover_the_deduplicated_union_in_order(run_in_session) -> None:
+    async def _scenario(db):
+        seeded = await _seed(db)
+        pages = []
+        cursor = None
+        while True:
+            page = await _page(db, limit=3, cursor=cursor)
+            pages.append(page)
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        single_page = await _page(db, limit=50)
+        return seeded, pages, single_page
+
+    seeded, pages, single_page = run_in_session(_scenario)
+
+    expected = [
+        seeded["legacy_only"].uuid,
+        seeded["same_time_bundle"].uuid,
+        seeded["covering_bundle"].uuid,
+        *(seeded[f"bundle_{index}"].uuid for index in range(5, 9)),
+        seeded["legacy_old"].uuid,
+    ]
+    paged = [item["uuid"] for page in pages for item in page["items"]]
+    assert paged == expected
+    assert [item["uuid"] for item in single_page["items"]] == expected
+    assert [len(page["items"]) for page in pages] == [3, 3, 2]
+    assert seeded["legacy_covered"].uuid not in paged
+
+    first = pages[0]["items"][1]
+    assert "snapshot_json" not in first
+    assert first["kind"] == "bundle" and first["status"] == "READY"
+    assert first["url"] == "https://b3.example" and first["risk_score"] == 73
+    assert first["snapshot_version"] == "2.0"
+    assert pages[0]["items"][0]["url"] == "https://alert0.example"
+
+
+def test_alert_filter_and_detail_endpoint_return_the_full_snapshot(run_in_session) -> None:
+    async def _scenario(db):
+        seeded = await _seed(db)
+        covered_alert_uuid = uuid.UUID(seeded["covering_bundle"].manifest_json["snapshot"]["data"]["alert"]["uuid"])
+        filtered = await _page(db, limit=10, alert_uuid=covered_alert_uuid)
+        bundle_detail = await get_report(report_uuid=seeded["covering_bundle"].uuid, db=db, token_data=ADMIN)
+        legacy_detail = await get_report(report_uuid=seeded["legacy_old"].uuid, db=db, token_data=ADMIN)
+        with pytest.raises(HTTPException) as missing:
+            await get_report(report_uuid=uuid.uuid4(), db=db, token_data=ADMIN)
+        return seeded, filtered, bundle_detail, legacy_detail, missing.value
+
+    seeded, filtered, bundle_detail, legacy_detail, missing = run_in_session(_scenario)
+
+    assert [item["uuid"] for item in filtered["items"]] == [seeded["covering_bundle"].uuid]
+    assert filtered["items"][0]["alert_id"] == bundle_detail["alert_id"] != 0
+    assert bundle_detail["snapshot_json"]["data"]["alert"]["url"] == "https://b2.example"
+    assert legacy_detail["snapshot_json"]["snapshot_version"] == "1.0"
+    assert missing.status_code == 404
+
+
+def test_cursor_round_trip_and_rejects_garbage() -> None:
+    cursor = encode_cursor({"t": BASE_TIME, "k": "bundle", "i": 7})
+
+    assert decode_cursor(cursor, datetime_keys=("t",)) == {"t": BASE_TIME, "k": "bundle", "i": 7}
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor", datetime_keys=("t",))
+    assert exc_info.value.status_code == 400
+    # Cle `i` absente ou non entiere : 400, pas une erreur SQL au moment de la comparaison.
+    for values in ({"t": BASE_TIME}, {"t": BASE_TIME, "i": "7"}, {"t": BASE_TIME, "i": True}):
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(encode_cursor(values), datetime_keys=("t",), int_keys=("i",))
+        assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("kind", [None, 5, "archive"])
+def test_listing_rejects_a_cursor_with_an_unknown_kind(run_in_session, kind) -> None:
+    values = {"t": BASE_TIME, "i": 7} if kind is None else {"t": BASE_TIME, "k": kind, "i": 7}
+
+    async def _scenario(db):
+        return await _page(db, limit=3, cursor=encode_cursor(values))
+
+    with pytest.raises(HTTPException) as exc_info:
+        run_in_session(_scenario)
+    assert exc_info.value.status_code == 400
+
+
+def test_listing_reads_denormalized_columns_not_the_manifest(run_in_session) -> None:
+    async def _scenario(db):
+        alert = Alert(uuid=uuid.uuid4(), url="https://alert.example", risk_score=40)
+        db.add(alert)
+        bundle = await _add_bundle(db, 1, created_at=BASE_TIME, legacy_alert_uuid=alert.uuid)
+        await db.commit()
+        columns = (bundle.alert_uuid, bundle.public_reference, bundle.snapshot_version, bundle.risk_score, bundle.alert_url)
+        snapshot_hash = bundle.snapshot_hash_sha256
+        return alert, columns, snapshot_hash, bundle
+
+    alert, columns, snapshot_hash, bundle = run_in_session(_scenario)
+
+    assert columns == (alert.uuid, "SIG-2026-000001", "2.0", 71, "https://b1.example")
+    assert snapshot_hash == bundle.manifest_json["snapshot_hash_sha256"]
+    query = _bundle_listing_query(scope_owner_user_id=7, alert_uuid=alert.uuid, cursor=None, limit=10)
+    assert "manifest_json" not in str(query)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.response_cache import AggregateCache, aggregate_cache_key
+from app.services.write_events import build_write_event, decode_write_event, encode_write_event
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _counting_loader(results: list[str], *, delay: float = 0.0):
+    calls: list[int] = []
+
+    async def _load() -> str:
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        return results[len(calls) - 1]
+
+    return _load, calls
+
+
+def test_cache_key_ignores_unset_params_and_separates_scopes() -> None:
+    key = aggregate_cache_key("/map/overview", {"window": "7d", "category": None, "risk": "all"}, "public")
+
+    assert key == "public:/map/overview?risk=all&window=7d"
+    assert aggregate_cache_key("/map/overview", {}, "admin") != aggregate_cache_key("/map/overview", {}, "public")
+
+
+def test_fresh_entry_is_served_without_recomputing() -> None:
+    async def _run():
+        clock = FakeClock()
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30, clock=clock)
+        loader, calls = _counting_loader(["v1", "v2"])
+        first = await cache.get_or_compute("k", loader, topics=("reports",))
+        clock.now = 9
+        second = await cache.get_or_compute("k", loader, topics=("reports",))
+        return first, second, len(calls)
+
+    assert asyncio.run(_run()) == ("v1", "v1", 1)
+
+
+def test_concurrent_misses_share_a_single_computation() -> None:
+    async def _run():
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30)
+        loader, calls = _counting_loader(["v1", "v2"], delay=0.01)
+        values = await asyncio.gather(*(cache.get_or_compute("k", loader, topics=("reports",)) for _ in range(5)))
+        return values, len(calls)
+
+    values, calls = asyncio.run(_run())
+
+    assert values == ["v1"] * 5
+    assert calls == 1
+
+
+def test_stale_entry_is_served_while_a_single_refresh_runs() -> None:
+    async def _run():
+        clock = FakeClock()
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30, clock=clock)
+        loader, _calls = _counting_loader(["v1"])
+        refresher, refresh_calls = _counting_loader(["v2", "v3"], delay=0.01)
+        await cache.get_or_compute("k", loader, topics=("reports",), refresher=refresher)
+
+        clock.now = 15
+        stale = [await cache.get_or_compute("k", loader, topics=("reports",), refresher=refresher) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        refreshed = await cache.get_or_compute("k", loader, topics=("reports",), refresher=refresher)
+        return stale, refreshed, len(refresh_calls)
+
+    stale, refreshed, refresh_calls = asyncio.run(_run())
+
+    assert stale == ["v1", "v1", "v1"]
+    assert refreshed == "v2"
+    assert refresh_calls == 1
+
+
+def test_expired_beyond_stale_window_blocks_on_reload() -> None:
+    async def _run():
+        clock = FakeClock()
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30, clock=clock)
+        loader, calls = _counting_loader(["v1", "v2"])
+        await cache.get_or_compute("k", loader, topics=("reports",), refresher=loader)
+        clock.now = 41
+        return await cache.get_or_compute("k", loader, topics=("reports",), refresher=loader), len(calls)
+
+    assert asyncio.run(_run()) == ("v2", 2)
+
+
+def test_invalidation_targets_entries_depending_on_the_topic() -> None:
+    async def _run():
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30)
+        reports, report_calls = _counting_loader(["r1", "r2"])
+        intel, intel_calls = _counting_loader(["i1", "i2"])
+        await cache.get_or_compute("reports", reports, topics=("reports", "rollups"))
+        await cache.get_or_compute("intel", intel, topics=("threat_intel",))
+
+        cache.invalidate("rollups")
+        values = (
+            await cache.get_or_compute("reports", reports, topics=("reports", "rollups")),
+            await cache.get_or_compute("intel", intel, topics=("threat_intel",)),
+        )
+        return values, len(report_calls), len(intel_calls)
+
+    assert asyncio.run(_run()) == (("r2", "i1"), 2, 1)
+
+
+def test_result_computed_across_an_invalidation_is_not_kept_fresh() -> None:
+    async def _run():
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30)
+        loader, calls = _counting_loader(["before", "after"], delay=0.01)
+        pending = asyncio.create_task(cache.get_or_compute("k", loader, topics=("reports",)))
+        await asyncio.sleep(0)
+        cache.invalidate("reports")
+        first = await pending
+        second = await cache.get_or_compute("k", loader, topics=("reports",))
+        return first, second, len(calls)
+
+    assert asyncio.run(_run()) == ("before", "after", 2)
+
+
+def test_waiters_take_over_when_the_leader_is_cancelled() -> None:
+    async def _run():
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30)
+        loader, calls = _counting_loader(["v1", "v2"], delay=0.01)
+        leader = asyncio.create_task(cache.get_or_compute("k", loader, topics=("reports",)))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("k", loader, topics=("reports",)))
+        await asyncio.sleep(0)
+        leader.cancel()
+        value = await waiter
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return value, len(calls)
+
+    assert asyncio.run(_run()) == ("v2", 2)
+
+
+def test_loader_errors_propagate_and_are_not_cached() -> None:
+    async def _run():
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30)
+        attempts: list[int] = []
+
+        async def _flaky() -> str:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("db down")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("k", _flaky, topics=("reports",))
+        return await cache.get_or_compute("k", _flaky, topics=("reports",))
+
+    assert asyncio.run(_run()) == "ok"
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    async def _run():
+        cache = AggregateCache(ttl_seconds=10, stale_seconds=30, max_entries=2)
+        for key in ("a", "b"):
+            await cache.get_or_compute(key, _counting_loader([key])[0], topics=())
+        await cache.get_or_compute("a", _counting_loader(["unused"])[0], topics=())
+        await cache.get_or_compute("c", _counting_loader(["c"])[0], topics=())
+        b_loader, b_calls = _counting_loader(["b2"])
+        return await cache.get_or_compute("b", b_loader, topics=()), len(b_calls), len(cache)
+
+    assert asyncio.run(_run()) == ("b2", 1, 2)
+
+
+def test_write_event_round_trip() -> None:
+    event = build_write_event(("reports", "campaigns"), kind="report.created", data={"reference": "SIG-1"})
+
+    assert decode_write_event(encode_write_event(event)) == event
+    assert event["topics"] == ["reports", "campaigns"]
+    assert decode_write_event("not json") is None
+    assert decode_write_event('{"topic": "reports"}') is None
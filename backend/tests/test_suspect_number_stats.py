@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import CitizenMessage, FormalReport, MessageAnalysis, SuspectNumber
+from app.services.suspect_number_stats import EMPTY_SUSPECT_NUMBER_STATS, load_suspect_number_stats
+
+
+# (numero, statut, declarant)
+REPORTS = (
+    (1, "NEW", 7),
+    (1, "IN_REVIEW", 8),
+    (1, "CONFIRMED", 7),
+    (1, "BLOCKED_SIMULATED", 7),
+    (2, "CONFIRMED", 8),
+    (2, "DISMISSED", 8),
+)
+
+
+async def _seed(db: AsyncSession) -> dict[int, int]:
+    suspects = {}
+    for number in (1, 2, 3):
+        suspect = SuspectNumber(phone_hash=f"{number:064d}", phone_ciphertext="cipher")
+        db.add(suspect)
+        await db.flush()
+        suspects[number] = suspect.id
+    for index, (number, status, reporter_user_id) in enumerate(REPORTS, start=1):
+        message = CitizenMessage(content=f"Message {index}")
+        db.add(message)
+        await db.flush()
+        analysis = MessageAnalysis(message_id=message.id, risk_score=60, risk_level="MEDIUM")
+        db.add(analysis)
+        await db.flush()
+        db.add(
+            FormalReport(
+                public_reference=f"SIG-2026-{index:06d}",
+                message_id=message.id,
+                analysis_id=analysis.id,
+                suspect_number_id=suspects[number],
+                reporter_user_id=reporter_user_id,
+                custody_hash="c" * 64,
+                status=status,
+            )
+        )
+    await db.commit()
+    return suspects
+
+
+def test_batch_stats_come_from_a_single_grouped_query(run_with_database) -> None:
+    async def _scenario(database):
+        async with database.session_factory() as db:
+            suspects = await _seed(db)
+
+        statements: list[str] = []
+
+        def _record(_conn, _cursor, statement, *_args) -> None:
+            statements.append(statement)
+
+        event.listen(database.engine.sync_engine, "before_cursor_execute", _record)
+        async with database.session_factory() as db:
+            stats = await load_suspect_number_stats(db, [suspects[1], suspects[2], suspects[3], None, suspects[1]])
+            owned = await load_suspect_number_stats(db, [suspects[1], suspects[2]], owner_user_id=7)
+            empty = await load_suspect_number_stats(db, [None])
+        event.remove(database.engine.sync_engine, "before_cursor_execute", _record)
+        return suspects, stats, owned, empty, statements
+
+    suspects, stats, owned, empty, statements = run_with_database(_scenario)
+
+    assert len(statements) == 2
+    assert stats[suspects[1]].model_dump() == {
+        "reports_for_phone": 4,
+        "open_reports_for_phone": 2,
+        "confirmed_reports_for_phone": 1,
+        "blocked_reports_for_phone": 1,
+    }
+    assert stats[suspects[2]].reports_for_phone == 2
+    assert stats[suspects[2]].confirmed_reports_for_phone == 1
+    assert suspects[3] not in stats
+    assert owned[suspects[1]].reports_for_phone == 3
+    assert owned[suspects[1]].open_reports_for_phone == 1
+    assert suspects[2] not in owned
+    assert empty == {}
+    assert EMPTY_SUSPECT_NUMBER_STATS.reports_for_phone == 0
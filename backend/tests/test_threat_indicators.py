@@ -5,6 +5,7 @@ import uuid
 
 from fastapi.testclient import TestClient
 
+from app.api.v1.endpoints.threat_intel import _regional_heatmap, _threat_intel_dashboard
 from app.core.config import settings
 from app.database import get_db
 from app.main import app
@@ -100,24 +101,30 @@ class FakeSession:
             return FakeResult(items=items[:10])
 
         if "GROUP BY threat_indicators.dominant_category" in query_text:
-            counts: dict[str | None, int] = {}
+            counts: dict[str | None, list[int]] = {}
             for item in self.indicators:
-                counts[item.dominant_category] = counts.get(item.dominant_category, 0) + 1
-            rows = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+                totals = counts.setdefault(item.dominant_category, [0, 0])
+                totals[0] += 1
+                totals[1] += 1 if item.alert_triggered else 0
+            rows = sorted(
+                ((category, total, active) for category, (total, active) in counts.items()),
+                key=lambda row: row[1],
+                reverse=True,
+            )
             return FakeResult(rows=rows)
 
-        if "count(threat_indicators.id)" in query_text and "threat_indicators.alert_triggered IS true" in query_text:
-            active_count = sum(1 for item in self.indicators if item.alert_triggered)
-            return FakeResult(scalar_value=active_count)
-
         if "WHERE threat_indicators.region IS NOT NULL" in query_text and "GROUP BY threat_indicators.region" in query_text:
-            grouped: dict[tuple[str, str | None], int] = {}
+            grouped: dict[str, dict[str | None, int]] = {}
             for item in self.indicators:
                 if not item.region:
                     continue
-                key = (item.region, item.dominant_category)
-                grouped[key] = grouped.get(key, 0) + 1
-            rows = [(region, category, count) for (region, category), count in grouped.items()]
+                per_category = grouped.setdefault(item.region, {})
+                per_category[item.dominant_category] = per_category.get(item.dominant_category, 0) + 1
+            rows = [
+                (region, sum(per_category.values()), max(per_category.items(), key=lambda entry: entry[1])[0])
+                for region, per_category in grouped.items()
+            ]
+            rows.sort(key=lambda row: row[1], reverse=True)
             return FakeResult(rows=rows)
 
         if "WHERE threat_indicators.alert_triggered IS true" in query_text:
@@ -202,3 +209,43 @@ def test_dashboard_requires_auth() -> None:
     client = build_client(db)
     response = client.get("/api/v1/threat-intel/dashboard")
     assert response.status_code in (401, 403)
+
+
+def test_heatmap_and_dashboard_aggregate_in_sql(run_in_session) -> None:
+    # (type, region, categorie, occurrences, alerte)
+    rows = (
+        ("phone", "Littoral", "mobile_money", 9, True),
+        ("phone", "Littoral", "mobile_money", 4, False),
+        ("phone", "Littoral", "phishing", 7, True),
+        ("url", "Borgou", "phishing", 2, False),
+        ("phone", "Borgou", None, 1, False),
+        ("phone", None, "mobile_money", 3, False),
+    )
+
+    async def _seed(db):
+        for indicator_type, region, category, occurrences, alert in rows:
+            db.add(
+                ThreatIndicator(
+                    indicator_type=indicator_type,
+                    raw_value_masked="+229 XX XX",
+                    occurrence_count=occurrences,
+                    region=region,
+                    dominant_category=category,
+                    alert_triggered=alert,
+                )
+            )
+
+    async def _scenario(db):
+        return await _regional_heatmap(db), await _threat_intel_dashboard(db)
+
+    heatmap, dashboard = run_in_session(_scenario, seed=_seed)
+
+    assert heatmap == [
+        {"region": "Littoral", "count": 3, "dominant_type": "mobile_money"},
+        # Egalite 1-1 : la categorie renseignee l'emporte sur NULL (tri par nom).
+        {"region": "Borgou", "count": 2, "dominant_type": "phishing"},
+    ]
+    assert [item["count"] for item in dashboard["top_numbers"]] == [9, 7, 4, 3, 1]
+    assert dashboard["categories"][0] == {"name": "mobile_money", "count": 3}
+    assert dashboard["active_threats"] == 2
+
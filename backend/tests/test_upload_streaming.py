@@ -0,0 +1,55 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.services.evidence_store import EvidenceStore, LocalEvidenceBackend
+from app.services.upload_streaming import STAGING_DIRNAME, stage_upload
+
+
+class RecordingUpload(UploadFile):
+    def __init__(self, payload: bytes) -> None:
+        super().__init__(file=io.BytesIO(payload), filename="capture.png")
+        self.read_sizes: list[int] = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.read_sizes.append(size)
+        return await super().read(size)
+
+
+def test_stage_upload_hashes_in_chunks_and_publishes_atomically(tmp_path) -> None:
+    payload = b"\x89PNG" + b"x" * 10_000
+    upload = RecordingUpload(payload)
+
+    async def _run():
+        staged = await stage_upload(upload, base_dir=tmp_path, max_bytes=20_000, chunk_size=4096)
+        key = await EvidenceStore(LocalEvidenceBackend(tmp_path), tmp_path).put_staged(staged)
+        return staged, tmp_path / key
+
+    staged, target = asyncio.run(_run())
+
+    digest = hashlib.sha256(payload).hexdigest()
+    assert staged.sha256 == digest
+    assert staged.size_bytes == len(payload)
+    assert all(size == 4096 for size in upload.read_sizes)
+    assert target == tmp_path / "sha256" / digest[:2] / digest[2:4] / digest
+    assert target.read_bytes() == payload
+    assert not staged.temp_path.exists()
+
+
+def test_stage_upload_aborts_as_soon_as_cap_is_exceeded(tmp_path) -> None:
+    upload = RecordingUpload(b"y" * 50_000)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(stage_upload(upload, base_dir=tmp_path, max_bytes=10_000, chunk_size=4096))
+
+    assert exc_info.value.status_code == 413
+    assert len(upload.read_sizes) == 3
+    assert list((tmp_path / STAGING_DIRNAME).iterdir()) == []
+
+
+def test_stage_upload_skips_empty_file(tmp_path) -> None:
+    assert asyncio.run(stage_upload(RecordingUpload(b""), base_dir=tmp_path, max_bytes=10)) is None
+    assert list((tmp_path / STAGING_DIRNAME).iterdir()) == []
@@ -1,11 +1,12 @@
-import { useMemo, useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useCallback, useMemo, useState } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { Filter, Loader2, MapPinned, RadioTower, RefreshCcw } from 'lucide-react';
 
 import { apiClient } from '@/api/client';
 import type { APIResponse } from '@/api/types';
 import PageHero from '@/components/layout/PageHero';
 import { Badge } from '@/components/ui/badge';
+import { LIVE_RESYNC_EVENT, useLiveFeed, type LiveFeedEvent } from '@/lib/live-feed';
 import { categoryLabel } from '@/lib/presentation';
 import type { DepartmentMapPoint, MapOverviewData, MapRiskFilter, MapWindowFilter } from '@/types';
 import BeninSignalMap from '@/features/live/BeninSignalMap';
@@ -22,10 +23,25 @@ const WINDOW_OPTIONS: Array<{ value: MapWindowFilter; label: string }> = [
   { value: '30d', label: '30 jours' },
 ];
 
+// Sujets des evenements qui invalident la carte (memes sujets que le cache serveur de /map/overview).
+const MAP_TOPICS = new Set(['rollups', 'transmissions']);
+
 export default function LivePage() {
   const [windowFilter, setWindowFilter] = useState<MapWindowFilter>('7d');
   const [riskFilter, setRiskFilter] = useState<MapRiskFilter>('all');
   const [selectedDepartment, setSelectedDepartment] = useState<string | null>(null);
+  const queryClient = useQueryClient();
+
+  // Mise a jour poussee par le serveur : la carte n'est rechargee que si un evenement la concerne.
+  const handleLiveEvent = useCallback(
+    (event: LiveFeedEvent) => {
+      if (event.kind === LIVE_RESYNC_EVENT || event.topics.some((topic) => MAP_TOPICS.has(topic))) {
+        void queryClient.invalidateQueries({ queryKey: ['map-overview'] });
+      }
+    },
+    [queryClient],
+  );
+  const isLive = useLiveFeed(handleLiveEvent);
 
   const { data, isLoading, isError, refetch, isFetching } = useQuery({
     queryKey: ['map-overview', windowFilter, riskFilter],
@@ -58,6 +74,7 @@ export default function LivePage() {
               <>
                 <Badge variant="secondary">Veille nationale</Badge>
                 <Badge variant="outline">Carte Benin</Badge>
+                {isLive ? <Badge variant="success">En direct</Badge> : null}
               </>
             }
             actions={
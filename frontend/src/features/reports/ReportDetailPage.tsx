@@ -17,15 +17,9 @@ interface ReportListItem {
     uuid: string;
     report_hash: string;
     snapshot_hash_sha256?: string;
-    snapshot_version?: string;
+    snapshot_version?: string | null;
     generated_at: string;
-    snapshot_json?: {
-        data?: {
-            alert?: {
-                uuid?: string;
-            };
-        };
-    };
+    alert_uuid?: string | null;
 }
 
 function riskBadge(score: number): 'destructive' | 'warning' | 'outline' {
@@ -50,17 +44,17 @@ export default function ReportDetailPage() {
     });
 
     const { data: reports } = useQuery({
-        queryKey: ['reports-list'],
+        queryKey: ['reports-list', 'alert', id],
         queryFn: async () => {
-            const response = await apiClient.get<ReportListItem[]>('/reports/');
-            return response.data || [];
+            const response = await apiClient.get<{ items: ReportListItem[] }>('/reports/', {
+                params: { alert_uuid: id, limit: 1 },
+            });
+            return response.data.items || [];
         },
+        enabled: !!id,
     });
 
-    const activeReport = useMemo(() => {
-        const items = reports ?? [];
-        return items.find((report) => report.snapshot_json?.data?.alert?.uuid === id) ?? null;
-    }, [reports, id]);
+    const activeReport = useMemo(() => (reports ?? [])[0] ?? null, [reports]);
 
     if (isLoadingAlert) {
         return (
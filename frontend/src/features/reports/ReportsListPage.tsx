@@ -1,5 +1,5 @@
 import { useMemo } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useInfiniteQuery } from '@tanstack/react-query';
 import { useNavigate } from 'react-router-dom';
 import { Calendar, Download, ExternalLink, FileText, Fingerprint, Loader2, RefreshCcw } from 'lucide-react';
 
@@ -10,24 +10,26 @@ import { downloadApiFile } from '@/lib/download';
 import { riskTone } from '@/lib/presentation';
 
 interface ReportListItem {
+    kind: 'bundle' | 'legacy';
     id: number;
     uuid: string;
     alert_id: number;
+    alert_uuid?: string | null;
+    url?: string | null;
+    risk_score?: number | null;
+    status: string;
     report_hash: string;
-    snapshot_hash_sha256?: string;
-    snapshot_version?: string;
-    pdf_path: string;
+    snapshot_hash_sha256?: string | null;
+    snapshot_version?: string | null;
+    pdf_path?: string | null;
     generated_at: string;
-    snapshot_json?: {
-        data?: {
-            alert?: {
-                uuid?: string;
-                url?: string;
-                risk_score?: number;
-                source_type?: string;
-            };
-        };
-    };
+    detail_url: string;
+}
+
+interface ReportListPage {
+    items: ReportListItem[];
+    next_cursor: string | null;
+    limit: number;
 }
 
 interface ReportsListPageProps {
@@ -45,19 +47,23 @@ export default function ReportsListPage({
     const navigate = useNavigate();
     const { toast } = useToast();
 
-    const { data: reports, isLoading, isError, refetch, isFetching } = useQuery({
+    const { data, isLoading, isError, refetch, isFetching, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery({
         queryKey: ['reports-list', scope ?? 'all'],
-        queryFn: async () => {
-            const query = scope ? `?scope=${scope}` : '';
-            const response = await apiClient.get<ReportListItem[]>(`/reports/${query}`);
-            return response.data || [];
+        queryFn: async ({ pageParam }) => {
+            const response = await apiClient.get<ReportListPage>('/reports/', {
+                params: { scope, cursor: pageParam ?? undefined },
+            });
+            return response.data;
         },
+        initialPageParam: null as string | null,
+        getNextPageParam: (lastPage) => lastPage.next_cursor,
     });
 
+    const reports = useMemo(() => data?.pages.flatMap((page) => page.items) ?? [], [data]);
+
     const summary = useMemo(() => {
-        const items = reports ?? [];
-        const total = items.length;
-        const withAlert = items.filter((r) => !!r.snapshot_json?.data?.alert?.uuid).length;
+        const total = reports.length;
+        const withAlert = reports.filter((r) => !!r.alert_uuid).length;
         return { total, withAlert };
     }, [reports]);
 
@@ -99,7 +105,7 @@ export default function ReportsListPage({
                 </section>
             )}
 
-            {!isLoading && !isError && (!reports || reports.length === 0) && (
+            {!isLoading && !isError && reports.length === 0 && (
                 <section className="panel border-dashed p-10 text-center fade-rise-in-1">
                     <FileText className="mx-auto mb-3 h-12 w-12 text-muted-foreground/50" />
                     <h2 className="text-lg font-semibold">Aucun rapport genere</h2>
@@ -117,13 +123,12 @@ export default function ReportsListPage({
                 </section>
             )}
 
-            {!isLoading && !isError && reports && reports.length > 0 && (
+            {!isLoading && !isError && reports.length > 0 && (
                 <section className="space-y-3 fade-rise-in-1">
                     {reports.map((report) => {
-                        const alert = report.snapshot_json?.data?.alert;
-                        const alertUuid = alert?.uuid;
-                        const target = alert?.url || 'Incident sans URL (signal textuel)';
-                        const risk = alert?.risk_score || 0;
+                        const alertUuid = report.alert_uuid;
+                        const target = report.url || 'Incident sans URL (signal textuel)';
+                        const risk = report.risk_score || 0;
                         const createdAt = new Date(report.generated_at);
 
                         return (
@@ -221,6 +226,17 @@ export default function ReportsListPage({
                             </article>
                         );
                     })}
+                    {hasNextPage && (
+                        <div className="flex justify-center pt-2">
+                            <button
+                                onClick={() => fetchNextPage()}
+                                disabled={isFetchingNextPage}
+                                className="inline-flex items-center gap-2 rounded-lg border border-input px-3 py-2 text-xs text-muted-foreground transition hover:bg-secondary/40 hover:text-foreground disabled:opacity-60"
+                            >
+                                {isFetchingNextPage && <Loader2 className="h-3.5 w-3.5 animate-spin" />} Charger plus
+                            </button>
+                        </div>
+                    )}
                 </section>
             )}
         </div>
@@ -1,9 +1,10 @@
-import { useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useCallback, useState } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { AlertTriangle, Download, FileJson } from 'lucide-react';
 import { Bar, BarChart, CartesianGrid, Cell, Pie, PieChart, ResponsiveContainer, Tooltip, XAxis, YAxis } from 'recharts';
 
 import { apiClient } from '@/api/client';
+import { LIVE_RESYNC_EVENT, useLiveFeed, type LiveFeedEvent } from '@/lib/live-feed';
 import { useAuthStore } from '@/store/auth-store';
 
 type TopNumber = {
@@ -40,6 +41,18 @@ export default function ThreatMapPage() {
   const token = useAuthStore((state) => state.token);
   const [isStixDownloading, setIsStixDownloading] = useState(false);
   const apiRoot = (import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1').replace(/\/api\/v1\/?$/, '');
+  const queryClient = useQueryClient();
+
+  // Plus de rafraichissement periodique : le flux /live signale les indicateurs modifies.
+  const handleLiveEvent = useCallback(
+    (event: LiveFeedEvent) => {
+      if (event.kind === LIVE_RESYNC_EVENT || event.topics.includes('threat_intel')) {
+        void queryClient.invalidateQueries({ queryKey: ['threat-intel', 'dashboard'] });
+      }
+    },
+    [queryClient],
+  );
+  useLiveFeed(handleLiveEvent);
 
   const { data, isLoading } = useQuery({
     queryKey: ['threat-intel', 'dashboard'],
@@ -47,7 +60,6 @@ export default function ThreatMapPage() {
       const response = await apiClient.get<ThreatIntelDashboard>('/threat-intel/dashboard');
       return response.data;
     },
-    refetchInterval: 60_000,
   });
 
   const downloadBlob = (blob: Blob, filename: string) => {
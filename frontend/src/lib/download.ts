@@ -30,6 +30,10 @@ export async function downloadApiFile(
         data: options?.data,
         responseType: 'blob',
     });
+    if (response.status === 202) {
+        // Bundle encore en cours de generation : le corps est le statut du job, pas le fichier.
+        throw new Error('Document en cours de generation');
+    }
     const filename = extractFilename(response, fallbackFilename);
     const blobUrl = window.URL.createObjectURL(response.data);
     const anchor = document.createElement('a');
@@ -0,0 +1,167 @@
+import { useEffect, useRef, useState } from 'react';
+
+import { useAuthStore } from '@/store/auth-store';
+
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
+const DEFAULT_RETRY_MS = 3000;
+
+// Evenement de controle du serveur : l'historique manque, recharger les agregats REST.
+export const LIVE_RESYNC_EVENT = 'resync';
+
+export interface LiveFeedEvent {
+    id: string | null;
+    kind: string;
+    topics: string[];
+    at: string | null;
+    data: Record<string, unknown>;
+}
+
+interface LiveFeedOptions {
+    token: string;
+    onEvent: (event: LiveFeedEvent) => void;
+    onStatusChange?: (connected: boolean) => void;
+    onUnauthorized?: () => void;
+}
+
+interface SseFrame {
+    id: string | null;
+    event: string;
+    data: string;
+    retry: number | null;
+}
+
+function parseFrame(block: string): SseFrame | null {
+    const frame: SseFrame = { id: null, event: 'message', data: '', retry: null };
+    const dataLines: string[] = [];
+    for (const line of block.split('\n')) {
+        if (!line || line.startsWith(':')) continue;
+        const separator = line.indexOf(':');
+        const field = separator === -1 ? line : line.slice(0, separator);
+        const value = separator === -1 ? '' : line.slice(separator + 1).replace(/^ /, '');
+        if (field === 'id') frame.id = value;
+        else if (field === 'event') frame.event = value;
+        else if (field === 'data') dataLines.push(value);
+        else if (field === 'retry' && /^\d+$/.test(value)) frame.retry = Number(value);
+    }
+    frame.data = dataLines.join('\n');
+    return frame.id !== null || dataLines.length > 0 || frame.retry !== null ? frame : null;
+}
+
+function toLiveEvent(frame: SseFrame): LiveFeedEvent {
+    let payload: Partial<LiveFeedEvent> = {};
+    try {
+        payload = frame.data ? JSON.parse(frame.data) : {};
+    } catch {
+        payload = {};
+    }
+    return {
+        id: frame.id,
+        kind: frame.event,
+        topics: Array.isArray(payload.topics) ? payload.topics : [],
+        at: payload.at ?? null,
+        data: payload.data ?? {},
+    };
+}
+
+/**
+ * Client SSE sur fetch : EventSource ne sait pas envoyer l'en-tete Authorization.
+ * Reconnexion automatique avec Last-Event-ID ; retourne la fonction de fermeture.
+ */
+export function connectLiveFeed({ token, onEvent, onStatusChange, onUnauthorized }: LiveFeedOptions): () => void {
+    const controller = new AbortController();
+    let lastEventId: string | null = null;
+    let retryMs = DEFAULT_RETRY_MS;
+
+    const readStream = async (): Promise<boolean> => {
+        const headers: Record<string, string> = {
+            Accept: 'text/event-stream',
+            Authorization: `Bearer ${token}`,
+        };
+        if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+        const response = await fetch(`${API_BASE_URL}/live/events`, {
+            headers,
+            signal: controller.signal,
+            cache: 'no-store',
+        });
+        if (response.status === 401 || response.status === 403) {
+            onUnauthorized?.();
+            return false;
+        }
+        if (!response.ok || !response.body) {
+            return true;
+        }
+
+        onStatusChange?.(true);
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        try {
+            for (;;) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += value.replace(/\r\n?/g, '\n');
+                let boundary = buffer.indexOf('\n\n');
+                while (boundary !== -1) {
+                    const frame = parseFrame(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                    boundary = buffer.indexOf('\n\n');
+                    if (!frame) continue;
+                    if (frame.retry !== null) retryMs = frame.retry;
+                    if (frame.id) lastEventId = frame.id;
+                    if (frame.data) onEvent(toLiveEvent(frame));
+                }
+            }
+        } finally {
+            onStatusChange?.(false);
+        }
+        return true;
+    };
+
+    void (async () => {
+        while (!controller.signal.aborted) {
+            let reconnect = true;
+            try {
+                reconnect = await readStream();
+            } catch {
+                // Coupure reseau ou fermeture par le serveur (client trop lent) : on reprend.
+            }
+            if (!reconnect || controller.signal.aborted) break;
+            await new Promise((resolve) => window.setTimeout(resolve, retryMs));
+        }
+    })();
+
+    return () => controller.abort();
+}
+
+/**
+ * Abonne l'ecran au flux `/live/events` tant qu'un utilisateur est connecte.
+ * `onEvent` recoit aussi l'evenement `resync` ; retourne l'etat de la connexion.
+ */
+export function useLiveFeed(onEvent: (event: LiveFeedEvent) => void): boolean {
+    const accessToken = useAuthStore((state) => state.token?.access_token ?? null);
+    const [connected, setConnected] = useState(false);
+    const handlerRef = useRef(onEvent);
+
+    useEffect(() => {
+        handlerRef.current = onEvent;
+    }, [onEvent]);
+
+    useEffect(() => {
+        if (!accessToken) {
+            setConnected(false);
+            return undefined;
+        }
+        const close = connectLiveFeed({
+            token: accessToken,
+            onEvent: (event) => handlerRef.current(event),
+            onStatusChange: setConnected,
+            onUnauthorized: () => useAuthStore.getState().logout(),
+        });
+        return () => {
+            close();
+            setConnected(false);
+        };
+    }, [accessToken]);
+
+    return connected;
+}
@@ -99,6 +99,9 @@ export interface CitizenIncidentListItem {
     created_at: ISOString;
     attachments_count: number;
     reports_for_phone: number;
+    open_reports_for_phone?: number;
+    confirmed_reports_for_phone?: number;
+    blocked_reports_for_phone?: number;
 }
 
 export interface CitizenIncidentListData {
@@ -407,6 +410,7 @@ export interface AdminTransmissionListData {
     retrying_count: number;
     failed_count: number;
     delivered_count: number;
+    next_cursor?: string | null;
 }
 
 export interface PaginatedResponse<T> {